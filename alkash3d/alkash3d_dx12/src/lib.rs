@@ -176,6 +176,18 @@ mod root_sig {
             },
         ];
 
+        // ClusterCB (b3) – своя таблица: корневой параметр 1
+        // (зеркало – alkash3d/graphics/root_signature.py)
+        let cluster_ranges = [
+            D3D12_DESCRIPTOR_RANGE {
+                RangeType: D3D12_DESCRIPTOR_RANGE_TYPE_CBV,
+                NumDescriptors: 1,
+                BaseShaderRegister: 3,
+                RegisterSpace: 0,
+                OffsetInDescriptorsFromTableStart: D3D12_DESCRIPTOR_RANGE_OFFSET_APPEND,
+            },
+        ];
+
         // Статический сэмплер
         let samplers = [
             D3D12_STATIC_SAMPLER_DESC {
@@ -209,6 +221,19 @@ mod root_sig {
                 Constants: Default::default(),
                 Descriptor: Default::default(),
             },
+            D3D12_ROOT_PARAMETER {
+                ParameterType: D3D12_ROOT_PARAMETER_TYPE_DESCRIPTOR_TABLE,
+                Anonymous: D3D12_ROOT_PARAMETER_0 {
+                    DescriptorTable: D3D12_ROOT_DESCRIPTOR_TABLE {
+                        NumDescriptorRanges: cluster_ranges.len() as u32,
+                        pDescriptorRanges: cluster_ranges.as_ptr(),
+                    },
+                },
+                ShaderVisibility: D3D12_SHADER_VISIBILITY_PIXEL,
+                DescriptorTable: Default::default(),
+                Constants: Default::default(),
+                Descriptor: Default::default(),
+            },
         ];
 
         let root_desc = D3D12_ROOT_SIGNATURE_DESC {
@@ -662,6 +687,16 @@ mod texture_mod {
         width: u32,
         height: u32,
         format: DXGI_FORMAT,
+    ) -> Option<ID3D12Resource> {
+        create_2d_mips(device, width, height, 1, format)
+    }
+
+    pub unsafe fn create_2d_mips(
+        device: &ID3D12Device,
+        width: u32,
+        height: u32,
+        mip_levels: u16,
+        format: DXGI_FORMAT,
     ) -> Option<ID3D12Resource> {
         let heap_props = D3D12_HEAP_PROPERTIES {
             Type: D3D12_HEAP_TYPE_DEFAULT,
@@ -677,7 +712,7 @@ mod texture_mod {
             Width: width as u64,
             Height: height,
             DepthOrArraySize: 1,
-            MipLevels: 1,
+            MipLevels: mip_levels,
             Format: format,
             SampleDesc: DXGI_SAMPLE_DESC { Count: 1, Quality: 0 },
             Layout: D3D12_TEXTURE_LAYOUT_UNKNOWN,
@@ -725,6 +760,31 @@ mod texture_mod {
         texture.Unmap(0, None);
         true
     }
+
+    /// Запись одного mip‑уровня построчно (`row_pitch` – байт в строке
+    /// исходных данных, для BC – строка блоков 4×4).
+    pub unsafe fn update_mip(
+        texture: &ID3D12Resource,
+        mip: u32,
+        data: *const c_void,
+        row_pitch: usize,
+        rows: u32,
+    ) -> bool {
+        let mut mapped: *mut c_void = ptr::null_mut();
+        if let Err(e) = texture.Map(mip, None, Some(&mut mapped)) {
+            debug_println!("[texture] Failed to map mip {}: HRESULT 0x{:X}", mip, e.code().0);
+            return false;
+        }
+
+        if !mapped.is_null() && !data.is_null() {
+            std::ptr::copy_nonoverlapping(
+                data as *const u8, mapped as *mut u8, row_pitch * rows as usize,
+            );
+        }
+
+        texture.Unmap(mip, None);
+        true
+    }
 }
 
 /* ==================== ШЕЙДЕРЫ ==================== */
@@ -735,6 +795,42 @@ mod shader_mod {
         file_path: *const u16,
         entry_point: *const u8,
         profile: *const u8,
+    ) -> Option<ID3DBlob> {
+        compile_from_file_ex(file_path, entry_point, profile, std::ptr::null())
+    }
+
+    /// Загрузить функцию из d3dcompiler_47.dll.
+    pub unsafe fn compiler_proc(name: &str) -> Option<unsafe extern "system" fn() -> isize> {
+        let dll_name = CString::new("d3dcompiler_47.dll").ok()?;
+        let lib = LoadLibraryA(PCSTR(dll_name.as_ptr() as *const u8)).ok()?;
+        let proc_name = CString::new(name).ok()?;
+        GetProcAddress(lib, PCSTR(proc_name.as_ptr() as *const u8))
+    }
+
+    /// D3DCreateBlob + копия байт (байткод из дискового кэша).
+    pub unsafe fn create_blob(data: *const u8, size: usize) -> Option<ID3DBlob> {
+        type D3DCreateBlobFn = unsafe extern "system" fn(
+            usize,
+            *mut *mut ID3DBlob,
+        ) -> windows::core::HRESULT;
+
+        let fn_ptr = compiler_proc("D3DCreateBlob")?;
+        let create: D3DCreateBlobFn = std::mem::transmute(fn_ptr);
+        let mut blob: *mut ID3DBlob = std::ptr::null_mut();
+        if create(size, &mut blob).is_err() || blob.is_null() {
+            return None;
+        }
+        let blob: ID3DBlob = std::mem::transmute_copy(&blob);
+        std::ptr::copy_nonoverlapping(data, blob.GetBufferPointer() as *mut u8, size);
+        Some(blob)
+    }
+
+    /// `macros` – массив D3D_SHADER_MACRO, завершённый {NULL, NULL}, или NULL.
+    pub unsafe fn compile_from_file_ex(
+        file_path: *const u16,
+        entry_point: *const u8,
+        profile: *const u8,
+        macros: *const D3D_SHADER_MACRO,
     ) -> Option<ID3DBlob> {
         debug_println!("\n[shader] Compiling from file...");
 
@@ -803,10 +899,13 @@ mod shader_mod {
         let flags1 = 0x0001;
         let flags2 = 0;
 
+        // D3D_COMPILE_STANDARD_FILE_INCLUDE – #include относительно файла
+        let standard_include = 1usize as *mut std::ffi::c_void;
+
         let hr = compile(
             PCWSTR(file_path),
-            std::ptr::null(),
-            std::ptr::null_mut(),
+            macros as *const std::ffi::c_void,
+            standard_include,
             PCSTR(entry_point),
             PCSTR(profile),
             flags1,
@@ -1438,6 +1537,85 @@ pub extern "C" fn create_texture_from_memory(
     }
 }
 
+/// Текстура с цепочкой mip‑уровней; форматы: rgba8, rgba16f, rgba32f,
+/// bc1, bc3. Данные пишутся по уровням через `update_texture_mip`.
+#[no_mangle]
+pub extern "C" fn create_texture_mips(
+    device_ptr: *mut c_void,
+    width: u32,
+    height: u32,
+    mip_levels: u32,
+    format: *const u8,
+) -> *mut c_void {
+    debug_println!("\n[API] create_texture_mips({}x{}, {} mips)", width, height, mip_levels);
+
+    unsafe {
+        use ptr_utils::*;
+
+        if width == 0 || height == 0 || width > 16384 || height > 16384
+            || mip_levels == 0 || mip_levels > 15
+        {
+            debug_println!("[API] Invalid texture dimensions: {}x{}", width, height);
+            return ptr::null_mut();
+        }
+
+        let device = match as_device(device_ptr) {
+            Some(d) => d,
+            None => {
+                debug_println!("[API] Invalid device");
+                return ptr::null_mut();
+            }
+        };
+
+        let fmt_str = if format.is_null() {
+            "rgba8"
+        } else {
+            CStr::from_ptr(format as *const i8).to_str().unwrap_or("rgba8")
+        };
+
+        let dxgi_format = match fmt_str.to_ascii_lowercase().as_str() {
+            "rgba8" | "rgba8unorm" => DXGI_FORMAT_R8G8B8A8_UNORM,
+            "rgba16f" => DXGI_FORMAT_R16G16B16A16_FLOAT,
+            "rgba32f" => DXGI_FORMAT_R32G32B32A32_FLOAT,
+            "bc1" => DXGI_FORMAT_BC1_UNORM,
+            "bc3" => DXGI_FORMAT_BC3_UNORM,
+            _ => DXGI_FORMAT_R8G8B8A8_UNORM,
+        };
+
+        let texture = match texture_mod::create_2d_mips(
+            &device, width, height, mip_levels as u16, dxgi_format,
+        ) {
+            Some(t) => t,
+            None => return ptr::null_mut(),
+        };
+        std::mem::forget(device);
+
+        let raw_ptr = texture.as_raw();
+        std::mem::forget(texture);
+        raw_ptr as *mut c_void
+    }
+}
+
+#[no_mangle]
+pub extern "C" fn update_texture_mip(
+    texture_ptr: *mut c_void,
+    mip: u32,
+    data_ptr: *const c_void,
+    row_pitch: u32,
+    rows: u32,
+) {
+    debug_println!("\n[API] update_texture_mip({}, {}x{})", mip, row_pitch, rows);
+
+    unsafe {
+        use ptr_utils::*;
+
+        if let Some(texture) = as_resource(texture_ptr) {
+            texture_mod::update_mip(&texture, mip, data_ptr, row_pitch as usize, rows);
+            std::mem::forget(texture);
+        }
+    }
+}
+
 #[no_mangle]
 pub extern "C" fn update_texture(
     texture_ptr: *mut c_void,
@@ -1485,6 +1663,124 @@ pub extern "C" fn compile_shader(
     }
 }
 
+/// Компиляция с макросами: `defines` – строки "NAME=VALUE" (или "NAME"),
+/// каждая завершена NUL, весь список – пустой строкой; NULL – без макросов.
+#[no_mangle]
+pub extern "C" fn compile_shader_ex(
+    file_path: *const u16,
+    entry_point: *const u8,
+    profile: *const u8,
+    defines: *const u8,
+    out_blob: *mut *mut c_void,
+) -> i32 {
+    if file_path.is_null() || entry_point.is_null() || profile.is_null() || out_blob.is_null() {
+        return -1;
+    }
+
+    unsafe {
+        ptr::write(out_blob, ptr::null_mut());
+
+        // Разбор списка "A=1\0B\0\0" → пары CString (живут до конца вызова)
+        let mut pairs: Vec<(CString, CString)> = Vec::new();
+        if !defines.is_null() {
+            let mut cur = defines;
+            loop {
+                let item = std::ffi::CStr::from_ptr(cur as *const std::ffi::c_char);
+                let bytes = item.to_bytes();
+                if bytes.is_empty() {
+                    break;
+                }
+                let text = String::from_utf8_lossy(bytes).into_owned();
+                let (name, value) = match text.split_once('=') {
+                    Some((n, v)) => (n.to_string(), v.to_string()),
+                    None => (text.clone(), "1".to_string()),
+                };
+                match (CString::new(name), CString::new(value)) {
+                    (Ok(n), Ok(v)) => pairs.push((n, v)),
+                    _ => return -1,
+                }
+                cur = cur.add(bytes.len() + 1);
+            }
+        }
+
+        let mut macros: Vec<D3D_SHADER_MACRO> = pairs
+            .iter()
+            .map(|(n, v)| D3D_SHADER_MACRO {
+                Name: PCSTR(n.as_ptr() as *const u8),
+                Definition: PCSTR(v.as_ptr() as *const u8),
+            })
+            .collect();
+        macros.push(D3D_SHADER_MACRO {
+            Name: PCSTR(ptr::null()),
+            Definition: PCSTR(ptr::null()),
+        });
+
+        match shader_mod::compile_from_file_ex(file_path, entry_point, profile, macros.as_ptr()) {
+            Some(blob) => {
+                let raw_ptr = blob.as_raw();
+                std::mem::forget(blob);
+                ptr::write(out_blob, raw_ptr as *mut c_void);
+                0
+            },
+            None => -1
+        }
+    }
+}
+
+/// Размер байткода blob-а.
+#[no_mangle]
+pub extern "C" fn blob_size(blob_ptr: *mut c_void) -> usize {
+    unsafe {
+        match ptr_utils::as_blob(blob_ptr) {
+            Some(blob) => {
+                let size = blob.GetBufferSize();
+                std::mem::forget(blob);
+                size
+            },
+            None => 0
+        }
+    }
+}
+
+/// Скопировать байткод blob-а в `dst` (не более `size` байт).
+#[no_mangle]
+pub extern "C" fn blob_copy(blob_ptr: *mut c_void, dst: *mut u8, size: usize) -> usize {
+    if dst.is_null() {
+        return 0;
+    }
+    unsafe {
+        match ptr_utils::as_blob(blob_ptr) {
+            Some(blob) => {
+                let n = blob.GetBufferSize().min(size);
+                ptr::copy_nonoverlapping(blob.GetBufferPointer() as *const u8, dst, n);
+                std::mem::forget(blob);
+                n
+            },
+            None => 0
+        }
+    }
+}
+
+/// Blob из готового байткода (дисковый кэш шейдеров).
+#[no_mangle]
+pub extern "C" fn create_blob(data: *const u8, size: usize, out_blob: *mut *mut c_void) -> i32 {
+    if data.is_null() || out_blob.is_null() || size == 0 {
+        return -1;
+    }
+    unsafe {
+        ptr::write(out_blob, ptr::null_mut());
+        match shader_mod::create_blob(data, size) {
+            Some(blob) => {
+                let raw_ptr = blob.as_raw();
+                std::mem::forget(blob);
+                ptr::write(out_blob, raw_ptr as *mut c_void);
+                0
+            },
+            None => -1
+        }
+    }
+}
+
 #[no_mangle]
 pub extern "C" fn create_shader_resource_view(
     device_ptr: *mut c_void,
@@ -1556,8 +1852,53 @@ pub extern "C" fn create_graphics_ps(
     device_ptr: *mut c_void,
     vs_blob_ptr: *mut c_void,
     ps_blob_ptr: *mut c_void,
+) -> *mut c_void {
+    create_graphics_ps_ex(device_ptr, vs_blob_ptr, ps_blob_ptr, 0)
+}
+
+/// Input layout формата вершин (`alkash3d.mesh.vertex_format`):
+/// 0 – float32 (32 B), 1 – compact16 (16 B), 2 – compact8 (12 B).
+/// В compact8 NORMAL лежит в pos.w: POSITION читается 4‑компонентным,
+/// шейдер берёт только xyz.
+fn vertex_input_elements(vertex_format: u32) -> Vec<D3D12_INPUT_ELEMENT_DESC> {
+    let element = |name: &'static str, format: DXGI_FORMAT, offset: u32| D3D12_INPUT_ELEMENT_DESC {
+        SemanticName: PCSTR(name.as_ptr() as *const u8),
+        SemanticIndex: 0,
+        Format: format,
+        InputSlot: 0,
+        AlignedByteOffset: offset,
+        InputSlotClass: D3D12_INPUT_CLASSIFICATION_PER_VERTEX_DATA,
+        InstanceDataStepRate: 0,
+    };
+    match vertex_format {
+        1 => vec![
+            element("POSITION\0", DXGI_FORMAT_R16G16B16A16_UNORM, 0),
+            element("NORMAL\0", DXGI_FORMAT_R16G16_SNORM, 8),
+            element("TEXCOORD\0", DXGI_FORMAT_R16G16_FLOAT, 12),
+        ],
+        2 => vec![
+            element("POSITION\0", DXGI_FORMAT_R16G16B16A16_UNORM, 0),
+            element("NORMAL\0", DXGI_FORMAT_R8G8_SNORM, 6),
+            element("TEXCOORD\0", DXGI_FORMAT_R16G16_FLOAT, 8),
+        ],
+        _ => vec![
+            element("POSITION\0", DXGI_FORMAT_R32G32B32_FLOAT, 0),
+            element("NORMAL\0", DXGI_FORMAT_R32G32B32_FLOAT, 12),
+            element("TEXCOORD\0", DXGI_FORMAT_R32G32_FLOAT, 24),
+        ],
+    }
+}
+
+/// Как `create_graphics_ps`, но с input layout формата вершин.
+#[no_mangle]
+pub extern "C" fn create_graphics_ps_ex(
+    device_ptr: *mut c_void,
+    vs_blob_ptr: *mut c_void,
+    ps_blob_ptr: *mut c_void,
+    vertex_format: u32,
 ) -> *mut c_void {
     println!("\n[API] create_graphics_ps() called");
+    println!("  vertex_format: {}", vertex_format);
     println!("  device_ptr: {:p}", device_ptr);
     println!("  vs_blob_ptr: {:p}", vs_blob_ptr);
     println!("  ps_blob_ptr: {:p}", ps_blob_ptr);
@@ -1626,35 +1967,7 @@ pub extern "C" fn create_graphics_ps(
             }
         };
 
-        let input_elements = [
-            D3D12_INPUT_ELEMENT_DESC {
-                SemanticName: PCSTR("POSITION\0".as_ptr() as *const u8),
-                SemanticIndex: 0,
-                Format: DXGI_FORMAT_R32G32B32_FLOAT,
-                InputSlot: 0,
-                AlignedByteOffset: D3D12_APPEND_ALIGNED_ELEMENT,
-                InputSlotClass: D3D12_INPUT_CLASSIFICATION_PER_VERTEX_DATA,
-                InstanceDataStepRate: 0,
-            },
-            D3D12_INPUT_ELEMENT_DESC {
-                SemanticName: PCSTR("NORMAL\0".as_ptr() as *const u8),
-                SemanticIndex: 0,
-                Format: DXGI_FORMAT_R32G32B32_FLOAT,
-                InputSlot: 0,
-                AlignedByteOffset: D3D12_APPEND_ALIGNED_ELEMENT,
-                InputSlotClass: D3D12_INPUT_CLASSIFICATION_PER_VERTEX_DATA,
-                InstanceDataStepRate: 0,
-            },
-            D3D12_INPUT_ELEMENT_DESC {
-                SemanticName: PCSTR("TEXCOORD\0".as_ptr() as *const u8),
-                SemanticIndex: 0,
-                Format: DXGI_FORMAT_R32G32_FLOAT,
-                InputSlot: 0,
-                AlignedByteOffset: D3D12_APPEND_ALIGNED_ELEMENT,
-                InputSlotClass: D3D12_INPUT_CLASSIFICATION_PER_VERTEX_DATA,
-                InstanceDataStepRate: 0,
-            },
-        ];
+        let input_elements = vertex_input_elements(vertex_format);
 
         let input_layout = D3D12_INPUT_LAYOUT_DESC {
             pInputElementDescs: input_elements.as_ptr(),
@@ -1888,6 +2201,52 @@ pub unsafe extern "C" fn set_vertex_buffers(vertex_buffer: *mut c_void, index_bu
     }
 }
 
+/// Как `set_vertex_buffers`, но с явными размерами, шагом вершины и
+/// форматом индексов (16 или 32 бита).
+#[no_mangle]
+pub unsafe extern "C" fn set_vertex_buffers_ex(
+    vertex_buffer: *mut c_void,
+    vertex_bytes: u32,
+    stride: u32,
+    index_buffer: *mut c_void,
+    index_bytes: u32,
+    index_bits: u32,
+) {
+    debug_println!(
+        "\n[API] set_vertex_buffers_ex({:p}, {}, {}, {:p}, {}, {})",
+        vertex_buffer, vertex_bytes, stride, index_buffer, index_bytes, index_bits
+    );
+
+    use ptr_utils::*;
+
+    let state = STATE.lock().unwrap();
+    if let Some(list) = &state.command_list {
+        if !vertex_buffer.is_null() {
+            if let Some(buffer) = as_resource(vertex_buffer) {
+                let view = D3D12_VERTEX_BUFFER_VIEW {
+                    BufferLocation: buffer.GetGPUVirtualAddress(),
+                    SizeInBytes: vertex_bytes,
+                    StrideInBytes: stride,
+                };
+                list.IASetVertexBuffers(0, Some(&[view]));
+                std::mem::forget(buffer);
+            }
+        }
+
+        if !index_buffer.is_null() {
+            if let Some(buffer) = as_resource(index_buffer) {
+                let view = D3D12_INDEX_BUFFER_VIEW {
+                    BufferLocation: buffer.GetGPUVirtualAddress(),
+                    SizeInBytes: index_bytes,
+                    Format: if index_bits == 16 { DXGI_FORMAT_R16_UINT } else { DXGI_FORMAT_R32_UINT },
+                };
+                list.IASetIndexBuffer(Some(&view));
+                std::mem::forget(buffer);
+            }
+        }
+    }
+}
+
 #[no_mangle]
 pub unsafe extern "C" fn draw_instanced(
     vertex_count: u32,
@@ -1,6 +1,11 @@
 # alkash3d/assets/__init__.py
-"""Пакет с материалами и менеджером текстур."""
+"""Пакет с материалами, менеджером текстур и загрузчиками мешей."""
 from alkash3d.assets.material import PBRMaterial
 from alkash3d.assets.texture_manager import TextureManager
+from alkash3d.assets.obj import load_obj, load_obj_mesh
+from alkash3d.assets.gltf import load_gltf
+from alkash3d.assets.async_loader import AsyncLoader, AssetHandle
+from alkash3d.assets.atlas import TextureAtlas, DynamicAtlas
 
-__all__ = ["PBRMaterial", "TextureManager"]
+__all__ = ["PBRMaterial", "TextureManager", "load_obj", "load_obj_mesh", "load_gltf",
+           "AsyncLoader", "AssetHandle", "TextureAtlas", "DynamicAtlas"]
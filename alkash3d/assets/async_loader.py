@@ -0,0 +1,351 @@
+"""
+Асинхронная загрузка ассетов с подменой на placeholder.
+
+Чтение файлов и декодирование (Pillow, разбор OBJ/glTF) выполняются в
+отдельных I/O‑потоках; главный (или render‑) поток только загружает
+готовые данные в GPU:
+
+1️⃣  `request_texture(path)` / `request_mesh(path)` – сразу возвращают
+    `AssetHandle` (повторный запрос того же файла – тот же handle);
+2️⃣  I/O‑поток декодирует файл и кладёт результат в очередь готовых;
+3️⃣  `pump(backend)` раз в кадр забирает готовые результаты и создаёт
+    GPU‑ресурсы в пределах бюджета кадра (байты + миллисекунды); то,
+    что не поместилось, ждёт следующего кадра.
+
+Пока `handle.is_ready()` ложно, потребитель рисует placeholder
+(`PBRMaterial` – белую 1×1‑текстуру `ForwardRenderer`).
+
+Меши (разбор OBJ/glTF держит GIL) читаются собственными I/O‑потоками.
+Текстуры при переданном `jobs` декодируются фоновыми задачами
+`JobSystem` (`submit(background=True)`: Pillow отпускает GIL, а
+`wait_frame()` такие задачи не ждёт, так что большой файл кадр не
+задерживает).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from alkash3d.utils.logger import logger
+
+_STOP = object()
+_CALLBACK_LOCK = threading.Lock()
+
+# Состояния handle
+PENDING = "pending"        # в очереди / декодируется
+DECODED = "decoded"        # декодирован, ждёт загрузки в GPU
+READY = "ready"            # ресурс в GPU
+FAILED = "failed"
+
+
+class AssetHandle:
+    """Ссылка на загружаемый ассет; `value` появляется в состоянии READY."""
+
+    __slots__ = ("path", "kind", "state", "value", "error",
+                 "_decoded", "_callbacks")
+
+    def __init__(self, path: Path, kind: str):
+        self.path = path
+        self.kind = kind
+        self.state = PENDING
+        self.value = None
+        self.error: BaseException | None = None
+        self._decoded = None
+        self._callbacks: list = []
+
+    def is_ready(self) -> bool:
+        return self.state == READY
+
+    def is_failed(self) -> bool:
+        return self.state == FAILED
+
+    def is_done(self) -> bool:
+        return self.state in (READY, FAILED)
+
+    def on_ready(self, callback) -> None:
+        """`callback(handle)` после загрузки (или ошибки) – в потоке `pump`."""
+        with _CALLBACK_LOCK:
+            if not self.is_done():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def __repr__(self):
+        return f"AssetHandle({self.kind}, {self.path.name}, {self.state})"
+
+
+# ---------------------------------------------------------------------
+#   Декодеры (I/O‑поток) и загрузчики (поток GPU) по типам ассетов
+# ---------------------------------------------------------------------
+def _decode_texture(path: Path):
+    from alkash3d.utils.texture_loader import decode_texture
+    decoded = decode_texture(path)
+    return decoded, decoded.nbytes
+
+
+def _upload_texture(decoded, backend):
+    from alkash3d.utils.texture_loader import upload_texture
+    return upload_texture(decoded, backend)
+
+
+def _decode_mesh(path: Path):
+    suffix = path.suffix.lower()
+    if suffix == ".obj":
+        from alkash3d.assets.obj import load_obj_mesh
+        root = load_obj_mesh(path)
+    elif suffix in (".gltf", ".glb"):
+        from alkash3d.assets.gltf import load_gltf
+        root = load_gltf(path)
+    elif suffix == ".amesh":
+        from alkash3d.mesh.mesh_file import load_mesh
+        root = load_mesh(path)
+    else:
+        raise ValueError(f"Unsupported mesh format: {path.suffix}")
+    nbytes = sum(_mesh_bytes(m) for m in _iter_meshes(root))
+    return root, nbytes
+
+
+def _upload_mesh(root, backend):
+    for mesh in _iter_meshes(root):
+        if getattr(mesh, "vb", None) is None:
+            mesh._setup_gpu_buffers(backend)
+    return root
+
+
+def _iter_meshes(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if hasattr(node, "_setup_gpu_buffers"):
+            yield node
+        stack.extend(getattr(node, "children", ()))
+
+
+def _mesh_bytes(mesh) -> int:
+    n = mesh.vertices.nbytes
+    for arr in (mesh.normals, mesh.texcoords, mesh.indices):
+        if arr is not None:
+            n += arr.nbytes
+    return n
+
+
+_KINDS = {
+    "texture": (_decode_texture, _upload_texture),
+    "mesh": (_decode_mesh, _upload_mesh),
+    # только декодирование: GPU‑ресурс создаёт получатель в `on_ready`
+    # (напр. `TextureManager` – после проверки хэша содержимого)
+    "texture_data": (_decode_texture, lambda decoded, backend: decoded),
+    # (напр. `watch_mesh` – геометрия уходит в уже существующие меши)
+    "mesh_data": (_decode_mesh, lambda decoded, backend: decoded),
+}
+
+
+_JOB_KINDS = {"texture", "texture_data"}    # декод на JobSystem (если есть)
+
+
+def register_kind(kind: str, decode, upload) -> None:
+    """
+    Зарегистрировать тип ассета: `decode(path) -> (data, nbytes)`
+    выполняется в I/O‑потоке, `upload(data, backend) -> value` – в `pump`.
+    """
+    _KINDS[kind] = (decode, upload)
+
+
+class AsyncLoader:
+    """
+    Пул I/O‑потоков + очередь готовых результатов с бюджетом загрузки.
+
+    `budget_bytes` / `budget_ms` – сколько данных и времени `pump()` может
+    потратить на создание GPU‑ресурсов за кадр. Первый результат кадра
+    загружается всегда, даже если сам превышает бюджет.
+    """
+
+    def __init__(self, workers: int = 2,
+                 budget_bytes: int = 16 * 1024 * 1024,
+                 budget_ms: float = 2.0, jobs=None):
+        self.budget_bytes = int(budget_bytes)
+        self.budget_ms = float(budget_ms)
+        self.jobs = jobs                  # JobSystem для декода текстур
+
+        self._handles: dict[tuple[str, Path], AssetHandle] = {}
+        self._lock = threading.Lock()
+        self._requests: queue.Queue = queue.Queue()
+        self._completed: queue.Queue = queue.Queue()
+        self._deferred: deque = deque()   # не влезли в бюджет кадра
+
+        # Статистика
+        self.decoded = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.uploaded_bytes = 0
+        self.last_pump_ms = 0.0
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"alkash3d-io-{i}", daemon=True)
+            for i in range(max(1, int(workers)))
+        ]
+        for t in self._threads:
+            t.start()
+
+    # -----------------------------------------------------------------
+    #   Запросы
+    # -----------------------------------------------------------------
+    def request(self, kind: str, path, on_ready=None) -> AssetHandle:
+        """Поставить ассет в очередь загрузки (или вернуть существующий handle)."""
+        if kind not in _KINDS:
+            raise ValueError(f"Unknown asset kind: {kind}")
+        p = Path(path).expanduser().resolve()
+        key = (kind, p)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                handle = AssetHandle(p, kind)
+                self._handles[key] = handle
+                if self.jobs is not None and kind in _JOB_KINDS:
+                    self.jobs.submit(self._decode, handle, name=f"decode {p.name}",
+                                     background=True)
+                else:
+                    self._requests.put(handle)
+        if on_ready is not None:
+            handle.on_ready(on_ready)
+        return handle
+
+    def request_texture(self, path, on_ready=None) -> AssetHandle:
+        return self.request("texture", path, on_ready)
+
+    def request_mesh(self, path, on_ready=None) -> AssetHandle:
+        return self.request("mesh", path, on_ready)
+
+    def forget(self, handle: AssetHandle) -> None:
+        """
+        Убрать handle из таблицы дедупликации (следующий запрос – заново).
+        Более новый handle того же файла не трогается.
+        """
+        key = (handle.kind, handle.path)
+        with self._lock:
+            if self._handles.get(key) is handle:
+                del self._handles[key]
+
+    @property
+    def pending(self) -> int:
+        """Сколько ассетов ещё не загружено в GPU."""
+        with self._lock:
+            return sum(1 for h in self._handles.values() if not h.is_done())
+
+    # -----------------------------------------------------------------
+    #   Поток GPU
+    # -----------------------------------------------------------------
+    def pump(self, backend) -> int:
+        """
+        Загрузить в GPU готовые результаты в пределах бюджета кадра.
+        Вызывать из потока, владеющего command‑list‑ом. Возвращает
+        число завершённых handle‑ов.
+        """
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000.0
+        spent_bytes = 0
+        done = 0
+
+        while True:
+            if self._deferred:
+                handle, nbytes = self._deferred.popleft()
+            else:
+                try:
+                    handle, nbytes = self._completed.get_nowait()
+                except queue.Empty:
+                    break
+
+            if done and (spent_bytes + nbytes > self.budget_bytes
+                         or time.perf_counter() >= deadline):
+                self._deferred.appendleft((handle, nbytes))
+                break
+
+            if handle.state == DECODED:
+                try:
+                    _, upload = _KINDS[handle.kind]
+                    handle.value = upload(handle._decoded, backend)
+                    handle.state = READY
+                    self.uploaded += 1
+                    self.uploaded_bytes += nbytes
+                    spent_bytes += nbytes
+                except Exception as exc:
+                    self._fail(handle, exc)
+                handle._decoded = None
+            self._finish(handle)
+            done += 1
+
+        self.last_pump_ms = (time.perf_counter() - start) * 1000.0
+        return done
+
+    def wait(self, handles=None, backend=None, timeout: float | None = None) -> bool:
+        """
+        Дождаться завершения `handles` (или всех запросов). С `backend`
+        заодно выполняет `pump` без бюджета – для тулзов и тестов.
+        """
+        end = None if timeout is None else time.perf_counter() + timeout
+        if handles is None:
+            with self._lock:
+                handles = list(self._handles.values())
+        while not all(h.is_done() for h in handles):
+            if backend is not None:
+                saved = self.budget_bytes, self.budget_ms
+                self.budget_bytes, self.budget_ms = 1 << 62, float("inf")
+                try:
+                    self.pump(backend)
+                finally:
+                    self.budget_bytes, self.budget_ms = saved
+            if end is not None and time.perf_counter() >= end:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def shutdown(self) -> None:
+        """Остановить I/O‑потоки (незапущенные запросы отбрасываются)."""
+        for _ in self._threads:
+            self._requests.put(_STOP)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    # -----------------------------------------------------------------
+    #   I/O‑потоки
+    # -----------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            handle = self._requests.get()
+            if handle is _STOP:
+                return
+            self._decode(handle)
+
+    def _decode(self, handle: AssetHandle) -> None:
+        """Прочитать и декодировать файл (I/O‑поток или задача JobSystem)."""
+        nbytes = 0
+        try:
+            decode, _ = _KINDS[handle.kind]
+            handle._decoded, nbytes = decode(handle.path)
+            handle.state = DECODED
+            self.decoded += 1
+        except Exception as exc:
+            self._fail(handle, exc)
+        self._completed.put((handle, nbytes))
+
+    # -----------------------------------------------------------------
+    def _fail(self, handle: AssetHandle, exc: BaseException) -> None:
+        logger.error(f"[AsyncLoader] Failed to load {handle.kind} '{handle.path}': {exc}")
+        handle.error = exc
+        handle.state = FAILED
+        self.failed += 1
+
+    @staticmethod
+    def _finish(handle: AssetHandle) -> None:
+        with _CALLBACK_LOCK:
+            callbacks, handle._callbacks = handle._callbacks, []
+        for cb in callbacks:
+            try:
+                cb(handle)
+            except Exception as exc:
+                logger.error(f"[AsyncLoader] on_ready callback failed: {exc}")
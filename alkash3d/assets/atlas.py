@@ -0,0 +1,397 @@
+"""
+Текстурные атласы: много мелких текстур → одна текстура + один SRV.
+
+* `SkylinePacker` / `MaxRectsPacker` – упаковка прямоугольников
+  (skyline bottom‑left и MaxRects best‑short‑side‑fit; MaxRects умеет
+  освобождать прямоугольники – для динамического атласа).
+* `TextureAtlas.build(images)` – офлайн/при загрузке: упаковка с
+  отступами (края изображений дублируются в отступ, чтобы билинейная
+  фильтрация и mip‑уровни не «подтекали» из соседей), mip‑цепочка,
+  `uv_transform` каждого региона. `assign(material, name)` переписывает
+  UV‑преобразование материала и подменяет его albedo на атлас.
+* `DynamicAtlas` – атлас фиксированного размера в GPU, под‑прямоугольники
+  выделяются и освобождаются на лету (текст, иконки, FPS‑счётчик);
+  изменения копятся в CPU‑копии и грузятся одним `flush()` за кадр.
+
+UV‑преобразование – `(scale_u, scale_v, offset_u, offset_v)`:
+`uv_atlas = uv * scale + offset` (см. `uUVTransform` в forward‑шейдере).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from alkash3d.utils.logger import logger
+
+IDENTITY_UV = np.array([1.0, 1.0, 0.0, 0.0], dtype=np.float32)
+
+
+@dataclass
+class AtlasRegion:
+    """Прямоугольник изображения в атласе (без отступа)."""
+    name: str
+    x: int
+    y: int
+    w: int
+    h: int
+    atlas_w: int
+    atlas_h: int
+
+    @property
+    def uv_transform(self) -> np.ndarray:
+        return np.array([self.w / self.atlas_w, self.h / self.atlas_h,
+                         self.x / self.atlas_w, self.y / self.atlas_h],
+                        dtype=np.float32)
+
+
+# ---------------------------------------------------------------------
+#   Упаковщики
+# ---------------------------------------------------------------------
+class SkylinePacker:
+    """Skyline bottom‑left: быстро, хорошо для похожих по высоте строк."""
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        self._skyline = [(0, 0, width)]          # (x, y, ширина сегмента)
+
+    def insert(self, w: int, h: int) -> tuple[int, int] | None:
+        best = None                              # (y, waste, i, x)
+        for i, (x, _, _) in enumerate(self._skyline):
+            y = self._fit(i, w, h)
+            if y is None:
+                continue
+            waste = self._waste(i, w, y)
+            if best is None or (y + h, waste) < (best[0] + h, best[1]):
+                best = (y, waste, i, x)
+        if best is None:
+            return None
+        y, _, i, x = best
+        self._add_segment(i, x, y + h, w)
+        return x, y
+
+    def _fit(self, i: int, w: int, h: int) -> int | None:
+        x = self._skyline[i][0]
+        if x + w > self.width:
+            return None
+        y, remaining = 0, w
+        while remaining > 0:
+            if i >= len(self._skyline):
+                return None
+            _, sy, sw = self._skyline[i]
+            y = max(y, sy)
+            if y + h > self.height:
+                return None
+            remaining -= sw
+            i += 1
+        return y
+
+    def _waste(self, i: int, w: int, y: int) -> int:
+        x0, waste = self._skyline[i][0], 0
+        for sx, sy, sw in self._skyline[i:]:
+            if sx >= x0 + w:
+                break
+            waste += (min(sx + sw, x0 + w) - sx) * (y - sy)
+        return waste
+
+    def _add_segment(self, i: int, x: int, y: int, w: int) -> None:
+        self._skyline.insert(i, (x, y, w))
+        j = i + 1
+        while j < len(self._skyline):
+            sx, sy, sw = self._skyline[j]
+            px, _, pw = self._skyline[j - 1]
+            overlap = px + pw - sx
+            if overlap <= 0:
+                break
+            if sw - overlap > 0:
+                self._skyline[j] = (sx + overlap, sy, sw - overlap)
+                break
+            del self._skyline[j]
+        # слить соседние сегменты одной высоты
+        merged = [self._skyline[0]]
+        for sx, sy, sw in self._skyline[1:]:
+            mx, my, mw = merged[-1]
+            if my == sy:
+                merged[-1] = (mx, my, mw + sw)
+            else:
+                merged.append((sx, sy, sw))
+        self._skyline = merged
+
+
+class MaxRectsPacker:
+    """MaxRects best‑short‑side‑fit; поддерживает `free()`."""
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        self._free = [(0, 0, width, height)]
+        self._used: set[tuple[int, int, int, int]] = set()
+
+    def insert(self, w: int, h: int) -> tuple[int, int] | None:
+        best, best_key = None, None
+        for fx, fy, fw, fh in self._free:
+            if w <= fw and h <= fh:
+                key = (min(fw - w, fh - h), max(fw - w, fh - h))
+                if best_key is None or key < best_key:
+                    best, best_key = (fx, fy), key
+        if best is None:
+            return None
+        self._place((best[0], best[1], w, h))
+        self._used.add((best[0], best[1], w, h))
+        return best
+
+    def free(self, x: int, y: int, w: int, h: int) -> None:
+        """
+        Вернуть прямоугольник. Список максимальных свободных
+        прямоугольников строится заново по занятым – так освобождённые
+        соседние области снова сливаются в большие.
+        """
+        self._used.discard((x, y, w, h))
+        self._free = [(0, 0, self.width, self.height)]
+        for rect in self._used:
+            self._place(rect)
+
+    def _place(self, rect) -> None:
+        rx, ry, rw, rh = rect
+        out = []
+        for f in self._free:
+            fx, fy, fw, fh = f
+            if rx >= fx + fw or rx + rw <= fx or ry >= fy + fh or ry + rh <= fy:
+                out.append(f)
+                continue
+            if rx > fx:
+                out.append((fx, fy, rx - fx, fh))
+            if rx + rw < fx + fw:
+                out.append((rx + rw, fy, fx + fw - rx - rw, fh))
+            if ry > fy:
+                out.append((fx, fy, fw, ry - fy))
+            if ry + rh < fy + fh:
+                out.append((fx, ry + rh, fw, fy + fh - ry - rh))
+        self._free = out
+        self._prune()
+
+    def _prune(self) -> None:
+        rects = self._free
+        keep = []
+        for i, (ax, ay, aw, ah) in enumerate(rects):
+            contained = False
+            for j, (bx, by, bw, bh) in enumerate(rects):
+                if i != j and bx <= ax and by <= ay \
+                        and ax + aw <= bx + bw and ay + ah <= by + bh \
+                        and ((ax, ay, aw, ah) != (bx, by, bw, bh) or j < i):
+                    contained = True
+                    break
+            if not contained:
+                keep.append((ax, ay, aw, ah))
+        self._free = keep
+
+
+_PACKERS = {"skyline": SkylinePacker, "maxrects": MaxRectsPacker}
+
+
+def _load_image(img) -> np.ndarray:
+    if isinstance(img, np.ndarray):
+        return np.ascontiguousarray(img, dtype=np.uint8)
+    from PIL import Image
+    with Image.open(Path(img).expanduser()) as im:
+        return np.asarray(im.convert("RGBA"), dtype=np.uint8)
+
+
+def _blit_padded(dst: np.ndarray, src: np.ndarray, x: int, y: int, pad: int) -> None:
+    """Вставить `src` в (x, y) и продублировать края в отступ `pad`."""
+    if pad:
+        src = np.pad(src, ((pad, pad), (pad, pad), (0, 0)), mode="edge")
+    h, w = src.shape[:2]
+    dst[y - pad:y - pad + h, x - pad:x - pad + w] = src
+
+
+# ---------------------------------------------------------------------
+#   Статический атлас
+# ---------------------------------------------------------------------
+class TextureAtlas:
+    """Готовый атлас: `pixels` (H, W, 4), `levels` (mip‑цепочка), `regions`."""
+
+    def __init__(self, pixels: np.ndarray, regions: dict[str, AtlasRegion],
+                 levels: list[np.ndarray] | None = None, padding: int = 0):
+        self.pixels = pixels
+        self.regions = regions
+        self.levels = levels if levels is not None else [pixels]
+        self.padding = padding
+        self.texture = None
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    @classmethod
+    def build(cls, images: dict, max_size: int = 4096, padding: int = 2,
+              packer: str = "maxrects", mips: bool = True) -> "TextureAtlas":
+        """
+        Упаковать `images` (имя → (h, w, 4) uint8 или путь) в атлас
+        наименьшего подходящего размера (степень двойки, ≤ `max_size`).
+        Число mip‑уровней ограничено так, чтобы отступ не исчезал
+        (`padding >> level ≥ 1`).
+        """
+        if packer not in _PACKERS:
+            raise ValueError(f"Unknown packer: {packer}")
+        arrays = {name: _load_image(img) for name, img in images.items()}
+        if not arrays:
+            raise ValueError("No images to pack")
+        order = sorted(arrays, key=lambda n: (-max(arrays[n].shape[:2]),
+                                              -arrays[n].shape[0], n))
+        sizes = {n: (arrays[n].shape[1] + 2 * padding, arrays[n].shape[0] + 2 * padding)
+                 for n in order}
+        for name in order:
+            w, h = sizes[name]
+            if w > max_size or h > max_size:
+                raise ValueError(f"Image {name!r} ({w}x{h} with padding) exceeds "
+                                 f"max atlas size {max_size}")
+
+        area = sum(w * h for w, h in sizes.values())
+        side = 1 << max(int(np.ceil(np.log2(max(1.0, np.sqrt(area))))), 0)
+        side = max(side, 1 << int(np.ceil(np.log2(max(max(s) for s in sizes.values())))))
+        side = min(side, max_size)
+        w, h = side, side
+        while True:
+            placed = cls._try_pack(order, sizes, w, h, packer)
+            if placed is not None:
+                break
+            if w >= max_size and h >= max_size:
+                raise ValueError(f"Images do not fit into a {max_size}² atlas")
+            w, h = (w * 2, h) if w <= h else (w, h * 2)
+            w, h = min(w, max_size), min(h, max_size)
+
+        pixels = np.zeros((h, w, 4), dtype=np.uint8)
+        regions = {}
+        for name, (px, py) in placed.items():
+            img = arrays[name]
+            x, y = px + padding, py + padding
+            _blit_padded(pixels, img, x, y, padding)
+            regions[name] = AtlasRegion(name, x, y, img.shape[1], img.shape[0], w, h)
+
+        levels = None
+        if mips:
+            from alkash3d.assets.texture_cook import build_mips
+            levels = build_mips(pixels, filt="box",
+                                max_levels=max(1, padding.bit_length()))
+        logger.debug(f"[Atlas] Packed {len(regions)} images into {w}x{h}")
+        return cls(pixels, regions, levels, padding)
+
+    @staticmethod
+    def _try_pack(order, sizes, w, h, packer):
+        p = _PACKERS[packer](w, h)
+        placed = {}
+        for name in order:
+            pos = p.insert(*sizes[name])
+            if pos is None:
+                return None
+            placed[name] = pos
+        return placed
+
+    # -----------------------------------------------------------------
+    def upload(self, backend):
+        """Создать GPU‑текстуру атласа (с mip‑ами, если бэкенд умеет)."""
+        if getattr(backend, "supports_texture_mips", False) and len(self.levels) > 1:
+            levels = [lvl.reshape(lvl.shape[0], -1) for lvl in self.levels]
+            self.texture = backend.create_texture_mips(levels, self.width,
+                                                       self.height, "RGBA8")
+        else:
+            self.texture = backend.create_texture(
+                data=self.pixels, w=self.width, h=self.height, fmt="RGBA8"
+            )
+        return self.texture
+
+    def assign(self, material, name: str) -> None:
+        """Материалу – текстура атласа + UV‑преобразование региона `name`."""
+        if self.texture is None:
+            raise RuntimeError("Atlas is not uploaded (call upload(backend))")
+        material.set_atlas(self.texture, self.regions[name].uv_transform)
+
+    # -----------------------------------------------------------------
+    def save(self, path) -> Path:
+        """`.atex` (RGBA8 + mip‑ы) и таблица регионов `<path>.json`."""
+        from alkash3d.assets.texture_file import write_texture_file
+        path = Path(path)
+        write_texture_file(path, self.levels, self.width, self.height, "RGBA8")
+        table = {"padding": self.padding,
+                 "regions": {n: [r.x, r.y, r.w, r.h] for n, r in self.regions.items()}}
+        path.with_suffix(".json").write_text(json.dumps(table, indent=2), "utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path) -> "TextureAtlas":
+        from alkash3d.assets.texture_file import TextureFile
+        path = Path(path)
+        tf = TextureFile(path)
+        table = json.loads(path.with_suffix(".json").read_text("utf-8"))
+        levels = [tf.to_rgba(i) for i in range(tf.mip_count)]
+        regions = {n: AtlasRegion(n, x, y, w, h, tf.width, tf.height)
+                   for n, (x, y, w, h) in table["regions"].items()}
+        return cls(levels[0], regions, levels, table.get("padding", 0))
+
+
+# ---------------------------------------------------------------------
+#   Динамический атлас
+# ---------------------------------------------------------------------
+class DynamicAtlas:
+    """
+    Атлас с выделением/освобождением регионов во время работы.
+    Без mip‑ов (мелкий UI/текст). `flush()` – одна загрузка за кадр.
+    """
+
+    def __init__(self, backend, size: int = 1024, padding: int = 1):
+        self.backend = backend
+        self.size = size
+        self.padding = padding
+        self.pixels = np.zeros((size, size, 4), dtype=np.uint8)
+        self._packer = MaxRectsPacker(size, size)
+        self.regions: dict[str, AtlasRegion] = {}
+        self._dirty = False
+        self.texture = backend.create_texture(data=self.pixels, w=size, h=size,
+                                              fmt="RGBA8")
+
+    def allocate(self, name: str, w: int, h: int,
+                 pixels: np.ndarray | None = None) -> AtlasRegion | None:
+        """Выделить регион `w`×`h` (None – атлас заполнен)."""
+        if name in self.regions:
+            self.free(name)
+        pad = self.padding
+        pos = self._packer.insert(w + 2 * pad, h + 2 * pad)
+        if pos is None:
+            logger.warning(f"[Atlas] Dynamic atlas full, cannot fit {name} ({w}x{h})")
+            return None
+        region = AtlasRegion(name, pos[0] + pad, pos[1] + pad, w, h,
+                             self.size, self.size)
+        self.regions[name] = region
+        if pixels is not None:
+            self.update(name, pixels)
+        return region
+
+    def update(self, name: str, pixels: np.ndarray) -> None:
+        """Записать пиксели региона (загрузятся в `flush()`)."""
+        r = self.regions[name]
+        pixels = np.asarray(pixels, dtype=np.uint8).reshape(r.h, r.w, 4)
+        _blit_padded(self.pixels, pixels, r.x, r.y, self.padding)
+        self._dirty = True
+
+    def free(self, name: str) -> None:
+        r = self.regions.pop(name)
+        pad = self.padding
+        self._packer.free(r.x - pad, r.y - pad, r.w + 2 * pad, r.h + 2 * pad)
+
+    def flush(self) -> bool:
+        """Загрузить изменения в GPU (если были)."""
+        if not self._dirty:
+            return False
+        self.backend.update_texture(self.texture, self.pixels, self.size, self.size)
+        self._dirty = False
+        return True
+
+    def assign(self, material, name: str) -> None:
+        material.set_atlas(self.texture, self.regions[name].uv_transform)
@@ -0,0 +1,425 @@
+"""
+Импорт glTF 2.0 (`.gltf` + `.bin` и бинарный `.glb`).
+
+Бинарные буферы отображаются в память (`np.memmap`), а каждый
+accessor превращается в NumPy‑view поверх `bufferView`
+(`np.ndarray(buffer=..., offset=..., strides=...)`) – без поэлементной
+конвертации. Ограничивающая сфера меша берётся из `min` / `max`
+accessor‑а POSITION, поэтому время импорта пропорционально числу узлов,
+а не вершин. Если POSITION / NORMAL / TEXCOORD_0 уже лежат в одном
+bufferView с шагом 32 байта (pos | normal | uv), вершинный поток
+грузится в GPU напрямую.
+
+Строится иерархия:
+
+* узел с одним примитивом → `Mesh`, с несколькими → `Model` из `Mesh`;
+* `camera` → `Camera` (perspective);
+* материалы → `PBRMaterial` (факторы + карты; текстуры, встроенные в
+  GLB, извлекаются в дисковый кэш);
+* `KHR_lights_punctual` → Directional / Point / SpotLight. Свет
+  движка считает позицию и направление без учёта родителей, поэтому
+  источники добавляются в корень импорта в мировых координатах.
+
+Поворот (кватернион или матрица узла) переводится в углы Эйлера
+`Node.rotation` (`Quat.to_euler`).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from alkash3d.assets.material import PBRMaterial
+from alkash3d.math.mat4 import Mat4
+from alkash3d.math.quat import Quat
+from alkash3d.math.vec3 import Vec3
+from alkash3d.scene.camera import Camera
+from alkash3d.scene.light import DirectionalLight, PointLight, SpotLight
+from alkash3d.scene.mesh import Mesh
+from alkash3d.scene.model import Model
+from alkash3d.scene.node import Node
+from alkash3d.utils.cache import cache_root
+from alkash3d.utils.logger import logger
+
+_GLB_MAGIC = b"glTF"
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+
+_COMPONENT = {
+    5120: np.int8, 5121: np.uint8, 5122: np.int16,
+    5123: np.uint16, 5125: np.uint32, 5126: np.float32,
+}
+_WIDTH = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4,
+          "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+_MODE_TRIANGLES = 4
+
+
+def load_gltf(path) -> Node:
+    """Импортировать `.gltf` / `.glb` → корневой `Node` с иерархией."""
+    return _GltfImporter(Path(path).expanduser().resolve()).build()
+
+
+class _GltfImporter:
+    def __init__(self, path: Path):
+        if not path.is_file():
+            raise FileNotFoundError(f"glTF not found: {path}")
+        self.path = path
+        self.base_dir = path.parent
+        self._glb_bin: np.ndarray | None = None
+
+        with path.open("rb") as f:
+            is_glb = f.read(4) == _GLB_MAGIC
+        self.doc = self._read_glb() if is_glb else json.loads(path.read_text("utf-8"))
+
+        self._buffers: dict[int, np.ndarray] = {}
+        self._accessors: dict[int, np.ndarray] = {}
+        self._materials: dict[int, PBRMaterial] = {}
+        self._images: dict[int, str] = {}
+        self._lights = (self.doc.get("extensions", {})
+                        .get("KHR_lights_punctual", {})
+                        .get("lights", []))
+        self._light_nodes: list[Node] = []
+
+    # -----------------------------------------------------------------
+    #   Контейнер
+    # -----------------------------------------------------------------
+    def _read_glb(self) -> dict:
+        data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        magic, version, length = struct.unpack_from("<4sII", data, 0)
+        if version != 2:
+            raise ValueError(f"Unsupported GLB version {version}: {self.path}")
+
+        doc = None
+        offset = 12
+        while offset < min(length, len(data)):
+            chunk_len, chunk_type = struct.unpack_from("<II", data, offset)
+            start = offset + 8
+            if chunk_type == _CHUNK_JSON:
+                doc = json.loads(bytes(data[start:start + chunk_len]).decode("utf-8"))
+            elif chunk_type == _CHUNK_BIN and self._glb_bin is None:
+                self._glb_bin = data[start:start + chunk_len]
+            offset = start + chunk_len
+        if doc is None:
+            raise ValueError(f"GLB without JSON chunk: {self.path}")
+        return doc
+
+    def _buffer(self, index: int) -> np.ndarray:
+        buf = self._buffers.get(index)
+        if buf is not None:
+            return buf
+        uri = self.doc["buffers"][index].get("uri")
+        if uri is None:
+            buf = self._glb_bin            # GLB: буфер 0 – BIN‑chunk
+        elif uri.startswith("data:"):
+            buf = np.frombuffer(base64.b64decode(uri.split(",", 1)[1]), dtype=np.uint8)
+        else:
+            buf = np.memmap(self.base_dir / uri, dtype=np.uint8, mode="r")
+        if buf is None:
+            raise ValueError(f"glTF buffer {index} has no data")
+        self._buffers[index] = buf
+        return buf
+
+    def _buffer_view_bytes(self, index: int) -> np.ndarray:
+        view = self.doc["bufferViews"][index]
+        buf = self._buffer(view["buffer"])
+        start = view.get("byteOffset", 0)
+        return buf[start:start + view["byteLength"]]
+
+    # -----------------------------------------------------------------
+    #   Accessor → NumPy view
+    # -----------------------------------------------------------------
+    def accessor(self, index: int) -> np.ndarray:
+        arr = self._accessors.get(index)
+        if arr is not None:
+            return arr
+
+        acc = self.doc["accessors"][index]
+        dtype = np.dtype(_COMPONENT[acc["componentType"]])
+        width = _WIDTH[acc["type"]]
+        count = acc["count"]
+
+        if "bufferView" in acc:
+            view = self.doc["bufferViews"][acc["bufferView"]]
+            raw = self._buffer_view_bytes(acc["bufferView"])
+            stride = view.get("byteStride") or dtype.itemsize * width
+            arr = np.ndarray(
+                shape=(count, width), dtype=dtype, buffer=raw,
+                offset=acc.get("byteOffset", 0),
+                strides=(stride, dtype.itemsize),
+            )
+        else:
+            arr = np.zeros((count, width), dtype=dtype)
+
+        if "sparse" in acc:
+            arr = self._apply_sparse(arr.copy(), acc["sparse"])
+        if width == 1:
+            arr = arr.reshape(count)
+        self._accessors[index] = arr
+        return arr
+
+    def _apply_sparse(self, arr: np.ndarray, sparse: dict) -> np.ndarray:
+        n = sparse["count"]
+        idx_info, val_info = sparse["indices"], sparse["values"]
+        idx = np.frombuffer(self._buffer_view_bytes(idx_info["bufferView"]),
+                            dtype=_COMPONENT[idx_info["componentType"]],
+                            count=n, offset=idx_info.get("byteOffset", 0))
+        vals = np.frombuffer(self._buffer_view_bytes(val_info["bufferView"]),
+                             dtype=arr.dtype, count=n * arr.shape[1],
+                             offset=val_info.get("byteOffset", 0))
+        arr[idx] = vals.reshape(n, arr.shape[1])
+        return arr
+
+    def _float_accessor(self, index: int) -> np.ndarray:
+        """Атрибут как float32 (normalized int → [0, 1] / [-1, 1])."""
+        arr = self.accessor(index)
+        if arr.dtype == np.float32:
+            return arr
+        acc = self.doc["accessors"][index]
+        out = arr.astype(np.float32)
+        if acc.get("normalized"):
+            out /= float(np.iinfo(arr.dtype).max)
+            if np.issubdtype(arr.dtype, np.signedinteger):
+                np.maximum(out, -1.0, out=out)
+        return out
+
+    # -----------------------------------------------------------------
+    #   Сборка сцены
+    # -----------------------------------------------------------------
+    def build(self) -> Node:
+        root = Node(self.path.stem)
+        scenes = self.doc.get("scenes", [])
+        if scenes:
+            scene = scenes[self.doc.get("scene", 0)]
+            top = scene.get("nodes", [])
+        else:
+            top = range(len(self.doc.get("nodes", [])))
+
+        for index in top:
+            root.add_child(self._build_node(index, np.identity(4, dtype=np.float32)))
+        for light in self._light_nodes:
+            root.add_child(light)
+        logger.info(
+            f"[glTF] Imported {self.path.name}: {len(self.doc.get('nodes', []))} nodes, "
+            f"{len(self.doc.get('meshes', []))} meshes"
+        )
+        return root
+
+    def _build_node(self, index: int, parent_world: np.ndarray) -> Node:
+        data = self.doc["nodes"][index]
+        name = data.get("name", f"Node{index}")
+
+        node: Node
+        if "camera" in data:
+            node = self._build_camera(data["camera"], name)
+            if "mesh" in data:
+                node.add_child(self._build_mesh(data["mesh"], f"{name}_mesh"))
+        elif "mesh" in data:
+            node = self._build_mesh(data["mesh"], name)
+        else:
+            node = Node(name)
+
+        local = self._apply_transform(node, data)
+        world = parent_world @ local
+
+        light = data.get("extensions", {}).get("KHR_lights_punctual")
+        if light is not None:
+            self._light_nodes.append(self._build_light(light["light"], world, name))
+
+        for child in data.get("children", []):
+            node.add_child(self._build_node(child, world))
+        return node
+
+    def _apply_transform(self, node: Node, data: dict) -> np.ndarray:
+        """Записать TRS узла в Node, вернуть локальную матрицу."""
+        if "matrix" in data:
+            m = np.asarray(data["matrix"], dtype=np.float32).reshape(4, 4).T
+            node.position = Vec3(*m[:3, 3])
+            node.scale = Vec3(*np.linalg.norm(m[:3, :3], axis=0))
+            node.rotation = Vec3(*Mat4(m).to_euler())
+            return m
+
+        t = data.get("translation", (0.0, 0.0, 0.0))
+        q = Quat(*data.get("rotation", (0.0, 0.0, 0.0, 1.0)))
+        s = data.get("scale", (1.0, 1.0, 1.0))
+        node.position = Vec3(*t)
+        node.rotation = Vec3(*q.to_euler())
+        node.scale = Vec3(*s)
+
+        m = q.normalized().to_mat4()
+        m[:3, :3] *= np.asarray(s, dtype=np.float32)
+        m[:3, 3] = t
+        return m
+
+    # -----------------------------------------------------------------
+    def _build_mesh(self, index: int, name: str) -> Node:
+        mesh_data = self.doc["meshes"][index]
+        meshes = []
+        for i, prim in enumerate(mesh_data.get("primitives", [])):
+            if prim.get("mode", _MODE_TRIANGLES) != _MODE_TRIANGLES:
+                logger.warning(f"[glTF] {name}: primitive mode {prim['mode']} skipped")
+                continue
+            meshes.append(self._build_primitive(prim, f"{name}_{i}"))
+
+        if len(meshes) == 1:
+            meshes[0].name = name
+            return meshes[0]
+        return Model(meshes, name=name)
+
+    def _build_primitive(self, prim: dict, name: str) -> Mesh:
+        attrs = prim["attributes"]
+        pos_idx = attrs["POSITION"]
+        positions = self._float_accessor(pos_idx)
+        normals = self._float_accessor(attrs["NORMAL"]) if "NORMAL" in attrs else None
+        uvs = self._float_accessor(attrs["TEXCOORD_0"]) if "TEXCOORD_0" in attrs else None
+
+        if "indices" in prim:
+            indices = self.accessor(prim["indices"])
+            if indices.dtype == np.uint8:
+                indices = indices.astype(np.uint16)
+        else:
+            indices = np.arange(len(positions), dtype=np.uint32)
+
+        mesh = Mesh(
+            positions, normals, uvs, indices, name=name,
+            bounds=self._bounds(pos_idx, positions),
+            interleaved=self._interleaved_view(attrs),
+        )
+        if "material" in prim:
+            mesh.material = self._material(prim["material"])
+        return mesh
+
+    def _bounds(self, pos_idx: int, positions: np.ndarray):
+        """Сфера из min/max accessor‑а (обязательны по спецификации)."""
+        acc = self.doc["accessors"][pos_idx]
+        if "min" in acc and "max" in acc:
+            lo = np.asarray(acc["min"], dtype=np.float32)
+            hi = np.asarray(acc["max"], dtype=np.float32)
+        else:
+            lo, hi = positions.min(axis=0), positions.max(axis=0)
+        return (lo + hi) * 0.5, float(np.linalg.norm(hi - lo) * 0.5)
+
+    def _interleaved_view(self, attrs: dict) -> np.ndarray | None:
+        """(N, 8) view, если pos | normal | uv уже упакованы по 32 байта."""
+        names = ("POSITION", "NORMAL", "TEXCOORD_0")
+        if not all(n in attrs for n in names):
+            return None
+        accs = [self.doc["accessors"][attrs[n]] for n in names]
+        views = {a.get("bufferView") for a in accs}
+        if len(views) != 1 or None in views:
+            return None
+        if any(a["componentType"] != 5126 or "sparse" in a for a in accs):
+            return None
+        view_index = views.pop()
+        if self.doc["bufferViews"][view_index].get("byteStride") != 32:
+            return None
+        base = accs[0].get("byteOffset", 0)
+        if [a.get("byteOffset", 0) - base for a in accs] != [0, 12, 24]:
+            return None
+        raw = self._buffer_view_bytes(view_index)
+        count = accs[0]["count"]
+        if base + count * 32 > len(raw):
+            return None
+        return np.ndarray(shape=(count, 8), dtype=np.float32, buffer=raw, offset=base)
+
+    # -----------------------------------------------------------------
+    def _material(self, index: int) -> PBRMaterial:
+        mat = self._materials.get(index)
+        if mat is not None:
+            return mat
+        data = self.doc["materials"][index]
+        pbr = data.get("pbrMetallicRoughness", {})
+        mr_map = self._texture_path(pbr.get("metallicRoughnessTexture"))
+        mat = PBRMaterial(
+            albedo=tuple(pbr.get("baseColorFactor", (1.0, 1.0, 1.0, 1.0))),
+            metallic=float(pbr.get("metallicFactor", 1.0)),
+            roughness=float(pbr.get("roughnessFactor", 1.0)),
+            emissive=tuple(data.get("emissiveFactor", (0.0, 0.0, 0.0))),
+            albedo_map=self._texture_path(pbr.get("baseColorTexture")),
+            normal_map=self._texture_path(data.get("normalTexture")),
+            metallic_map=mr_map,
+            roughness_map=mr_map,
+            ao_map=self._texture_path(data.get("occlusionTexture")),
+            emissive_map=self._texture_path(data.get("emissiveTexture")),
+        )
+        mat.name = data.get("name", f"Material{index}")
+        self._materials[index] = mat
+        return mat
+
+    def _texture_path(self, info: dict | None) -> str | None:
+        if not info:
+            return None
+        source = self.doc["textures"][info["index"]].get("source")
+        if source is None:
+            return None
+        return self._image_path(source)
+
+    def _image_path(self, index: int) -> str | None:
+        if index in self._images:
+            return self._images[index]
+        img = self.doc["images"][index]
+        uri = img.get("uri")
+        if uri and not uri.startswith("data:"):
+            path = str(self.base_dir / uri)
+        else:
+            # Встроенное изображение → файл в кэше (PBRMaterial ждёт путь)
+            if uri:
+                header, payload = uri.split(",", 1)
+                blob = base64.b64decode(payload)
+                mime = header[5:].split(";")[0]
+            else:
+                blob = self._buffer_view_bytes(img["bufferView"]).tobytes()
+                mime = img.get("mimeType", "image/png")
+            ext = ".jpg" if "jpeg" in mime else ".png"
+            out = cache_root("gltf") / (hashlib.sha1(blob).hexdigest() + ext)
+            if not out.is_file():
+                out.write_bytes(blob)
+            path = str(out)
+        self._images[index] = path
+        return path
+
+    # -----------------------------------------------------------------
+    def _build_camera(self, index: int, name: str) -> Camera:
+        data = self.doc["cameras"][index]
+        if data.get("type") != "perspective":
+            logger.warning(f"[glTF] {name}: orthographic camera imported as perspective")
+        p = data.get("perspective", {})
+        return Camera(
+            fov=float(np.degrees(p.get("yfov", np.radians(60.0)))),
+            near=float(p.get("znear", 0.1)),
+            far=float(p.get("zfar", 1000.0)),
+            name=name,
+        )
+
+    def _build_light(self, index: int, world: np.ndarray, name: str) -> Node:
+        data = self._lights[index]
+        kind = data.get("type", "point")
+        color = Vec3(*data.get("color", (1.0, 1.0, 1.0)))
+        intensity = float(data.get("intensity", 1.0))
+        position = Vec3(*world[:3, 3])
+        direction = world[:3, :3] @ np.array([0.0, 0.0, -1.0], dtype=np.float32)
+        direction = Vec3(*direction)
+        name = data.get("name", name)
+        radius = float(data.get("range", 10.0))
+
+        if kind == "directional":
+            light = DirectionalLight(direction=direction, color=color,
+                                     intensity=intensity, name=name)
+        elif kind == "spot":
+            spot = data.get("spot", {})
+            light = SpotLight(
+                direction=direction, color=color, intensity=intensity, name=name,
+                radius=radius,
+                inner_angle=float(np.degrees(spot.get("innerConeAngle", 0.0))),
+                outer_angle=float(np.degrees(spot.get("outerConeAngle", np.pi / 4.0))),
+            )
+        else:
+            light = PointLight(position=position, radius=radius,
+                               color=color, intensity=intensity, name=name)
+        light.position = position
+        return light
@@ -10,8 +10,8 @@ emissive) и ссылки на DX12‑текстуры.
     поэтому материал гарантировано имеет готовый `DX12Texture`.
 
 2️⃣  Для материала **не создаётся свой CBV** – все матрицы передаются
-    через единственный `constant‑buffer`, который создаёт `Shader`
-    (`Shader._frame_cb`).  Поскольку в текущем `forward`‑шейдере
+    через кольцо constant‑buffer‑ов, которое ведёт `Shader`
+    (`Shader.commit`).  Поскольку в текущем `forward`‑шейдере
     параметры материала не используются, отдельный CBV не нужен.
     (Если в будущих шейдерах понадобится отдельный буфер,
     его можно добавить, но сейчас – лишний оверхед).
@@ -24,6 +24,23 @@ emissive) и ссылки на DX12‑текстуры.
 
 Таким образом `bind()` теперь действительно привязывает вашу
 текстуру к шейдеру, а чёрный экран исчезает.
+
+4️⃣  Карты берутся через `TextureManager.shared()` (`acquire`):
+    одинаковые пути/файлы загружаются один раз, ссылки считаются,
+    `release()` отдаёт их обратно. Если у менеджера есть `AsyncLoader`
+    (его выставляет `Engine`), карты грузятся **асинхронно**, а до
+    готовности текстуры `bind()` привязывает placeholder
+    (`PBRMaterial.placeholder_srv_gpu` – белая 1×1‑текстура
+    `ForwardRenderer`).
+
+5️⃣  Материал может брать albedo из текстурного атласа
+    (`alkash3d.assets.atlas`): `set_atlas(texture, uv_transform)`
+    подменяет карту, а `uv_transform` (scale.xy, offset.xy) рендерер
+    передаёт в шейдер как `uUVTransform`.
+
+6️⃣  `shader_features()` – define‑ы минимального варианта шейдера
+    (есть ли карты, alpha‑test); материал без карт рисуется вариантом,
+    который вообще не читает текстуру, а только `base_color`.
 """
 
 from __future__ import annotations
@@ -31,7 +48,7 @@ from __future__ import annotations
 import numpy as np
 
 from alkash3d.utils import logger
-from alkash3d.utils.texture_loader import load_texture
+from alkash3d.assets.texture_manager import TextureManager
 from alkash3d.graphics.dx12_backend import DX12Backend
 
 
@@ -44,6 +61,9 @@ class PBRMaterial:
     # Уникальный “binding point” – пока только для отладки/расширений.
     _binding_counter = 0
 
+    # SRV placeholder‑текстуры; выставляется рендерером.
+    placeholder_srv_gpu = None
+
     # -------------------------------------------------------------
     # Инициализация
     # -------------------------------------------------------------
@@ -60,6 +80,7 @@ class PBRMaterial:
         roughness_map: str | None = None,
         ao_map: str | None = None,
         emissive_map: str | None = None,
+        alpha_test: bool = False,
     ) -> None:
         # ---------------------------------------------------------
         # 0️⃣  Уникальный id (не используется в текущей версии)
@@ -79,6 +100,10 @@ class PBRMaterial:
             dtype=np.float32,
         ).tobytes()                           # 48 байт, но сейчас не используется
 
+        # Базовый цвет (`uBaseColor`, множитель albedo‑карты) и отсечение по альфе
+        self.base_color = np.asarray(albedo, dtype=np.float32).reshape(4)
+        self.alpha_test = bool(alpha_test)
+
         # ---------------------------------------------------------
         # 2️⃣  Путь к пользовательским картам (загружаются «лениво»)
         # ---------------------------------------------------------
@@ -97,43 +122,89 @@ class PBRMaterial:
             self._texture_paths["emissive"] = emissive_map
 
         # После загрузки в `self.textures` будет храниться реальная
-        # `DX12Texture`‑обёртка, возвращаемая `load_texture`.
+        # `DX12Texture`‑обёртка из `TextureManager`.
         self.textures: dict[str, any] = {}
+        # Ссылки `TextureManager` (`TextureEntry`) по имени карты
+        self._entries: dict[str, any] = {}
+
+        # ---------------------------------------------------------
+        # 3️⃣  UV‑преобразование (регион атласа); по‑умолчанию единичное
+        # ---------------------------------------------------------
+        self.uv_transform = np.array([1.0, 1.0, 0.0, 0.0], dtype=np.float32)
+
+    def set_atlas(self, texture, uv_transform) -> None:
+        """Брать albedo из атласа: `texture` + регион `uv_transform`."""
+        entry = self._entries.pop("albedo", None)
+        if entry is not None:
+            TextureManager.shared().release(entry)
+        self._texture_paths.pop("albedo", None)
+        self.textures["albedo"] = texture
+        self.uv_transform = np.asarray(uv_transform, dtype=np.float32).reshape(4)
+
+    def shader_features(self) -> dict:
+        """Define‑ы минимального варианта шейдера (см. `permutations`)."""
+        has = set(self._texture_paths) | set(self.textures)
+        return {
+            "HAS_ALBEDO_MAP": bool(has),        # bind() берёт albedo или первую карту
+            "HAS_NORMAL_MAP": "normal" in has,
+            "ALPHA_TEST": self.alpha_test,
+        }
 
     # -------------------------------------------------------------
     # Внутренний помощник – загрузка всех отложенных карт
     # -------------------------------------------------------------
     def _ensure_textures(self, backend: DX12Backend) -> None:
         """
-        Если карта ещё не загружена – вызываем `load_texture`,
-        сохраняем полученный объект в `self.textures`.
+        Если карта ещё не загружена – берём её у `TextureManager`;
+        готовую текстуру сохраняем в `self.textures` (и обновляем, если
+        менеджер перезагрузил файл).
         """
+        manager = TextureManager.shared()
         for name, path in self._texture_paths.items():
-            if name in self.textures:
-                continue          # уже загружена
-
-            try:
-                tex = load_texture(path, backend)
-                logger.debug(f"[Material] Loaded texture '{name}' from {path}")
-            except Exception as exc:
-                # При любой ошибке – создаём простую чёрную 1×1‑текстуру,
-                # чтобы шейдер не падал.
-                logger.error(f"[Material] Failed to load texture '{path}': {exc}")
-                tex = backend.create_texture(
-                    data=b"\x00\x00\x00\x00", w=1, h=1, fmt="RGBA8"
-                )
-            self.textures[name] = tex
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = manager.acquire(path, backend)
+                self._entries[name] = entry
+
+            if entry.is_ready():
+                # Ресурс записи может смениться (горячая перезагрузка)
+                tex = entry.texture
+                if self.textures.get(name) is not tex:
+                    self.textures[name] = tex
+                    logger.debug(f"[Material] Texture '{name}' resident ({path})")
+            elif entry.is_failed() and name not in self.textures:
+                self.textures[name] = self._fallback_texture(backend)
+
+    def release(self) -> None:
+        """Вернуть ссылки на текстуры в `TextureManager`."""
+        manager = TextureManager.shared()
+        for entry in self._entries.values():
+            manager.release(entry)
+        self._entries.clear()
+        self.textures.clear()
+
+    @staticmethod
+    def _fallback_texture(backend: DX12Backend):
+        """При любой ошибке – простая чёрная 1×1‑текстура, чтобы шейдер не падал."""
+        return backend.create_texture(data=b"\x00\x00\x00\x00", w=1, h=1, fmt="RGBA8")
 
     # -------------------------------------------------------------
     # Привязка материала к пайплайну
     # -------------------------------------------------------------
     def bind(self, backend: DX12Backend) -> None:
+        """Привязать SRV карты (`srv_handle`) к slot 1."""
+        srv_gpu = self.srv_handle(backend)
+        if srv_gpu is not None:
+            backend.set_root_descriptor_table(1, srv_gpu)
+
+    def srv_handle(self, backend: DX12Backend):
         """
         1️⃣  Гарантируем, что все карты загружены.
-        2️⃣  Выбираем *первую* из загруженных карт (обычно albedo)
-            и создаём SRV‑дескриптор в `cbv_srv_uav_heap`.
-        3️⃣  Привязываем SRV к slot 1 (в корневой подписи он идёт
-            сразу после CBV).
+        2️⃣  Выбираем albedo (или первую из загруженных карт); пока
+            она не готова – placeholder.
+        3️⃣  Возвращаем GPU‑дескриптор SRV для slot 1 (в корневой
+            подписи он идёт сразу после CBV); None – привязывать
+            нечего. Снимок кадра запоминает его в update‑потоке.
         """
         # -----------------------------------------------------------------
         # 0️⃣  Убедимся, что карта(и) находятся в виде DX12‑texture‑объекта
@@ -143,29 +214,37 @@ class PBRMaterial:
         # -----------------------------------------------------------------
         # 1️⃣  Если пользователь не указал ни одной карты – ничего не делаем.
         #     В `ForwardRenderer` в момент инициализации уже создана
-        #     «белая placeholder‑текстура» и привязана к slot 1, так что
+        #     «белая placeholder‑текстура» и привязана к slot 1, так что
         #     оставляем её.
         # -----------------------------------------------------------------
-        if not self.textures:
-            return
+        if not self._texture_paths and not self.textures:
+            return None
 
         # -----------------------------------------------------------------
-        # 2️⃣  Берём первую (обычно albedo) текстуру.
+        # 2️⃣  Берём albedo (или первую загруженную) текстуру; пока она
+        #     грузится – placeholder, чтобы не остался SRV прошлого
+        #     материала.
         # -----------------------------------------------------------------
-        tex = next(iter(self.textures.values()))
+        tex = self.textures.get("albedo")
+        if tex is None and "albedo" not in self._texture_paths and self.textures:
+            tex = next(iter(self.textures.values()))
+        if tex is None:
+            return self.placeholder_srv_gpu
 
         # -----------------------------------------------------------------
-        # 3️⃣  Выделяем дескриптор в heap‑е, создаём SRV и привязываем.
+        # 3️⃣  SRV создан вместе с текстурой (`tex._srv_gpu`). Для текстур
+        #     без SRV – выделяем дескриптор в heap‑е.
         # -----------------------------------------------------------------
-        srv_idx = backend.cbv_srv_uav_heap.next_free()
-        cpu_handle = backend.cbv_srv_uav_heap.get_cpu_handle(srv_idx)
-        backend.create_shader_resource_view(tex, cpu_handle)
-
-        # GPU‑handle, который передаём в root‑signature (slot 1)
-        srv_gpu = backend.cbv_srv_uav_heap.get_gpu_handle(srv_idx)
-        backend.set_root_descriptor_table(1, srv_gpu)
+        srv_gpu = getattr(tex, "_srv_gpu", None)
+        if srv_gpu is None:
+            srv_idx = backend.cbv_srv_uav_heap.next_free()
+            cpu_handle = backend.cbv_srv_uav_heap.get_cpu_handle(srv_idx)
+            backend.create_shader_resource_view(tex, cpu_handle)
+            srv_gpu = backend.cbv_srv_uav_heap.get_gpu_handle(srv_idx)
+            tex._srv_gpu = srv_gpu
+        return srv_gpu
 
         # -------------------------------------------------------------
         # (Если в будущем понадобится несколько текстур – просто
         #  добавить их в `self.textures` и привязать к другим слотам.)
-        # -------------------------------------------------------------
\ No newline at end of file
+        # -------------------------------------------------------------
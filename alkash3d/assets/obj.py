@@ -0,0 +1,288 @@
+"""
+Векторизованный загрузчик Wavefront OBJ с бинарным кэшем.
+
+Файл читается целиком как `bytes` и разбирается NumPy‑операциями по
+типам записей (`v`, `vn`, `vt`, `f`) – без цикла Python по строкам:
+
+1️⃣  комментарии (`# …`, в т.ч. в конце записи) заменяются пробелами,
+    начало строки – первый непробельный символ; тип записи
+    определяется по первым двум байтам;
+2️⃣  числа всех строк одного типа разбираются одним `np.fromstring`;
+3️⃣  полигоны триангулируются веером (fan) векторно;
+4️⃣  углы (pos, uv, normal) свариваются в вершины через `np.unique`
+    по упакованному int64‑ключу;
+5️⃣  при записи в кэш треугольники и вершины переупорядочиваются под
+    кэш вершин GPU (`alkash3d.mesh.optimize`) – веерная триангуляция
+    даёт плохую локальность.
+
+Результат кэшируется на диске (ключ – путь + mtime + размер) в
+бинарном формате `.amesh` (`alkash3d.mesh.mesh_file`); повторная
+загрузка – это `np.memmap`, т.е. миллисекунды. `load_obj_mesh()`
+строит `Mesh` прямо на view в кэш‑файл, без копий.
+
+MTL, группы и объекты игнорируются (как и в прежнем загрузчике).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from alkash3d.mesh.mesh_file import MeshFile, load_mesh, write_mesh_file
+from alkash3d.mesh.optimize import optimize_mesh
+from alkash3d.utils.cache import cache_root, file_cache_key
+from alkash3d.utils.logger import logger
+
+# Версия формата кэша – увеличить при изменении разбора
+CACHE_VERSION = 3
+
+_NL, _SP, _TAB, _CR, _SLASH, _HASH = 10, 32, 9, 13, 47, 35
+
+
+def load_obj(path, cache: bool = True):
+    """
+    Загрузить OBJ → (positions (N,3), normals (N,3), texcoords (N,2),
+    indices (M,) uint16/uint32). Отсутствующие нормали – (0, 0, 1),
+    UV – (0, 0). Индексы 16‑битные, если вершин не больше 65535.
+    """
+    path = _resolve(path)
+    if not cache:
+        return parse_obj(path.read_bytes())
+    mf = MeshFile(_cached_mesh_file(path))
+    return mf.positions, mf.normals, mf.texcoords, mf.base_indices
+
+
+def load_obj_mesh(path, name: str | None = None):
+    """Загрузить OBJ как `scene.Mesh` на view в кэш‑файл `.amesh`."""
+    path = _resolve(path)
+    return load_mesh(_cached_mesh_file(path), name=name or path.stem)
+
+
+def _resolve(path) -> Path:
+    path = Path(path).expanduser().resolve()
+    if not path.is_file():
+        raise FileNotFoundError(f"OBJ not found: {path}")
+    return path
+
+
+def cache_path(path) -> Path:
+    """Путь к `.amesh`‑кэшу OBJ (туда же пишет LOD‑цепочки `mesh.simplify`)."""
+    return cache_root("obj") / f"{file_cache_key(_resolve(path), CACHE_VERSION)}.amesh"
+
+
+def _cached_mesh_file(path: Path) -> Path:
+    """Путь к `.amesh` в кэше (разбирает и записывает при промахе)."""
+    cached = cache_path(path)
+    if cached.is_file():
+        try:
+            MeshFile(cached)
+            return cached
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning(f"[OBJ] broken cache entry {cached}: {exc}")
+    positions, normals, texcoords, indices = parse_obj(path.read_bytes())
+    positions, normals, texcoords, (indices,), report = optimize_mesh(
+        positions, normals, texcoords, [indices])
+    logger.info(f"[OBJ] {path.name}: ACMR {report['before']['acmr']:.2f} → "
+                f"{report['after']['acmr']:.2f}, ATVR {report['before']['atvr']:.2f} → "
+                f"{report['after']['atvr']:.2f}")
+    write_mesh_file(cached, positions, normals, texcoords, indices)
+    return cached
+
+
+# ---------------------------------------------------------------------
+#   Разбор
+# ---------------------------------------------------------------------
+def parse_obj(data: bytes):
+    """Разобрать содержимое OBJ‑файла (см. `load_obj`)."""
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    buf = _strip_comments(np.frombuffer(data, dtype=np.uint8))
+
+    ends = np.flatnonzero(buf == _NL)
+    lines = np.empty_like(ends)                  # начала строк
+    lines[0] = 0
+    lines[1:] = ends[:-1] + 1
+    starts = _record_starts(buf, lines, ends)    # начала записей
+
+    c0 = buf[starts]
+    c1 = buf[np.minimum(starts + 1, len(buf) - 1)]
+    ws1 = (c1 == _SP) | (c1 == _TAB)
+    is_v = (c0 == ord("v")) & ws1
+    is_vn = (c0 == ord("v")) & (c1 == ord("n"))
+    is_vt = (c0 == ord("v")) & (c1 == ord("t"))
+    is_f = (c0 == ord("f")) & ws1
+
+    # Рабочая копия: префиксы записей заменяются пробелами
+    work = buf.copy()
+    work[starts[is_v | is_vn | is_vt | is_f]] = _SP
+    work[starts[is_vn | is_vt] + 1] = _SP
+
+    v = _parse_floats(work, lines, ends, is_v, 3)
+    vn = _parse_floats(work, lines, ends, is_vn, 3)
+    vt = _parse_floats(work, lines, ends, is_vt, 2)
+
+    corners, face_sizes, fields = _parse_faces(work, lines, ends, is_f)
+    if len(face_sizes) == 0:
+        raise ValueError("OBJ contains no faces")
+    corner_face = np.repeat(np.arange(len(face_sizes)), face_sizes)
+    face_lines = np.flatnonzero(is_f)
+
+    # Отрицательные (относительные) индексы: -1 – последний из
+    # объявленных *до* строки грани.
+    rel = corners < 0
+    if rel.any():
+        before = np.stack([np.cumsum(is_v)[face_lines],
+                           np.cumsum(is_vt)[face_lines],
+                           np.cumsum(is_vn)[face_lines]], axis=1)
+        corners = np.where(rel, corners + before[corner_face] + 1, corners)
+    _check_face_indices(corners, fields, (len(v), len(vt), len(vn)),
+                        face_lines[corner_face])
+    corners -= 1                     # 1‑based → 0‑based (пропуск → -1)
+
+    tri_corners = _triangulate_fan(face_sizes)
+    keys = corners[tri_corners]      # (3T, 3): pos, uv, normal
+    return _weld(keys, v, vt, vn)
+
+
+def _strip_comments(buf: np.ndarray) -> np.ndarray:
+    """Копия `buf`, где `#` и остаток строки заменены пробелами."""
+    hashes = np.flatnonzero(buf == _HASH)
+    if len(hashes) == 0:
+        return buf
+    line_of = np.cumsum(buf == _NL)              # номер строки байта
+    line_of[buf == _NL] -= 1                     # `\n` – конец своей строки
+    comment = np.full(int(line_of[-1]) + 2, len(buf), dtype=np.int64)
+    np.minimum.at(comment, line_of[hashes], hashes)
+    blank = (np.arange(len(buf)) >= comment[line_of]) & (buf != _NL)
+    out = buf.copy()
+    out[blank] = _SP
+    return out
+
+
+def _record_starts(buf: np.ndarray, lines: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Первый непробельный байт каждой строки (пустая строка – её `\n`)."""
+    solid = np.flatnonzero((buf != _SP) & (buf != _TAB))
+    first = solid[np.minimum(np.searchsorted(solid, lines), len(solid) - 1)]
+    return np.minimum(first, ends)
+
+
+def _check_face_indices(corners, fields, counts, corner_lines) -> None:
+    """Индексы (1‑based, после относительных) в пределах v/vt/vn."""
+    for col in fields:
+        idx = corners[:, col]
+        bad = np.flatnonzero((idx < 1) | (idx > counts[col]))
+        if len(bad):
+            kind = ("v", "vt", "vn")[col]
+            i = bad[0]
+            raise ValueError(
+                f"OBJ line {int(corner_lines[i]) + 1}: face {kind} index out of range "
+                f"({int(idx[i])} resolved, {counts[col]} {kind} record(s) declared)")
+
+
+def _token_counts(text: np.ndarray, nlines: int) -> np.ndarray:
+    """Число токенов в каждой строке `text` (строки разделены `\\n`)."""
+    ws = (text == _SP) | (text == _TAB) | (text == _CR) | (text == _NL)
+    prev_ws = np.empty_like(ws)
+    prev_ws[0] = True
+    prev_ws[1:] = ws[:-1]
+    tok = np.flatnonzero(~ws & prev_ws)
+    line_of = np.searchsorted(np.flatnonzero(text == _NL), tok)
+    return np.bincount(line_of, minlength=nlines)[:nlines]
+
+
+def _select_lines(work: np.ndarray, starts, ends, mask) -> np.ndarray:
+    """Байты выбранных строк (вместе с `\\n`) одним массивом."""
+    return work[np.repeat(mask, ends - starts + 1)]
+
+
+def _parse_floats(work, starts, ends, mask, ncomp: int) -> np.ndarray:
+    n = int(mask.sum())
+    if n == 0:
+        return np.zeros((0, ncomp), dtype=np.float32)
+    text = _select_lines(work, starts, ends, mask)
+    values = np.fromstring(text.tobytes(), dtype=np.float32, sep=" ")
+    if values.size == n * ncomp:
+        return values.reshape(n, ncomp)
+
+    # Разное число компонент (напр. `v x y z w` или цвета вершин)
+    counts = _token_counts(text, n)
+    if counts.min() < ncomp:
+        raise ValueError(f"OBJ record has fewer than {ncomp} components")
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return values[offsets[:, None] + np.arange(ncomp)]
+
+
+def _parse_faces(work, starts, ends, mask):
+    """
+    (corners (C, 3) int64 [pos, uv, normal] 1‑based/0=нет, face_sizes,
+    fields – заданные в файле столбцы).
+    """
+    nfaces = int(mask.sum())
+    if nfaces == 0:
+        return np.zeros((0, 3), dtype=np.int64), np.zeros(0, dtype=np.int64), (0,)
+    text = _select_lines(work, starts, ends, mask)
+    face_sizes = _token_counts(text, nfaces)
+    ncorners = int(face_sizes.sum())
+
+    # Формат угла: v | v/vt | v//vn | v/vt/vn (один на весь файл)
+    slash = text == _SLASH
+    double = slash[:-1] & slash[1:]
+    nslash, ndouble = int(slash.sum()), int(double.sum())
+    if nslash == 0:
+        fields = (0,)
+    elif ndouble == ncorners and nslash == 2 * ncorners:
+        fields = (0, 2)
+    elif nslash == ncorners:
+        fields = (0, 1)
+    elif nslash == 2 * ncorners and ndouble == 0:
+        fields = (0, 1, 2)
+    else:
+        raise ValueError("OBJ faces mix different vertex formats")
+
+    text = text.copy()
+    text[slash] = _SP
+    values = np.fromstring(text.tobytes(), dtype=np.int64, sep=" ")
+    if values.size != ncorners * len(fields):
+        raise ValueError("Malformed OBJ face records")
+
+    corners = np.zeros((ncorners, 3), dtype=np.int64)
+    corners[:, fields] = values.reshape(ncorners, len(fields))
+    return corners, face_sizes, fields
+
+
+def _triangulate_fan(face_sizes: np.ndarray) -> np.ndarray:
+    """Индексы углов для веерной триангуляции, плоско (3T,)."""
+    face_sizes = face_sizes.astype(np.int64)
+    face_start = np.concatenate(([0], np.cumsum(face_sizes)[:-1]))
+    ntri = np.maximum(face_sizes - 2, 0)
+    tri_face = np.repeat(np.arange(len(face_sizes)), ntri)
+    tri_first = np.concatenate(([0], np.cumsum(ntri)[:-1]))
+    j = np.arange(len(tri_face)) - tri_first[tri_face] + 1
+    a = face_start[tri_face]
+    return np.stack([a, a + j, a + j + 1], axis=1).ravel()
+
+
+def _weld(keys: np.ndarray, v, vt, vn):
+    """Сварка одинаковых (pos, uv, normal) → уникальные вершины + индексы."""
+    np_, nt, nn = len(v), len(vt) + 1, len(vn) + 1
+    if np_ * nt * nn < 2 ** 62:
+        packed = (keys[:, 0] * nt + (keys[:, 1] + 1)) * nn + (keys[:, 2] + 1)
+        _, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+    else:
+        _, first, inverse = np.unique(keys, axis=0, return_index=True,
+                                      return_inverse=True)
+    unique = keys[first]
+
+    positions = v[unique[:, 0]]
+    normals = np.empty((len(unique), 3), dtype=np.float32)
+    normals[:] = (0.0, 0.0, 1.0)
+    has_n = unique[:, 2] >= 0
+    normals[has_n] = vn[unique[has_n, 2]]
+    texcoords = np.zeros((len(unique), 2), dtype=np.float32)
+    has_t = unique[:, 1] >= 0
+    texcoords[has_t] = vt[unique[has_t, 1]]
+
+    idx_dtype = np.uint16 if len(unique) <= 0xFFFF else np.uint32
+    indices = inverse.reshape(-1).astype(idx_dtype)
+    return positions, normals, texcoords, indices
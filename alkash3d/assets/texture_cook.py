@@ -0,0 +1,394 @@
+"""
+Офлайн‑«варка» текстур: mip‑цепочка + BC1/BC3 → `.atex`.
+
+1️⃣  Mip‑уровни строятся векторно (NumPy) box‑ или Kaiser‑фильтром;
+    цветовые каналы фильтруются в линейном пространстве (sRGB → linear
+    → sRGB), альфа – как есть.
+2️⃣  Блоки 4×4 всех уровней кодируются пачкой: концы отрезка цвета –
+    главная ось блока (PCA степенным методом), затем одна итерация
+    МНК‑уточнения концов по выбранным индексам; альфа BC3 – min/max
+    блока с 8‑уровневой палитрой.
+3️⃣  Результат пишется в `.atex` (`alkash3d.assets.texture_file`) –
+    рантайм отображает файл в память и грузит уровни без декодирования.
+    D3D12 требует у BC‑текстуры размер уровня 0, кратный 4: другие
+    размеры варятся в RGBA8.
+
+`cook_directory()` варит каталог параллельно (процессы) и инкрементально:
+манифест хранит sha1 исходника и параметры варки, неизменённые файлы
+пропускаются. `.atex` по‑умолчанию кладётся рядом с исходником –
+`decode_texture("foo.png")` сам подхватит свежий `foo.atex`.
+
+Командная строка::
+
+    python -m alkash3d.assets.texture_cook resources/textures \\
+        --format auto --filter kaiser -j 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from alkash3d.assets.texture_file import write_texture_file
+from alkash3d.utils.cache import atomic_write
+from alkash3d.utils.logger import logger
+
+# Версия варки – увеличить при изменении фильтров/кодировщика
+COOK_VERSION = 2
+MANIFEST_NAME = "atex_manifest.json"
+SOURCE_SUFFIXES = (".png", ".jpg", ".jpeg", ".tga", ".bmp")
+
+
+# ---------------------------------------------------------------------
+#   Mip‑цепочка
+# ---------------------------------------------------------------------
+def _srgb_to_linear(c: np.ndarray) -> np.ndarray:
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(c: np.ndarray) -> np.ndarray:
+    c = np.clip(c, 0.0, 1.0)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * c ** (1.0 / 2.4) - 0.055)
+
+
+def _kaiser_taps(radius: int = 3, alpha: float = 4.0) -> tuple[np.ndarray, np.ndarray]:
+    """Смещения и веса Kaiser‑sinc фильтра для уменьшения в 2 раза."""
+    offsets = np.arange(-radius * 2 + 1, radius * 2 + 1)      # относительно 2j
+    x = offsets - 0.5                                        # центр между 2j и 2j+1
+    weights = np.sinc(x / 2.0) * np.kaiser(len(x), alpha)
+    return offsets, (weights / weights.sum()).astype(np.float32)
+
+
+def _downsample_axis(img: np.ndarray, axis: int, filt: str) -> np.ndarray:
+    n = img.shape[axis]
+    if n == 1:
+        return img
+    m = n // 2
+    if filt == "box":
+        idx = np.stack([2 * np.arange(m), 2 * np.arange(m) + 1], axis=1)
+        weights = np.array([0.5, 0.5], dtype=np.float32)
+    else:
+        offsets, weights = _kaiser_taps()
+        idx = np.clip(2 * np.arange(m)[:, None] + offsets[None, :], 0, n - 1)
+    taken = np.take(img, idx, axis=axis)               # ось → (m, taps)
+    return np.tensordot(taken, weights, axes=([axis + 1], [0]))
+
+
+def build_mips(rgba: np.ndarray, filt: str = "kaiser", srgb: bool = True,
+               max_levels: int | None = None) -> list[np.ndarray]:
+    """
+    Полная mip‑цепочка (h, w, 4) uint8 → список уровней до 1×1.
+    Размер уровня – `max(1, size // 2)`, как у D3D12.
+    """
+    if filt not in ("box", "kaiser"):
+        raise ValueError(f"Unknown mip filter: {filt}")
+    levels = [np.ascontiguousarray(rgba, dtype=np.uint8)]
+    work = rgba.astype(np.float32) / 255.0
+    if srgb:
+        work[..., :3] = _srgb_to_linear(work[..., :3])
+
+    while work.shape[0] > 1 or work.shape[1] > 1:
+        if max_levels is not None and len(levels) >= max_levels:
+            break
+        work = _downsample_axis(work, 0, filt)
+        work = _downsample_axis(work, 1, filt)
+        out = work.copy()
+        if srgb:
+            out[..., :3] = _linear_to_srgb(out[..., :3])
+        levels.append(np.clip(np.rint(out * 255.0), 0, 255).astype(np.uint8))
+    return levels
+
+
+# ---------------------------------------------------------------------
+#   BC1 / BC3
+# ---------------------------------------------------------------------
+_BC1_BLOCK = np.dtype([("c0", "<u2"), ("c1", "<u2"), ("idx", "<u4")])
+
+
+def _to_blocks(img: np.ndarray) -> tuple[np.ndarray, int, int]:
+    """(h, w, C) → (bh*bw, 16, C) с дополнением краёв до кратного 4."""
+    h, w = img.shape[:2]
+    bh, bw = (h + 3) // 4, (w + 3) // 4
+    if (bh * 4, bw * 4) != (h, w):
+        img = np.pad(img, ((0, bh * 4 - h), (0, bw * 4 - w), (0, 0)), mode="edge")
+    blocks = img.reshape(bh, 4, bw, 4, -1).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(bh * bw, 16, -1), bh, bw
+
+
+def _from_blocks(blocks: np.ndarray, bh: int, bw: int) -> np.ndarray:
+    return blocks.reshape(bh, bw, 4, 4, -1).transpose(0, 2, 1, 3, 4) \
+        .reshape(bh * 4, bw * 4, -1)
+
+
+def _pack565(c: np.ndarray) -> np.ndarray:
+    c = np.clip(np.rint(c), 0, 255).astype(np.uint32)
+    return (((c[..., 0] * 31 + 127) // 255) << 11
+            | ((c[..., 1] * 63 + 127) // 255) << 5
+            | ((c[..., 2] * 31 + 127) // 255)).astype(np.uint16)
+
+
+def _unpack565(v: np.ndarray) -> np.ndarray:
+    v = v.astype(np.uint32)
+    r, g, b = (v >> 11) & 31, (v >> 5) & 63, v & 31
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)],
+                    axis=-1).astype(np.float32)
+
+
+def _bc1_palette(c0: np.ndarray, c1: np.ndarray) -> np.ndarray:
+    """(n, 4, 3) – 4‑цветная палитра (c0 > c1)."""
+    e0, e1 = _unpack565(c0), _unpack565(c1)
+    return np.stack([e0, e1, (2 * e0 + e1) / 3, (e0 + 2 * e1) / 3], axis=1)
+
+
+def _nearest(pixels: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    d = ((pixels[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(-1)
+    return d.argmin(-1)
+
+
+# Вес второго конца для индексов палитры 0..3
+_BC1_WEIGHTS = np.array([0.0, 1.0, 1.0 / 3.0, 2.0 / 3.0], dtype=np.float32)
+
+
+def _fit_endpoints(rgb: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Концы отрезка (n, 3) по главной оси блока."""
+    mean = rgb.mean(axis=1, keepdims=True)
+    d = rgb - mean
+    cov = np.einsum("npi,npj->nij", d, d)
+    axis = np.ones((len(rgb), 3), dtype=np.float32)
+    for _ in range(4):                                    # степенной метод
+        axis = np.einsum("nij,nj->ni", cov, axis)
+        norm = np.linalg.norm(axis, axis=1, keepdims=True)
+        axis = np.where(norm > 1e-8, axis / np.maximum(norm, 1e-8), 0.0)
+    t = np.einsum("npi,ni->np", d, axis)
+    lo = mean[:, 0] + t.min(axis=1)[:, None] * axis
+    hi = mean[:, 0] + t.max(axis=1)[:, None] * axis
+    return hi, lo
+
+
+def _refine_endpoints(rgb, weights, e0, e1):
+    """МНК: x_i ≈ (1‑w_i)·e0 + w_i·e1 для выбранных индексов."""
+    a = 1.0 - weights
+    aa, ab, bb = (a * a).sum(1), (a * weights).sum(1), (weights * weights).sum(1)
+    ax = np.einsum("np,npc->nc", a, rgb)
+    bx = np.einsum("np,npc->nc", weights, rgb)
+    det = aa * bb - ab * ab
+    ok = np.abs(det) > 1e-6
+    safe = np.where(ok, det, 1.0)[:, None]
+    n0 = (bb[:, None] * ax - ab[:, None] * bx) / safe
+    n1 = (aa[:, None] * bx - ab[:, None] * ax) / safe
+    return np.where(ok[:, None], n0, e0), np.where(ok[:, None], n1, e1)
+
+
+def _encode_color(rgb: np.ndarray) -> np.ndarray:
+    """(n, 16, 3) float → (n,) `_BC1_BLOCK` в 4‑цветном режиме."""
+    e0, e1 = _fit_endpoints(rgb)
+    for refine in (True, False):
+        c0, c1 = _pack565(e0), _pack565(e1)
+        swap = c0 < c1
+        c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+        idx = _nearest(rgb, _bc1_palette(c0, c1))
+        if refine:
+            e0, e1 = _refine_endpoints(rgb, _BC1_WEIGHTS[idx],
+                                       _unpack565(c0), _unpack565(c1))
+
+    idx = np.where((c0 == c1)[:, None], 0, idx).astype(np.uint32)
+    out = np.empty(len(rgb), dtype=_BC1_BLOCK)
+    out["c0"], out["c1"] = c0, c1
+    out["idx"] = (idx << (2 * np.arange(16, dtype=np.uint32))).sum(1, dtype=np.uint32)
+    return out
+
+
+def encode_bc1(rgba: np.ndarray) -> np.ndarray:
+    """(h, w, 4) uint8 → (bh, bw, 8) uint8 BC1 (альфа игнорируется)."""
+    blocks, bh, bw = _to_blocks(rgba)
+    out = _encode_color(blocks[..., :3].astype(np.float32))
+    return out.view(np.uint8).reshape(bh, bw, 8)
+
+
+def encode_bc3(rgba: np.ndarray) -> np.ndarray:
+    """(h, w, 4) uint8 → (bh, bw, 16) uint8 BC3."""
+    blocks, bh, bw = _to_blocks(rgba)
+    alpha = blocks[..., 3].astype(np.int32)
+    a0, a1 = alpha.max(1), alpha.min(1)
+    span = np.maximum(a0 - a1, 1)[:, None]
+    # позиция 0..7 от a0 к a1 → код палитры (0 – a0, 1 – a1, 2..7 – между)
+    pos = np.rint((a0[:, None] - alpha) * 7 / span).astype(np.uint64)
+    code = np.where(pos == 0, 0, np.where(pos == 7, 1, pos + 1))
+    code = np.where((a0 == a1)[:, None], 0, code)
+    bits = (code << (3 * np.arange(16, dtype=np.uint64))).sum(1, dtype=np.uint64)
+
+    out = np.empty((len(blocks), 16), dtype=np.uint8)
+    out[:, 0], out[:, 1] = a0, a1
+    out[:, 2:8] = bits.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :6]
+    out[:, 8:] = _encode_color(blocks[..., :3].astype(np.float32)) \
+        .view(np.uint8).reshape(-1, 8)
+    return out.reshape(bh, bw, 16)
+
+
+def _decode_color(raw: np.ndarray) -> np.ndarray:
+    blk = np.ascontiguousarray(raw).view(_BC1_BLOCK).reshape(-1)
+    palette = _bc1_palette(blk["c0"], blk["c1"])
+    idx = (blk["idx"][:, None] >> (2 * np.arange(16, dtype=np.uint32))) & 3
+    return np.take_along_axis(palette, idx[..., None].astype(np.intp), axis=1)
+
+
+def decode_bc1(blocks: np.ndarray) -> np.ndarray:
+    """(bh, bw, 8) → (bh*4, bw*4, 4) uint8 (4‑цветный режим, альфа 255)."""
+    bh, bw = blocks.shape[:2]
+    rgb = _decode_color(blocks.reshape(-1, 8))
+    rgba = np.concatenate([np.rint(rgb), np.full(rgb.shape[:2] + (1,), 255.0)], -1)
+    return _from_blocks(rgba.astype(np.uint8), bh, bw)
+
+
+def decode_bc3(blocks: np.ndarray) -> np.ndarray:
+    """(bh, bw, 16) → (bh*4, bw*4, 4) uint8."""
+    bh, bw = blocks.shape[:2]
+    raw = np.ascontiguousarray(blocks.reshape(-1, 16))
+    a0, a1 = raw[:, 0].astype(np.float32), raw[:, 1].astype(np.float32)
+    bits = np.zeros((len(raw), 8), dtype=np.uint8)
+    bits[:, :6] = raw[:, 2:8]
+    bits = bits.view("<u8").reshape(-1)
+    code = (bits[:, None] >> (3 * np.arange(16, dtype=np.uint64))) & 7
+    pos = np.array([0, 7, 1, 2, 3, 4, 5, 6], dtype=np.float32)   # код → позиция
+    pal_a = (a0[:, None] * (7 - pos) + a1[:, None] * pos) / 7   # (n, 8)
+    alpha = np.take_along_axis(pal_a, code.astype(np.intp), axis=1)
+    rgb = _decode_color(raw[:, 8:])
+    rgba = np.concatenate([rgb, alpha[..., None]], -1)
+    return _from_blocks(np.rint(rgba).astype(np.uint8), bh, bw)
+
+
+# ---------------------------------------------------------------------
+#   Варка
+# ---------------------------------------------------------------------
+def choose_format(rgba: np.ndarray) -> str:
+    """BC3 при наличии прозрачности, иначе BC1."""
+    return "BC3" if (rgba[..., 3] < 255).any() else "BC1"
+
+
+def cook_texture(src, dst=None, fmt: str = "auto", filt: str = "kaiser",
+                 srgb: bool = True) -> Path:
+    """Сварить один файл → `.atex` (по‑умолчанию рядом с исходником)."""
+    src = Path(src)
+    dst = Path(dst) if dst is not None else src.with_suffix(".atex")
+    raw = src.read_bytes()
+    with Image.open(io.BytesIO(raw)) as img:
+        rgba = np.asarray(img.convert("RGBA"), dtype=np.uint8)
+
+    fmt = choose_format(rgba) if fmt.lower() == "auto" else fmt.upper()
+    h, w = rgba.shape[:2]
+    if fmt in ("BC1", "BC3") and (w % 4 or h % 4):
+        logger.warning(f"[TextureCook] {src.name}: {w}×{h} is not a multiple of 4, "
+                       f"storing RGBA8 instead of {fmt}")
+        fmt = "RGBA8"
+    mips = build_mips(rgba, filt=filt, srgb=srgb)
+    if fmt == "BC1":
+        levels = [encode_bc1(m) for m in mips]
+    elif fmt == "BC3":
+        levels = [encode_bc3(m) for m in mips]
+    elif fmt == "RGBA8":
+        levels = mips
+    else:
+        raise ValueError(f"Unsupported cook format: {fmt}")
+
+    return write_texture_file(dst, levels, w, h, fmt,
+                              source_hash=hashlib.sha1(raw).digest(), srgb=srgb)
+
+
+def _cook_job(args):
+    src, dst, fmt, filt, srgb = args
+    cook_texture(src, dst, fmt, filt, srgb)
+    return str(src)
+
+
+def cook_directory(src_dir, out_dir=None, fmt: str = "auto", filt: str = "kaiser",
+                   srgb: bool = True, workers: int | None = None,
+                   force: bool = False) -> dict:
+    """
+    Сварить все изображения каталога (рекурсивно). Файлы, у которых
+    sha1 и параметры варки совпадают с манифестом, пропускаются.
+    Возвращает `{"cooked", "skipped", "failed"}`.
+    """
+    src_dir = Path(src_dir).resolve()
+    out_dir = Path(out_dir).resolve() if out_dir is not None else src_dir
+    manifest_path = out_dir / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text("utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+    options = f"v{COOK_VERSION}|{fmt.lower()}|{filt}|{int(srgb)}"
+
+    jobs, hashes = [], {}
+    skipped = 0
+    for src in sorted(src_dir.rglob("*")):
+        if src.suffix.lower() not in SOURCE_SUFFIXES or not src.is_file():
+            continue
+        rel = src.relative_to(src_dir).as_posix()
+        dst = (out_dir / rel).with_suffix(".atex")
+        digest = hashlib.sha1(src.read_bytes()).hexdigest()
+        hashes[rel] = digest
+        entry = manifest.get(rel, {})
+        if (not force and entry.get("hash") == digest
+                and entry.get("options") == options and dst.is_file()):
+            skipped += 1
+            continue
+        jobs.append((src, dst, fmt, filt, srgb))
+
+    cooked, failed = 0, 0
+    if jobs:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [(job, pool.submit(_cook_job, job)) for job in jobs]
+            for (src, dst, *_), fut in futures:
+                rel = src.relative_to(src_dir).as_posix()
+                try:
+                    fut.result()
+                    manifest[rel] = {"hash": hashes[rel], "options": options,
+                                     "output": dst.relative_to(out_dir).as_posix()}
+                    cooked += 1
+                    logger.info(f"[TextureCook] {rel} → {dst.name}")
+                except Exception as exc:
+                    failed += 1
+                    manifest.pop(rel, None)
+                    logger.error(f"[TextureCook] Failed to cook {rel}: {exc}")
+
+    with atomic_write(manifest_path) as f:
+        f.write(json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return {"cooked": cooked, "skipped": skipped, "failed": failed}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m alkash3d.assets.texture_cook",
+        description="Cook textures into mip-mapped BC1/BC3 .atex files.",
+    )
+    parser.add_argument("src", help="source directory (or a single image)")
+    parser.add_argument("-o", "--out", help="output directory (default: next to sources)")
+    parser.add_argument("--format", default="auto", choices=["auto", "bc1", "bc3", "rgba8"])
+    parser.add_argument("--filter", default="kaiser", choices=["kaiser", "box"])
+    parser.add_argument("--linear", action="store_true",
+                        help="data textures (normal/roughness maps): no sRGB conversion")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="ignore the manifest")
+    args = parser.parse_args(argv)
+
+    src = Path(args.src)
+    if src.is_file():
+        out = Path(args.out) / src.with_suffix(".atex").name if args.out else None
+        print(cook_texture(src, out, args.format, args.filter, not args.linear))
+        return 0
+    stats = cook_directory(src, args.out, args.format, args.filter,
+                           not args.linear, args.workers, args.force)
+    print(f"cooked {stats['cooked']}, skipped {stats['skipped']}, failed {stats['failed']}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""
+Контейнер «сваренной» текстуры (`.atex`) для загрузки без декодирования.
+
+Раскладка файла (little‑endian, данные уровней выровнены на 64 байта):
+
+    Header : magic "ATEX", version u16, format u16, width u32,
+             height u32, mip_count u32, flags u32,
+             source_hash 20s (sha1 исходника)                    (44 B)
+    Mips   : mip_count × (offset u64, nbytes u64,
+             rows u32, row_pitch u32)                           (24 B)
+    Data   : уровни подряд; для RGBA8 строка – пиксели, для BC1/BC3 –
+             строка блоков 4×4 (8 / 16 байт на блок)
+
+`TextureFile` открывает файл через `np.memmap(mode="r")`; `levels` –
+2‑D uint8‑view (rows, row_pitch), которые `DX12Backend.create_texture_mips`
+копирует в текстуру как есть.
+"""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from alkash3d.utils.cache import atomic_write
+
+MAGIC = b"ATEX"
+VERSION = 1
+ALIGN = 64
+
+FORMATS = {0: "RGBA8", 1: "BC1", 2: "BC3"}
+FORMAT_CODES = {v: k for k, v in FORMATS.items()}
+BLOCK_BYTES = {"BC1": 8, "BC3": 16}
+
+FLAG_SRGB = 1
+
+_HEADER = struct.Struct("<4sHHIIII20s")
+_MIP = struct.Struct("<QQII")
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) & ~(ALIGN - 1)
+
+
+def level_shape(w: int, h: int, fmt: str) -> tuple[int, int]:
+    """(rows, row_pitch) уровня `w`×`h` в формате `fmt`."""
+    if fmt in BLOCK_BYTES:
+        return (h + 3) // 4, ((w + 3) // 4) * BLOCK_BYTES[fmt]
+    return h, w * 4
+
+
+def write_texture_file(path, levels, width: int, height: int, fmt: str,
+                       source_hash: bytes = b"", srgb: bool = True) -> Path:
+    """
+    Записать `.atex` (атомарно). `levels` – массивы уровней: (h, w, 4)
+    uint8 для RGBA8 или (bh, bw, block) uint8 для BC1/BC3.
+    """
+    path = Path(path)
+    fmt = fmt.upper()
+    if fmt not in FORMAT_CODES:
+        raise ValueError(f"Unsupported texture format: {fmt}")
+
+    table_end = _HEADER.size + _MIP.size * len(levels)
+    offset = _align(table_end)
+    entries = []
+    w, h = width, height
+    for level in levels:
+        rows, pitch = level_shape(w, h, fmt)
+        if level.nbytes != rows * pitch:
+            raise ValueError(f"Mip {len(entries)} has {level.nbytes} bytes, "
+                             f"expected {rows * pitch}")
+        entries.append((offset, level.nbytes, rows, pitch))
+        offset = _align(offset + level.nbytes)
+        w, h = max(1, w // 2), max(1, h // 2)
+
+    with atomic_write(path) as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, FORMAT_CODES[fmt], width, height,
+                             len(levels), FLAG_SRGB if srgb else 0,
+                             source_hash[:20].ljust(20, b"\0")))
+        for entry in entries:
+            f.write(_MIP.pack(*entry))
+        for (off, _, _, _), level in zip(entries, levels):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(np.ascontiguousarray(level, dtype=np.uint8).tobytes())
+    return path
+
+
+class TextureFile:
+    """Отображённый в память `.atex`; `levels` – view без копий."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+        (magic, version, fmt, self.width, self.height, count, self.flags,
+         source_hash) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an ATEX texture file: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported ATEX version {version}: {self.path}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown ATEX format {fmt}: {self.path}")
+        self.format = FORMATS[fmt]
+        self.source_hash = source_hash.hex()
+
+        self.levels: list[np.ndarray] = []
+        for i in range(count):
+            off, nbytes, rows, pitch = _MIP.unpack_from(
+                self._map, _HEADER.size + i * _MIP.size
+            )
+            self.levels.append(self._map[off:off + nbytes].reshape(rows, pitch))
+
+    @property
+    def mip_count(self) -> int:
+        return len(self.levels)
+
+    @property
+    def srgb(self) -> bool:
+        return bool(self.flags & FLAG_SRGB)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def to_rgba(self, mip: int = 0) -> np.ndarray:
+        """Распаковать уровень в (h, w, 4) uint8 (для бэкендов без BC)."""
+        w = max(1, self.width >> mip)
+        h = max(1, self.height >> mip)
+        level = self.levels[mip]
+        if self.format == "RGBA8":
+            return np.asarray(level).reshape(h, w, 4)
+        from alkash3d.assets.texture_cook import decode_bc1, decode_bc3
+        blocks = np.asarray(level).reshape(level.shape[0], -1, BLOCK_BYTES[self.format])
+        rgba = decode_bc1(blocks) if self.format == "BC1" else decode_bc3(blocks)
+        return rgba[:h, :w]
@@ -1,19 +1,319 @@
 # alkash3d/assets/texture_manager.py
-"""Менеджер кэширования текстур – DX12‑совместимый."""
+"""
+Менеджер кэширования текстур – DX12‑совместимый.
+
+* Ключ записи – канонический путь (`Path.resolve()`); одинаковые по
+  содержимому файлы (sha1) делят один GPU‑ресурс.
+* `acquire(path)` / `release(entry)` – счётчик ссылок. Запись без
+  ссылок остаётся в кэше, пока хватает бюджета.
+* Размер ресурса считается вместе с mip‑цепочкой
+  (`texture_loader.texture_nbytes`). При превышении `budget_bytes`
+  вытесняются наименее недавно использованные ресурсы без ссылок (LRU)
+  через `backend.defer_release` – GPU может ещё читать их в кадрах
+  «в полёте».
+* С `loader` (`AsyncLoader`) файлы декодируются в I/O‑потоках, а
+  текстура создаётся в `AsyncLoader.pump`; до этого `entry.is_ready()`
+  ложно и материал рисует placeholder.
+* `stats()` – попадания, промахи, вытеснения, занятые байты.
+* `reload(path)` – горячая перезагрузка: ресурс записи подменяется,
+  материалы берут новый при следующем `bind()`. С `watcher`
+  (`AssetWatcher`) каждый загруженный путь наблюдается автоматически.
+
+Один «общий» менеджер на процесс – `TextureManager.shared()`; его
+использует `PBRMaterial`, движок подменяет его своим (`set_shared`).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
 
 from alkash3d.utils.logger import logger
-from alkash3d.utils.texture_loader import load_texture
+from alkash3d.utils.texture_loader import decode_texture, upload_texture
+
+# Состояния записи
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class CachedTexture:
+    """GPU‑ресурс текстуры; ключ – хэш содержимого."""
+
+    __slots__ = ("content_hash", "texture", "nbytes", "refs", "paths")
+
+    def __init__(self, content_hash: str, texture, nbytes: int):
+        self.content_hash = content_hash
+        self.texture = texture
+        self.nbytes = nbytes
+        self.refs = 0
+        self.paths: set[Path] = set()
+
+
+class TextureEntry:
+    """Текстура по пути, выданная `acquire()`."""
+
+    __slots__ = ("path", "state", "resource", "refs", "error")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.state = PENDING
+        self.resource: CachedTexture | None = None
+        self.refs = 0
+        self.error: BaseException | None = None
+
+    @property
+    def texture(self):
+        return self.resource.texture if self.resource is not None else None
+
+    @property
+    def nbytes(self) -> int:
+        return self.resource.nbytes if self.resource is not None else 0
+
+    def is_ready(self) -> bool:
+        return self.state == READY
+
+    def is_failed(self) -> bool:
+        return self.state == FAILED
+
+    def __repr__(self):
+        return f"TextureEntry({self.path.name}, {self.state}, refs={self.refs})"
 
 
 class TextureManager:
-    """Кеширующий менеджер текстур – один объект на процесс."""
-    _cache = {}
+    """Кэш текстур с подсчётом ссылок и LRU‑вытеснением по бюджету."""
+
+    _shared: "TextureManager | None" = None
+
+    def __init__(self, backend=None, budget_bytes: int = 512 * 1024 * 1024,
+                 loader=None):
+        self.backend = backend
+        self.budget_bytes = int(budget_bytes)
+        self.loader = loader
+        self.watcher = None
+
+        self._entries: dict[Path, TextureEntry] = {}
+        self._watched: set[Path] = set()    # пути, уже отданные watcher‑у
+        # hash → ресурс; порядок – от давно к недавно использованным
+        self._resources: OrderedDict[str, CachedTexture] = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -----------------------------------------------------------------
+    #   Общий экземпляр
+    # -----------------------------------------------------------------
+    @classmethod
+    def shared(cls) -> "TextureManager":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @classmethod
+    def set_shared(cls, manager: "TextureManager | None") -> None:
+        cls._shared = manager
 
     @classmethod
     def get(cls, path: str, backend):
-        if path in cls._cache:
-            return cls._cache[path]
-        tex = load_texture(path, backend)   # создаёт DX12‑текстуру
-        cls._cache[path] = tex
-        logger.debug(f"[TextureManager] Loaded texture: {path}")
-        return tex
+        """Синхронно загрузить текстуру через общий менеджер (совместимость)."""
+        entry = cls.shared().acquire(path, backend, wait=True)
+        if entry.is_failed():
+            raise entry.error
+        return entry.texture
+
+    # -----------------------------------------------------------------
+    #   Ссылки
+    # -----------------------------------------------------------------
+    def acquire(self, path, backend=None, wait: bool = False) -> TextureEntry:
+        """
+        Взять ссылку на текстуру. Без `loader` (или с `wait=True`)
+        загрузка синхронная; иначе – асинхронная, см. `entry.is_ready()`.
+        """
+        backend = backend or self.backend
+        if self.backend is None:
+            self.backend = backend          # нужен для отложенного освобождения
+        p = Path(path).expanduser().resolve()
+        with self._lock:
+            entry = self._entries.get(p)
+            if entry is not None and not entry.is_failed():
+                self.hits += 1
+                entry.refs += 1
+                if entry.resource is not None:
+                    entry.resource.refs += 1
+                    self._resources.move_to_end(entry.resource.content_hash)
+                return entry
+
+            # Промах: ссылка берётся до загрузки, чтобы новый ресурс
+            # не был сразу вытеснен при переполненном бюджете.
+            self.misses += 1
+            entry = TextureEntry(p)
+            entry.refs = 1
+            self._entries[p] = entry
+            # Промах после вытеснения или ошибки – путь уже наблюдается,
+            # второй перезагрузчик вызвал бы reload() дважды.
+            if self.watcher is not None and p not in self._watched:
+                from alkash3d.assets.watcher import watch_texture
+                self._watched.add(p)
+                watch_texture(self.watcher, self, p)
+            if self.loader is not None and not wait:
+                self.loader.request(
+                    "texture_data", p,
+                    on_ready=lambda h, e=entry: self._on_decoded(e, h, backend),
+                )
+            else:
+                try:
+                    self._attach(entry, decode_texture(p), backend)
+                except Exception as exc:
+                    self._fail(entry, exc)
+            return entry
+
+    def release(self, entry: TextureEntry) -> None:
+        """Вернуть ссылку; ресурс без ссылок становится кандидатом на вытеснение."""
+        with self._lock:
+            if entry.refs <= 0:
+                return
+            entry.refs -= 1
+            if entry.resource is not None:
+                entry.resource.refs -= 1
+                if entry.resource.refs == 0:
+                    self._enforce_budget()
+
+    def reload(self, path) -> bool:
+        """
+        Перечитать файл и подменить ресурс записи (если содержимое
+        изменилось). Вызывать на границе кадров, из потока GPU.
+        """
+        p = Path(path).expanduser().resolve()
+        with self._lock:
+            entry = self._entries.get(p)
+        if entry is None:
+            return False
+        decoded = decode_texture(p)
+        with self._lock:
+            if self._entries.get(p) is not entry:
+                return False
+            old = entry.resource
+            if old is not None and old.content_hash == decoded.content_hash:
+                return False
+            if old is not None:
+                old.refs -= entry.refs
+                old.paths.discard(p)
+                entry.resource = None
+            self._attach(entry, decoded, self.backend)
+            if old is not None and old.refs <= 0 and not old.paths \
+                    and old.content_hash in self._resources:
+                self._evict(old, count=False)
+            logger.info(f"[TextureManager] Reloaded texture: {p}")
+            return True
+
+    def touch(self, entry: TextureEntry) -> None:
+        """Отметить использование (сдвигает ресурс в конец LRU)."""
+        if entry.resource is not None:
+            with self._lock:
+                if entry.resource.content_hash in self._resources:
+                    self._resources.move_to_end(entry.resource.content_hash)
+
+    # -----------------------------------------------------------------
+    #   Бюджет
+    # -----------------------------------------------------------------
+    def set_budget(self, budget_bytes: int) -> None:
+        with self._lock:
+            self.budget_bytes = int(budget_bytes)
+            self._enforce_budget()
+
+    def trim(self) -> int:
+        """Вытеснить все ресурсы без ссылок; возвращает освобождённые байты."""
+        with self._lock:
+            before = self.resident_bytes
+            for res in [r for r in self._resources.values() if r.refs == 0]:
+                self._evict(res)
+            return before - self.resident_bytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "textures": len(self._resources),
+                "entries": len(self._entries),
+                "resident_bytes": self.resident_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        """Освободить всё (при завершении)."""
+        with self._lock:
+            for res in list(self._resources.values()):
+                self._evict(res, count=False)
+            self._entries.clear()
+
+    # -----------------------------------------------------------------
+    #   Внутреннее
+    # -----------------------------------------------------------------
+    def _on_decoded(self, entry: TextureEntry, handle, backend) -> None:
+        """`AsyncLoader.pump` → создать текстуру (в потоке GPU)."""
+        self.loader.forget(handle)
+        with self._lock:
+            if self._entries.get(entry.path) is not entry:
+                return                      # запись уже вытеснена
+            if handle.is_failed():
+                self._fail(entry, handle.error)
+                return
+            try:
+                self._attach(entry, handle.value, backend)
+            except Exception as exc:
+                self._fail(entry, exc)
+
+    def _attach(self, entry: TextureEntry, decoded, backend) -> None:
+        res = self._resources.get(decoded.content_hash)
+        if res is None:
+            res = CachedTexture(decoded.content_hash,
+                                upload_texture(decoded, backend),
+                                decoded.nbytes)
+            self._resources[res.content_hash] = res
+            self.resident_bytes += res.nbytes
+            logger.debug(f"[TextureManager] Loaded texture: {entry.path} "
+                         f"({res.nbytes} B, resident {self.resident_bytes} B)")
+        else:
+            self._resources.move_to_end(res.content_hash)
+        res.paths.add(entry.path)
+        res.refs += entry.refs
+        entry.resource = res
+        entry.state = READY
+        self._enforce_budget()
+
+    def _fail(self, entry: TextureEntry, exc: BaseException) -> None:
+        logger.error(f"[TextureManager] Failed to load texture '{entry.path}': {exc}")
+        entry.state = FAILED
+        entry.error = exc
+
+    def _enforce_budget(self) -> None:
+        if self.resident_bytes <= self.budget_bytes:
+            return
+        for res in list(self._resources.values()):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if res.refs == 0:
+                self._evict(res)
+
+    def _evict(self, res: CachedTexture, count: bool = True) -> None:
+        del self._resources[res.content_hash]
+        for p in res.paths:
+            entry = self._entries.get(p)
+            if entry is not None and entry.resource is res:
+                del self._entries[p]
+        self.resident_bytes -= res.nbytes
+        backend = self.backend
+        if backend is not None and hasattr(backend, "defer_release"):
+            backend.defer_release(res.texture)
+        if count:
+            self.evictions += 1
+            logger.debug(f"[TextureManager] Evicted {res.content_hash[:8]} "
+                         f"({res.nbytes} B)")
@@ -0,0 +1,313 @@
+"""
+Горячая перезагрузка ассетов по изменению файлов.
+
+* Linux – inotify (через ctypes): наблюдаются каталоги файлов, события
+  читает фоновый поток; на кадр никакой работы, пока ничего не менялось.
+* Остальные ОС (или если inotify недоступен) – опрос `os.stat`, но не
+  всех файлов каждый кадр, а не более `poll_per_frame` по кругу.
+
+Изменения «успокаиваются» `debounce` секунд (редакторы пишут файл в
+несколько приёмов), затем `poll()` – раз в кадр, в главном потоке на
+границе кадров (до захвата снимка) – перезагружает изменённые ассеты и
+всех их зависимых по графу `add_dependency` (include → шейдер → PSO,
+текстура → материалы, меш → экземпляры). Вся пачка применяется внутри
+одного `poll()`, т.е. кадр видит либо старые, либо новые ресурсы;
+render‑поток получает только готовые GPU‑объекты через снимок. Меши
+разбираются в I/O‑потоке `AsyncLoader` и подменяются в его `pump`.
+Ошибка перезагрузки логируется, старый ресурс остаётся.
+
+Готовые связки: `watch_shader`, `watch_texture`, `watch_mesh`.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from alkash3d.renderer.shader_cache import shader_includes
+from alkash3d.utils.logger import logger
+
+# inotify(7)
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_IN_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Наблюдение за каталогами через inotify; события → `on_event(path)`."""
+
+    def __init__(self, on_event):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._libc = libc
+        self._fd = fd
+        self._on_event = on_event
+        self._dirs: dict[int, Path] = {}
+        self._watched: set[Path] = set()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="alkash3d-watch",
+                                        daemon=True)
+        self._thread.start()
+
+    def add_dir(self, directory: Path) -> None:
+        if directory in self._watched:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+        if wd < 0:
+            logger.warning(f"[AssetWatcher] inotify_add_watch failed for {directory}")
+            return
+        self._dirs[wd] = directory
+        self._watched.add(directory)
+
+    def _run(self) -> None:
+        while self._running:
+            ready, _, _ = select.select([self._fd], [], [], 0.25)
+            if not ready:
+                continue
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            pos = 0
+            while pos + _IN_EVENT.size <= len(data):
+                wd, _mask, _cookie, length = _IN_EVENT.unpack_from(data, pos)
+                name = data[pos + _IN_EVENT.size:pos + _IN_EVENT.size + length]
+                pos += _IN_EVENT.size + length
+                directory = self._dirs.get(wd)
+                if directory is not None and name:
+                    self._on_event(directory / os.fsdecode(name.rstrip(b"\0")))
+
+    def close(self) -> None:
+        self._running = False
+        self._thread.join()
+        os.close(self._fd)
+
+
+class AssetWatcher:
+    """Наблюдатель файлов + граф зависимостей для перезагрузки."""
+
+    def __init__(self, poll_per_frame: int = 64, debounce: float = 0.15,
+                 backend: str = "auto"):
+        self.poll_per_frame = max(1, int(poll_per_frame))
+        self.debounce = float(debounce)
+
+        self._files: dict[Path, tuple[int, int]] = {}     # путь → (mtime_ns, size)
+        self._poll_queue: deque[Path] = deque()
+        self._dependents: dict[object, set] = {}          # путь/ключ → зависимые
+        self._callbacks: dict[object, list] = {}          # ключ → перезагрузчики
+        self._pending: dict[Path, float] = {}             # путь → время события
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+        self._inotify = None
+        if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify(self._on_event)
+            except (OSError, AttributeError) as exc:
+                if backend == "inotify":
+                    raise
+                logger.info(f"[AssetWatcher] inotify unavailable ({exc}), polling")
+        self.backend = "inotify" if self._inotify else "poll"
+
+    # -----------------------------------------------------------------
+    #   Регистрация
+    # -----------------------------------------------------------------
+    def watch(self, path, callback=None) -> Path:
+        """Наблюдать файл; `callback(path)` – перезагрузчик самого файла."""
+        p = Path(path).expanduser().resolve()
+        with self._lock:
+            if p not in self._files:
+                self._files[p] = self._stat(p)
+                self._poll_queue.append(p)
+                if self._inotify is not None:
+                    self._inotify.add_dir(p.parent)
+        if callback is not None:
+            self.on_reload(p, callback)
+        return p
+
+    def add_dependency(self, path, dependent) -> None:
+        """При изменении `path` перезагрузить и `dependent` (путь или ключ)."""
+        p = self.watch(path)
+        if isinstance(dependent, (str, os.PathLike)):
+            dependent = Path(dependent).expanduser().resolve()
+        with self._lock:
+            self._dependents.setdefault(p, set()).add(dependent)
+
+    def on_reload(self, key, callback) -> None:
+        """`callback(key)` при перезагрузке `key` (путь или любой объект)."""
+        if isinstance(key, (str, os.PathLike)):
+            key = Path(key).expanduser().resolve()
+        with self._lock:
+            self._callbacks.setdefault(key, []).append(callback)
+
+    def unwatch(self, key) -> None:
+        """Забыть перезагрузчики и зависимости `key`."""
+        if isinstance(key, (str, os.PathLike)):
+            key = Path(key).expanduser().resolve()
+        with self._lock:
+            self._callbacks.pop(key, None)
+            for deps in self._dependents.values():
+                deps.discard(key)
+
+    # -----------------------------------------------------------------
+    #   Кадр
+    # -----------------------------------------------------------------
+    def poll(self) -> int:
+        """
+        На границе кадров: (при опросе) проверить очередную порцию
+        файлов, затем перезагрузить «успокоившиеся» изменения.
+        Возвращает число вызванных перезагрузчиков.
+        """
+        if self._inotify is None:
+            self._poll_some()
+
+        now = time.monotonic()
+        with self._lock:
+            ready = [p for p, t in self._pending.items() if now - t >= self.debounce]
+            changed = []
+            for p in ready:
+                del self._pending[p]
+                stat = self._stat(p)
+                if stat != self._files.get(p):          # отсечь «пустые» события
+                    self._files[p] = stat
+                    changed.append(p)
+        if not changed:
+            return 0
+        return self._reload(changed)
+
+    def _poll_some(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            count = min(self.poll_per_frame, len(self._poll_queue))
+            for _ in range(count):
+                p = self._poll_queue[0]
+                self._poll_queue.rotate(-1)
+                if p not in self._pending and self._stat(p) != self._files[p]:
+                    self._pending[p] = now
+
+    def _on_event(self, path: Path) -> None:
+        with self._lock:
+            if path in self._files:
+                self._pending[path] = time.monotonic()
+
+    def _reload(self, changed: list[Path]) -> int:
+        # Затронутые ключи в порядке обхода: сначала файлы, потом зависимые
+        order, seen = [], set()
+        queue = deque(changed)
+        with self._lock:
+            while queue:
+                key = queue.popleft()
+                if key in seen:
+                    continue
+                seen.add(key)
+                order.append(key)
+                queue.extend(self._dependents.get(key, ()))
+            jobs = [(key, list(self._callbacks.get(key, ()))) for key in order]
+
+        calls = 0
+        for key, callbacks in jobs:
+            for cb in callbacks:
+                try:
+                    cb(key)
+                    calls += 1
+                except Exception as exc:
+                    logger.error(f"[AssetWatcher] Reload of {key} failed: {exc}")
+        self.reloads += calls
+        logger.info(f"[AssetWatcher] Changed: {', '.join(p.name for p in changed)} "
+                    f"→ {calls} reload(s)")
+        return calls
+
+    @staticmethod
+    def _stat(p: Path) -> tuple[int, int]:
+        try:
+            st = p.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return 0, -1
+
+    def stop(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+# ---------------------------------------------------------------------
+#   Связки для типов ассетов
+# ---------------------------------------------------------------------
+def watch_shader(watcher: AssetWatcher, shader) -> None:
+    """Исходники и include‑ы шейдера → `shader.reload()` (новый PSO)."""
+    sources = [shader.vertex_path, shader.fragment_path]
+    for src in sources:
+        watcher.add_dependency(src, shader)
+        for inc in shader_includes(src):
+            watcher.add_dependency(inc, shader)
+    watcher.on_reload(shader, lambda _key: shader.reload())
+
+
+def watch_texture(watcher: AssetWatcher, manager, path) -> None:
+    """Текстура → `manager.reload(path)`; материалы подхватят новый ресурс."""
+    p = watcher.watch(path, lambda _key: manager.reload(p))
+    cooked = p.with_suffix(".atex")
+    if cooked != p:
+        watcher.add_dependency(cooked, p)
+
+
+def watch_mesh(watcher: AssetWatcher, loader, path, meshes, backend) -> None:
+    """
+    Файл меша → новая геометрия в экземплярах `meshes`.
+
+    `meshes` – {индекс или имя меша в файле: экземпляр или список};
+    простой список экземпляров сопоставляется с мешами файла по порядку
+    (как их отдаёт загрузка файла). Файл разбирает `loader`
+    (`AsyncLoader`), геометрия и GPU‑буферы подменяются в его `pump`.
+    """
+    from alkash3d.assets.async_loader import _iter_meshes
+
+    if not isinstance(meshes, dict):
+        meshes = dict(enumerate(meshes))
+    targets = {key: list(value) if isinstance(value, (list, tuple)) else [value]
+               for key, value in meshes.items()}
+    p = Path(path).expanduser().resolve()
+    current = [None]                            # последний запрос разбора
+
+    def apply(handle):
+        if handle is not current[0]:
+            return                              # файл успел смениться ещё раз
+        loader.forget(handle)
+        if not handle.is_ready():
+            return                              # ошибку залогировал loader
+        sources = list(_iter_meshes(handle.value))
+        by_name = {getattr(src, "name", None): src for src in sources}
+        for key, instances in targets.items():
+            if isinstance(key, str):
+                src = by_name.get(key)
+            else:
+                src = sources[key] if 0 <= key < len(sources) else None
+            if src is None:
+                logger.error(f"[AssetWatcher] {p.name}: no mesh {key!r}")
+                continue
+            for mesh in instances:
+                mesh.replace_geometry(src, backend)
+                mesh._setup_gpu_buffers(backend)
+
+    def reload(_key):
+        if current[0] is not None:
+            loader.forget(current[0])
+        current[0] = loader.request("mesh_data", p, on_ready=apply)
+
+    watcher.watch(p, reload)
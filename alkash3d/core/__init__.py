@@ -2,5 +2,8 @@
 Core‑подсистема (пока пустая).
 """
 from alkash3d.core.timer import Timer
+from alkash3d.core.frame_pacer import FramePacer
+from alkash3d.core.fixed_step import FixedTimestep
+from alkash3d.core.frame_pipeline import FramePipeline
 
-__all__ = ["Timer"]
+__all__ = ["Timer", "FramePacer", "FixedTimestep", "FramePipeline"]
@@ -0,0 +1,50 @@
+"""
+Фиксированный шаг симуляции (accumulator loop).
+
+Рендер идёт с любой частотой, а симуляция – строго тиками по
+`1 / sim_hz` секунд. Накопленное время, которого не хватило на тик,
+остаётся в аккумуляторе; `alpha` – доля следующего тика, используется
+для интерполяции трансформ при рендере.
+
+Защита от «спирали смерти»: за один кадр выполняется не больше
+`max_steps` тиков; лишнее время отбрасывается (симуляция замедляется,
+но кадр не становится ещё длиннее).
+"""
+
+
+class FixedTimestep:
+    """Аккумулятор времени → число тиков симуляции на кадр."""
+
+    def __init__(self, sim_hz: float = 60.0, max_steps: int = 5):
+        if sim_hz <= 0.0:
+            raise ValueError("sim_hz must be positive")
+        self.sim_hz = float(sim_hz)
+        self.step = 1.0 / self.sim_hz
+        self.max_steps = max(1, int(max_steps))
+
+        self._accumulator = 0.0
+        self.ticks = 0              # всего тиков с начала работы
+        self.dropped_time = 0.0     # отброшено секунд (перегрузка)
+
+    def advance(self, frame_dt: float) -> int:
+        """Добавить время кадра, вернуть число тиков для выполнения."""
+        self._accumulator += max(0.0, float(frame_dt))
+
+        steps = int(self._accumulator / self.step)
+        if steps > self.max_steps:
+            dropped = (steps - self.max_steps) * self.step
+            self.dropped_time += dropped
+            self._accumulator -= dropped
+            steps = self.max_steps
+
+        self._accumulator -= steps * self.step
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Доля [0, 1) между последним и следующим тиком."""
+        return min(1.0, self._accumulator / self.step)
+
+    def reset(self) -> None:
+        self._accumulator = 0.0
@@ -0,0 +1,152 @@
+"""
+Точный ограничитель FPS (frame pacer).
+
+`Window.set_vsync()` – заглушка, поэтому без ограничителя главный цикл
+крутится «на полную» и съедает целое ядро. `FramePacer` держит
+заданный FPS гибридным ожиданием:
+
+1️⃣  `time.sleep()` до (дедлайн − запас) – процесс отдаёт CPU;
+2️⃣  оставшийся «хвост» докручивается spin‑циклом по
+    `time.perf_counter_ns()` – для точности.
+
+Запас (slack) подстраивается под реально измеренный «пересып» ОС:
+если таймер планировщика систематически просыпается позже, запас
+растёт; если точный – уменьшается (меньше spin → меньше CPU).
+
+Дедлайны идут с шагом ровно в один период (без накопления дрейфа,
+как у `QTimer(16)`); если кадр опоздал больше чем на период, сетка
+дедлайнов сдвигается от текущего момента – без «догоняющих» рывков.
+"""
+
+import time
+
+_NS = 1_000_000_000
+
+
+class FramePacer:
+    """Гибридное sleep‑then‑spin ожидание до дедлайна кадра."""
+
+    def __init__(self, target_fps: float = 0.0,
+                 initial_slack_ms: float = 1.0,
+                 min_slack_ms: float = 0.2,
+                 max_slack_ms: float = 4.0,
+                 adapt_rate: float = 0.1):
+        self._min_slack_ns = int(min_slack_ms * 1e6)
+        self._max_slack_ns = int(max_slack_ms * 1e6)
+        self._slack_ns = int(initial_slack_ms * 1e6)
+        self._adapt_rate = float(adapt_rate)
+
+        self._period_ns = 0
+        self._deadline_ns: int | None = None
+        self.target_fps = target_fps
+
+        # Статистика (для отладки / UI)
+        self.last_oversleep_ns = 0
+        self.missed_deadlines = 0
+
+    # -----------------------------------------------------------------
+    #   Настройки
+    # -----------------------------------------------------------------
+    @property
+    def target_fps(self) -> float:
+        return _NS / self._period_ns if self._period_ns else 0.0
+
+    @target_fps.setter
+    def target_fps(self, fps: float) -> None:
+        """0 (или меньше) – без ограничения."""
+        fps = float(fps or 0.0)
+        self._period_ns = int(_NS / fps) if fps > 0.0 else 0
+        self._deadline_ns = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._period_ns > 0
+
+    @property
+    def period_ns(self) -> int:
+        return self._period_ns
+
+    @property
+    def slack_ns(self) -> int:
+        """Текущий запас перед дедлайном, который докручивается spin‑ом."""
+        return self._slack_ns
+
+    # -----------------------------------------------------------------
+    #   API дедлайнов
+    # -----------------------------------------------------------------
+    def begin_frame(self) -> int | None:
+        """Гарантировать, что дедлайн текущего кадра назначен; вернуть его."""
+        if not self._period_ns:
+            return None
+        if self._deadline_ns is None:
+            self._deadline_ns = time.perf_counter_ns() + self._period_ns
+        return self._deadline_ns
+
+    @property
+    def deadline_ns(self) -> int | None:
+        """Момент (perf_counter_ns), к которому должен закончиться кадр."""
+        return self._deadline_ns
+
+    def remaining_ns(self) -> int:
+        """Сколько осталось до дедлайна (0, если дедлайна нет/он прошёл)."""
+        if self._deadline_ns is None:
+            return 0
+        return max(0, self._deadline_ns - time.perf_counter_ns())
+
+    def remaining_s(self) -> float:
+        return self.remaining_ns() / _NS
+
+    def sleep_budget_ms(self) -> int:
+        """
+        Сколько миллисекунд можно безопасно «проспать» во внешнем
+        event‑loop‑е (Qt‑таймер и т.п.), не рискуя пропустить дедлайн.
+        Остаток докрутит `wait()`.
+        """
+        return max(0, (self.remaining_ns() - self._slack_ns) // 1_000_000)
+
+    # -----------------------------------------------------------------
+    #   Ожидание
+    # -----------------------------------------------------------------
+    def wait(self) -> float:
+        """
+        Подождать до дедлайна и назначить следующий.
+        Возвращает время ожидания в секундах.
+        """
+        if not self._period_ns:
+            return 0.0
+
+        start = time.perf_counter_ns()
+        deadline = self.begin_frame()
+
+        remaining = deadline - start
+        if remaining > self._slack_ns:
+            requested = remaining - self._slack_ns
+            time.sleep(requested / _NS)
+            actual = time.perf_counter_ns() - start
+            self._adapt_slack(actual - requested)
+
+        # Spin‑хвост: точность до единиц микросекунд
+        now = time.perf_counter_ns()
+        while now < deadline:
+            now = time.perf_counter_ns()
+
+        # Следующий дедлайн – ровно через период (без дрейфа).
+        # Если опоздали больше чем на период – перестраиваем сетку.
+        next_deadline = deadline + self._period_ns
+        if now - deadline > self._period_ns:
+            self.missed_deadlines += 1
+            next_deadline = now + self._period_ns
+        self._deadline_ns = next_deadline
+
+        return (now - start) / _NS
+
+    def _adapt_slack(self, oversleep_ns: int) -> None:
+        """
+        EMA пересыпа ОС‑таймера → запас с коэффициентом 1.5.
+        Рост – быстрый (иначе пропускаем дедлайны), спад – медленный.
+        """
+        self.last_oversleep_ns = max(0, oversleep_ns)
+        target = int(self.last_oversleep_ns * 1.5)
+        rate = 0.5 if target > self._slack_ns else self._adapt_rate
+        slack = self._slack_ns + (target - self._slack_ns) * rate
+        self._slack_ns = int(min(self._max_slack_ns, max(self._min_slack_ns, slack)))
@@ -0,0 +1,112 @@
+"""
+Конвейер update → render на двух потоках.
+
+Главный поток симулирует кадр N+1, пока render‑поток записывает и
+отправляет на GPU кадр N. Общих изменяемых данных у потоков нет:
+update‑стадия упаковывает кадр в `RenderSnapshot`, render‑поток читает
+только его (`renderer.render_snapshot(snap)`).
+
+Снимков два (double buffering):
+
+1️⃣  `acquire()` – взять свободный снимок (блокирует, если render‑поток
+    отстал на два кадра – естественный back‑pressure);
+2️⃣  `snap.capture(...)` – заполнить его в главном потоке;
+3️⃣  `submit(snap)` – отдать render‑потоку; после отрисовки снимок
+    возвращается в пул свободных.
+
+Исключение из render‑потока пробрасывается в главный при следующем
+`acquire()` / `submit()` / `flush()`.
+
+Снимок содержит всё, что нужно каждому draw (матрицы, GPU‑буферы,
+SRV, константы материала), поэтому узлы, материалы и загрузка ассетов
+(`AsyncLoader.pump`, горячая перезагрузка) остаются в главном потоке –
+между `acquire()` и `capture`.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+
+from alkash3d.renderer.snapshot import RenderSnapshot
+from alkash3d.utils import logger
+
+_STOP = object()
+
+
+class FramePipeline:
+    """Render‑поток + пул из двух `RenderSnapshot`."""
+
+    def __init__(self, renderer, buffers: int = 2):
+        self.renderer = renderer
+        self.depth = max(2, int(buffers))     # снимков «в полёте» максимум
+        self._free: queue.Queue = queue.Queue()
+        for _ in range(self.depth):
+            self._free.put(RenderSnapshot())
+        self._pending: queue.Queue = queue.Queue(maxsize=1)
+
+        self._error: BaseException | None = None
+        self.frames_rendered = 0
+        self.last_render_s = 0.0
+
+        self._thread = threading.Thread(
+            target=self._run, name="alkash3d-render", daemon=True
+        )
+        self._thread.start()
+
+    # -----------------------------------------------------------------
+    #   API главного потока
+    # -----------------------------------------------------------------
+    def acquire(self) -> RenderSnapshot:
+        """Свободный снимок для заполнения."""
+        self._raise_pending_error()
+        while True:
+            try:
+                return self._free.get(timeout=0.1)
+            except queue.Empty:
+                self._raise_pending_error()
+
+    def submit(self, snap: RenderSnapshot) -> None:
+        """Отдать заполненный снимок render‑потоку."""
+        self._raise_pending_error()
+        self._pending.put(snap)
+
+    def flush(self) -> None:
+        """Дождаться, пока все отправленные кадры будут отрисованы."""
+        self._pending.join()
+        self._raise_pending_error()
+
+    def stop(self) -> None:
+        """Дорисовать очередь и остановить render‑поток."""
+        if not self._thread.is_alive():
+            return
+        self._pending.put(_STOP)
+        self._thread.join()
+
+    # -----------------------------------------------------------------
+    #   Render‑поток
+    # -----------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            snap = self._pending.get()
+            try:
+                if snap is _STOP:
+                    return
+                if self._error is None:
+                    start = time.perf_counter()
+                    self.renderer.render_snapshot(snap)
+                    self.last_render_s = time.perf_counter() - start
+                    self.frames_rendered += 1
+            except BaseException as exc:  # пробросим в главный поток
+                logger.error(f"[FramePipeline] render thread failed: {exc}")
+                self._error = exc
+            finally:
+                if snap is not _STOP:
+                    self._free.put(snap)
+                self._pending.task_done()
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            exc, self._error = self._error, None
+            raise exc
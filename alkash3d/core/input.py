@@ -23,9 +23,11 @@ class InputManager:
         self.keys[key] = action != glfw.RELEASE
 
     def _mouse_move_cb(self, win, xpos, ypos):
-        dx = xpos - self.mouse["x"]
-        dy = ypos - self.mouse["y"]
-        self.mouse.update({"dx": dx, "dy": dy, "x": xpos, "y": ypos})
+        # Дельты копятся до get_mouse_delta(): при фиксированном шаге
+        # симуляции между тиками может пройти несколько событий/кадров.
+        self.mouse["dx"] += xpos - self.mouse["x"]
+        self.mouse["dy"] += ypos - self.mouse["y"]
+        self.mouse.update({"x": xpos, "y": ypos})
 
     def _mouse_scroll_cb(self, win, xoff, yoff):
         self.scroll["dx"] += xoff
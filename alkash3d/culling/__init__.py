@@ -3,6 +3,7 @@
 """
 
 from alkash3d.culling.bvh import BVH
+from alkash3d.culling.frustum import Frustum
 from alkash3d.culling.octree import Octree
 
-__all__ = ["BVH", "Octree"]
+__all__ = ["BVH", "Frustum", "Octree"]
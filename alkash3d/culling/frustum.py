@@ -0,0 +1,59 @@
+"""
+Frustum камеры: 6 плоскостей из view‑projection матрицы
+(Gribb–Hartmann) и пакетная проверка сфер.
+
+`cull_spheres(centres, radii, jobs)` – одна NumPy‑проверка на весь
+массив; с `JobSystem` массив режется `parallel_for` на чанки (NumPy
+отпускает GIL, так что чанки идут на воркерах параллельно).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+CULL_CHUNK = 1024               # сфер на задачу parallel_for
+
+
+class Frustum:
+    """Плоскости `planes` (6, 4): `n·x + d ≥ 0` – внутри."""
+
+    def __init__(self, planes: np.ndarray):
+        planes = np.asarray(planes, dtype=np.float32).reshape(6, 4)
+        length = np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+        self.planes = planes / np.maximum(length, 1e-30)
+
+    @classmethod
+    def from_matrices(cls, view_gl: np.ndarray, proj_gl: np.ndarray) -> "Frustum":
+        """Из view / proj в раскладке `to_gl` (транспонированные), clip z ∈ [-w, w]."""
+        m = np.asarray(proj_gl, dtype=np.float64).T @ np.asarray(view_gl, dtype=np.float64).T
+        r0, r1, r2, r3 = m
+        return cls(np.stack([r3 + r0, r3 - r0, r3 + r1, r3 - r1, r3 + r2, r3 - r2]))
+
+    # -----------------------------------------------------------------
+    def intersects_sphere(self, centre, radius) -> bool:
+        d = self.planes[:, :3] @ np.asarray(centre, dtype=np.float32) + self.planes[:, 3]
+        return bool((d >= -radius).all())
+
+    def intersects_aabb(self, lo, hi) -> bool:
+        """AABB хоть частично внутри (проверка «положительной» вершины)."""
+        n = self.planes[:, :3]
+        p = np.where(n >= 0.0, hi, lo)
+        return bool(((n * p).sum(axis=1) + self.planes[:, 3] >= 0.0).all())
+
+    def cull_spheres(self, centres: np.ndarray, radii: np.ndarray,
+                     jobs=None, min_chunk: int = CULL_CHUNK) -> np.ndarray:
+        """Маска видимых сфер; `jobs` – `JobSystem` для больших массивов."""
+        centres = np.asarray(centres, dtype=np.float32).reshape(-1, 3)
+        radii = np.asarray(radii, dtype=np.float32).reshape(-1)
+        visible = np.empty(len(radii), dtype=bool)
+        n, d = self.planes[:, :3].T, self.planes[:, 3]
+
+        def run(start, end):
+            dist = centres[start:end] @ n + d
+            visible[start:end] = (dist >= -radii[start:end, None]).all(axis=1)
+
+        if jobs is None or len(radii) < 2 * min_chunk:
+            run(0, len(radii))
+        else:
+            jobs.parallel_for(len(radii), run, min_chunk=min_chunk, name="cull")
+        return visible
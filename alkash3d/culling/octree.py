@@ -1,5 +1,9 @@
 """
 Простая Octree‑структура для ускорения frustum‑culling.
+
+`query` отбрасывает узлы дерева по AABB, а сферы объектов оставшихся
+узлов проверяет одним пакетом (`Frustum.cull_spheres`, с `JobSystem` –
+параллельно). Сферы кэшируются в `rebuild`.
 """
 
 from __future__ import annotations
@@ -91,34 +95,25 @@ class OctreeNode:
             self.children.append(child)
 
     def _intersects_frustum(self, frustum) -> bool:
-        if frustum is None:
+        if frustum is None or not hasattr(frustum, "intersects_aabb"):
             return True
+        return frustum.intersects_aabb(*self.bounds)
 
-        minb, maxb = self.bounds
-        for plane in frustum.planes:
-            p = np.where(plane.normal >= 0, maxb, minb)
-            if np.dot(plane.normal, p) + plane.distance < 0:
-                return False
-        return True
+    def collect(self, frustum, out: list) -> list:
+        """Объекты узлов, чей AABB пересекает frustum (без проверки сфер)."""
+        if not self._intersects_frustum(frustum):
+            return out
+        out.extend(self.objects)
+        for child in self.children:
+            child.collect(frustum, out)
+        return out
 
     def query(self, frustum) -> List[object]:
         """Возвратить все объекты, попадающие в frustum."""
-        result = []
-        if not self._intersects_frustum(frustum):
-            return result
-
+        result = self.collect(frustum, [])
         if frustum is None:
-            result.extend(self.objects)
-        else:
-            for obj in self.objects:
-                centre, radius = obj.bounding_sphere
-                if frustum.intersects_sphere(centre, radius):
-                    result.append(obj)
-
-        for child in self.children:
-            result.extend(child.query(frustum))
-
-        return result
+            return result
+        return [obj for obj in result if frustum.intersects_sphere(*obj.bounding_sphere)]
 
 class Octree:
     """Публичный API – создаём один объект Octree и работаем с ним."""
@@ -126,24 +121,61 @@ class Octree:
                  bounds: Tuple[Tuple[float, float, float], Tuple[float, float, float]],
                  max_depth: int = 6,
                  max_objects: int = 8):
+        # Заданные границы – минимальные; `rebuild` расширяет их под
+        # объекты (потоковый мир не ограничен заранее известным кубом).
+        self.bounds = (np.array(bounds[0], dtype=np.float32),
+                       np.array(bounds[1], dtype=np.float32))
         self.root = OctreeNode(bounds, depth=0,
                                max_depth=max_depth,
                                max_objects=max_objects)
+        self._spheres: dict[int, int] = {}         # id(obj) → строка массивов
+        self._centres = np.zeros((0, 3), dtype=np.float32)
+        self._radii = np.zeros(0, dtype=np.float32)
 
     def insert(self, obj) -> None:
         self.root.insert(obj)
 
     def clear(self) -> None:
         bounds = self.root.bounds
+        self._spheres = {}
         self.root = OctreeNode(bounds, depth=0,
                                max_depth=self.root.max_depth,
                                max_objects=self.root.max_objects)
 
     def rebuild(self, scene_root) -> None:
-        self.clear()
-        for node in scene_root.traverse():
-            if hasattr(node, "bounding_sphere"):
-                self.insert(node)
-
-    def query(self, frustum) -> List[object]:
-        return self.root.query(frustum)
\ No newline at end of file
+        objects = [n for n in scene_root.traverse() if hasattr(n, "bounding_sphere")]
+        spheres = [o.bounding_sphere for o in objects]
+        lo, hi = self.bounds
+        if spheres:
+            centres = np.array([c for c, _ in spheres], dtype=np.float32).reshape(-1, 3)
+            radii = np.array([r for _, r in spheres], dtype=np.float32)[:, None]
+            lo = np.minimum(lo, (centres - radii).min(axis=0))
+            hi = np.maximum(hi, (centres + radii).max(axis=0))
+        self.root = OctreeNode((lo, hi), depth=0,
+                               max_depth=self.root.max_depth,
+                               max_objects=self.root.max_objects)
+        for obj in objects:
+            self.root.insert(obj)
+        self._spheres = {id(o): i for i, o in enumerate(objects)}
+        if spheres:
+            self._centres, self._radii = centres, radii[:, 0]
+
+    def query(self, frustum, jobs=None) -> List[object]:
+        """
+        Объекты, попадающие в frustum. Сферы кандидатов проверяются
+        пакетом (`Frustum.cull_spheres`, `jobs` – параллельно).
+        """
+        if not hasattr(frustum, "cull_spheres"):
+            return self.root.query(frustum)
+        candidates = self.root.collect(frustum, [])
+        if not candidates:
+            return candidates
+        rows = [self._spheres.get(id(o), -1) for o in candidates]
+        if -1 in rows:              # вставлены мимо rebuild
+            spheres = [o.bounding_sphere for o in candidates]
+            centres = np.array([c for c, _ in spheres], dtype=np.float32).reshape(-1, 3)
+            radii = np.array([r for _, r in spheres], dtype=np.float32)
+        else:
+            centres, radii = self._centres[rows], self._radii[rows]
+        visible = frustum.cull_spheres(centres, radii, jobs)
+        return [o for o, v in zip(candidates, visible.tolist()) if v]
\ No newline at end of file
@@ -7,13 +7,43 @@
 * После создания бэкенда увеличивает размер RTV‑heap и сразу
   пересоздаёт RTV‑дескрипторы (иначе получаем чёрный кадр).
 * Включён V‑Sync, FPS‑counter и система плагинов.
+* `FramePacer` ограничивает FPS (`fps_cap`; при включённом V‑Sync и
+  `fps_cap == 0` – частота монитора), т.к. swap‑chain цикл не тормозит.
+* Симуляция идёт фиксированным шагом (`sim_hz`, не больше
+  `max_sim_steps` тиков за кадр), рендер – с частотой пейсера;
+  трансформы между тиками интерполируются.
+* `pipelined` – рендер кадра N идёт в отдельном потоке
+  (`FramePipeline`), пока главный поток симулирует кадр N+1; рендерер
+  читает только неизменяемый `RenderSnapshot`.
+* `JobSystem` (`job_workers`, 0 – по числу ядер) – общий пул задач
+  для подсистем (frustum‑culling рендера, декод текстур); все задачи
+  кадра дожидаются в конце update‑стадии.
+* `AsyncLoader` (`asset_io_workers`) – чтение/декодирование мешей в
+  I/O‑потоках, текстур – фоновыми задачами `JobSystem`; готовое грузится в GPU перед рендером в пределах
+  `upload_budget_mb` / `upload_budget_ms` за кадр, материалы до этого
+  рисуются с placeholder‑текстурой.
+* `TextureManager` (`texture_budget_mb`) – кэш текстур со счётчиком
+  ссылок; сверх бюджета вытесняет неиспользуемые текстуры (LRU).
+* До создания рендерера его `PIPELINES` (+ записанные в прошлой сессии,
+  `pipeline_record`) компилируются параллельно на `JobSystem`
+  (`pipeline_warmup`), так что первый кадр не ждёт компиляции.
+* LOD мешей выбирается рендерером по экранному размеру; `lod_bias`
+  (> 0 – грубее) – глобальный сдвиг уровней для слабых машин.
+* `FrameStats` собирает времена кадра (update / render / present) –
+  раз в секунду в лог пишутся перцентили, 1 % lows и число хитчей.
 """
 import time
 import glfw
 from alkash3d.core.timer import Timer
-from alkash3d.scene import Scene, Camera
-from alkash3d.utils import logger, Config, FPSCounter, Profiler
+from alkash3d.core.frame_pacer import FramePacer
+from alkash3d.core.fixed_step import FixedTimestep
+from alkash3d.core.frame_pipeline import FramePipeline
+from alkash3d.jobs import JobSystem
+from alkash3d.assets import AsyncLoader, TextureManager
+from alkash3d.scene import Scene, Camera, TransformInterpolator
+from alkash3d.utils import logger, Config, FPSCounter, FrameStats, Profiler
 from alkash3d.utils.logger import gl_check_error
+from alkash3d.utils.cache import cache_root
 from alkash3d.postproc import (
     PostProcessingPipeline,
     BloomPass,
@@ -27,6 +57,8 @@ from alkash3d.renderer.pipelines.forward import ForwardRenderer
 from alkash3d.renderer.pipelines.deferred import DeferredRenderer
 from alkash3d.renderer.pipelines.hybrid import HybridRenderer
 from alkash3d.renderer.pipelines.rtx_renderer import RTXRenderer
+from alkash3d.renderer.pipeline_registry import PipelineRegistry
+from alkash3d.renderer.shader_cache import ShaderCache
 from alkash3d.graphics import select_backend
 from alkash3d.graphics.gl_backend import GLBackend   # только для тип‑чеков
 from alkash3d.graphics.utils.descriptor_heap import DescriptorHeap   # NEW
@@ -92,18 +124,30 @@ class Engine:
         self.scene.add_child(self.camera)
 
         # ---------------------------------------------------------
-        # 4️⃣  Выбор рендера
+        # 4️⃣  Выбор рендера (пайплайны прогреваются заранее)
         # ---------------------------------------------------------
-        if renderer == "forward":
-            self.renderer = ForwardRenderer(self.window, self.backend)
-        elif renderer == "deferred":
-            self.renderer = DeferredRenderer(self.window, self.backend)
-        elif renderer == "hybrid":
-            self.renderer = HybridRenderer(self.window, self.backend)
-        elif renderer == "rtx":
-            self.renderer = RTXRenderer(self.window, self.backend)
-        else:
+        renderers = {
+            "forward": ForwardRenderer,
+            "deferred": DeferredRenderer,
+            "hybrid": HybridRenderer,
+            "rtx": RTXRenderer,
+        }
+        if renderer not in renderers:
             raise ValueError(f"Unknown renderer mode: {renderer}")
+        self.jobs = JobSystem(
+            num_workers=int(self.cfg.get("job_workers", 0)),
+            profile=bool(self.cfg.get("profile_jobs", False)),
+        )
+        self.pipelines = PipelineRegistry.shared(self.backend)
+        self._pipeline_log = cache_root("pipelines") / f"{renderer}.json"
+        if self.cfg.get("pipeline_warmup", True):
+            self._warm_up_pipelines(renderers[renderer])
+        self.renderer = renderers[renderer](self.window, self.backend)
+        if hasattr(self.renderer, "lod"):
+            self.renderer.lod.bias = float(self.cfg.get("lod_bias", 0.0))
+        if hasattr(self.renderer, "jobs"):
+            self.renderer.jobs = self.jobs
+        logger.info(ShaderCache.shared(self.backend).report())
 
         # ---------------------------------------------------------
         # 5️⃣  Пост‑процессинг (только для GL‑бэкенда)
@@ -136,21 +180,119 @@ class Engine:
             self.renderer.postproc = self.postprocess
 
         # ---------------------------------------------------------
-        # 7️⃣  V‑Sync, таймер, FPS‑counter
+        # 7️⃣  V‑Sync, таймер, FPS‑counter, статистика кадров
         # ---------------------------------------------------------
         glfw.set_framebuffer_size_callback(
             self.window.handle,
             lambda win, w, h: self._on_resize(w, h),
         )
+        self.pacer = FramePacer()
         self.set_vsync(bool(self.cfg.get("v_sync", True)))
 
         self.timer = Timer()
+        self.fixed_step = FixedTimestep(
+            sim_hz=float(self.cfg.get("sim_hz", 60)),
+            max_steps=int(self.cfg.get("max_sim_steps", 5)),
+        )
+        self.interpolator = TransformInterpolator()
+        self.interpolate = bool(self.cfg.get("interpolate", True))
         self.fps_counter = FPSCounter()
+        self.frame_stats = FrameStats(
+            capacity=int(self.cfg.get("frame_stats_capacity", 1024)),
+            hitch_factor=float(self.cfg.get("hitch_factor", 2.0)),
+        )
+        self.assets = AsyncLoader(
+            workers=int(self.cfg.get("asset_io_workers", 2)),
+            budget_bytes=int(float(self.cfg.get("upload_budget_mb", 16)) * 1024 * 1024),
+            budget_ms=float(self.cfg.get("upload_budget_ms", 2.0)),
+            jobs=self.jobs,
+        )
+        self.textures = TextureManager(
+            backend=self.backend,
+            budget_bytes=int(float(self.cfg.get("texture_budget_mb", 512)) * 1024 * 1024),
+            loader=self.assets,
+        )
+        TextureManager.set_shared(self.textures)
+        self.streaming = None               # см. enable_streaming()
+        self.watcher = None
+        if self.cfg.get("hot_reload", False):
+            self._enable_hot_reload()
         self._last_fps_print = time.time()
         self.show_fps = bool(self.cfg.get("show_fps", True))
         self._key_state = {}
         self._editor = None
 
+        # ---------------------------------------------------------
+        # 8️⃣  Конвейер update/render (только для рендеров со снимками;
+        #     GL‑контекст привязан к потоку, поэтому без post‑proc)
+        # ---------------------------------------------------------
+        self.pipeline = None
+        if (self.cfg.get("pipelined", False)
+                and hasattr(self.renderer, "render_snapshot")
+                and self.postprocess is None):
+            self.pipeline = FramePipeline(self.renderer)
+            logger.info("[Engine] Pipelined update/render ON")
+
+    # -----------------------------------------------------------------
+    def _warm_up_pipelines(self, renderer_cls):
+        """Объявленные + записанные пайплайны → ShaderCache (параллельно)."""
+        descs = list(getattr(renderer_cls, "PIPELINES", ()))
+        if self.cfg.get("pipeline_record", True):
+            descs += PipelineRegistry.load_recorded(self._pipeline_log)
+        last = [-1]
+
+        def progress(done, total, label):
+            pct = done * 100 // total
+            if pct // 25 != last[0] // 25 or done == total:
+                last[0] = pct
+                logger.info(f"[Engine] Loading pipelines {done}/{total} ({pct}%) – {label}")
+
+        self.pipelines.warm_up(descs, jobs=self.jobs, progress=progress)
+
+    # -----------------------------------------------------------------
+    def _enable_hot_reload(self):
+        """Наблюдать шейдеры рендера и все текстуры `TextureManager`."""
+        from alkash3d.assets.watcher import AssetWatcher, watch_shader
+        from alkash3d.renderer.shader import Shader
+        self.watcher = AssetWatcher(
+            poll_per_frame=int(self.cfg.get("hot_reload_poll_files", 64)),
+            debounce=float(self.cfg.get("hot_reload_debounce_ms", 150)) / 1000.0,
+        )
+        self.textures.watcher = self.watcher
+        for value in vars(self.renderer).values():
+            if isinstance(value, Shader):
+                watch_shader(self.watcher, value)
+        logger.info(f"[Engine] Hot reload ON ({self.watcher.backend})")
+
+    # -----------------------------------------------------------------
+    def enable_streaming(self, world, **kwargs):
+        """
+        Подгружать мир по ячейкам вокруг камеры (`world` – каталог с
+        `world.json`, см. `alkash3d.scene.streaming`). Радиусы и бюджеты
+        берутся из конфига, `kwargs` их переопределяют.
+        """
+        from alkash3d.scene.streaming import StreamingManager
+        mb = 1024 * 1024
+        load_radius = float(self.cfg.get("stream_load_radius", 128.0))
+        params = {
+            "load_radius": load_radius,
+            "unload_radius": float(self.cfg.get("stream_unload_radius",
+                                                load_radius * 1.25)),
+            "budget_bytes": int(float(self.cfg.get("stream_budget_mb", 512)) * mb),
+            "io_budget_bytes": int(float(self.cfg.get("stream_io_mb_per_frame", 8)) * mb),
+            # Выгруженные ячейки могут рисоваться ещё из снимков «в полёте»
+            "retire_frames": self.pipeline.depth if self.pipeline else 0,
+        }
+        params.update(kwargs)
+        if self.streaming:
+            if self.pipeline:
+                self.pipeline.flush()
+            self.streaming.unload_all()
+        self.streaming = StreamingManager(self.scene, self.assets, world,
+                                          backend=self.backend, **params)
+        logger.info(f"[Engine] World streaming ON ({len(self.streaming.cells)} cells)")
+        return self.streaming
+
     # -----------------------------------------------------------------
     def _create_window(self, w: int, h: int, title: str):
         from alkash3d.window import Window
@@ -158,6 +300,8 @@ class Engine:
 
     # -----------------------------------------------------------------
     def _on_resize(self, w: int, h: int):
+        if self.pipeline:
+            self.pipeline.flush()
         self.window.width, self.window.height = w, h
         self.backend.resize(w, h)
         self.renderer.resize(w, h)
@@ -170,41 +314,134 @@ class Engine:
         self.window.set_vsync(enable)
         self.cfg["v_sync"] = enable
         logger.info(f"[Engine] V‑Sync {'ON' if enable else 'OFF'}")
+        self._apply_frame_cap()
+
+    # -----------------------------------------------------------------
+    def set_fps_cap(self, fps: float):
+        """Ограничить FPS (0 – без ограничения) и сохранить в конфиге."""
+        self.cfg["fps_cap"] = fps
+        self._apply_frame_cap()
+
+    # -----------------------------------------------------------------
+    def _apply_frame_cap(self):
+        """
+        Swap‑chain не троттлит цикл, поэтому V‑Sync эмулируется
+        пейсером с частотой монитора (если явный `fps_cap` не задан).
+        """
+        cap = float(self.cfg.get("fps_cap", 0) or 0)
+        if cap <= 0 and self.cfg.get("v_sync", True):
+            cap = self.window.get_refresh_rate()
+        self.pacer.target_fps = cap
+        logger.info(
+            f"[Engine] Frame cap: {f'{cap:.0f} FPS' if cap > 0 else 'off'}"
+        )
 
     # -----------------------------------------------------------------
     def run(self):
         """Главный игровой цикл."""
         logger.info("[Engine] Engine started")
+        stats = self.frame_stats
         while not self.window.should_close():
+            stats.begin_frame()
+            self.pacer.begin_frame()
             dt = self.timer.tick()
-            self.window.poll_events()
-            self.camera.update_fly(dt, self.window.input)
 
-            # F9 – FPS‑display, F10 – V‑Sync
-            self._handle_toggle_key(glfw.KEY_F9, "show_fps", "FPS display")
-            self._handle_toggle_key(glfw.KEY_F10, "v_sync", "V‑Sync")
+            with stats.stage("update"):
+                self.window.poll_events()
+
+                # F9 – FPS‑display, F10 – V‑Sync
+                self._handle_toggle_key(glfw.KEY_F9, "show_fps", "FPS display")
+                self._handle_toggle_key(glfw.KEY_F10, "v_sync", "V‑Sync")
+
+                steps = self.fixed_step.advance(dt)
+                for _ in range(steps):
+                    self._simulate(self.fixed_step.step)
+                if steps and self.interpolate:
+                    self.interpolator.capture_current(self.scene)
 
-            if self._editor:
-                self._editor.update(dt)
+                if self.streaming:
+                    self.streaming.update(self.camera.position)
 
-            self.scene.update(dt)
+                # Барьер кадра: задачи подсистем, поставленные в update
+                self.jobs.wait_frame()
 
             # Render + (если у рендера нет собственного post‑proc)
-            self.renderer.render(self.scene, self.camera)
+            with stats.stage("render"):
+                if self.pipeline:
+                    self._submit_frame()
+                else:
+                    self._render_frame()
 
-            if not hasattr(self.renderer, "postproc") and self.postprocess:
-                self.postprocess.run(self.backend)
+            with stats.stage("present"):
+                self.window.swap_buffers()
 
-            self.window.swap_buffers()
+            stats.end_frame()
+            self.pacer.wait()
 
             if self.show_fps:
                 now = time.time()
                 if now - self._last_fps_print >= 1.0:
-                    logger.info(f"[Engine] FPS: {self.timer.fps:.2f}")
+                    logger.info(f"[Engine] {stats.format_summary()}")
                     self._last_fps_print = now
 
         self.shutdown()
 
+    # -----------------------------------------------------------------
+    def _pump_assets(self):
+        """
+        Граница кадров в главном потоке: горячая перезагрузка изменённых
+        файлов, затем загрузка в GPU готовых ассетов. В конвейерном
+        режиме – после `acquire()`: снимки в полёте держат свои буферы
+        и SRV, узлы render‑поток не читает.
+        """
+        if self.watcher:
+            self.watcher.poll()
+        self.assets.pump(self.backend)
+
+    # -----------------------------------------------------------------
+    def _render_frame(self):
+        """Последовательный режим: рендер в главном потоке."""
+        self._pump_assets()
+        if self.interpolate:
+            self.interpolator.apply(self.fixed_step.alpha)
+        try:
+            self.renderer.render(self.scene, self.camera)
+
+            if not hasattr(self.renderer, "postproc") and self.postprocess:
+                self.postprocess.run(self.backend)
+        finally:
+            self.interpolator.restore()
+
+    # -----------------------------------------------------------------
+    def _submit_frame(self):
+        """
+        Конвейерный режим: упаковать кадр в свободный снимок и отдать
+        render‑потоку. Сам рендер идёт параллельно следующему update.
+        """
+        snap = self.pipeline.acquire()
+        self._pump_assets()
+        if self.interpolate:
+            self.interpolator.apply(self.fixed_step.alpha)
+        try:
+            self.renderer.capture_snapshot(snap, self.scene, self.camera)
+            snap.frame = self.frame_stats.count
+        finally:
+            self.interpolator.restore()
+        self.pipeline.submit(snap)
+
+    # -----------------------------------------------------------------
+    def _simulate(self, step: float):
+        """Один тик симуляции фиксированной длины `step`."""
+        if self.interpolate:
+            self.interpolator.capture_previous(self.scene)
+
+        self.camera.update_fly(step, self.window.input)
+
+        if self._editor:
+            self._editor.update(step)
+
+        self.scene.update(step)
+
     # -----------------------------------------------------------------
     def _handle_toggle_key(self, glfw_key, cfg_name, description):
         im = self.window.input
@@ -229,6 +466,8 @@ class Engine:
     def shutdown(self):
         """Освободить ресурсы и закрыть окно."""
         logger.info("[Engine] Shutting down")
+        if self.pipeline:
+            self.pipeline.stop()
         self.window.close()
 
         if self.postprocess:
@@ -237,5 +476,20 @@ class Engine:
         if hasattr(self.renderer, "cleanup"):
             self.renderer.cleanup()
 
+        if self.streaming:
+            self.streaming.unload_all()
+        if self.watcher:
+            self.watcher.stop()
+        if self.cfg.get("pipeline_record", True):
+            try:
+                n = self.pipelines.save_recorded(self._pipeline_log)
+                logger.info(f"[Engine] Recorded {n} pipeline(s) for next warm-up")
+            except OSError as exc:
+                logger.warning(f"[Engine] Cannot save pipeline list: {exc}")
+        self.jobs.shutdown()
+        self.assets.shutdown()
+        self.textures.clear()
+        TextureManager.set_shared(None)
+
         if hasattr(self.backend, "shutdown"):
             self.backend.shutdown()
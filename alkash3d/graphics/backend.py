@@ -9,6 +9,22 @@ from typing import Any, Sequence, Tuple, Optional
 class GraphicsBackend(ABC):
     """Base interface for graphics backends."""
 
+    #: Backend accepts 16‑bit index buffers and the extended
+    #: `set_vertex_buffers(..., stride, vertex_bytes, index_bytes, index_format)`.
+    supports_index16: bool = False
+
+    #: Backend can create textures with a mip chain and BC1/BC3 formats
+    #: (`create_texture_mips`).
+    supports_texture_mips: bool = False
+    #: Backend can compile with defines and round-trip shader bytecode
+    #: (`compile_shader(..., defines)`, `shader_blob_bytes`,
+    #: `create_shader_blob`) – needed by the on-disk shader cache.
+    supports_shader_blobs: bool = False
+    #: Backend can create PSOs for the compact vertex layouts
+    #: (`create_graphics_ps(..., vertex_format)`, see
+    #: `alkash3d.mesh.vertex_format`).
+    supports_vertex_formats: bool = False
+
     @abstractmethod
     def init_device(self, hwnd: int, width: int, height: int) -> None:
         pass
@@ -22,11 +38,12 @@ class GraphicsBackend(ABC):
         pass
 
     @abstractmethod
-    def compile_shader(self, stage: str, source_path: str) -> Any:
+    def compile_shader(self, stage: str, source_path: str,
+                       defines: dict | None = None) -> Any:
         pass
 
     @abstractmethod
-    def create_graphics_ps(self, vs_blob: Any, ps_blob: Any) -> Any:
+    def create_graphics_ps(self, vs_blob: Any, ps_blob: Any, vertex_format: int = 0) -> Any:
         pass
 
     @abstractmethod
@@ -165,6 +182,13 @@ class GraphicsBackend(ABC):
     def release_resource(self, resource: Any) -> None:
         pass
 
+    def defer_release(self, resource: Any) -> None:
+        """
+        Освободить ресурс, когда GPU гарантированно перестал его
+        использовать. По‑умолчанию – сразу (`release_resource`).
+        """
+        self.release_resource(resource)
+
     @abstractmethod
     def enable_depth_test(self, enable: bool) -> None:
         pass
@@ -12,6 +12,8 @@ from __future__ import annotations
 
 import ctypes
 import os
+import threading
+from collections import deque
 from typing import Any, Sequence, Tuple, Optional
 
 from alkash3d.graphics.backend import GraphicsBackend
@@ -19,13 +21,21 @@ from alkash3d.graphics.utils import d3d12_wrapper as dx
 from alkash3d.graphics.utils.descriptor_heap import DescriptorHeap
 from alkash3d.utils.logger import logger
 
+# Заглушки, которые возвращаются при ошибке компиляции / создания PSO
+STUB_SHADER = 0x12345678
+STUB_PSO = 0x87654321
+
+# Стадия → (точка входа, профиль)
+SHADER_STAGES = {"vs": ("VSMain", "vs_5_0"), "ps": ("PSMain", "ps_5_0")}
+
 class DX12Texture:
     """Обёртка над ID3D12Resource*."""
-    __slots__ = ("ptr", "_srv_gpu")
+    __slots__ = ("ptr", "_srv_gpu", "_srv_index")
 
     def __init__(self, ptr: ctypes.c_void_p):
         self.ptr = ptr
         self._srv_gpu = None
+        self._srv_index = None
 
 class DX12Backend(GraphicsBackend):
     """DirectX 12‑бэкенд с автоматическим переходом в stub‑режим."""
@@ -46,6 +56,11 @@ class DX12Backend(GraphicsBackend):
         self._depth_test_enabled: bool = False
         self._in_stub_mode: bool = False
 
+        # Отложенное освобождение: (кадр, после которого можно, ресурс)
+        self._frame_number: int = 0
+        self._retired: deque = deque()
+        self._retired_lock = threading.Lock()
+
         self._hwnd: int = 0
         self._width: int = 0
         self._height: int = 0
@@ -190,45 +205,75 @@ class DX12Backend(GraphicsBackend):
     # -----------------------------------------------------------------
     #   Shaders
     # -----------------------------------------------------------------
-    def compile_shader(self, shader_type: str, source_path: str) -> int:
+    def compile_shader(self, shader_type: str, source_path: str,
+                       defines: dict | None = None) -> int:
         if self._in_stub_mode:
             logger.debug(f"[DX12Backend] Stub shader for {source_path}")
-            return 0x12345678
+            return STUB_SHADER
 
-        entry = "VSMain" if shader_type == "vs" else "PSMain"
-        profile = "vs_5_0" if shader_type == "vs" else "ps_5_0"
+        entry, profile = SHADER_STAGES.get(shader_type, SHADER_STAGES["ps"])
 
         if not os.path.exists(source_path):
             logger.warning(f"[DX12Backend] Shader file not found: {source_path}")
-            return 0x12345678
+            return STUB_SHADER
 
         try:
-            result = dx.compile_hlsl(source_path, entry, profile)
+            if dx.has_shader_blobs():
+                result = dx.compile_hlsl_ex(source_path, entry, profile, defines)
+            else:
+                if defines:
+                    logger.warning("[DX12Backend] Native library ignores shader defines")
+                result = dx.compile_hlsl(source_path, entry, profile)
             logger.debug(f"[DX12Backend] Shader compiled ({shader_type}) – {hex(result)}")
             return result
         except Exception as e:
             logger.error(f"[DX12Backend] Shader compilation error: {e}")
-            return 0x12345678
-
-    def create_graphics_ps(self, vs_blob: int, ps_blob: int) -> int:
-        if vs_blob == 0x12345678 or ps_blob == 0x12345678:
+            return STUB_SHADER
+
+    @property
+    def supports_shader_blobs(self) -> bool:
+        """DLL отдаёт/принимает байткод (`blob_bytes` / `create_blob`)."""
+        return not self._in_stub_mode and dx.has_shader_blobs()
+
+    def shader_blob_bytes(self, blob: int) -> bytes:
+        """Байткод скомпилированного шейдера."""
+        if blob == STUB_SHADER or not self.supports_shader_blobs:
+            return b""
+        return dx.blob_bytes(blob)
+
+    def create_shader_blob(self, data: bytes) -> int:
+        """Blob из байткода дискового кэша (0 – не удалось)."""
+        if not self.supports_shader_blobs:
+            return 0
+        return dx.create_blob(data)
+
+    @property
+    def supports_vertex_formats(self) -> bool:
+        """DLL создаёт PSO с компактными input layout‑ами."""
+        return not self._in_stub_mode and dx.has_vertex_formats()
+
+    def create_graphics_ps(self, vs_blob: int, ps_blob: int, vertex_format: int = 0) -> int:
+        if vs_blob == STUB_SHADER or ps_blob == STUB_SHADER:
             logger.warning("[DX12Backend] Using stub shaders – returning stub PSO")
-            return 0x87654321
+            return STUB_PSO
 
         try:
             vs_ptr = ctypes.c_void_p(vs_blob)
             ps_ptr = ctypes.c_void_p(ps_blob)
-            pso = dx.create_graphics_ps(self.device, vs_ptr, ps_ptr)
+            if vertex_format and self.supports_vertex_formats:
+                pso = dx.create_graphics_ps_ex(self.device, vs_ptr, ps_ptr, vertex_format)
+            else:
+                pso = dx.create_graphics_ps(self.device, vs_ptr, ps_ptr)
 
             if pso and hasattr(pso, "value") and pso.value:
                 logger.debug(f"[DX12Backend] PSO created: {hex(pso.value)}")
                 return pso.value
             else:
                 logger.error("[DX12Backend] PSO creation failed")
-                return 0x87654321
+                return STUB_PSO
         except Exception as e:
             logger.error(f"[DX12Backend] PSO creation exception: {e}")
-            return 0x87654321
+            return STUB_PSO
 
     def set_graphics_pipeline(self, pso: Any) -> None:
         if not self._in_stub_mode and pso and pso != 0xFEEDC0DE:
@@ -244,7 +289,8 @@ class DX12Backend(GraphicsBackend):
         if self._in_stub_mode or not self.device or not self.device.value:
             return ctypes.c_void_p(0xDEADBEEF)
 
-        buf = dx.create_buffer(self.device, len(data), usage)
+        size = data.nbytes if hasattr(data, "nbytes") else len(data)
+        buf = dx.create_buffer(self.device, size, usage)
         if not buf or not buf.value or buf.value == 0xDEADBEEF:
             return ctypes.c_void_p(0xDEADBEEF)
 
@@ -298,6 +344,7 @@ class DX12Backend(GraphicsBackend):
                 cpu_handle = self.cbv_srv_uav_heap.get_cpu_handle(idx)
                 self.create_shader_resource_view(tex, cpu_handle)
                 tex._srv_gpu = self.cbv_srv_uav_heap.get_gpu_handle(idx)
+                tex._srv_index = idx
             else:
                 tex._srv_gpu = 0xDEADDEAD
 
@@ -310,6 +357,47 @@ class DX12Backend(GraphicsBackend):
             tex._srv_gpu = 0xDEADDEAD
             return tex
 
+    @property
+    def supports_texture_mips(self) -> bool:
+        """DLL умеет mip‑цепочки и BC1/BC3 (`create_texture_mips`)."""
+        return not self._in_stub_mode and dx.has_texture_mips()
+
+    def create_texture_mips(self, levels, w: int, h: int,
+                            fmt: str = "RGBA8") -> DX12Texture:
+        """
+        Текстура из готовой mip‑цепочки: `levels[i]` – 2‑D uint8‑массив
+        (строки, байт в строке); для BC – строки блоков 4×4. Данные
+        пишутся без промежуточных копий (в т.ч. из `np.memmap`).
+        """
+        logger.debug(f"[DX12Backend] Creating texture {w}×{h} fmt={fmt} "
+                     f"mips={len(levels)}")
+
+        if not self.supports_texture_mips or not self.device or not self.device.value:
+            dummy = ctypes.c_void_p(0xDEADBEEF + w + h)
+            tex = DX12Texture(dummy)
+            tex._srv_gpu = 0xDEADDEAD
+            return tex
+
+        tex_ptr = dx.create_texture_mips(self.device, w, h, len(levels), fmt)
+        if not tex_ptr or not tex_ptr.value:
+            raise RuntimeError("Native texture creation returned nullptr")
+        tex = DX12Texture(tex_ptr)
+        for mip, level in enumerate(levels):
+            rows, pitch = level.shape[0], level.shape[1] * level.itemsize
+            dx.update_texture_mip(tex_ptr, mip, level, pitch, rows)
+
+        if self.cbv_srv_uav_heap:
+            idx = self.cbv_srv_uav_heap.next_free()
+            cpu_handle = self.cbv_srv_uav_heap.get_cpu_handle(idx)
+            self.create_shader_resource_view(tex, cpu_handle)
+            tex._srv_gpu = self.cbv_srv_uav_heap.get_gpu_handle(idx)
+            tex._srv_index = idx
+        else:
+            tex._srv_gpu = 0xDEADDEAD
+
+        self._resources.append(tex.ptr)
+        return tex
+
     # -----------------------------------------------------------------
     #   Descriptor heaps
     # -----------------------------------------------------------------
@@ -428,13 +516,29 @@ class DX12Backend(GraphicsBackend):
     # -----------------------------------------------------------------
     #   Vertex / Index buffers & draw calls
     # -----------------------------------------------------------------
+    @property
+    def supports_index16(self) -> bool:
+        """DLL умеет явный stride / размеры / 16‑битные индексы."""
+        return not self._in_stub_mode and dx.has_vertex_buffers_ex()
+
     def set_vertex_buffers(self,
         vertex_buffer: Any,
         index_buffer: Optional[Any] = None,
+        stride: int = 32,
+        vertex_bytes: int = 0,
+        index_bytes: int = 0,
+        index_format: str = "uint32",
     ) -> None:
         if not self._in_stub_mode:
             try:
-                dx.set_vertex_buffers(vertex_buffer, index_buffer)
+                if vertex_bytes and self.supports_index16:
+                    dx.set_vertex_buffers_ex(
+                        vertex_buffer, vertex_bytes, stride,
+                        index_buffer, index_bytes,
+                        16 if index_format == "uint16" else 32,
+                    )
+                else:
+                    dx.set_vertex_buffers(vertex_buffer, index_buffer)
             except Exception as e:
                 logger.debug(f"[DX12Backend] Set vertex buffers failed: {e}")
 
@@ -499,6 +603,41 @@ class DX12Backend(GraphicsBackend):
             except Exception as e:
                 logger.debug(f"[DX12Backend] Release resource failed: {e}")
 
+    def defer_release(self, resource: Any) -> None:
+        """
+        Поставить ресурс в очередь на освобождение: он может ещё
+        использоваться кадрами «в полёте», поэтому освобождается через
+        `SWAP_CHAIN_BUFFER_COUNT` кадров (в `end_frame`). SRV‑дескриптор
+        текстуры возвращается в heap. Потокобезопасно.
+        """
+        if not resource:
+            return
+        with self._retired_lock:
+            self._retired.append(
+                (self._frame_number + dx.SWAP_CHAIN_BUFFER_COUNT, resource)
+            )
+
+    def _collect_retired(self) -> None:
+        """Освободить ресурсы, чьи кадры GPU уже завершил."""
+        with self._retired_lock:
+            ready = []
+            while self._retired and self._retired[0][0] <= self._frame_number:
+                ready.append(self._retired.popleft()[1])
+        for resource in ready:
+            self._release_now(resource)
+
+    def _release_now(self, resource: Any) -> None:
+        srv_index = getattr(resource, "_srv_index", None)
+        if srv_index is not None and self.cbv_srv_uav_heap:
+            self.cbv_srv_uav_heap.free(srv_index)
+            resource._srv_index = None
+        ptr = getattr(resource, "ptr", resource)
+        try:
+            self._resources.remove(ptr)
+        except ValueError:
+            pass
+        self.release_resource(ptr)
+
     # -----------------------------------------------------------------
     #   Frame management
     # -----------------------------------------------------------------
@@ -516,10 +655,17 @@ class DX12Backend(GraphicsBackend):
         logger.debug("[DX12Backend] end_frame – presenting")
         self.present()
         self.wait_for_gpu()
+        self._frame_number += 1
+        self._collect_retired()
 
     def shutdown(self) -> None:
         """Освободить все нативные ресурсы."""
         logger.info("[DX12Backend] Releasing all native resources")
+        with self._retired_lock:
+            retired = [r for _, r in self._retired]
+            self._retired.clear()
+        for r in retired:
+            self._release_now(r)
         for r in self._resources:
             try:
                 self.release_resource(r)
@@ -22,10 +22,11 @@ class GLBackend(GraphicsBackend):
     def present(self) -> None:
         raise NotImplementedError()
 
-    def compile_shader(self, stage: str, source_path: str) -> Any:
+    def compile_shader(self, stage: str, source_path: str,
+                       defines: dict | None = None) -> Any:
         raise NotImplementedError()
 
-    def create_graphics_ps(self, vs_blob: Any, ps_blob: Any) -> Any:
+    def create_graphics_ps(self, vs_blob: Any, ps_blob: Any, vertex_format: int = 0) -> Any:
         raise NotImplementedError()
 
     def set_graphics_pipeline(self, pso: Any) -> None:
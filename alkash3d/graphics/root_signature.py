@@ -0,0 +1,28 @@
+"""
+Раскладка корневой подписи нативного бэкенда (Python‑зеркало
+`root_sig::create_graphics_root_signature` в `alkash3d_dx12/src/lib.rs`).
+
+Каждый корневой параметр – таблица дескрипторов; таблица – список
+диапазонов `(тип, первый регистр, число регистров)`. Индекс в
+`ROOT_SIGNATURE` – `root_index` для `set_root_descriptor_table`.
+Правка одной стороны без другой ловится `test_root_signature.py`.
+"""
+
+from __future__ import annotations
+
+ROOT_SIGNATURE = (
+    (("CBV", 0, 1), ("SRV", 0, 1)),     # 0 – кадр / LightCB + текстура t0
+    (("CBV", 3, 1),),                   # 1 – ClusterCB (light_clusters)
+)
+
+ROOT_FRAME = 0
+ROOT_CLUSTER_CB = 1
+
+
+def root_index_for(kind: str, register: int) -> int | None:
+    """Корневой параметр, таблица которого покрывает регистр (или None)."""
+    for index, table in enumerate(ROOT_SIGNATURE):
+        for range_kind, base, count in table:
+            if range_kind == kind and base <= register < base + count:
+                return index
+    return None
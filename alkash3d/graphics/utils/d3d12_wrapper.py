@@ -94,9 +94,29 @@ _compile_shader = _load_func(
     required=True,
 )
 
+_compile_shader_ex = _load_func(
+    "compile_shader_ex",
+    ctypes.c_int,
+    [ctypes.c_wchar_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p,
+     ctypes.POINTER(ctypes.c_void_p)],
+)
+_blob_size = _load_func("blob_size", ctypes.c_size_t, [ctypes.c_void_p])
+_blob_copy = _load_func(
+    "blob_copy", ctypes.c_size_t, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+)
+_create_blob = _load_func(
+    "create_blob", ctypes.c_int,
+    [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_void_p)],
+)
+
 _create_graphics_ps = _load_func(
     "create_graphics_ps", ctypes.c_void_p, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
 )
+# Необязательный экспорт: PSO с input layout формата вершин
+_create_graphics_ps_ex = _load_func(
+    "create_graphics_ps_ex", ctypes.c_void_p,
+    [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32],
+)
 _set_graphics_pipeline = _load_func("set_graphics_pipeline", None, [ctypes.c_void_p])
 
 _create_buffer = _load_func(
@@ -114,6 +134,16 @@ _create_texture_from_memory = _load_func(
 _update_texture = _load_func(
     "update_texture", None, [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint]
 )
+_create_texture_mips = _load_func(
+    "create_texture_mips",
+    ctypes.c_void_p,
+    [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint, ctypes.c_char_p],
+)
+_update_texture_mip = _load_func(
+    "update_texture_mip",
+    None,
+    [ctypes.c_void_p, ctypes.c_uint, ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint],
+)
 
 _create_descriptor_heap = _load_func(
     "create_descriptor_heap", ctypes.c_void_p, [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint]
@@ -162,6 +192,12 @@ _set_scissor_rect = _load_func(
 _set_vertex_buffers = _load_func(
     "set_vertex_buffers", None, [ctypes.c_void_p, ctypes.c_void_p]
 )
+_set_vertex_buffers_ex = _load_func(
+    "set_vertex_buffers_ex",
+    None,
+    [ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint,
+     ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint],
+)
 _draw_instanced = _load_func(
     "draw_instanced", None, [ctypes.c_uint, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint]
 )
@@ -255,6 +291,48 @@ def compile_hlsl(source_path: str, entry_point: str, profile: str) -> int:
 
     return out_blob.value
 
+def has_shader_blobs() -> bool:
+    """Умеет ли DLL макросы при компиляции и чтение/создание blob‑ов."""
+    return None not in (_compile_shader_ex, _blob_size, _blob_copy, _create_blob)
+
+def compile_hlsl_ex(source_path: str, entry_point: str, profile: str,
+                    defines: dict | None = None) -> int:
+    """`compile_hlsl` с макросами `defines` и стандартным `#include`."""
+    if not _compile_shader_ex:
+        raise RuntimeError("Shader compiler with defines not available")
+    if not os.path.isfile(source_path):
+        raise FileNotFoundError(f"Shader file not found: {source_path}")
+
+    packed = b"".join(f"{k}={v}".encode("utf-8") + b"\0"
+                      for k, v in (defines or {}).items()) + b"\0"
+    out_blob = ctypes.c_void_p()
+    hr = _compile_shader_ex(os.path.abspath(source_path),
+                            entry_point.encode("utf-8"), profile.encode("utf-8"),
+                            packed, ctypes.byref(out_blob))
+    if hr != 0:
+        raise RuntimeError(f"Shader compilation failed with HRESULT {hr}")
+    if not out_blob.value:
+        raise RuntimeError("Shader compilation returned null blob")
+    return out_blob.value
+
+def blob_bytes(blob: int) -> bytes:
+    """Байткод blob‑а (для дискового кэша)."""
+    if not _blob_size or not blob:
+        return b""
+    size = _blob_size(ctypes.c_void_p(blob))
+    buf = ctypes.create_string_buffer(size)
+    n = _blob_copy(ctypes.c_void_p(blob), buf, size)
+    return buf.raw[:n]
+
+def create_blob(data: bytes) -> int:
+    """Blob из готового байткода; 0 – не удалось."""
+    if not _create_blob or not data:
+        return 0
+    out_blob = ctypes.c_void_p()
+    if _create_blob(data, len(data), ctypes.byref(out_blob)) != 0:
+        return 0
+    return out_blob.value or 0
+
 def create_graphics_ps(
         device: ctypes.c_void_p,
         vs_blob: ctypes.c_void_p,
@@ -269,6 +347,23 @@ def create_graphics_ps(
         return ctypes.c_void_p(result) if result else ctypes.c_void_p(0xFEEDC0DE)
     return ctypes.c_void_p(0xFEEDC0DE)
 
+def has_vertex_formats() -> bool:
+    """Умеет ли DLL компактные форматы вершин (`create_graphics_ps_ex`)."""
+    return _create_graphics_ps_ex is not None
+
+def create_graphics_ps_ex(
+        device: ctypes.c_void_p,
+        vs_blob: ctypes.c_void_p,
+        ps_blob: ctypes.c_void_p,
+        vertex_format: int,
+) -> ctypes.c_void_p:
+    if not _create_graphics_ps_ex:
+        return create_graphics_ps(device, vs_blob, ps_blob)
+    if device and vs_blob and ps_blob and vs_blob.value and ps_blob.value:
+        result = _create_graphics_ps_ex(device, vs_blob, ps_blob, vertex_format)
+        return ctypes.c_void_p(result) if result else ctypes.c_void_p(0xFEEDC0DE)
+    return ctypes.c_void_p(0xFEEDC0DE)
+
 def set_graphics_pipeline(pso: ctypes.c_void_p) -> None:
     if _set_graphics_pipeline and pso:
         _set_graphics_pipeline(pso)
@@ -305,9 +400,16 @@ def update_subresource(buffer: Any, data: bytes) -> None:
         buffer_ptr = buffer
     if not buffer_ptr or not buffer_ptr.value:
         return
-    sz = len(data)
-    raw = ctypes.create_string_buffer(data, sz)
-    data_ptr = ctypes.c_void_p(ctypes.addressof(raw))
+    if hasattr(data, "ctypes"):
+        # NumPy‑массив (в т.ч. np.memmap) – без промежуточной копии
+        if not data.flags.c_contiguous:
+            data = data.copy(order="C")
+        sz = data.nbytes
+        data_ptr = ctypes.c_void_p(data.ctypes.data)
+    else:
+        sz = len(data)
+        raw = ctypes.create_string_buffer(data, sz)
+        data_ptr = ctypes.c_void_p(ctypes.addressof(raw))
     _update_subresource(buffer_ptr, data_ptr, ctypes.c_size_t(sz))
 
 def create_texture_from_memory(
@@ -350,7 +452,12 @@ def update_texture(texture: ctypes.c_void_p, data: Union[bytes, ctypes.c_void_p]
         return
     data_ptr = ctypes.c_void_p()
     if data is not None:
-        if isinstance(data, (bytes, bytearray)):
+        if hasattr(data, "ctypes"):
+            # NumPy‑массив пикселей – без промежуточной копии
+            if not data.flags.c_contiguous:
+                data = data.copy(order="C")
+            data_ptr = ctypes.c_void_p(data.ctypes.data)
+        elif isinstance(data, (bytes, bytearray)):
             raw = ctypes.create_string_buffer(data, len(data))
             data_ptr = ctypes.c_void_p(ctypes.addressof(raw))
         elif isinstance(data, ctypes.c_void_p):
@@ -467,6 +574,56 @@ def set_vertex_buffers(
         ib = index_buffer if index_buffer is not None else ctypes.c_void_p()
         _set_vertex_buffers(vertex_buffer, ib)
 
+def has_texture_mips() -> bool:
+    """Поддерживает ли DLL mip‑цепочки и BC1/BC3‑текстуры."""
+    return _create_texture_mips is not None and _update_texture_mip is not None
+
+def create_texture_mips(
+    device: ctypes.c_void_p,
+    width: int,
+    height: int,
+    mip_levels: int,
+    format: str = "rgba8",
+) -> ctypes.c_void_p:
+    if not _create_texture_mips or not device:
+        return ctypes.c_void_p(0xDEADBEEF + width + height)
+    result = _create_texture_mips(device, width, height, mip_levels,
+                                  format.lower().encode("utf-8"))
+    return ctypes.c_void_p(result) if result else ctypes.c_void_p()
+
+def update_texture_mip(texture: ctypes.c_void_p, mip: int, data,
+                       row_pitch: int, rows: int) -> None:
+    """Записать mip‑уровень; `data` – NumPy‑массив (без копии) или bytes."""
+    if not _update_texture_mip or not texture:
+        return
+    if hasattr(data, "ctypes"):
+        if not data.flags.c_contiguous:
+            data = data.copy(order="C")
+        data_ptr = ctypes.c_void_p(data.ctypes.data)
+    else:
+        raw = ctypes.create_string_buffer(bytes(data), len(data))
+        data_ptr = ctypes.c_void_p(ctypes.addressof(raw))
+    _update_texture_mip(texture, mip, data_ptr, row_pitch, rows)
+
+def has_vertex_buffers_ex() -> bool:
+    """Поддерживает ли DLL явный stride / 16‑битные индексы."""
+    return _set_vertex_buffers_ex is not None
+
+def set_vertex_buffers_ex(
+    vertex_buffer: ctypes.c_void_p,
+    vertex_bytes: int,
+    stride: int,
+    index_buffer: Optional[ctypes.c_void_p] = None,
+    index_bytes: int = 0,
+    index_bits: int = 32,
+) -> None:
+    if _set_vertex_buffers_ex:
+        ib = index_buffer if index_buffer is not None else ctypes.c_void_p()
+        _set_vertex_buffers_ex(vertex_buffer, vertex_bytes, stride,
+                               ib, index_bytes, index_bits)
+    else:
+        set_vertex_buffers(vertex_buffer, index_buffer)
+
 def draw_instanced(
     vertex_count: int,
     instance_count: int = 1,
@@ -548,12 +705,21 @@ __all__ = [
     "present_swap_chain",
     "compile_shader",
     "compile_hlsl",
+    "has_shader_blobs",
+    "compile_hlsl_ex",
+    "blob_bytes",
+    "create_blob",
     "create_graphics_ps",
+    "has_vertex_formats",
+    "create_graphics_ps_ex",
     "set_graphics_pipeline",
     "create_buffer",
     "update_subresource",
     "create_texture_from_memory",
     "update_texture",
+    "has_texture_mips",
+    "create_texture_mips",
+    "update_texture_mip",
     "create_descriptor_heap",
     "GetCPUDescriptorHandleForHeapStart",
     "GetGPUDescriptorHandleForHeapStart",
@@ -568,6 +734,8 @@ __all__ = [
     "set_viewport",
     "set_scissor_rect",
     "set_vertex_buffers",
+    "has_vertex_buffers_ex",
+    "set_vertex_buffers_ex",
     "draw_instanced",
     "draw_indexed_instanced",
     "wait_for_gpu",
@@ -3,6 +3,7 @@ Descriptor heap wrapper class.
 """
 
 import ctypes
+import threading
 from typing import Optional
 from . import d3d12_wrapper as dx
 
@@ -33,6 +34,9 @@ class DescriptorHeap:
         self.num_descriptors = num_descriptors
         self.heap_type = heap_type
         self._next_free = 0
+        self._free_list: list[int] = []
+        # SRV ассетов создаёт главный поток, CBV‑кольцо шейдера – render‑поток
+        self._lock = threading.Lock()
 
         heap_type_int = self._TYPE_MAP[heap_type]
         self._heap = dx.create_descriptor_heap(
@@ -66,11 +70,14 @@ class DescriptorHeap:
         return self._heap
 
     def next_free(self) -> int:
-        if self._next_free >= self.num_descriptors:
-            raise RuntimeError("Descriptor heap exhausted")
-        idx = self._next_free
-        self._next_free += 1
-        return idx
+        with self._lock:
+            if self._free_list:
+                return self._free_list.pop()
+            if self._next_free >= self.num_descriptors:
+                raise RuntimeError("Descriptor heap exhausted")
+            idx = self._next_free
+            self._next_free += 1
+            return idx
 
     def get_cpu_handle(self, index: int) -> int:
         if index < 0 or index >= self.num_descriptors:
@@ -86,5 +93,13 @@ class DescriptorHeap:
             raise ValueError(f"Index {index} out of range")
         return dx.offset_descriptor_handle(self.gpu_start, index)
 
+    def free(self, index: int) -> None:
+        """Вернуть дескриптор в heap (переиспользуется `next_free`)."""
+        with self._lock:
+            if 0 <= index < self._next_free and index not in self._free_list:
+                self._free_list.append(index)
+
     def reset(self) -> None:
-        self._next_free = 0
\ No newline at end of file
+        with self._lock:
+            self._next_free = 0
+            self._free_list.clear()
\ No newline at end of file
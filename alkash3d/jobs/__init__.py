@@ -0,0 +1,7 @@
+"""
+Job‑система: work‑stealing пул воркеров, parallel‑for, зависимости.
+"""
+
+from alkash3d.jobs.job_system import Job, JobCounter, JobSystem
+
+__all__ = ["Job", "JobCounter", "JobSystem"]
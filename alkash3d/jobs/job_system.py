@@ -0,0 +1,324 @@
+"""
+Job‑система движка: постоянный пул воркеров с work‑stealing.
+
+* У каждого воркера своя deque: владелец берёт задачи с «хвоста»
+  (LIFO – горячий кэш), остальные воруют с «головы» (FIFO).
+  Задачи из не‑воркерских потоков попадают в общую injection‑очередь.
+* `parallel_for(count, fn)` – разбиение диапазона индексов на чанки;
+  `fn(start, end)` получает полуинтервал.
+* Зависимости: `submit(fn, after=[job_a, job_b])` / `job.then(fn)` –
+  задача попадает в очередь, только когда все предшественники
+  завершились.
+* `JobCounter` – счётчик незавершённых задач; `wait()` не простаивает,
+  а выполняет задачи из очередей, пока счётчик не обнулится.
+  `frame_counter` считает все задачи текущего кадра (`wait_frame()`);
+  `submit(..., background=True)` – задача вне кадра (декод ассетов):
+  `wait_frame()` её не ждёт, и берут её только воркеры, когда других
+  задач нет (ожидающий поток не застрянет в долгом декоде).
+* `profile=True` – каждая задача оборачивается в `Profiler`.
+
+Потоки Python делят GIL, поэтому выигрыш дают задачи, которые
+проводят время в NumPy / ctypes / I/O (GIL отпущен): culling по
+массивам, скиннинг, частицы, тайлы трассировщика, декод текстур.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+from collections import deque
+
+from alkash3d.utils.logger import logger
+from alkash3d.utils.profiler import Profiler
+
+_tls = threading.local()
+
+
+# ---------------------------------------------------------------------
+#   Счётчик
+# ---------------------------------------------------------------------
+class JobCounter:
+    """Счётчик незавершённых задач + первая пойманная ошибка."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value = 0
+        self._error: BaseException | None = None
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def is_done(self) -> bool:
+        return self._value == 0
+
+    def increment(self, n: int = 1) -> None:
+        with self._cond:
+            self._value += n
+
+    def decrement(self, error: BaseException | None = None) -> None:
+        with self._cond:
+            self._value -= 1
+            if error is not None and self._error is None:
+                self._error = error
+            if self._value <= 0:
+                self._cond.notify_all()
+
+    def wait(self, jobs: "JobSystem | None" = None, timeout: float = 0.001) -> None:
+        """
+        Дождаться обнуления. Если передана `JobSystem`, ожидающий поток
+        сам выполняет задачи из очередей (не блокируя воркеров).
+        Пробрасывает первое исключение из задач этого счётчика.
+        """
+        while self._value > 0:
+            if jobs is not None and jobs.run_one():
+                continue
+            with self._cond:
+                if self._value > 0:
+                    self._cond.wait(timeout)
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+
+# ---------------------------------------------------------------------
+#   Задача
+# ---------------------------------------------------------------------
+class Job:
+    """Единица работы: `fn(*args)` + зависимости и счётчики."""
+
+    __slots__ = ("fn", "args", "name", "counters", "result", "exception",
+                 "done", "background", "_system", "_remaining", "_dependents")
+
+    def __init__(self, system: "JobSystem", fn, args, name, counters,
+                 background: bool = False):
+        self.fn = fn
+        self.args = args
+        self.name = name
+        self.counters = counters
+        self.result = None
+        self.exception: BaseException | None = None
+        self.done = False
+        self.background = background
+        self._system = system
+        self._remaining = 0          # незавершённые зависимости
+        self._dependents: list[Job] = []
+
+    def then(self, fn, *args, name: str | None = None,
+             counter: JobCounter | None = None) -> "Job":
+        """Продолжение: `fn` запустится после этой задачи."""
+        return self._system.submit(fn, *args, name=name, counter=counter, after=[self])
+
+
+# ---------------------------------------------------------------------
+#   Пул
+# ---------------------------------------------------------------------
+class JobSystem:
+    """Постоянный пул воркеров с work‑stealing‑очередями."""
+
+    def __init__(self, num_workers: int | None = None, profile: bool = False):
+        if not num_workers or num_workers <= 0:
+            num_workers = max(1, (os.cpu_count() or 2) - 1)
+        self.num_workers = int(num_workers)
+        self.profile = bool(profile)
+
+        self._queues = [deque() for _ in range(self.num_workers)]
+        self._inject: deque = deque()
+        self._background: deque = deque()     # только для воркеров
+        self._signal = threading.Semaphore(0)
+        self._dep_lock = threading.Lock()
+        self._running = True
+
+        self.frame_counter = JobCounter()
+        self.jobs_executed = 0
+        self.steals = 0
+
+        self._threads = [
+            threading.Thread(target=self._worker, args=(i,),
+                             name=f"alkash3d-job-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for t in self._threads:
+            t.start()
+        logger.info(f"[JobSystem] {self.num_workers} workers started")
+
+    # -----------------------------------------------------------------
+    #   Постановка задач
+    # -----------------------------------------------------------------
+    def submit(self, fn, *args, name: str | None = None,
+               counter: JobCounter | None = None,
+               after=None, background: bool = False) -> Job:
+        """
+        Поставить задачу; `after` – список задач‑предшественников,
+        `background` – не считать задачу в `frame_counter`.
+        """
+        if not self._running:
+            raise RuntimeError("JobSystem already shut down")
+
+        counters = () if background else (self.frame_counter,)
+        if counter is not None:
+            counters += (counter,)
+        for c in counters:
+            c.increment()
+        job = Job(self, fn, args, name, counters, background)
+
+        if after:
+            with self._dep_lock:
+                for dep in after:
+                    if not dep.done:
+                        dep._dependents.append(job)
+                        job._remaining += 1
+                ready = job._remaining == 0
+        else:
+            ready = True
+
+        if ready:
+            self._push(job)
+        return job
+
+    def parallel_for(self, count: int, fn, min_chunk: int = 64,
+                     counter: JobCounter | None = None,
+                     name: str | None = None,
+                     wait: bool = True) -> JobCounter:
+        """
+        Выполнить `fn(start, end)` для чанков диапазона `[0, count)`.
+        Число чанков – не больше 4 × (воркеры + 1), но каждый не меньше
+        `min_chunk` индексов. При `wait=True` вызывающий поток участвует
+        в работе и возвращается, когда все чанки выполнены.
+        """
+        counter = counter or JobCounter()
+        if count <= 0:
+            return counter
+
+        max_chunks = 4 * (self.num_workers + 1)
+        chunks = max(1, min(max_chunks, count // max(1, min_chunk)))
+        size = -(-count // chunks)
+
+        for start in range(0, count, size):
+            self.submit(fn, start, min(count, start + size),
+                        name=name, counter=counter)
+        if wait:
+            counter.wait(self)
+        return counter
+
+    # -----------------------------------------------------------------
+    #   Ожидание
+    # -----------------------------------------------------------------
+    def wait(self, counter: JobCounter) -> None:
+        """Дождаться счётчика, помогая выполнять задачи."""
+        counter.wait(self)
+
+    def wait_frame(self) -> None:
+        """Дождаться всех задач, поставленных с прошлого `wait_frame()`."""
+        self.frame_counter.wait(self)
+
+    def run_one(self) -> bool:
+        """Выполнить одну задачу в текущем потоке (если есть)."""
+        job = self._find_job(getattr(_tls, "index", None))
+        if job is None:
+            return False
+        self._signal.acquire(blocking=False)
+        self._execute(job)
+        return True
+
+    # -----------------------------------------------------------------
+    def shutdown(self, wait: bool = True) -> None:
+        if not self._running:
+            return
+        if wait:
+            self.frame_counter.wait(self)
+        self._running = False
+        for _ in self._threads:
+            self._signal.release()
+        for t in self._threads:
+            t.join()
+        logger.info(
+            f"[JobSystem] stopped ({self.jobs_executed} jobs, {self.steals} steals)"
+        )
+
+    # -----------------------------------------------------------------
+    #   Внутреннее
+    # -----------------------------------------------------------------
+    def _push(self, job: Job) -> None:
+        index = getattr(_tls, "index", None)
+        if job.background:
+            self._background.append(job)
+        elif index is not None and getattr(_tls, "system", None) is self:
+            self._queues[index].append(job)
+        else:
+            self._inject.append(job)
+        self._signal.release()
+
+    def _find_job(self, index: int | None) -> Job | None:
+        if index is not None and getattr(_tls, "system", None) is self:
+            try:
+                return self._queues[index].pop()
+            except IndexError:
+                pass
+        try:
+            return self._inject.popleft()
+        except IndexError:
+            pass
+
+        # Воровство: начинаем со случайной очереди
+        n = self.num_workers
+        offset = random.randrange(n)
+        for k in range(n):
+            victim = (offset + k) % n
+            if victim == index:
+                continue
+            try:
+                job = self._queues[victim].popleft()
+            except IndexError:
+                continue
+            self.steals += 1
+            return job
+        if index is not None and getattr(_tls, "system", None) is self:
+            try:
+                return self._background.popleft()
+            except IndexError:
+                pass
+        return None
+
+    def _worker(self, index: int) -> None:
+        _tls.index = index
+        _tls.system = self
+        while True:
+            self._signal.acquire()
+            if not self._running:
+                return
+            job = self._find_job(index)
+            if job is not None:
+                self._execute(job)
+
+    def _execute(self, job: Job) -> None:
+        error = None
+        try:
+            if self.profile:
+                with Profiler(job.name or getattr(job.fn, "__name__", "job")):
+                    job.result = job.fn(*job.args)
+            else:
+                job.result = job.fn(*job.args)
+        except BaseException as exc:
+            error = exc
+            job.exception = exc
+            logger.error(f"[JobSystem] job {job.name or job.fn!r} failed: {exc}")
+
+        with self._dep_lock:
+            job.done = True
+            self.jobs_executed += 1
+            ready = []
+            for dep in job._dependents:
+                dep._remaining -= 1
+                if dep._remaining == 0:
+                    ready.append(dep)
+            job._dependents = []
+        for dep in ready:
+            self._push(dep)
+
+        # Ошибка достаётся явному счётчику задачи; frame_counter
+        # получает её, только если явного счётчика нет.
+        own = job.counters[-1] if job.counters else None
+        for c in job.counters:
+            c.decrement(error if c is own else None)
@@ -74,6 +74,24 @@ class Mat4:
         Rz = Mat4.rotate_z(roll)
         return Ry @ Rx @ Rz
 
+    def to_euler(self):
+        """
+        Обратное к `from_euler`: (pitch, yaw, roll) в градусах из
+        вращательной части (столбцы 3×3 нормируются – масштаб не мешает).
+        """
+        r = self.m[:3, :3].astype(np.float64)
+        norms = np.linalg.norm(r, axis=0)
+        r = r / np.where(norms > 0.0, norms, 1.0)
+        sp = -r[1, 2]
+        pitch = np.arcsin(np.clip(sp, -1.0, 1.0))
+        if abs(sp) < 0.9999999:
+            yaw = np.arctan2(r[0, 2], r[2, 2])
+            roll = np.arctan2(r[1, 0], r[1, 1])
+        else:                                   # gimbal lock
+            yaw = np.arctan2(-r[2, 0], r[0, 0])
+            roll = 0.0
+        return tuple(float(np.degrees(a)) for a in (pitch, yaw, roll))
+
     @staticmethod
     def perspective(fov_deg: float, aspect: float,
                     z_near: float, z_far: float):
@@ -69,6 +69,11 @@ class Quat:
 
         return m
 
+    def to_euler(self):
+        """(pitch, yaw, roll) в градусах – в порядке `Mat4.from_euler`."""
+        from alkash3d.math.mat4 import Mat4
+        return Mat4(self.normalized().to_mat4()).to_euler()
+
     def rotate_vector(self, vec):
         qvec = Quat(vec[0], vec[1], vec[2], 0.0)
         res = self * qvec * self.conjugate()
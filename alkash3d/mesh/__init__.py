@@ -1,5 +1,7 @@
 # alkash3d/mesh/__init__.py
-"""Пакет, содержащий базовый Mesh‑класс."""
+"""Пакет, содержащий базовый Mesh‑класс, бинарный формат мешей и упрощение (LOD)."""
 from alkash3d.mesh.mesh import Mesh
+from alkash3d.mesh.mesh_file import MeshFile, load_mesh, write_mesh_file
+from alkash3d.mesh.simplify import generate_lods, simplify_mesh
 
-__all__ = ["Mesh"]
+__all__ = ["Mesh", "MeshFile", "load_mesh", "write_mesh_file", "generate_lods", "simplify_mesh"]
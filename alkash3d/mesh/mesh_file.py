@@ -0,0 +1,335 @@
+"""
+Бинарный контейнер меша (`.amesh`) для загрузки без копирования.
+
+Раскладка файла (little‑endian, все секции выровнены на 64 байта):
+
+    Header   : magic "AMSH", version u16, flags u16, section_count u32,
+               reserved u32                                       (16 B)
+               flags & 0xF – формат вершин (`vertex_format`)
+    Sections : section_count × (tag 4s, item_size u32,
+               offset u64, nbytes u64)                            (24 B)
+    VTX0     : interleaved float32 [pos.xyz | normal.xyz | uv.xy]
+               – 32 байта на вершину, как ждёт input layout; для
+               компактных форматов – `VERTEX_DTYPES[format]` (16/12 B)
+    QUNT     : float32[4] – деквантование позиций (offset.xyz, scale),
+               только у компактных форматов
+    IDX0     : индексы, uint16 если вершин ≤ 65535, иначе uint32
+    BNDS     : float32[10] – центр, радиус, AABB min, AABB max
+    LODS     : LOD_DTYPE – диапазоны индексов LOD‑цепочки;
+               `requested_levels` первой строки – сколько уровней
+               просили при варке (цепочка могла оборваться раньше),
+               0 – неизвестно
+    MSHL     : MESHLET_DTYPE – таблица meshlet‑ов (опционально, вместе
+               с MLVX и MLTR; `build_meshlets`)
+    MLVX     : uint32 – вершины meshlet‑ов (индексы VTX0), срезы
+               `vertex_offset/vertex_count`
+    MLTR     : uint8[3] – треугольники meshlet‑ов в локальных номерах
+               вершин, срезы `triangle_offset/triangle_count`
+
+`write_mesh_file` пишет секции в файл по одной (без сборки всего
+файла в памяти); `encode_mesh_file` – то же в `bytes` (для `.ascene`).
+
+`MeshFile` открывает файл через `np.memmap(mode="r")`; все массивы –
+view в отображение, т.е. загрузка сводится к page‑in, а несколько
+процессов делят один page cache. `load_mesh()` строит `scene.Mesh`
+прямо на этих view, без копий, и вершинный поток грузится в GPU как
+есть.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from alkash3d.mesh.vertex_format import (
+    FLOAT32, VERTEX_DTYPES, decode_vertices, encode_vertices, format_id,
+)
+from alkash3d.utils.cache import atomic_write
+
+MAGIC = b"AMSH"
+VERSION = 2
+_READABLE = (1, 2)                  # v1 – только float32, флаги 0
+_FORMAT_MASK = 0xF
+ALIGN = 64
+VERTEX_STRIDE = 32
+
+_HEADER = struct.Struct("<4sHHII")
+_SECTION = struct.Struct("<4sIQQ")
+
+LOD_DTYPE = np.dtype([
+    ("index_offset", np.uint32),
+    ("index_count", np.uint32),
+    ("error", np.float32),
+    ("requested_levels", np.uint32),   # значим только в lods[0]
+])
+
+MESHLET_DTYPE = np.dtype([
+    ("vertex_offset", np.uint32),
+    ("vertex_count", np.uint32),
+    ("triangle_offset", np.uint32),
+    ("triangle_count", np.uint32),
+])
+
+
+class Meshlets(NamedTuple):
+    """Meshlet‑ы меша: таблица, их вершины и локальные треугольники."""
+    table: np.ndarray           # MESHLET_DTYPE
+    vertices: np.ndarray        # uint32
+    triangles: np.ndarray       # (T, 3) uint8
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) & ~(ALIGN - 1)
+
+
+# ---------------------------------------------------------------------
+#   Запись
+# ---------------------------------------------------------------------
+def interleave(positions, normals=None, texcoords=None) -> np.ndarray:
+    """(N, 8) float32: pos | normal (или 0,0,1) | uv (или 0,0)."""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    out = np.zeros((len(positions), 8), dtype=np.float32)
+    out[:, 0:3] = positions
+    if normals is not None and len(normals):
+        out[:, 3:6] = np.asarray(normals, dtype=np.float32).reshape(-1, 3)
+    else:
+        out[:, 5] = 1.0
+    if texcoords is not None and len(texcoords):
+        out[:, 6:8] = np.asarray(texcoords, dtype=np.float32).reshape(-1, 2)
+    return out
+
+
+def lod_table(counts, errors=None, requested_levels: int = 0) -> np.ndarray:
+    """`LOD_DTYPE` для уровней, идущих подряд в одном индексном буфере."""
+    lods = np.zeros(len(counts), dtype=LOD_DTYPE)
+    lods["index_count"] = counts
+    lods["index_offset"] = np.cumsum(lods["index_count"]) - lods["index_count"]
+    if errors is not None:
+        lods["error"] = errors
+    if len(lods):
+        lods[0]["requested_levels"] = requested_levels
+    return lods
+
+
+def compute_bounds(positions: np.ndarray) -> np.ndarray:
+    """float32[10]: центр AABB, радиус сферы, AABB min, AABB max."""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    bounds = np.zeros(10, dtype=np.float32)
+    if len(positions) == 0:
+        return bounds
+    lo, hi = positions.min(axis=0), positions.max(axis=0)
+    centre = (lo + hi) * 0.5
+    bounds[0:3] = centre
+    bounds[3] = np.sqrt(((positions - centre) ** 2).sum(axis=1).max())
+    bounds[4:7] = lo
+    bounds[7:10] = hi
+    return bounds
+
+
+def _sections(positions, normals, texcoords, indices, lods, meshlets, vertex_format):
+    """Формат вершин и список секций `(tag, item_size, array)`."""
+    fmt = format_id(vertex_format)
+    if fmt == FLOAT32:
+        vertices, decode = interleave(positions, normals, texcoords), None
+    else:
+        vertices, decode = encode_vertices(positions, normals, texcoords, fmt)
+    # Bounds – по тому, что увидит GPU (после квантования)
+    bounded = vertices[:, 0:3] if decode is None \
+        else decode_vertices(vertices, fmt, decode)[:, 0:3]
+    if indices is None:
+        indices = np.arange(len(vertices), dtype=np.uint32)
+    indices = np.asarray(indices).reshape(-1)
+    idx_dtype = np.uint16 if len(vertices) <= 0xFFFF else np.uint32
+    indices = indices.astype(idx_dtype, copy=False)
+
+    if lods is None:
+        lods = np.zeros(1, dtype=LOD_DTYPE)
+        lods["index_count"] = len(indices)
+    lods = np.asarray(lods, dtype=LOD_DTYPE)
+
+    sections = [
+        (b"VTX0", VERTEX_STRIDE if fmt == FLOAT32 else vertices.itemsize, vertices),
+        (b"IDX0", indices.itemsize, indices),
+        (b"BNDS", 4, compute_bounds(bounded)),
+        (b"LODS", LOD_DTYPE.itemsize, lods),
+    ]
+    if decode is not None:
+        sections.append((b"QUNT", 4, decode))
+    if meshlets is True:
+        from alkash3d.mesh.optimize import build_meshlets
+
+        start = int(lods[0]["index_offset"]) if len(lods) else 0
+        count = int(lods[0]["index_count"]) if len(lods) else len(indices)
+        meshlets = build_meshlets(indices[start:start + count])
+    if meshlets is not None and len(meshlets.table):
+        sections += [
+            (b"MSHL", MESHLET_DTYPE.itemsize, np.asarray(meshlets.table, dtype=MESHLET_DTYPE)),
+            (b"MLVX", 4, np.asarray(meshlets.vertices, dtype=np.uint32)),
+            (b"MLTR", 3, np.asarray(meshlets.triangles, dtype=np.uint8)),
+        ]
+    return fmt, sections
+
+
+def _write_sections(f, fmt: int, sections) -> None:
+    """Заголовок, таблица секций и сами секции – последовательно в `f`."""
+    table_end = _HEADER.size + _SECTION.size * len(sections)
+    offset = _align(table_end)
+    head = bytearray(offset)
+    _HEADER.pack_into(head, 0, MAGIC, VERSION, fmt, len(sections), 0)
+    for i, (tag, item_size, arr) in enumerate(sections):
+        _SECTION.pack_into(head, _HEADER.size + i * _SECTION.size,
+                           tag, item_size, offset, arr.nbytes)
+        offset = _align(offset + arr.nbytes)
+    f.write(head)
+    for _, _, arr in sections:
+        f.write(np.ascontiguousarray(arr).reshape(-1).view(np.uint8))
+        f.write(bytes(_align(arr.nbytes) - arr.nbytes))
+
+
+def encode_mesh_file(positions, normals=None, texcoords=None,
+                     indices=None, lods=None, meshlets=None,
+                     vertex_format=FLOAT32) -> bytes:
+    """
+    Содержимое `.amesh` в памяти (см. `write_mesh_file`); используется
+    и для встраивания мешей в `.ascene`.
+    """
+    out = io.BytesIO()
+    _write_sections(out, *_sections(positions, normals, texcoords, indices, lods,
+                                    meshlets, vertex_format))
+    return out.getvalue()
+
+
+def write_mesh_file(path, positions, normals=None, texcoords=None,
+                    indices=None, lods=None, meshlets=None,
+                    vertex_format=FLOAT32) -> Path:
+    """
+    Записать меш в `.amesh` (атомарно: временный файл + rename); секции
+    пишутся в файл по одной.
+    `lods` – массив `LOD_DTYPE` (по‑умолчанию один LOD на все индексы),
+    `meshlets` – `Meshlets`, True (нарезать уровень 0, `build_meshlets`)
+    или None, `vertex_format` – раскладка вершин
+    (`alkash3d.mesh.vertex_format`, имя или номер).
+    """
+    path = Path(path)
+    fmt, sections = _sections(positions, normals, texcoords, indices, lods, meshlets,
+                              vertex_format)
+    with atomic_write(path) as f:
+        _write_sections(f, fmt, sections)
+    return path
+
+
+# ---------------------------------------------------------------------
+#   Чтение
+# ---------------------------------------------------------------------
+class MeshFile:
+    """
+    Отображённый в память `.amesh`; все поля – view без копий.
+    `buffer`/`base` – меш, встроенный в другой отображённый файл
+    (`.ascene`) со смещения `base`.
+
+    У компактных форматов `vertices` – структурный массив
+    `VERTEX_DTYPES[vertex_format]`, а `positions`/`normals`/`texcoords`
+    – декодированные копии (для CPU: bounds, пикинг, упрощение).
+    """
+
+    def __init__(self, path, buffer: np.ndarray | None = None, base: int = 0):
+        self.path = Path(path)
+        if buffer is None:
+            buffer = np.memmap(self.path, dtype=np.uint8, mode="r")
+        self._map = buffer[base:] if base else buffer
+
+        magic, version, flags, count, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an AMSH mesh file: {self.path}")
+        if version not in _READABLE:
+            raise ValueError(f"Unsupported AMSH version {version}: {self.path}")
+        self.vertex_format = format_id(flags & _FORMAT_MASK)
+
+        self.sections: dict[str, tuple[int, int, int]] = {}
+        for i in range(count):
+            tag, item_size, off, nbytes = _SECTION.unpack_from(
+                self._map, _HEADER.size + i * _SECTION.size
+            )
+            self.sections[tag.decode("ascii")] = (item_size, off, nbytes)
+
+        if self.vertex_format == FLOAT32:
+            self.vertices = self._view("VTX0", np.float32).reshape(-1, 8)
+            self.position_decode = None
+        else:
+            self.vertices = self._view("VTX0", VERTEX_DTYPES[self.vertex_format])
+            self.position_decode = self._view("QUNT", np.float32)
+        self._decoded = None
+        idx_size = self.sections["IDX0"][0]
+        self.indices = self._view("IDX0", np.uint16 if idx_size == 2 else np.uint32)
+        self.bounds = self._view("BNDS", np.float32)
+        self.lods = self._view("LODS", LOD_DTYPE)
+        self.meshlets = None
+        if {"MSHL", "MLVX", "MLTR"} <= self.sections.keys():
+            self.meshlets = Meshlets(self._view("MSHL", MESHLET_DTYPE),
+                                     self._view("MLVX", np.uint32),
+                                     self._view("MLTR", np.uint8).reshape(-1, 3))
+
+    def _view(self, tag: str, dtype) -> np.ndarray:
+        _, off, nbytes = self.sections[tag]
+        return self._map[off:off + nbytes].view(dtype)
+
+    # -----------------------------------------------------------------
+    @property
+    def attributes(self) -> np.ndarray:
+        """(N, 8) float32 `pos | normal | uv` (у компактных – декодированный)."""
+        if self.vertex_format == FLOAT32:
+            return self.vertices
+        if self._decoded is None:
+            self._decoded = decode_vertices(self.vertices, self.vertex_format,
+                                            self.position_decode)
+        return self._decoded
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.attributes[:, 0:3]
+
+    @property
+    def normals(self) -> np.ndarray:
+        return self.attributes[:, 3:6]
+
+    @property
+    def texcoords(self) -> np.ndarray:
+        return self.attributes[:, 6:8]
+
+    @property
+    def base_indices(self) -> np.ndarray:
+        """Индексы уровня 0 (без остальных уровней LOD‑цепочки)."""
+        lod0 = self.lods[0]
+        start = int(lod0["index_offset"])
+        return self.indices[start:start + int(lod0["index_count"])]
+
+    @property
+    def bounding_sphere(self) -> tuple[np.ndarray, float]:
+        return self.bounds[0:3], float(self.bounds[3])
+
+    @property
+    def aabb(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.bounds[4:7], self.bounds[7:10]
+
+
+def load_mesh(path, name: str | None = None):
+    """Построить `scene.Mesh` на view в отображённый `.amesh`."""
+    from alkash3d.scene.mesh import Mesh
+
+    mf = MeshFile(path)
+    mesh = Mesh(
+        mf.positions, mf.normals, mf.texcoords, mf.indices,
+        name=name or Path(path).stem,
+        bounds=mf.bounding_sphere,
+        interleaved=mf.vertices,
+        vertex_format=mf.vertex_format,
+        position_decode=mf.position_decode,
+    )
+    mesh.lod_ranges = mf.lods
+    mesh.index_count = int(mf.lods[0]["index_count"]) if len(mf.lods) else mesh.index_count
+    mesh.meshlets = mf.meshlets
+    return mesh
@@ -0,0 +1,290 @@
+"""
+Оптимизация индексных буферов на этапе импорта/варки.
+
+1️⃣  `optimize_vertex_cache` – перестановка треугольников под
+    post‑transform кэш вершин (алгоритм Форсайта, «linear‑speed vertex
+    cache optimisation»): жадно выбирается треугольник с наибольшей
+    суммой очков вершин (позиция в LRU‑кэше + бонус за малое число
+    оставшихся треугольников у вершины).
+2️⃣  `optimize_overdraw` – (опционально) порядок кластеров этой
+    последовательности: кластер режется там, где кэш «холодный», и
+    кластеры, обращённые наружу от центра меша, рисуются первыми – они
+    чаще перекрывают остальные. Внутри кластера порядок не меняется,
+    так что локальность кэша почти не страдает.
+3️⃣  `optimize_vertex_fetch` – вершины переупорядочиваются в порядке
+    первого использования (линейное чтение вершинного буфера).
+
+4️⃣  `build_meshlets` – нарезка индексов на meshlet‑ы (≤ `max_vertices`
+    вершин и ≤ `max_triangles` треугольников) в порядке треугольников,
+    т.е. после оптимизации кэша соседние треугольники попадают в один
+    meshlet; секции `MSHL`/`MLVX`/`MLTR` формата `.amesh`.
+
+`cache_stats` – ACMR (промахи кэша на треугольник, идеал ~0.5) и ATVR
+(промахи на уникальную вершину, идеал 1.0) для FIFO‑кэша заданного
+размера; `optimize_mesh` прогоняет всё для LOD‑цепочки (уровни делят
+вершины) и возвращает отчёт «до/после».
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+MESHLET_VERTICES = 64          # лимиты meshlet‑а (как у mesh shader‑ов)
+MESHLET_TRIANGLES = 124
+CACHE_SIZE = 32                 # размер модели LRU‑кэша при оптимизации
+FIFO_SIZE = 16                  # размер FIFO‑кэша для метрик
+
+_CACHE_DECAY = 1.5
+_LAST_TRI_SCORE = 0.75
+_VALENCE_SCALE = 2.0
+_VALENCE_POWER = 0.5
+
+
+# ---------------------------------------------------------------------
+#   Метрики
+# ---------------------------------------------------------------------
+def cache_stats(indices, vertex_count: int | None = None, cache_size: int = FIFO_SIZE) -> dict:
+    """`{"acmr", "atvr"}` для FIFO‑кэша из `cache_size` вершин."""
+    idx = np.asarray(indices).reshape(-1)
+    tris = len(idx) // 3
+    if tris == 0:
+        return {"acmr": 0.0, "atvr": 0.0}
+    if vertex_count is None:
+        vertex_count = int(idx.max()) + 1
+    stamp = [-cache_size - 1] * vertex_count     # время попадания в кэш
+    clock, misses = 0, 0
+    for v in idx.tolist():
+        if clock - stamp[v] > cache_size:
+            stamp[v] = clock
+            clock += 1
+            misses += 1
+    unique = len(np.unique(idx))
+    return {"acmr": misses / tris, "atvr": misses / max(unique, 1)}
+
+
+# ---------------------------------------------------------------------
+#   Кэш вершин (Форсайт)
+# ---------------------------------------------------------------------
+def _score_tables(cache_size: int, max_valence: int):
+    pos = np.arange(cache_size, dtype=np.float64)
+    cache = np.where(pos < 3, _LAST_TRI_SCORE,
+                     (1.0 - (pos - 3) / max(cache_size - 3, 1)) ** _CACHE_DECAY)
+    val = np.arange(max_valence + 1, dtype=np.float64)
+    valence = np.zeros(max_valence + 1)
+    valence[1:] = _VALENCE_SCALE * val[1:] ** -_VALENCE_POWER
+    return cache.tolist(), valence.tolist()
+
+
+def optimize_vertex_cache(indices, vertex_count: int | None = None,
+                          cache_size: int = CACHE_SIZE) -> np.ndarray:
+    """Треугольники в порядке, дружественном post‑transform кэшу."""
+    src = np.asarray(indices).reshape(-1)
+    tris = src.reshape(-1, 3)
+    ntri = len(tris)
+    if ntri == 0:
+        return src.copy()
+    if vertex_count is None:
+        vertex_count = int(src.max()) + 1
+
+    # Смежность вершина → треугольники (CSR) – векторно
+    flat = tris.reshape(-1).astype(np.int64)
+    valence = np.bincount(flat, minlength=vertex_count)
+    order = np.argsort(flat, kind="stable")
+    offsets = np.concatenate(([0], np.cumsum(valence)))
+    adj_all = (order // 3).tolist()
+    adj = [adj_all[offsets[v]:offsets[v + 1]] for v in range(vertex_count)]
+
+    cache_score, valence_score = _score_tables(cache_size, int(valence.max()))
+    remaining = valence.tolist()
+    cache_pos = [-1] * vertex_count
+    vscore = [valence_score[r] for r in remaining]
+    tri_list = tris.tolist()
+    tscore = [vscore[a] + vscore[b] + vscore[c] for a, b, c in tri_list]
+    emitted = [False] * ntri
+
+    out = []
+    cache: list[int] = []
+    best = max(range(ntri), key=tscore.__getitem__)
+    cursor = 0                                   # для поиска, когда кэш пуст
+    for _ in range(ntri):
+        if best < 0:
+            while emitted[cursor]:
+                cursor += 1
+            best = cursor
+        tri = tri_list[best]
+        emitted[best] = True
+        out.append(best)
+
+        for v in tri:
+            remaining[v] -= 1
+            adj[v].remove(best)
+        # LRU: вершины треугольника – в начало, хвост вытесняется
+        new_cache = list(tri) + [v for v in cache if v not in tri]
+        evicted = new_cache[cache_size:]
+        cache = new_cache[:cache_size]
+        for v in evicted:
+            cache_pos[v] = -1
+        touched = set()
+        for i, v in enumerate(cache):
+            cache_pos[v] = i
+            s = (cache_score[i] if remaining[v] else 0.0) + valence_score[remaining[v]]
+            vscore[v] = s
+            touched.update(adj[v])
+        for v in evicted:
+            vscore[v] = valence_score[remaining[v]]
+            touched.update(adj[v])
+
+        best, best_score = -1, -1.0
+        for t in touched:
+            a, b, c = tri_list[t]
+            s = vscore[a] + vscore[b] + vscore[c]
+            tscore[t] = s
+            if s > best_score:
+                best, best_score = t, s
+
+    return tris[np.asarray(out, dtype=np.int64)].reshape(-1)
+
+
+# ---------------------------------------------------------------------
+#   Overdraw
+# ---------------------------------------------------------------------
+def _cluster_starts(indices: np.ndarray, cache_size: int) -> np.ndarray:
+    """Начала кластеров: треугольники, все вершины которых – промахи FIFO."""
+    stamp: dict[int, int] = {}
+    clock, starts = 0, []
+    for t, tri in enumerate(indices.reshape(-1, 3).tolist()):
+        misses = 0
+        for v in tri:
+            if clock - stamp.get(v, -cache_size - 1) > cache_size:
+                stamp[v] = clock
+                clock += 1
+                misses += 1
+        if misses == 3 or t == 0:
+            starts.append(t)
+    return np.asarray(starts, dtype=np.int64)
+
+
+def optimize_overdraw(indices, positions, cache_size: int = FIFO_SIZE) -> np.ndarray:
+    """
+    Переставить кластеры (уже оптимизированной под кэш) последовательности:
+    сначала обращённые наружу от центра меша.
+    """
+    idx = np.asarray(indices).reshape(-1)
+    tris = idx.reshape(-1, 3)
+    if len(tris) < 2:
+        return idx.copy()
+    p = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    starts = _cluster_starts(idx, cache_size)
+    if len(starts) < 2:
+        return idx.copy()
+
+    t = p[tris]
+    normal = np.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0])      # × 2·площадь
+    centroid = t.mean(axis=1)
+    area = np.linalg.norm(normal, axis=1)
+    c_normal = np.add.reduceat(normal, starts, axis=0)
+    c_area = np.maximum(np.add.reduceat(area, starts), 1e-30)
+    c_centre = np.add.reduceat(centroid * area[:, None], starts, axis=0) / c_area[:, None]
+    mesh_centre = (centroid * area[:, None]).sum(axis=0) / max(area.sum(), 1e-30)
+    c_normal /= np.maximum(np.linalg.norm(c_normal, axis=1), 1e-30)[:, None]
+    key = ((c_centre - mesh_centre) * c_normal).sum(axis=1)
+
+    order = np.argsort(-key, kind="stable")
+    bounds = np.append(starts, len(tris))
+    tri_order = np.concatenate([np.arange(bounds[c], bounds[c + 1]) for c in order])
+    return tris[tri_order].reshape(-1)
+
+
+# ---------------------------------------------------------------------
+#   Порядок вершин
+# ---------------------------------------------------------------------
+def optimize_vertex_fetch(indices, vertex_count: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Вершины в порядке первого использования. Возвращает `(indices,
+    order)`: новые индексы и `order` (новая → старая вершина) – атрибуты
+    переставляются как `array[order]`. Неиспользуемые вершины – в конце.
+    """
+    idx = np.asarray(indices).reshape(-1)
+    used, first = np.unique(idx, return_index=True)
+    order = used[np.argsort(first, kind="stable")]
+    unused = np.setdiff1d(np.arange(vertex_count), used, assume_unique=True)
+    order = np.concatenate([order, unused]).astype(np.int64)
+    remap = np.empty(vertex_count, dtype=np.int64)
+    remap[order] = np.arange(vertex_count)
+    return remap[idx].astype(idx.dtype), order
+
+
+# ---------------------------------------------------------------------
+#   Meshlet‑ы
+# ---------------------------------------------------------------------
+def build_meshlets(indices, max_vertices: int = MESHLET_VERTICES,
+                   max_triangles: int = MESHLET_TRIANGLES):
+    """
+    Жадно нарезать треугольники (в их порядке) на meshlet‑ы. Возвращает
+    `mesh_file.Meshlets`: таблицу `MESHLET_DTYPE`, вершины meshlet‑ов
+    (uint32, индексы меша) и локальные треугольники (uint8 × 3).
+    """
+    from alkash3d.mesh.mesh_file import MESHLET_DTYPE, Meshlets
+
+    if max_vertices < 3 or max_vertices > 256:
+        raise ValueError(f"max_vertices must be in [3, 256], got {max_vertices}")
+    tris = np.asarray(indices).reshape(-1, 3).tolist()
+    table, verts, local = [], [], []
+    slots: dict[int, int] = {}
+    v_start, t_start = 0, 0
+    for tri in tris:
+        new = len({v for v in tri if v not in slots})
+        if len(slots) + new > max_vertices or len(local) - t_start >= max_triangles:
+            table.append((v_start, len(slots), t_start, len(local) - t_start))
+            v_start, t_start = len(verts), len(local)
+            slots = {}
+        row = []
+        for v in tri:
+            slot = slots.get(v)
+            if slot is None:
+                slot = slots[v] = len(slots)
+                verts.append(v)
+            row.append(slot)
+        local.append(row)
+    if len(local) > t_start:
+        table.append((v_start, len(slots), t_start, len(local) - t_start))
+    return Meshlets(np.array(table, dtype=MESHLET_DTYPE).reshape(-1),
+                    np.array(verts, dtype=np.uint32),
+                    np.array(local, dtype=np.uint8).reshape(-1, 3))
+
+
+# ---------------------------------------------------------------------
+#   Всё вместе
+# ---------------------------------------------------------------------
+def optimize_mesh(positions, normals=None, texcoords=None, levels=None,
+                  overdraw: bool = False, cache_size: int = CACHE_SIZE):
+    """
+    Оптимизировать меш с LOD‑цепочкой `levels` (список индексов уровней,
+    общий набор вершин; один массив – один уровень). Возвращает
+    `(positions, normals, texcoords, levels, report)`; `report` – ACMR/ATVR
+    уровня 0 до и после.
+    """
+    positions = np.asarray(positions).reshape(-1, 3)
+    nverts = len(positions)
+    if levels is None:
+        levels = [np.arange(nverts, dtype=np.uint32)]
+    elif isinstance(levels, np.ndarray):
+        levels = [levels]
+    levels = [np.asarray(lvl).reshape(-1) for lvl in levels]
+    before = cache_stats(levels[0], nverts)
+
+    levels = [optimize_vertex_cache(lvl, nverts, cache_size) for lvl in levels]
+    if overdraw:
+        levels[0] = optimize_overdraw(levels[0], positions)
+
+    # Порядок вершин – по уровню 0 (остальные уровни – его подмножество)
+    _, order = optimize_vertex_fetch(levels[0], nverts)
+    remap = np.empty(nverts, dtype=np.int64)
+    remap[order] = np.arange(nverts)
+    levels = [remap[lvl].astype(lvl.dtype) for lvl in levels]
+    positions = positions[order]
+    normals = normals[order] if normals is not None else None
+    texcoords = texcoords[order] if texcoords is not None else None
+
+    report = {"before": before, "after": cache_stats(levels[0], nverts)}
+    return positions, normals, texcoords, levels, report
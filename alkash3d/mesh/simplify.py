@@ -0,0 +1,469 @@
+"""
+Упрощение мешей для LOD‑цепочек: схлопывание рёбер по квадрикам ошибки
+(Garland–Heckbert, QEM).
+
+Схлопывание «половинное» – вершина `u` переезжает в соседнюю `v`, новые
+вершины не создаются. Поэтому все уровни LOD ссылаются на один вершинный
+буфер, и цепочка – просто диапазоны индексов (`Mesh.set_lod_chain`,
+`mesh_file.LOD_DTYPE`).
+
+1️⃣  Квадрики граней (площадь × плоскость ⊗ плоскость) считаются и
+    суммируются по вершинам векторно (`np.add.at`).
+2️⃣  Граница (ребро одной грани по сваренным позициям) получает
+    перпендикулярные плоскости с большим весом – контур сохраняется.
+3️⃣  Схлопываются классы позиций (вершины, сваренные по позиции), а не
+    отдельные вершины: каждая вершина класса `u` переезжает в вершину
+    класса `v` с ближайшими атрибутами. Швы UV/нормалей и
+    flat‑shaded/неиндексированные меши поэтому упрощаются, а разрыв
+    атрибутов на шве ложится в стоимость, а не в блокировку.
+4️⃣  Стоимость всех рёбер в обе стороны – тоже одним проходом NumPy:
+    ошибка квадрики + штраф за разницу атрибутов каждой переезжающей
+    вершины (нормаль, UV).
+5️⃣  Цикл – по куче: дешёвое ребро схлопывается, если ни один
+    треугольник не переворачивается; рёбра вокруг `v` пересчитываются.
+
+Командная строка (OBJ каталога → LOD‑цепочки в кэше `.amesh`, их
+подхватывает `load_obj_mesh`)::
+
+    python -m alkash3d.mesh.simplify resources/models --lods 3 --ratio 0.5 -j 8
+
+`--vertex-format compact16|compact8` – заодно закодировать вершины в
+компактный формат (`alkash3d.mesh.vertex_format`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from alkash3d.mesh.mesh_file import MeshFile, lod_table, write_mesh_file
+from alkash3d.mesh.optimize import optimize_mesh
+from alkash3d.mesh.vertex_format import FLOAT32, FORMATS, format_id
+from alkash3d.utils.logger import logger
+
+BORDER_WEIGHT = 1000.0
+_FLIP_COS = 0.2                 # минимальный cos между нормалями до/после
+
+
+# ---------------------------------------------------------------------
+#   Квадрики
+# ---------------------------------------------------------------------
+def _planes(p: np.ndarray, tris: np.ndarray):
+    """Единичные нормали, площади и плоскости (n, d) треугольников."""
+    p0, p1, p2 = p[tris[:, 0]], p[tris[:, 1]], p[tris[:, 2]]
+    n = np.cross(p1 - p0, p2 - p0)
+    length = np.linalg.norm(n, axis=1)
+    n = n / np.maximum(length, 1e-30)[:, None]
+    plane = np.concatenate([n, -(n * p0).sum(axis=1, keepdims=True)], axis=1)
+    return n, length * 0.5, plane
+
+
+def vertex_quadrics(p: np.ndarray, tris: np.ndarray, border_weight: float = BORDER_WEIGHT,
+                    weld: np.ndarray | None = None) -> np.ndarray:
+    """(V, 4, 4) квадрики: грани + ограничивающие плоскости границы."""
+    q = np.zeros((len(p), 4, 4), dtype=np.float64)
+    normals, area, plane = _planes(p, tris)
+    k = area[:, None, None] * plane[:, :, None] * plane[:, None, :]
+    for c in range(3):
+        np.add.at(q, tris[:, c], k)
+
+    if border_weight > 0.0:
+        a, b, face = _border_edges(tris, weld)
+        if len(a):
+            d = p[b] - p[a]
+            bn = np.cross(d, normals[face])
+            bn /= np.maximum(np.linalg.norm(bn, axis=1), 1e-30)[:, None]
+            bp = np.concatenate([bn, -(bn * p[a]).sum(axis=1, keepdims=True)], axis=1)
+            w = border_weight * (d * d).sum(axis=1)
+            kb = w[:, None, None] * bp[:, :, None] * bp[:, None, :]
+            np.add.at(q, a, kb)
+            np.add.at(q, b, kb)
+    return q
+
+
+def _border_edges(tris: np.ndarray, weld: np.ndarray | None = None):
+    """Рёбра, принадлежащие одной грани (по сваренным позициям): (a, b, face)."""
+    ids = tris if weld is None else weld[tris]
+    a = tris[:, [0, 1, 2]].ravel()
+    b = tris[:, [1, 2, 0]].ravel()
+    wa, wb = ids[:, [0, 1, 2]].ravel(), ids[:, [1, 2, 0]].ravel()
+    key = np.minimum(wa, wb) * (int(ids.max(initial=0)) + 1) + np.maximum(wa, wb)
+    _, inverse, counts = np.unique(key, return_inverse=True, return_counts=True)
+    border = counts[inverse.reshape(-1)] == 1
+    face = np.repeat(np.arange(len(tris)), 3)
+    return a[border], b[border], face[border]
+
+
+def _members(weld: np.ndarray, classes: int) -> np.ndarray:
+    """(C, M) вершины каждого класса позиций, дополненные -1."""
+    order = np.argsort(weld, kind="stable")
+    counts = np.bincount(weld, minlength=classes)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    slot = np.arange(len(weld)) - np.repeat(starts, counts)
+    mem = np.full((classes, max(int(counts.max(initial=1)), 1)), -1, dtype=np.int64)
+    mem[weld[order], slot] = order
+    return mem
+
+
+def _seam_cost(attrs: np.ndarray, mem: np.ndarray, remove: np.ndarray,
+               keep: np.ndarray) -> np.ndarray:
+    """
+    Сумма квадратов разницы атрибутов: каждая вершина класса `remove`
+    переезжает в вершину класса `keep` с ближайшими атрибутами.
+    """
+    mr, mk = mem[remove], mem[keep]
+    cols_r = int((mr >= 0).sum(axis=1).max(initial=0))
+    cols_k = int((mk >= 0).sum(axis=1).max(initial=0))
+    total = np.zeros(len(remove))
+    for i in range(cols_r):
+        ri = mr[:, i]
+        best = np.full(len(remove), np.inf)
+        for j in range(cols_k):
+            kj = mk[:, j]
+            d = attrs[ri] - attrs[kj]
+            best = np.minimum(best, np.where(kj >= 0, (d * d).sum(axis=1), np.inf))
+        total += np.where(ri >= 0, best, 0.0)
+    return total
+
+
+def _collapse_cost(q: np.ndarray, p: np.ndarray, attrs: np.ndarray | None,
+                   attr_scale: float, remove: np.ndarray, keep: np.ndarray,
+                   mem: np.ndarray | None = None) -> np.ndarray:
+    """
+    Стоимость переноса `remove` → `keep` (векторно). С `mem` индексы –
+    классы позиций, атрибуты сравниваются по их вершинам.
+    """
+    vh = np.concatenate([p[keep], np.ones((len(keep), 1))], axis=1)
+    qs = q[remove] + q[keep]
+    cost = np.einsum("ni,nij,nj->n", vh, qs, vh)
+    if attrs is not None:
+        if mem is None:
+            diff = attrs[remove] - attrs[keep]
+            seam = (diff * diff).sum(axis=1)
+        else:
+            seam = _seam_cost(attrs, mem, remove, keep)
+        cost = cost + attr_scale * seam
+    return np.maximum(cost, 0.0)
+
+
+def _member_map(attrs: np.ndarray | None, mem: np.ndarray, r: int, k: int) -> dict:
+    """Вершина класса `r` → вершина класса `k` с ближайшими атрибутами."""
+    src = mem[r][mem[r] >= 0]
+    dst = mem[k][mem[k] >= 0]
+    if attrs is None or len(dst) == 1:
+        return dict.fromkeys(src.tolist(), int(dst[0]))
+    d = attrs[src][:, None, :] - attrs[dst][None, :, :]
+    best = dst[np.argmin((d * d).sum(axis=2), axis=1)]
+    return dict(zip(src.tolist(), best.tolist()))
+
+
+# ---------------------------------------------------------------------
+#   Упрощение
+# ---------------------------------------------------------------------
+def simplify(positions, indices, target_ratio: float = 0.5, normals=None, texcoords=None,
+             target_count: int | None = None, max_error: float = np.inf,
+             attribute_weight: float = 1e-3, border_weight: float = BORDER_WEIGHT,
+             lock_border: bool = False) -> tuple[np.ndarray, float]:
+    """
+    Упростить треугольный меш до `target_count` индексов (по‑умолчанию
+    `target_ratio` от исходных). Возвращает `(indices, error)`: индексы
+    по исходным вершинам (тот же dtype) и оценку геометрической ошибки
+    (в единицах модели) – для поля `error` LOD‑цепочки.
+    """
+    p = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    src = np.asarray(indices).reshape(-1)
+    tris = src.reshape(-1, 3).astype(np.int64)
+    if target_count is None:
+        target_count = int(len(src) * target_ratio)
+    target_tris = max(target_count // 3, 1)
+    if len(tris) <= target_tris:
+        return src.copy(), 0.0
+
+    # Сварка по позиции: граница ищется по топологии без швов, а
+    # схлопываются классы позиций целиком (швы и flat‑shaded меши)
+    cp, weld = np.unique(p, axis=0, return_inverse=True)
+    weld = weld.reshape(-1)
+    mem = _members(weld, len(cp))
+    ctris = weld[tris]
+    q = np.zeros((len(cp), 4, 4))
+    np.add.at(q, weld, vertex_quadrics(p, tris, border_weight, weld))
+    # Сумма площадей в квадрике – ошибка в единицах длины: sqrt(cost / area)
+    area = np.zeros(len(cp))
+    tri_area = _planes(p, tris)[1]
+    for c in range(3):
+        np.add.at(area, ctris[:, c], tri_area)
+    locked = np.zeros(len(cp), dtype=bool)
+    if lock_border:
+        a, b, _ = _border_edges(tris, weld)
+        locked[weld[a]] = locked[weld[b]] = True
+
+    attrs = None
+    parts = [np.asarray(a, dtype=np.float64).reshape(len(p), -1)
+             for a in (normals, texcoords) if a is not None]
+    if parts:
+        attrs = np.concatenate(parts, axis=1)
+    extent = float(np.ptp(p, axis=0).max()) if len(p) else 1.0
+    attr_scale = attribute_weight * extent * extent
+
+    # Начальные стоимости всех рёбер (между классами) в обе стороны
+    e = np.concatenate([ctris[:, [0, 1]], ctris[:, [1, 2]], ctris[:, [2, 0]]])
+    e = np.unique(np.sort(e, axis=1), axis=0)
+    e = e[e[:, 0] != e[:, 1]]
+    u, v = e[:, 0], e[:, 1]
+    c_uv = np.where(locked[u], np.inf, _collapse_cost(q, cp, attrs, attr_scale, u, v, mem))
+    c_vu = np.where(locked[v], np.inf, _collapse_cost(q, cp, attrs, attr_scale, v, u, mem))
+    forward = c_uv <= c_vu
+    cost = np.where(forward, c_uv, c_vu)
+    rem = np.where(forward, u, v)
+    kep = np.where(forward, v, u)
+    ok = np.isfinite(cost)
+    heap = list(zip(cost[ok].tolist(), rem[ok].tolist(), kep[ok].tolist(),
+                    [0] * int(ok.sum()), [0] * int(ok.sum())))
+    heapq.heapify(heap)
+
+    # Смежность класс → треугольники
+    vert_tris: list[set] = [set() for _ in range(len(cp))]
+    for t, row in enumerate(ctris.tolist()):
+        for w in row:
+            vert_tris[w].add(t)
+
+    alive = np.ones(len(tris), dtype=bool)
+    dead = np.zeros(len(cp), dtype=bool)
+    stamp = [0] * len(cp)
+    live_tris = len(tris)
+    max_error_sq = 0.0
+    limit = max_error * max_error
+
+    while heap and live_tris > target_tris:
+        c, r, k, sr, sk = heapq.heappop(heap)
+        if dead[r] or dead[k] or stamp[r] != sr or stamp[k] != sk:
+            continue
+        err_sq = c / max(area[r] + area[k], 1e-30)
+        if err_sq > limit:
+            break
+        shared = vert_tris[r] & vert_tris[k]
+        moved = vert_tris[r] - shared
+        if not shared or _flips(cp, ctris, moved, r, k):
+            continue
+
+        for t in shared:
+            alive[t] = False
+            for w in ctris[t]:
+                vert_tris[w].discard(t)
+        remap = _member_map(attrs, mem, r, k)
+        for t in moved:
+            crow, row = ctris[t], tris[t]
+            on_r = crow == r
+            row[on_r] = [remap[w] for w in row[on_r].tolist()]
+            crow[on_r] = k
+            vert_tris[k].add(t)
+        vert_tris[r].clear()
+        dead[r] = True
+        q[k] += q[r]
+        area[k] += area[r]
+        live_tris -= len(shared)
+        max_error_sq = max(max_error_sq, err_sq)
+        stamp[k] += 1
+
+        # Рёбра вокруг k – заново
+        ring = {w for t in vert_tris[k] for w in ctris[t].tolist()} - {k}
+        if not ring:
+            continue
+        nb = np.fromiter(ring, dtype=np.int64, count=len(ring))
+        kk = np.full(len(nb), k, dtype=np.int64)
+        to_k = np.where(locked[nb], np.inf,
+                        _collapse_cost(q, cp, attrs, attr_scale, nb, kk, mem))
+        from_k = (np.full(len(nb), np.inf) if locked[k]
+                  else _collapse_cost(q, cp, attrs, attr_scale, kk, nb, mem))
+        for w, c1, c2 in zip(nb.tolist(), to_k.tolist(), from_k.tolist()):
+            if c1 <= c2 and c1 != np.inf:
+                heapq.heappush(heap, (c1, w, k, stamp[w], stamp[k]))
+            elif c2 != np.inf:
+                heapq.heappush(heap, (c2, k, w, stamp[k], stamp[w]))
+
+    out = tris[alive].reshape(-1).astype(src.dtype)
+    return out, float(np.sqrt(max_error_sq))
+
+
+def _flips(p: np.ndarray, tris: np.ndarray, moved, r: int, k: int) -> bool:
+    """Перевернётся ли (или выродится) хоть один треугольник после r → k."""
+    if not moved:
+        return False
+    rows = tris[list(moved)]
+    new = np.where(rows == r, k, rows)
+    # Старые и новые треугольники одним массивом; np.cross на малых
+    # массивах заметно медленнее покомпонентного произведения
+    t = p[np.concatenate([rows, new])]
+    e1, e2 = t[:, 1] - t[:, 0], t[:, 2] - t[:, 0]
+    n = np.stack([e1[:, 1] * e2[:, 2] - e1[:, 2] * e2[:, 1],
+                  e1[:, 2] * e2[:, 0] - e1[:, 0] * e2[:, 2],
+                  e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0]], axis=1)
+    n_old, n_new = n[:len(rows)], n[len(rows):]
+    dot = (n_old * n_new).sum(axis=1)
+    len2 = (n * n).sum(axis=1)
+    lim = _FLIP_COS * np.sqrt(len2[:len(rows)] * len2[len(rows):])
+    return bool(np.any(dot <= lim))
+
+
+def generate_lods(positions, indices, normals=None, texcoords=None, levels: int = 3,
+                  ratio: float = 0.5, **kwargs) -> tuple[list[np.ndarray], list[float]]:
+    """
+    LOD‑цепочка: уровень 0 – исходные индексы, каждый следующий –
+    `ratio` треугольников предыдущего. Цепочка обрывается, если
+    упрощение почти ничего не дало. Возвращает `(levels, errors)`.
+    """
+    base = np.asarray(indices).reshape(-1)
+    chain, errors = [base], [0.0]
+    for _ in range(1, levels):
+        prev = chain[-1]
+        out, err = simplify(positions, prev, ratio, normals, texcoords, **kwargs)
+        if len(out) >= len(prev) * 0.95 or len(out) == 0:
+            break
+        chain.append(out)
+        errors.append(max(err, errors[-1]))
+    return chain, errors
+
+
+def simplify_mesh(mesh, levels: int = 3, ratio: float = 0.5, backend=None, **kwargs):
+    """Построить и назначить LOD‑цепочку `scene.Mesh` (`Mesh.set_lod_chain`)."""
+    positions = mesh.vertices.reshape(-1, 3)
+    indices = mesh.indices
+    if mesh.lod_ranges is not None and indices is not None:
+        lod0 = mesh.lod_ranges[0]
+        start = int(lod0["index_offset"])
+        indices = indices[start:start + int(lod0["index_count"])]
+    if indices is None:
+        indices = np.arange(len(positions), dtype=np.uint32)
+    chain, errors = generate_lods(positions, indices, mesh.normals, mesh.texcoords,
+                                  levels, ratio, **kwargs)
+    mesh.set_lod_chain(chain, errors, backend)
+    return errors
+
+
+# ---------------------------------------------------------------------
+#   Пакетная генерация (процессы)
+# ---------------------------------------------------------------------
+def cook_lods(src, levels: int = 3, ratio: float = 0.5, vertex_format=FLOAT32) -> Path:
+    """
+    OBJ → `.amesh` с LOD‑цепочкой в кэше OBJ (его читает `load_obj_mesh`);
+    уровни и вершины переупорядочиваются под кэш вершин (`optimize_mesh`),
+    вершины пишутся в формате `vertex_format`, уровень 0 нарезается на
+    meshlet‑ы.
+    """
+    from alkash3d.assets.obj import cache_path, parse_obj
+
+    positions, normals, texcoords, indices = parse_obj(Path(src).read_bytes())
+    chain, errors = generate_lods(positions, indices, normals, texcoords, levels, ratio)
+    positions, normals, texcoords, chain, _ = optimize_mesh(positions, normals, texcoords, chain)
+    dst = cache_path(src)
+    write_mesh_file(dst, positions, normals, texcoords, np.concatenate(chain),
+                    lods=lod_table([len(c) for c in chain], errors, levels),
+                    meshlets=True, vertex_format=vertex_format)
+    return dst
+
+
+def _cook_job(args):
+    src, levels, ratio, vertex_format = args
+    cook_lods(src, levels, ratio, vertex_format)
+    return str(src)
+
+
+def _has_lods(src, levels: int, vertex_format=FLOAT32) -> bool:
+    """
+    Кэш уже сварен с теми же `levels` и `vertex_format`. Сравнивается
+    запрошенное число уровней, а не длина цепочки: цепочка, оборвавшаяся
+    раньше, иначе пересобиралась бы при каждом запуске.
+    """
+    from alkash3d.assets.obj import cache_path
+
+    try:
+        mf = MeshFile(cache_path(src))
+        if mf.vertex_format != format_id(vertex_format) or not len(mf.lods):
+            return False
+        requested = int(mf.lods[0]["requested_levels"])
+    except (OSError, ValueError, KeyError):
+        return False
+    if requested == 0:                  # кэш без записи о запросе
+        return len(mf.lods) >= levels
+    return requested == levels
+
+
+def simplify_directory(src_dir, levels: int = 3, ratio: float = 0.5,
+                       workers: int | None = None, force: bool = False,
+                       vertex_format=FLOAT32) -> dict:
+    """
+    LOD‑цепочки для всех OBJ каталога (рекурсивно) в рабочих процессах.
+    Файлы, чей кэш сварен с теми же `levels` и `vertex_format`,
+    пропускаются.
+    Возвращает `{"cooked", "skipped", "failed"}`.
+    """
+    src_dir = Path(src_dir).resolve()
+    jobs, skipped = [], 0
+    for src in sorted(src_dir.rglob("*.obj")):
+        if not force and _has_lods(src, levels, vertex_format):
+            skipped += 1
+            continue
+        jobs.append((src, levels, ratio, vertex_format))
+
+    cooked, failed = 0, 0
+    if jobs:
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers == 1:
+            results = []
+            for job in jobs:
+                try:
+                    results.append((job, _cook_job(job), None))
+                except Exception as exc:
+                    results.append((job, None, exc))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(job, pool.submit(_cook_job, job)) for job in jobs]
+                results = []
+                for job, fut in futures:
+                    try:
+                        results.append((job, fut.result(), None))
+                    except Exception as exc:
+                        results.append((job, None, exc))
+        for (src, *_), _, exc in results:
+            rel = src.relative_to(src_dir).as_posix()
+            if exc is None:
+                cooked += 1
+                logger.info(f"[Simplify] {rel}: {levels} LOD(s)")
+            else:
+                failed += 1
+                logger.error(f"[Simplify] Failed to simplify {rel}: {exc}")
+    return {"cooked": cooked, "skipped": skipped, "failed": failed}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m alkash3d.mesh.simplify",
+        description="Generate QEM LOD chains for OBJ meshes into the mesh cache.",
+    )
+    parser.add_argument("src", help="source directory (or a single .obj)")
+    parser.add_argument("--lods", type=int, default=3, help="levels including the original")
+    parser.add_argument("--ratio", type=float, default=0.5,
+                        help="triangle ratio between consecutive levels")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="rebuild existing chains")
+    parser.add_argument("--vertex-format", choices=sorted(FORMATS), default="float32",
+                        help="vertex layout of the cooked mesh")
+    args = parser.parse_args(argv)
+
+    src = Path(args.src)
+    if src.is_file():
+        print(cook_lods(src, args.lods, args.ratio, args.vertex_format))
+        return 0
+    stats = simplify_directory(src, args.lods, args.ratio, args.workers, args.force,
+                               args.vertex_format)
+    print(f"cooked {stats['cooked']}, skipped {stats['skipped']}, failed {stats['failed']}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
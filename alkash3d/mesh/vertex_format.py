@@ -0,0 +1,191 @@
+"""
+Компактные форматы вершин (кодируются один раз – при варке `.amesh`).
+
+Формат – номер раскладки вершинного потока; тот же номер – define
+`VERTEX_FORMAT` вершинного шейдера и input layout PSO
+(`create_graphics_ps(..., vertex_format)`):
+
+    0  FLOAT32    pos f32×3 | normal f32×3 | uv f32×2              32 B
+    1  COMPACT16  pos unorm16×4 | normal oct snorm16×2 | uv f16×2  16 B
+    2  COMPACT8   pos unorm16×3 | normal oct snorm8×2 | uv f16×2   12 B
+
+1️⃣  Позиции квантуются в 16 бит относительно куба вокруг AABB меша
+    (общий масштаб по осям): `p = offset + q / 65535 · scale`.
+    Деквантование не стоит шейдеру ничего – `position_decode`
+    (offset.xyz, scale) домножается на модельную матрицу
+    (`decode_model`); масштаб одинаковый по осям, поэтому нормали
+    после `normalize` не искажаются.
+2️⃣  Нормали – октаэдрическая развёртка единичной сферы на квадрат
+    [-1, 1]² (2 × snorm16 или 2 × snorm8, ~0.01° и ~1° ошибки);
+    декодирует вершинный шейдер (`vertex_decode.hlsli`).
+3️⃣  UV – half float (точность ~1/2048 на [0, 1]).
+
+В COMPACT8 нормаль занимает 4‑ю компоненту позиции (pos.w, байты
+6..7): элемент POSITION читается как R16G16B16A16_UNORM, но шейдер
+берёт только `xyz`, а NORMAL – R8G8_SNORM со смещением 6.
+
+Бэкенд без `supports_vertex_formats` получает поток, развёрнутый
+обратно в float32 (`decode_vertices(..., normalized=True)`): позиции
+остаются в единичном кубе, так что `decode_model` верна в обоих
+случаях.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+FLOAT32 = 0
+COMPACT16 = 1
+COMPACT8 = 2
+
+FORMATS = {"float32": FLOAT32, "compact16": COMPACT16, "compact8": COMPACT8}
+
+VERTEX_DTYPES = {
+    FLOAT32: np.dtype([("position", "<f4", 3), ("normal", "<f4", 3), ("texcoord", "<f4", 2)]),
+    COMPACT16: np.dtype([("position", "<u2", 4), ("normal", "<i2", 2), ("texcoord", "<f2", 2)]),
+    COMPACT8: np.dtype([("position", "<u2", 3), ("normal", "i1", 2), ("texcoord", "<f2", 2)]),
+}
+
+_NORMAL_BITS = {COMPACT16: 16, COMPACT8: 8}
+_POS_MAX = 65535.0
+
+IDENTITY_DECODE = np.array([0.0, 0.0, 0.0, 1.0], dtype=np.float32)
+
+
+def format_id(fmt) -> int:
+    """Номер формата по имени (`"compact16"`) или номеру."""
+    if isinstance(fmt, str):
+        try:
+            return FORMATS[fmt.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown vertex format: {fmt!r}") from None
+    fmt = int(fmt or 0)
+    if fmt not in VERTEX_DTYPES:
+        raise ValueError(f"Unknown vertex format: {fmt}")
+    return fmt
+
+
+def vertex_stride(fmt) -> int:
+    return VERTEX_DTYPES[format_id(fmt)].itemsize
+
+
+# ---------------------------------------------------------------------
+#   Позиции
+# ---------------------------------------------------------------------
+def quantize_positions(positions) -> tuple[np.ndarray, np.ndarray]:
+    """`(q uint16 (N, 3), decode float32[4] = offset.xyz, scale)`."""
+    p = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    if len(p) == 0:
+        return np.zeros((0, 3), dtype=np.uint16), IDENTITY_DECODE.copy()
+    lo = p.min(axis=0)
+    scale = float((p.max(axis=0) - lo).max()) or 1.0
+    q = np.rint((p - lo) * (_POS_MAX / scale))
+    decode = np.array([*lo, scale], dtype=np.float32)
+    return np.clip(q, 0, _POS_MAX).astype(np.uint16), decode
+
+
+def dequantize_positions(q, decode) -> np.ndarray:
+    """Позиции в координатах меша (float32, (N, 3))."""
+    decode = np.asarray(decode, dtype=np.float32)
+    unit = np.asarray(q, dtype=np.float32)[:, :3] * np.float32(1.0 / _POS_MAX)
+    return unit * decode[3] + decode[:3]
+
+
+def decode_model(model: np.ndarray, decode) -> np.ndarray:
+    """
+    Модельная матрица (формат `to_gl`) с деквантованием позиций:
+    `M · T(offset) · S(scale)`. `decode=None` – матрица как есть.
+    """
+    if decode is None:
+        return model
+    decode = np.asarray(decode, dtype=np.float32)
+    out = np.empty((4, 4), dtype=np.float32)
+    m = np.asarray(model, dtype=np.float32).reshape(4, 4)
+    out[:3] = m[:3] * decode[3]
+    out[3] = decode[0] * m[0] + decode[1] * m[1] + decode[2] * m[2] + m[3]
+    return out
+
+
+# ---------------------------------------------------------------------
+#   Нормали (октаэдр)
+# ---------------------------------------------------------------------
+def oct_encode(normals) -> np.ndarray:
+    """(N, 3) → (N, 2) в [-1, 1]²."""
+    n = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+    n = n / np.maximum(np.abs(n).sum(axis=1, keepdims=True), 1e-30)
+    e = n[:, :2].copy()
+    back = n[:, 2] < 0.0
+    folded = (1.0 - np.abs(e[back][:, ::-1])) * np.where(e[back] >= 0.0, 1.0, -1.0)
+    e[back] = folded
+    return e
+
+
+def oct_decode(e) -> np.ndarray:
+    """(N, 2) → единичные (N, 3); зеркально `OctDecode` в шейдере."""
+    e = np.asarray(e, dtype=np.float32).reshape(-1, 2)
+    n = np.empty((len(e), 3), dtype=np.float32)
+    n[:, :2] = e
+    n[:, 2] = 1.0 - np.abs(e).sum(axis=1)
+    t = np.clip(-n[:, 2], 0.0, None)[:, None]
+    n[:, :2] -= np.where(n[:, :2] >= 0.0, t, -t)
+    return n / np.maximum(np.linalg.norm(n, axis=1, keepdims=True), 1e-30)
+
+
+def encode_snorm(x, bits: int) -> np.ndarray:
+    top = (1 << (bits - 1)) - 1
+    dtype = np.int8 if bits == 8 else np.int16
+    return np.rint(np.clip(x, -1.0, 1.0) * top).astype(dtype)
+
+
+def decode_snorm(v, bits: int) -> np.ndarray:
+    """Как IA для SNORM: `max(v / (2^(n-1) − 1), −1)`."""
+    top = (1 << (bits - 1)) - 1
+    return np.maximum(np.asarray(v, dtype=np.float32) / top, -1.0)
+
+
+# ---------------------------------------------------------------------
+#   Поток вершин
+# ---------------------------------------------------------------------
+def encode_vertices(positions, normals=None, texcoords=None,
+                    fmt=COMPACT16) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Вершинный поток формата `fmt` (структурный массив `VERTEX_DTYPES`)
+    и `position_decode` (None для FLOAT32). Нет нормалей – (0, 0, 1),
+    нет UV – (0, 0), как в `mesh_file.interleave`.
+    """
+    fmt = format_id(fmt)
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    out = np.zeros(len(positions), dtype=VERTEX_DTYPES[fmt])
+    if normals is None or not len(normals):
+        normals = np.broadcast_to(np.array([0.0, 0.0, 1.0], np.float32), positions.shape)
+    if fmt == FLOAT32:
+        out["position"] = positions
+        out["normal"] = np.asarray(normals, dtype=np.float32).reshape(-1, 3)
+        decode = None
+    else:
+        q, decode = quantize_positions(positions)
+        out["position"][:, :3] = q
+        out["normal"] = encode_snorm(oct_encode(normals), _NORMAL_BITS[fmt])
+    if texcoords is not None and len(texcoords):
+        out["texcoord"] = np.asarray(texcoords, dtype=np.float32).reshape(-1, 2)
+    return out, decode
+
+
+def decode_vertices(stream: np.ndarray, fmt, decode=None,
+                    normalized: bool = False) -> np.ndarray:
+    """
+    Поток формата `fmt` → (N, 8) float32 `pos | normal | uv`.
+    `normalized` – позиции в единичном кубе (как их видит шейдер до
+    `decode_model`), иначе – в координатах меша по `decode`.
+    """
+    fmt = format_id(fmt)
+    out = np.empty((len(stream), 8), dtype=np.float32)
+    if fmt == FLOAT32:
+        out[:, 0:3] = stream["position"]
+        out[:, 3:6] = stream["normal"]
+    else:
+        q = stream["position"]
+        out[:, 0:3] = dequantize_positions(q, IDENTITY_DECODE if normalized else decode)
+        out[:, 3:6] = oct_decode(decode_snorm(stream["normal"], _NORMAL_BITS[fmt]))
+    out[:, 6:8] = stream["texcoord"]
+    return out
@@ -4,6 +4,8 @@
 
 from alkash3d.renderer.base_renderer import BaseRenderer
 from alkash3d.renderer.shader import Shader
+from alkash3d.renderer.shader_cache import ShaderCache
+from alkash3d.renderer.pipeline_registry import PipelineDesc, PipelineRegistry
 from alkash3d.renderer.pipelines.forward import ForwardRenderer
 from alkash3d.renderer.pipelines.deferred import DeferredRenderer
 from alkash3d.renderer.pipelines.hybrid import HybridRenderer
@@ -13,6 +15,9 @@ from alkash3d.renderer.pas import RenderPass
 __all__ = [
     "BaseRenderer",
     "Shader",
+    "ShaderCache",
+    "PipelineDesc",
+    "PipelineRegistry",
     "ForwardRenderer",
     "DeferredRenderer",
     "HybridRenderer",
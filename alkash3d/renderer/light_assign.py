@@ -0,0 +1,153 @@
+"""
+Назначение источников света объектам (per‑object light lists) для
+forward‑рендера.
+
+Для каждого видимого объекта выбираются `k` самых влиятельных
+источников – по пересечению ограничивающих сфер и затуханию в центре
+объекта. Всё считается матрицами NumPy «объекты × источники» (кусками,
+чтобы память не росла квадратично):
+
+1️⃣  `object_bounds` – мировые центры/радиусы всех объектов одним
+    умножением на массив матриц снимка;
+2️⃣  вклад `score[i, j]`: яркость × затухание (× конус прожектора);
+    источник, не достающий до сферы объекта, получает 0; направленные
+    влияют на всё;
+3️⃣  `argpartition` по строкам → k лучших, затем сортировка внутри k;
+4️⃣  `blocks` – (N, k) строк `LIGHT_CB_DTYPE`: константы `uDrawLights`
+    для каждой отрисовки берутся срезом без Python‑цикла по источникам.
+
+Если ни источники, ни объекты не изменились с прошлого кадра, `update`
+ничего не пересчитывает.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from alkash3d.renderer.light_buffer import LIGHT_CB_DTYPE
+
+MAX_DRAW_LIGHTS = 4                 # = MAX_DRAW_LIGHTS в forward_frag.hlsl
+_LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+_CHUNK_CELLS = 1 << 20              # пар (объект, источник) за один проход
+
+
+def object_bounds(nodes, transforms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Мировые ограничивающие сферы: `nodes` – узлы снимка, `transforms` –
+    их матрицы в формате `to_gl` (N, 4, 4). Узлы без bounds – точка.
+    """
+    n = len(nodes)
+    local = np.zeros((n, 4), dtype=np.float32)
+    local[:, 3] = 1.0
+    radii = np.zeros(n, dtype=np.float32)
+    for i, node in enumerate(nodes):
+        centre = getattr(node, "_bounding_center", None)
+        if centre is not None:
+            local[i, :3] = centre
+            radii[i] = getattr(node, "_bounding_radius", 0.0)
+    gl = transforms[:n]
+    centres = np.einsum("ni,nij->nj", local, gl)[:, :3]
+    # Масштаб – наибольшая длина базисного вектора (строки to_gl)
+    scale = np.linalg.norm(gl[:, :3, :3], axis=2).max(axis=1) if n else radii
+    return centres, radii * scale
+
+
+def light_scores(centres: np.ndarray, radii: np.ndarray, lights: np.ndarray) -> np.ndarray:
+    """Матрица вкладов (N объектов × L источников), float32."""
+    kind = lights["type"]
+    power = lights["intensity"] * (lights["color"] @ _LUMA)
+    delta = lights["position"][None, :, :] - centres[:, None, :]
+    dist = np.sqrt((delta * delta).sum(axis=2))
+    reach = np.maximum(lights["radius"], 1e-6)[None, :]
+
+    overlap = dist < reach + radii[:, None]
+    # Затухание в центре (как в шейдере); источник, задевающий только
+    # край сферы объекта, остаётся в списке с минимальным весом
+    att = np.clip(1.0 - dist / reach, 0.0, 1.0) + 1e-3
+
+    spot = kind == 2
+    if spot.any():
+        axis = lights["direction"][spot]
+        axis = axis / np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-12)
+        to_obj = -delta[:, spot] / np.maximum(dist[:, spot, None], 1e-12)
+        cos_t = (to_obj * axis[None]).sum(axis=2)
+        outer = lights["outer_cutoff"][spot][None]
+        inner = np.maximum(lights["inner_cutoff"][spot][None], outer + 1e-6)
+        cone = np.clip((cos_t - outer) / (inner - outer), 0.0, 1.0)
+        # Объект, внутри которого стоит прожектор, освещён всегда
+        inside = dist[:, spot] <= radii[:, None]
+        att[:, spot] *= np.where(inside, 1.0, cone + 1e-3)
+
+    score = np.where(overlap, att, 0.0) * power[None, :]
+    score[:, kind == 0] = power[kind == 0]
+    return score.astype(np.float32)
+
+
+class LightAssignment:
+    """Списки `k` источников на объект + упакованные per‑draw константы."""
+
+    def __init__(self, k: int = MAX_DRAW_LIGHTS):
+        self.k = int(k)
+        self.indices = np.full((0, self.k), -1, dtype=np.int32)
+        self.counts = np.zeros(0, dtype=np.int32)
+        self.blocks = np.zeros((0, self.k), dtype=LIGHT_CB_DTYPE)
+        self.recomputed = 0
+        self._key = None
+
+    # -----------------------------------------------------------------
+    def update(self, centres: np.ndarray, radii: np.ndarray, lights: np.ndarray,
+               light_version: int | None = None) -> bool:
+        """
+        Пересчитать списки; False – ничего не двигалось (кэш). Без
+        `light_version` источники сравниваются побайтно.
+        """
+        centres = np.ascontiguousarray(centres, dtype=np.float32)
+        radii = np.ascontiguousarray(radii, dtype=np.float32)
+        lights_id = light_version if light_version is not None else lights.tobytes()
+        key = self._key
+        if (key is not None and key[0] == lights_id
+                and np.array_equal(key[1], centres) and np.array_equal(key[2], radii)):
+            return False
+
+        n, k = len(centres), self.k
+        indices = np.full((n, k), -1, dtype=np.int32)
+        if n and len(lights):
+            chunk = max(1, _CHUNK_CELLS // len(lights))
+            for start in range(0, n, chunk):
+                stop = min(n, start + chunk)
+                indices[start:stop] = self._top_k(
+                    light_scores(centres[start:stop], radii[start:stop], lights))
+
+        valid = indices >= 0
+        rows = np.zeros((n, k), dtype=LIGHT_CB_DTYPE)
+        if valid.any():
+            src = lights[indices[valid]]
+            dst = rows[valid]
+            for name in LIGHT_CB_DTYPE.names:
+                dst[name] = src[name]
+            rows[valid] = dst
+
+        self.indices, self.blocks = indices, rows
+        self.counts = valid.sum(axis=1).astype(np.int32)
+        self._key = (lights_id, centres.copy(), radii.copy())
+        self.recomputed += 1
+        return True
+
+    def _top_k(self, score: np.ndarray) -> np.ndarray:
+        k = min(self.k, score.shape[1])
+        if score.shape[1] > k:
+            part = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(k), (len(score), k))
+        best = np.take_along_axis(score, part, axis=1)
+        order = np.argsort(-best, axis=1, kind="stable")
+        part = np.take_along_axis(part, order, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        out = np.full((len(score), self.k), -1, dtype=np.int32)
+        out[:, :k] = np.where(best > 0.0, part, -1)
+        return out
+
+    # -----------------------------------------------------------------
+    def draw_constants(self, i: int) -> tuple[int, bytes]:
+        """(число источников, байты `uDrawLights`) для i‑й отрисовки."""
+        return int(self.counts[i]), self.blocks[i].tobytes()
@@ -0,0 +1,111 @@
+"""
+GPU‑буфер источников света (`LightCB` в `deferred_light_frag.hlsl`).
+
+Раскладка cbuffer‑а (HLSL packing: 16‑байтные регистры):
+
+    offset 0   int   uNumLights; int uNumDirectional; uint2 pad
+    offset 16  Light lights[MAX_LIGHTS]   – по 64 байта:
+        float3 color;     float intensity;
+        float3 position;  float radius;
+        float3 direction; float innerCutoff;
+        int    type;      float outerCutoff; float2 pad;
+
+`LIGHT_CB_DTYPE` повторяет эту раскладку байт в байт, так что весь
+буфер – один NumPy‑массив. `update(lights)` (массив
+`snapshot.LIGHT_DTYPE`) ставит направленные источники первыми
+(`uNumDirectional`; порядок `rows` – тот, на который ссылаются списки
+кластеров), переписывает только изменившиеся строки и поднимает
+`version`; `upload()` / `bind()` – не больше одной записи
+в GPU за кадр и ни одной, если источники не менялись.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from alkash3d.utils.logger import logger
+
+MAX_LIGHTS = 1020                   # 16 + 1020 × 64 байт ≤ 64 КБ cbuffer‑а
+LIGHT_CB_HEADER = 16
+
+LIGHT_CB_DTYPE = np.dtype({
+    "names": ["color", "intensity", "position", "radius",
+              "direction", "inner_cutoff", "type", "outer_cutoff"],
+    "formats": [(np.float32, 3), np.float32, (np.float32, 3), np.float32,
+                (np.float32, 3), np.float32, np.int32, np.float32],
+    "offsets": [0, 12, 16, 28, 32, 44, 48, 52],
+    "itemsize": 64,
+})
+
+
+class LightBuffer:
+    """CPU‑копия `LightCB` + constant‑buffer и его дескриптор."""
+
+    def __init__(self, backend, capacity: int = MAX_LIGHTS):
+        self.backend = backend
+        self.capacity = int(capacity)
+        self.data = np.zeros(LIGHT_CB_HEADER + self.capacity * LIGHT_CB_DTYPE.itemsize,
+                             dtype=np.uint8)
+        self._header = self.data[:LIGHT_CB_HEADER].view(np.int32)
+        self.rows = self.data[LIGHT_CB_HEADER:].view(LIGHT_CB_DTYPE)
+        self._staging = np.zeros(self.capacity, dtype=LIGHT_CB_DTYPE)
+
+        self.count = 0
+        self.num_directional = 0
+        self.version = 0            # растёт при каждом изменении содержимого
+        self.uploads = 0
+        self._uploaded = -1         # версия, лежащая в GPU
+
+        self._cb = backend.create_constant_buffer(self.data.tobytes())
+        heap = backend.cbv_srv_uav_heap
+        idx = heap.next_free()
+        backend.create_shader_resource_view(self._cb, heap.get_cpu_handle(idx))
+        self._cb_gpu = heap.get_gpu_handle(idx)
+
+    # -----------------------------------------------------------------
+    def update(self, lights: np.ndarray) -> bool:
+        """
+        Записать источники (`LIGHT_DTYPE`); True – что‑то изменилось.
+        Переписываются только строки, отличающиеся от прошлого кадра.
+        """
+        n = len(lights)
+        if n > self.capacity:
+            logger.warning(f"[LightBuffer] {n} lights, only {self.capacity} uploaded")
+            n = self.capacity
+        # Направленные – первыми (стабильно), остальные – в исходном порядке
+        order = np.argsort(lights["type"][:n] != 0, kind="stable")
+        new = self._staging[:n]
+        for name in LIGHT_CB_DTYPE.names:
+            new[name] = lights[name][order]
+        num_directional = int(np.count_nonzero(lights["type"][:n] == 0))
+
+        cur = self.rows[:n]
+        row_bytes = LIGHT_CB_DTYPE.itemsize
+        changed = (cur.view(np.uint8).reshape(n, row_bytes)
+                   != new.view(np.uint8).reshape(n, row_bytes)).any(axis=1)
+        if n == self.count and not changed.any() and num_directional == self.num_directional:
+            return False
+        cur[changed] = new[changed]
+        if n < self.count:
+            self.rows[n:self.count] = np.zeros(1, dtype=LIGHT_CB_DTYPE)
+        self.count = n
+        self.num_directional = num_directional
+        self._header[0] = n
+        self._header[1] = num_directional
+        self.version += 1
+        return True
+
+    def upload(self) -> bool:
+        """Одна запись всего буфера в GPU, если версия изменилась."""
+        if self._uploaded == self.version:
+            return False
+        size = LIGHT_CB_HEADER + max(self.count, 1) * LIGHT_CB_DTYPE.itemsize
+        self.backend.update_buffer(self._cb, self.data[:size].tobytes())
+        self._uploaded = self.version
+        self.uploads += 1
+        return True
+
+    def bind(self, root_index: int = 0) -> None:
+        """Загрузить (при необходимости) и привязать таблицу `LightCB`."""
+        self.upload()
+        self.backend.set_root_descriptor_table(root_index, self._cb_gpu)
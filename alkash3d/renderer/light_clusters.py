@@ -0,0 +1,272 @@
+"""
+Кластерное (froxel) распределение источников света на CPU.
+
+Видимый объём камеры делится на сетку `tiles_x × tiles_y` экранных
+тайлов × `slices` срезов по глубине (экспоненциально от near до far).
+Для каждого точечного/прожекторного источника:
+
+1️⃣  консервативный диапазон кластеров – проекция view‑space AABB сферы
+    на экран и по глубине (векторно по всем источникам);
+2️⃣  точный тест пар (источник, кластер‑кандидат): сфера против AABB
+    кластера, для прожекторов дополнительно конус против описанной
+    сферы кластера – тоже векторно, одним массивом пар;
+3️⃣  пары сортируются по кластеру → компактный список индексов
+    `indices` и `offsets` / `counts` на кластер.
+
+Направленные источники в кластеры не попадают – шейдер перебирает их
+отдельно (первые `uNumDirectional` элементов `LightCB`, см.
+`light_buffer`). Индексы ссылаются на порядок `LightBuffer.rows`.
+
+`pack()` / `bind()` – раскладка `ClusterCB` из `deferred_light_frag.hlsl`
+(вариант `CLUSTERED`): view‑матрица, размеры сетки, параметры глубины,
+`(offset << 12) | count` по 4 на регистр и uint16‑индексы по 8 на
+регистр; всё в пределах 64 КБ cbuffer‑а. `ClusterCB` (b3) – отдельная
+таблица корневой подписи (`graphics.root_signature.ROOT_CLUSTER_CB`).
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from alkash3d.graphics.root_signature import ROOT_CLUSTER_CB
+from alkash3d.utils.logger import logger
+
+_CB_REGS = 4096                      # 64 КБ / 16 байт
+_HEADER_REGS = 6                     # float4x4 + uint4 + float4
+_MAX_COUNT = 0xFFF                   # 12 бит на число источников в кластере
+
+
+class LightClusters:
+    """Сетка кластеров + списки источников; при `backend` – и ClusterCB."""
+
+    def __init__(self, backend=None, tiles: tuple[int, int] = (16, 9),
+                 slices: int = 24):
+        self.tiles_x, self.tiles_y = int(tiles[0]), int(tiles[1])
+        self.slices = int(slices)
+        self.num_clusters = self.tiles_x * self.tiles_y * self.slices
+        self.grid_regs = (self.num_clusters + 3) // 4
+        self.max_indices = (_CB_REGS - _HEADER_REGS - self.grid_regs) * 8
+        if self.max_indices <= 0:
+            raise ValueError("[LightClusters] Grid does not fit into a constant buffer")
+
+        self.offsets = np.zeros(self.num_clusters, dtype=np.uint32)
+        self.counts = np.zeros(self.num_clusters, dtype=np.uint32)
+        self.indices = np.zeros(0, dtype=np.uint16)
+        self.pairs_tested = 0
+        self._bounds_key = None
+        self._aabb_min = self._aabb_max = None
+        self._view = np.identity(4, dtype=np.float32)
+        self._depth = (0.1, 1000.0)
+        self._warned = False
+
+        self.backend = backend
+        self._cb = self._cb_gpu = None
+        if backend is not None:
+            self._cb = backend.create_constant_buffer(bytes(_CB_REGS * 16))
+            heap = backend.cbv_srv_uav_heap
+            idx = heap.next_free()
+            backend.create_shader_resource_view(self._cb, heap.get_cpu_handle(idx))
+            self._cb_gpu = heap.get_gpu_handle(idx)
+
+    # -----------------------------------------------------------------
+    #   Define‑ы шейдера
+    # -----------------------------------------------------------------
+    def defines(self) -> dict:
+        """`CLUSTERED` (+ размеры сетки, если они не по умолчанию)."""
+        out = {"CLUSTERED": True}
+        if (self.tiles_x, self.tiles_y, self.slices) != (16, 9, 24):
+            out.update(CLUSTER_X=self.tiles_x, CLUSTER_Y=self.tiles_y,
+                       CLUSTER_Z=self.slices)
+        return out
+
+    # -----------------------------------------------------------------
+    #   Геометрия кластеров
+    # -----------------------------------------------------------------
+    def _slice_depths(self, near: float, far: float) -> np.ndarray:
+        k = np.arange(self.slices + 1, dtype=np.float64) / self.slices
+        return near * (far / near) ** k
+
+    def _cluster_bounds(self, sx: float, sy: float, near: float, far: float) -> None:
+        """View‑space AABB всех кластеров (кэш по параметрам проекции)."""
+        key = (sx, sy, near, far)
+        if key == self._bounds_key:
+            return
+        ndc_x = -1.0 + 2.0 * np.arange(self.tiles_x + 1) / self.tiles_x
+        ndc_y = -1.0 + 2.0 * np.arange(self.tiles_y + 1) / self.tiles_y
+        depth = self._slice_depths(near, far)
+
+        z0, z1 = depth[:-1, None, None], depth[1:, None, None]          # (Z,1,1)
+        x0, x1 = ndc_x[None, None, :-1] / sx, ndc_x[None, None, 1:] / sx  # (1,1,X)
+        y0, y1 = ndc_y[None, :-1, None] / sy, ndc_y[None, 1:, None] / sy  # (1,Y,1)
+        # x = ndc·d/sx: экстремумы – на ближней или дальней грани среза
+        xs = np.stack(np.broadcast_arrays(x0 * z0, x0 * z1, x1 * z0, x1 * z1))
+        ys = np.stack(np.broadcast_arrays(y0 * z0, y0 * z1, y1 * z0, y1 * z1))
+        shape = (self.slices, self.tiles_y, self.tiles_x)
+        lo = [np.broadcast_to(v, shape) for v in (xs.min(0), ys.min(0), -z1)]
+        hi = [np.broadcast_to(v, shape) for v in (xs.max(0), ys.max(0), -z0)]
+        self._aabb_min = np.stack(lo, axis=-1).reshape(-1, 3)
+        self._aabb_max = np.stack(hi, axis=-1).reshape(-1, 3)
+        self._bounds_key = key
+
+    # -----------------------------------------------------------------
+    #   Распределение
+    # -----------------------------------------------------------------
+    def build(self, lights: np.ndarray, view, proj, near: float, far: float) -> None:
+        """
+        Распределить источники по кластерам. `lights` – строки с полями
+        type/position/radius/direction/outer_cutoff (`LightBuffer.rows[:n]`
+        или `LIGHT_DTYPE`); `view` / `proj` – матрицы в формате снимка
+        (`to_gl`, т.е. транспонированные).
+        """
+        V = np.asarray(view, dtype=np.float64).reshape(4, 4).T
+        P = np.asarray(proj, dtype=np.float64).reshape(4, 4).T
+        self._view[:] = np.asarray(view, dtype=np.float32).reshape(4, 4)
+        self._depth = (float(near), float(far))
+        sx, sy = float(P[0, 0]), float(P[1, 1])
+        self._cluster_bounds(sx, sy, float(near), float(far))
+
+        local = np.flatnonzero((lights["type"] != 0) & (lights["radius"] > 0.0))
+        if local.size == 0:
+            self._set_lists(np.zeros(0, np.int64), np.zeros(0, np.int64))
+            return
+
+        pos = lights["position"][local].astype(np.float64)
+        centre = pos @ V[:3, :3].T + V[:3, 3]                      # view‑space
+        radius = lights["radius"][local].astype(np.float64)
+        dist = -centre[:, 2]                                       # глубина
+
+        # 1️⃣  Консервативный диапазон кластеров каждой сферы
+        d_lo = np.maximum(dist - radius, near)
+        d_hi = dist + radius
+        keep = (d_hi > near) & (d_lo < far)
+        x_lo = np.minimum((centre[:, 0] - radius) / d_lo, (centre[:, 0] - radius) / d_hi) * sx
+        x_hi = np.maximum((centre[:, 0] + radius) / d_lo, (centre[:, 0] + radius) / d_hi) * sx
+        y_lo = np.minimum((centre[:, 1] - radius) / d_lo, (centre[:, 1] - radius) / d_hi) * sy
+        y_hi = np.maximum((centre[:, 1] + radius) / d_lo, (centre[:, 1] + radius) / d_hi) * sy
+        keep &= (x_hi > -1.0) & (x_lo < 1.0) & (y_hi > -1.0) & (y_lo < 1.0)
+        # Сфера, задевающая плоскость камеры, может проецироваться куда угодно
+        straddle = dist - radius <= near
+        x_lo[straddle], y_lo[straddle] = -1.0, -1.0
+        x_hi[straddle], y_hi[straddle] = 1.0, 1.0
+
+        def tile_range(lo, hi, n):
+            a = np.clip(np.floor((lo + 1.0) * 0.5 * n), 0, n - 1).astype(np.int64)
+            b = np.clip(np.floor((hi + 1.0) * 0.5 * n), 0, n - 1).astype(np.int64)
+            return a, b - a + 1
+
+        log_scale = self.slices / math.log(far / near)
+        z_a = np.clip(np.floor(np.log(d_lo / near) * log_scale), 0, self.slices - 1).astype(np.int64)
+        z_b = np.clip(np.floor(np.log(np.clip(d_hi, near, far) / near) * log_scale),
+                      0, self.slices - 1).astype(np.int64)
+        tx, wx = tile_range(x_lo, x_hi, self.tiles_x)
+        ty, wy = tile_range(y_lo, y_hi, self.tiles_y)
+        tz, wz = z_a, z_b - z_a + 1
+
+        sel = np.flatnonzero(keep)
+        if sel.size == 0:
+            self._set_lists(np.zeros(0, np.int64), np.zeros(0, np.int64))
+            return
+        tx, wx, ty, wy, tz, wz = tx[sel], wx[sel], ty[sel], wy[sel], tz[sel], wz[sel]
+
+        # 2️⃣  Все пары (источник, кластер‑кандидат) одним массивом
+        per_light = wx * wy * wz
+        total = int(per_light.sum())
+        owner = np.repeat(np.arange(sel.size), per_light)
+        starts = np.cumsum(per_light) - per_light
+        k = np.arange(total) - np.repeat(starts, per_light)
+        wyz = (wy * wz)[owner]
+        ix = tx[owner] + k // wyz
+        rem = k % wyz
+        iy = ty[owner] + rem // wz[owner]
+        iz = tz[owner] + rem % wz[owner]
+        cid = (iz * self.tiles_y + iy) * self.tiles_x + ix
+
+        li = sel[owner]
+        c, r = centre[li], radius[li]
+        lo, hi = self._aabb_min[cid], self._aabb_max[cid]
+        closest = np.clip(c, lo, hi)
+        hit = ((closest - c) ** 2).sum(axis=1) <= r * r
+
+        # Прожекторы: конус против описанной сферы кластера
+        spot = lights["type"][local][li] == 2
+        if spot.any():
+            axis = lights["direction"][local][li[spot]].astype(np.float64) @ V[:3, :3].T
+            axis /= np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-12)
+            cos_a = lights["outer_cutoff"][local][li[spot]].astype(np.float64)
+            sin_a = np.sqrt(np.maximum(0.0, 1.0 - cos_a * cos_a))
+            sc = (lo[spot] + hi[spot]) * 0.5
+            sr = np.linalg.norm(hi[spot] - lo[spot], axis=1) * 0.5
+            v = sc - c[spot]
+            v_len2 = (v * v).sum(axis=1)
+            v1 = (v * axis).sum(axis=1)
+            closest_d = cos_a * np.sqrt(np.maximum(v_len2 - v1 * v1, 0.0)) - v1 * sin_a
+            inside = ~((closest_d > sr) | (v1 > sr + r[spot]) | (v1 < -sr))
+            hit[spot] &= inside
+
+        self.pairs_tested = total
+        self._set_lists(cid[hit], local[li[hit]])
+
+    def _set_lists(self, cid: np.ndarray, light_index: np.ndarray) -> None:
+        # 3️⃣  Сортировка пар по кластеру → offsets / counts / indices
+        order = np.argsort(cid, kind="stable")
+        cid, light_index = cid[order], light_index[order]
+        if cid.size > self.max_indices:
+            if not self._warned:
+                logger.warning(f"[LightClusters] {cid.size} light/cluster pairs, "
+                               f"keeping {self.max_indices}")
+                self._warned = True
+            cid, light_index = cid[:self.max_indices], light_index[:self.max_indices]
+        counts = np.bincount(cid, minlength=self.num_clusters)
+        if counts.max(initial=0) > _MAX_COUNT:
+            # Переполненные кластеры обрезаются до 4095 источников
+            rank = np.arange(cid.size) - (np.cumsum(counts) - counts)[cid]
+            keep = rank < _MAX_COUNT
+            cid, light_index = cid[keep], light_index[keep]
+            counts = np.bincount(cid, minlength=self.num_clusters)
+        self.counts = counts.astype(np.uint32)
+        self.offsets = (np.cumsum(counts) - counts).astype(np.uint32)
+        self.indices = light_index.astype(np.uint16)
+
+    # -----------------------------------------------------------------
+    #   Запросы / статистика
+    # -----------------------------------------------------------------
+    def cluster_lights(self, cluster: int) -> np.ndarray:
+        o, n = int(self.offsets[cluster]), int(self.counts[cluster])
+        return self.indices[o:o + n]
+
+    def stats(self) -> dict:
+        occupied = self.counts[self.counts > 0]
+        return {
+            "pairs_tested": self.pairs_tested,
+            "indices": int(self.indices.size),
+            "max_per_cluster": int(occupied.max(initial=0)),
+            "mean_per_occupied": float(occupied.mean()) if occupied.size else 0.0,
+        }
+
+    # -----------------------------------------------------------------
+    #   GPU
+    # -----------------------------------------------------------------
+    def pack(self) -> bytes:
+        """Содержимое `ClusterCB` (только используемая часть)."""
+        near, far = self._depth
+        header = np.zeros(24, dtype=np.float32)
+        header[:16] = self._view.reshape(16)
+        header[16:20].view(np.uint32)[:] = (self.tiles_x, self.tiles_y, self.slices, 0)
+        header[20:24] = (near, far, self.slices / math.log(far / near), 0.0)
+
+        grid = np.zeros(self.grid_regs * 4, dtype=np.uint32)
+        grid[:self.num_clusters] = (self.offsets << 12) | self.counts
+
+        n = self.indices.size
+        idx = np.zeros(((n + 7) // 8) * 8, dtype=np.uint16)
+        idx[:n] = self.indices
+        return header.tobytes() + grid.tobytes() + idx.tobytes()
+
+    def bind(self, root_index: int = ROOT_CLUSTER_CB) -> None:
+        """Одна запись ClusterCB за кадр + привязка таблицы."""
+        if self.backend is None:
+            return
+        self.backend.update_buffer(self._cb, self.pack())
+        self.backend.set_root_descriptor_table(root_index, self._cb_gpu)
@@ -0,0 +1,91 @@
+"""
+Выбор LOD по экранному размеру ограничивающей сферы.
+
+LOD‑цепочка меша – диапазоны одного индексного буфера
+(`Mesh.lod_ranges`, `mesh_file.LOD_DTYPE`); вершинный буфер общий.
+Каждый следующий уровень рассчитан примерно на вдвое меньший экранный
+размер, поэтому уровень – это log2 отношения размеров:
+
+    size  = r · P[1,1] / dist          – доля высоты экрана
+    x     = log2(lod0_size / size) + bias
+    level = ceil(x), в пределах [0, lod_count − 1]
+
+Всё считается одним проходом NumPy по всем видимым узлам кадра.
+
+Гистерезис: уровень прошлого кадра сохраняется, пока `x` не выйдет за
+его интервал `(L − 1, L]`, расширенный на `hysteresis` – объект на
+границе не «мигает» между уровнями. `bias` (> 0 – грубее) – глобальная
+настройка производительности (`lod_bias` в конфиге).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class LODSelector:
+    """Пакетный выбор уровней детализации для узлов кадра."""
+
+    def __init__(self, bias: float = 0.0, lod0_size: float = 0.25,
+                 hysteresis: float = 0.15):
+        self.bias = float(bias)
+        self.lod0_size = float(lod0_size)
+        self.hysteresis = float(hysteresis)
+
+    # -----------------------------------------------------------------
+    @staticmethod
+    def screen_sizes(centres: np.ndarray, radii: np.ndarray, cam_pos,
+                     proj, near: float = 0.1) -> np.ndarray:
+        """Диаметр сферы в долях высоты экрана (`proj` – формат снимка)."""
+        p11 = float(np.asarray(proj, dtype=np.float32).reshape(4, 4)[1, 1])
+        dist = np.linalg.norm(centres - np.asarray(cam_pos, np.float32), axis=1)
+        return radii * p11 / np.maximum(dist, near)
+
+    def levels(self, sizes: np.ndarray, lod_counts: np.ndarray,
+               previous: np.ndarray | None = None) -> np.ndarray:
+        """Уровни по экранным размерам (с гистерезисом относительно `previous`)."""
+        x = np.log2(self.lod0_size / np.maximum(sizes, 1e-9)) + self.bias
+        level = np.ceil(x)
+        if previous is not None:
+            h = self.hysteresis
+            keep = (x > previous - 1.0 - h) & (x <= previous + h)
+            level = np.where(keep, previous, level)
+        top = np.maximum(np.asarray(lod_counts) - 1, 0)
+        return np.clip(level, 0, top).astype(np.int32)
+
+    # -----------------------------------------------------------------
+    def select(self, nodes, transforms: np.ndarray, cam_pos, proj,
+               near: float = 0.1) -> np.ndarray:
+        """
+        Уровни для `nodes` с матрицами `transforms` (`to_gl`, (N, 4, 4)).
+        Узлы без LOD‑цепочки получают 0; выбранный уровень запоминается
+        в `node.lod` (состояние гистерезиса, только update‑поток).
+        """
+        n = len(nodes)
+        out = np.zeros(n, dtype=np.int32)
+        chained = [i for i, node in enumerate(nodes) if getattr(node, "lod_count", 1) > 1]
+        if not chained:
+            return out
+
+        sel = np.asarray(chained)
+        local = np.ones((len(sel), 4), dtype=np.float32)
+        radii = np.empty(len(sel), dtype=np.float32)
+        counts = np.empty(len(sel), dtype=np.int32)
+        previous = np.empty(len(sel), dtype=np.float64)
+        for j, i in enumerate(chained):
+            node = nodes[i]
+            local[j, :3] = node._bounding_center
+            radii[j] = node._bounding_radius
+            counts[j] = node.lod_count
+            previous[j] = node.lod
+
+        gl = transforms[sel]
+        centres = np.einsum("ni,nij->nj", local, gl)[:, :3]
+        radii = radii * np.linalg.norm(gl[:, :3, :3], axis=2).max(axis=1)
+        sizes = self.screen_sizes(centres, radii, cam_pos, proj, near)
+        levels = self.levels(sizes, counts, previous)
+
+        out[sel] = levels
+        for j, i in enumerate(chained):
+            nodes[i].lod = int(levels[j])
+        return out
@@ -0,0 +1,88 @@
+"""
+Перестановки (варианты) шейдеров по define‑ам.
+
+Вариант – набор define‑ов; ключ (`variant_key`) – отсортированный
+кортеж без «выключенных» флагов, поэтому `{"ALPHA_TEST": False}` и `{}`
+– один и тот же вариант. Компилирует и кэширует варианты `Shader.use(
+features)` через `ShaderCache` (лениво, один раз на процесс/диск).
+
+Набор флагов намеренно мал, чтобы число вариантов оставалось
+ограниченным:
+
+* материал / меш – `HAS_TEXCOORDS`, `HAS_ALBEDO_MAP`, `HAS_NORMAL_MAP`,
+  `ALPHA_TEST` (`material_features`);
+* освещение – `LIGHT_COUNT` (корзина из `LIGHT_BUCKETS`, а не точное
+  число) и `LIGHT_TYPES` (битовая маска: 1 – directional, 2 – point,
+  4 – spot) (`light_features`); не более 6 × 7 вариантов;
+  `CLUSTERED` – списки источников по кластерам (`light_clusters`);
+* вершины – `VERTEX_FORMAT` (компактная раскладка меша,
+  `alkash3d.mesh.vertex_format`; `vertex_features`), не более 3
+  вариантов.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Верхние границы циклов по источникам в lighting‑шейдере
+LIGHT_BUCKETS = (1, 4, 16, 64, 256, 1024)
+
+# Биты `LIGHT_TYPES` по `light["type"]` (0 – dir, 1 – point, 2 – spot)
+LIGHT_TYPE_BITS = {0: 1, 1: 2, 2: 4}
+
+
+def variant_key(defines: dict | None) -> tuple:
+    """Нормализованный ключ варианта: без False/None, True → 1."""
+    out = []
+    for name, value in (defines or {}).items():
+        if value is None or value is False:
+            continue
+        out.append((name, 1 if value is True else value))
+    return tuple(sorted(out))
+
+
+def light_bucket(count: int) -> int:
+    """Наименьшая корзина ≥ `count` (0 источников → 1)."""
+    for bucket in LIGHT_BUCKETS:
+        if count <= bucket:
+            return bucket
+    return LIGHT_BUCKETS[-1]
+
+
+def light_features(lights) -> dict:
+    """
+    Define‑ы lighting‑шейдера для источников: массив `LIGHT_DTYPE` или
+    список словарей с ключом `"type"`.
+    """
+    if isinstance(lights, np.ndarray):
+        types = lights["type"]
+    else:
+        types = np.fromiter((light["type"] for light in lights), dtype=np.int32)
+    mask = 0
+    for t in np.unique(types):
+        mask |= LIGHT_TYPE_BITS.get(int(t), 0)
+    return {"LIGHT_COUNT": light_bucket(len(lights)), "LIGHT_TYPES": mask or 1}
+
+
+def vertex_features(mesh, backend=None) -> dict:
+    """
+    `VERTEX_FORMAT` для меша: компактный поток декодирует шейдер, если
+    бэкенд умеет его input layout (иначе меш грузится как float32).
+    """
+    fmt = int(getattr(mesh, "vertex_format", 0) or 0)
+    if fmt and getattr(backend, "supports_vertex_formats", False):
+        return {"VERTEX_FORMAT": fmt}
+    return {}
+
+
+def material_features(material, mesh=None) -> dict:
+    """
+    Минимальный вариант для пары материал/меш: карты читаются, только
+    если у меша есть UV; без материала – вариант без текстур.
+    """
+    has_uv = bool(getattr(mesh, "has_texcoords", mesh is None))
+    feats = {"HAS_TEXCOORDS": has_uv}
+    if material is not None and hasattr(material, "shader_features"):
+        for name, value in material.shader_features().items():
+            feats[name] = bool(value) and (has_uv or name == "ALPHA_TEST")
+    return feats
@@ -0,0 +1,199 @@
+"""
+Реестр пайплайнов и параллельный «прогрев» при старте.
+
+Рендереры объявляют свои комбинации заранее – атрибутом класса
+`PIPELINES` (кортеж `PipelineDesc`) – и создают шейдеры из них же
+(`Shader.from_desc`). До конструктора рендерера движок вызывает
+`PipelineRegistry.warm_up(...)`:
+
+1️⃣  все уникальные варианты (стадия, исходник, define‑ы) компилируются
+    задачами `JobSystem` (компилятор отпускает GIL в ctypes‑вызове);
+2️⃣  PSO каждой пары создаётся задачей, зависящей от двух своих
+    компиляций (`after=`);
+3️⃣  результат оседает в `ShaderCache`, поэтому конструктор рендерера и
+    первый кадр берут готовые blob‑ы и PSO из памяти.
+
+Прогресс – `progress(done, total, label)` (из рабочих потоков).
+
+Запись сессии: `Shader.use()` отмечает пайплайн в реестре
+(`record`), `save_recorded(path)` сохраняет список в JSON, а
+`load_recorded(path)` на следующем запуске добавляет его к набору
+прогрева.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from alkash3d.jobs import JobCounter, JobSystem
+from alkash3d.renderer.permutations import variant_key
+from alkash3d.renderer.shader_cache import ShaderCache
+from alkash3d.utils.cache import atomic_write
+from alkash3d.utils.logger import logger
+
+RESOURCE_ROOT = Path(__file__).resolve().parents[2] / "resources"
+
+
+@dataclass(frozen=True)
+class PipelineDesc:
+    """
+    Пара шейдеров + define‑ы + метка состояния.
+
+    Пути – относительно `resources/` (или абсолютные). `state` – метка
+    состояния конвейера (blend/depth); нативный `create_graphics_ps`
+    пока создаёт PSO с фиксированным состоянием, метка разделяет ключи.
+    """
+    vertex: str
+    fragment: str
+    defines: tuple = ()             # (("NAME", value), ...) – отсортированы
+    state: str = "default"
+
+    @classmethod
+    def make(cls, vertex, fragment, defines: dict | None = None,
+             state: str = "default") -> "PipelineDesc":
+        return cls(str(vertex), str(fragment), variant_key(defines), state)
+
+    @property
+    def vertex_path(self) -> Path:
+        return RESOURCE_ROOT / self.vertex
+
+    @property
+    def fragment_path(self) -> Path:
+        return RESOURCE_ROOT / self.fragment
+
+    @property
+    def define_map(self) -> dict | None:
+        return dict(self.defines) or None
+
+    def to_json(self) -> dict:
+        return {"vertex": self.vertex, "fragment": self.fragment,
+                "defines": dict(self.defines), "state": self.state}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PipelineDesc":
+        return cls.make(data["vertex"], data["fragment"],
+                        data.get("defines"), data.get("state", "default"))
+
+
+class PipelineRegistry:
+    """Объявленные/использованные пайплайны одного бэкенда + прогрев."""
+
+    _shared: dict[int, "PipelineRegistry"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, backend, cache: ShaderCache | None = None):
+        self.backend = backend
+        self.cache = cache or ShaderCache.shared(backend)
+        self._used: dict[PipelineDesc, None] = {}        # порядок первого use()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, backend) -> "PipelineRegistry":
+        with cls._shared_lock:
+            reg = cls._shared.get(id(backend))
+            if reg is None or reg.backend is not backend:
+                reg = cls._shared[id(backend)] = cls(backend)
+            return reg
+
+    # -----------------------------------------------------------------
+    #   Запись сессии
+    # -----------------------------------------------------------------
+    def record(self, desc: PipelineDesc) -> None:
+        with self._lock:
+            self._used.setdefault(desc, None)
+
+    def recorded(self) -> list[PipelineDesc]:
+        with self._lock:
+            return list(self._used)
+
+    def save_recorded(self, path) -> int:
+        descs = self.recorded()
+        with atomic_write(path) as f:
+            f.write(json.dumps([d.to_json() for d in descs], indent=2).encode("utf-8"))
+        return len(descs)
+
+    @staticmethod
+    def load_recorded(path) -> list[PipelineDesc]:
+        """Список из `save_recorded`; битый/отсутствующий файл – пусто."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            return [PipelineDesc.from_json(d) for d in data]
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            if Path(path).exists():
+                logger.warning(f"[PipelineRegistry] Ignoring {path}: {exc}")
+            return []
+
+    # -----------------------------------------------------------------
+    #   Прогрев
+    # -----------------------------------------------------------------
+    def warm_up(self, descs, jobs: JobSystem | None = None, workers: int = 0,
+                progress=None) -> dict:
+        """
+        Скомпилировать и создать PSO для `descs` параллельно.
+        `jobs` – общий пул движка; без него создаётся временный.
+        Возвращает `{"pipelines", "failed", "ms"}`.
+        """
+        unique = []
+        for d in dict.fromkeys(descs):
+            if d.vertex_path.is_file() and d.fragment_path.is_file():
+                unique.append(d)
+            else:
+                logger.warning(f"[PipelineRegistry] Missing sources, skipped: "
+                               f"{d.vertex} / {d.fragment}")
+        stages = {}
+        for d in unique:
+            stages.setdefault(("vs", d.vertex, d.defines), d)
+            stages.setdefault(("ps", d.fragment, d.defines), d)
+
+        total = len(stages) + len(unique)
+        t0 = time.perf_counter()
+        if not total:
+            return {"pipelines": 0, "failed": 0, "ms": 0.0}
+
+        own = jobs is None
+        if own:
+            jobs = JobSystem(num_workers=workers)
+        state = {"done": 0, "failed": 0}
+        lock = threading.Lock()
+
+        def step(label, ok):
+            with lock:
+                state["done"] += 1
+                state["failed"] += 0 if ok else 1
+                done = state["done"]
+            if progress is not None:
+                progress(done, total, label)
+
+        def compile_stage(stage, path, d):
+            blob = self.cache.compile(stage, path, d.define_map)
+            step(Path(path).name, bool(blob))
+
+        def create_pso(d):
+            _, _, pso = self.cache.pipeline(d.vertex_path, d.fragment_path,
+                                            d.define_map)
+            step(f"{Path(d.vertex).stem}+{Path(d.fragment).stem}", bool(pso))
+
+        counter = JobCounter()
+        try:
+            compile_jobs = {}
+            for (stage, rel, defines), d in stages.items():
+                path = d.vertex_path if stage == "vs" else d.fragment_path
+                compile_jobs[(stage, rel, defines)] = jobs.submit(
+                    compile_stage, stage, path, d, name=f"compile:{rel}", counter=counter)
+            for d in unique:
+                deps = [compile_jobs[("vs", d.vertex, d.defines)],
+                        compile_jobs[("ps", d.fragment, d.defines)]]
+                jobs.submit(create_pso, d, name="pso", counter=counter, after=deps)
+            counter.wait(jobs)
+        finally:
+            if own:
+                jobs.shutdown()
+
+        ms = (time.perf_counter() - t0) * 1000.0
+        logger.info(f"[PipelineRegistry] Warm-up: {len(unique)} pipeline(s), "
+                    f"{state['failed']} failed, {ms:.1f} ms")
+        return {"pipelines": len(unique), "failed": state["failed"], "ms": ms}
@@ -2,15 +2,21 @@
 import ctypes
 import numpy as np
 from pathlib import Path
+from alkash3d.graphics.root_signature import ROOT_CLUSTER_CB
 from alkash3d.renderer.base_renderer import BaseRenderer
+from alkash3d.renderer.permutations import light_features
+from alkash3d.renderer.light_buffer import LightBuffer
+from alkash3d.renderer.light_clusters import LightClusters
+from alkash3d.renderer.lod import LODSelector
+from alkash3d.renderer.pipeline_registry import PipelineDesc
 from alkash3d.renderer.shader import Shader
+from alkash3d.renderer.snapshot import RenderSnapshot
 from alkash3d.utils import logger, gl_check_error
-from alkash3d.scene.light import DirectionalLight, PointLight, SpotLight
-from alkash3d.scene.mesh import Mesh
 from alkash3d.culling.bvh import BVH
 from alkash3d.graphics import select_backend
 
-MAX_LIGHTS = 256
+MAX_LIGHTS = 1020                   # = MAX_LIGHTS в deferred_light_frag.hlsl
+CLUSTER_MIN_LIGHTS = 16             # меньше локальных источников – простой цикл
 
 # -------------------------------------------------------------
 # Корневой каталог проекта → resources/shaders
@@ -19,34 +25,60 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]   # …/AlKAsH3D-Engine
 SHADER_DIR = PROJECT_ROOT / "resources" / "shaders"
 
 
+def prepare_lights(light_buffer: LightBuffer, clusters: LightClusters, lights,
+                   view, proj, near: float, far: float) -> tuple[dict, bool]:
+    """
+    Записать источники в LightCB и выбрать путь освещения: при многих
+    локальных источниках – кластерные списки (`clusters.build`), иначе
+    цикл по корзине числа источников. Возвращает `(features, clustered)`
+    для `light_shader.use` / `clusters.bind`.
+    """
+    lights = lights[:light_buffer.capacity]
+    light_buffer.update(lights)
+    features = light_features(lights)
+    num_local = light_buffer.count - light_buffer.num_directional
+    if num_local < CLUSTER_MIN_LIGHTS:
+        return features, False
+    clusters.build(light_buffer.rows[:light_buffer.count], view, proj, near, far)
+    return {**clusters.defines(), "LIGHT_TYPES": features["LIGHT_TYPES"]}, True
+
+
 class DeferredRenderer(BaseRenderer):
     """Deferred‑renderer с PBR‑G‑buffer и простым кластер‑lighting."""
 
+    PIPELINES = (
+        PipelineDesc("shaders/deferred_geom_vert.hlsl", "shaders/deferred_geom_frag.hlsl"),
+        PipelineDesc("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl"),
+        PipelineDesc.make("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl",
+                          {"LIGHT_COUNT": 1, "LIGHT_TYPES": 1}),
+        PipelineDesc.make("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl",
+                          {"LIGHT_COUNT": 16, "LIGHT_TYPES": 7}),
+        PipelineDesc.make("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl",
+                          {"CLUSTERED": True, "LIGHT_TYPES": 7}),
+    )
+
     def __init__(self, window, backend=None):
         self.window = window
         self.backend = backend or select_backend("dx12")
         self.width, self.height = window.width, window.height
 
         # Geometry‑pass shaders
-        self.geom_shader = Shader(
-            vertex_path=str(SHADER_DIR / "deferred_geom_vert.hlsl"),
-            fragment_path=str(SHADER_DIR / "deferred_geom_frag.hlsl"),
-            backend=self.backend,
-        )
+        self.geom_shader = Shader.from_desc(self.backend, self.PIPELINES[0])
 
         # Lighting‑pass shaders
-        self.light_shader = Shader(
-            vertex_path=str(SHADER_DIR / "deferred_light_vert.hlsl"),
-            fragment_path=str(SHADER_DIR / "deferred_light_frag.hlsl"),
-            backend=self.backend,
-        )
+        self.light_shader = Shader.from_desc(self.backend, self.PIPELINES[1])
 
         # G‑buffer (4 render‑targets)
         self._setup_gbuffer()
         self._setup_quad()
         self._setup_state()
+        self.light_buffer = LightBuffer(self.backend, MAX_LIGHTS)
+        self.clusters = LightClusters(self.backend)
 
         self.bvh = BVH()  # ускоритель (заглушка)
+        self.lod = LODSelector()
+        self.jobs = None        # JobSystem движка (culling), задаёт Engine
+        self._snapshot = RenderSnapshot()
 
     # -----------------------------------------------------------------
     def _setup_gbuffer(self):
@@ -103,38 +135,51 @@ class DeferredRenderer(BaseRenderer):
 
     # -----------------------------------------------------------------
     def render(self, scene, camera):
+        """Последовательный режим: снимок сцены + его отрисовка."""
+        self.render_snapshot(self.capture_snapshot(self._snapshot, scene, camera))
+
+    def capture_snapshot(self, snap: RenderSnapshot, scene, camera) -> RenderSnapshot:
+        """Заполнить снимок видимыми узлами (update‑поток)."""
+        return snap.capture(scene, camera, self.width / self.height, lod=self.lod,
+                            jobs=self.jobs, backend=self.backend)
+
+    # -----------------------------------------------------------------
+    def render_snapshot(self, snap: RenderSnapshot):
+        """Отрисовать кадр только по данным снимка (render‑поток)."""
         # -------------------------------------------------------------
         # 1️⃣ Geometry‑pass → G‑buffer
         # -------------------------------------------------------------
         self.backend.begin_frame()
+        self.geom_shader.begin_frame()
+        self.light_shader.begin_frame()
 
         # привязываем все 4 RTV
         self.backend.set_render_targets(self.rtv_handles)
 
         self.geom_shader.use()
-        self.geom_shader.set_uniform_mat4("uView", camera.get_view_matrix())
-        self.geom_shader.set_uniform_mat4("uProj", camera.get_projection_matrix(self.width / self.height))
-
-        # culling (упрощённый)
-        cam_pos = camera.position.as_np()
-        for node in scene.visible_nodes(camera):
-            if not hasattr(node, "draw"):
+        self.geom_shader.set_uniform_mat4("uView", snap.view)
+        self.geom_shader.set_uniform_mat4("uProj", snap.proj)
+
+        # culling (упрощённый) – по сферам снимка, не по живым узлам
+        bound_pso = self.geom_shader.pso
+        n = snap.count
+        dist = np.linalg.norm(snap.centres[:n] - snap.cam_pos, axis=1)
+        radii = snap.radii[:n]
+        keep = (dist - radii <= snap.far) & (dist + radii >= snap.near)
+        for visible, (call, features, srv, model, *_) in zip(keep, snap.draws()):
+            if not visible:
                 continue
-            if isinstance(node, Mesh):
-                centre, radius = node.bounding_sphere
-                dist = np.linalg.norm(centre - cam_pos)
-                if dist - radius > camera.far:
-                    continue
-                if dist + radius < camera.near:
-                    continue
-
-            model = node.get_world_matrix().to_gl()
             self.geom_shader.set_uniform_mat4("uModel", model)
 
-            if hasattr(node, "material"):
-                node.material.bind(self.backend)
+            pso = self.geom_shader.variant(features)
+            if pso != bound_pso:
+                self.backend.set_graphics_pipeline(pso)
+                bound_pso = pso
+            if srv is not None:
+                self.backend.set_root_descriptor_table(1, srv)
 
-            node.draw(self.backend)
+            self.geom_shader.commit()
+            call.submit(self.backend)
 
         # -------------------------------------------------------------
         # 2️⃣ Lighting‑pass (fullscreen)
@@ -144,8 +189,13 @@ class DeferredRenderer(BaseRenderer):
         self.backend.set_render_target(back_rtv)
         self.backend.clear_render_target(back_rtv, (0.07, 0.07, 0.08, 1.0))
 
-        self.light_shader.use()
-        self.light_shader.set_uniform_vec3("uCamPos", camera.position)
+        # bind lights (упакованы в snap.lights) – LightCB целиком, одной
+        # записью и только если источники изменились
+        features, clustered = prepare_lights(self.light_buffer, self.clusters,
+                                             snap.active_lights, snap.view, snap.proj,
+                                             snap.near, snap.far)
+        self.light_shader.use(features)
+        self.light_shader.set_uniform_vec3("uCamPos", snap.cam_pos)
 
         # bind G‑buffer textures (SRV) – каждый SRV уже находится в cbv_srv_uav‑heap
         for i, name in enumerate(self.gbuffer_textures):
@@ -153,28 +203,10 @@ class DeferredRenderer(BaseRenderer):
             gpu_handle = self.backend.cbv_srv_uav_heap.get_gpu_handle(i)
             self.backend.set_root_descriptor_table(i, gpu_handle)
 
-        # bind lights
-        lights = [
-            n for n in scene.traverse()
-            if isinstance(n, (DirectionalLight, PointLight, SpotLight))
-        ]
-        self.light_shader.set_uniform_int("uNumLights", min(len(lights), MAX_LIGHTS))
-        for i, light in enumerate(lights[:MAX_LIGHTS]):
-            uni = light.get_uniforms()
-            prefix = f"lights[{i}]"
-            self.light_shader.set_uniform_int(f"{prefix}.type", uni["type"])
-            self.light_shader.set_uniform_vec3(f"{prefix}.color", uni["color"])
-            self.light_shader.set_uniform_float(f"{prefix}.intensity", uni["intensity"])
-            if uni["type"] == 0:  # directional
-                self.light_shader.set_uniform_vec3(f"{prefix}.direction", uni["direction"])
-            elif uni["type"] == 1:  # point
-                self.light_shader.set_uniform_vec3(f"{prefix}.position", uni["position"])
-                self.light_shader.set_uniform_float(f"{prefix}.radius", uni["radius"])
-            elif uni["type"] == 2:  # spot
-                self.light_shader.set_uniform_vec3(f"{prefix}.position", uni["position"])
-                self.light_shader.set_uniform_vec3(f"{prefix}.spotDir", uni["direction"])
-                self.light_shader.set_uniform_float(f"{prefix}.innerCutoff", uni["innerCutoff"])
-                self.light_shader.set_uniform_float(f"{prefix}.outerCutoff", uni["outerCutoff"])
+        self.light_shader.commit()
+        self.light_buffer.bind(0)
+        if clustered:
+            self.clusters.bind(ROOT_CLUSTER_CB)      # ClusterCB : register(b3)
 
         # draw fullscreen triangle (lighting)
         self.backend.set_vertex_buffers(self.quad_vb)
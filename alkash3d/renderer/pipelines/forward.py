@@ -3,9 +3,12 @@
 # (UPLOAD‑heap → UpdateTexture) и без «перезаписи» CBV‑слота.
 # ------------------------------------------------------------
 
-import numpy as np
-
+from alkash3d.assets.material import PBRMaterial
+from alkash3d.renderer.light_assign import LightAssignment
+from alkash3d.renderer.lod import LODSelector
+from alkash3d.renderer.pipeline_registry import PipelineDesc
 from alkash3d.renderer.shader import Shader
+from alkash3d.renderer.snapshot import RenderSnapshot
 from alkash3d.utils import logger
 from alkash3d.graphics import select_backend
 
@@ -13,17 +16,30 @@ class ForwardRenderer:
     """
     Простой forward‑pipeline.
     Если у меша нет материала – используется 1×1‑белая placeholder‑текстура.
+    Вариант шейдера выбирается по материалу/мешу (`material_features`,
+    записывается в снимок):
+    материал без карт не читает текстуру вовсе.
+    Освещение – до `MAX_DRAW_LIGHTS` источников на объект, выбранных на
+    CPU (`LightAssignment`) и записанных в per‑draw константы.
     """
+    PIPELINES = (
+        PipelineDesc("shaders/forward_vert.hlsl", "shaders/forward_frag.hlsl"),
+        PipelineDesc.make("shaders/forward_vert.hlsl", "shaders/forward_frag.hlsl",
+                          {"HAS_TEXCOORDS": True}),
+        PipelineDesc.make("shaders/forward_vert.hlsl", "shaders/forward_frag.hlsl",
+                          {"HAS_TEXCOORDS": True, "HAS_ALBEDO_MAP": True}),
+        PipelineDesc.make("shaders/forward_vert.hlsl", "shaders/forward_frag.hlsl",
+                          {"HAS_TEXCOORDS": True, "DRAW_LIGHTS": True}),
+        PipelineDesc.make("shaders/forward_vert.hlsl", "shaders/forward_frag.hlsl",
+                          {"HAS_TEXCOORDS": True, "HAS_ALBEDO_MAP": True, "DRAW_LIGHTS": True}),
+    )
+
     def __init__(self, window, backend=None):
         self.window = window
         self.backend = backend or select_backend("dx12")
 
         # ---------- 1️⃣ Шейдер ----------
-        self.shader = Shader(
-            vertex_path=str(window.resource_path("shaders/forward_vert.hlsl")),
-            fragment_path=str(window.resource_path("shaders/forward_frag.hlsl")),
-            backend=self.backend,
-        )
+        self.shader = Shader.from_desc(self.backend, self.PIPELINES[0])
 
         # ---------- 2️⃣ Белая placeholder ----------
         self._create_white_placeholder()
@@ -35,6 +51,15 @@ class ForwardRenderer:
         # ---------- 4️⃣ PSO ----------
         self.backend.set_graphics_pipeline(self.shader.pso)
 
+        # ---------- 5️⃣ Снимок для последовательного режима ----------
+        self._snapshot = RenderSnapshot()
+
+        # ---------- 6️⃣ Источники на объект ----------
+        self.light_assign = LightAssignment()
+
+        # ---------- 7️⃣ Выбор LOD ----------
+        self.lod = LODSelector()
+
     def _create_white_placeholder(self):
         """Создать 1×1‑белую текстуру и SRV."""
         white_pixel = (255).to_bytes(1, "little") * 4
@@ -55,24 +80,38 @@ class ForwardRenderer:
         self.backend.create_shader_resource_view(self.white_tex, cpu_handle)
 
         self.default_srv_gpu = self.backend.cbv_srv_uav_heap.get_gpu_handle(srv_idx)
+        # Материалы с ещё не загруженными картами рисуются с ней
+        PBRMaterial.placeholder_srv_gpu = self.default_srv_gpu
 
     def resize(self, w: int, h: int) -> None:
         self.backend.set_viewport(0, 0, w, h)
         self.backend.set_scissor_rect(0, 0, w, h)
 
     def render(self, scene, camera) -> None:
+        """Последовательный режим: снимок сцены + его отрисовка."""
+        self.render_snapshot(self.capture_snapshot(self._snapshot, scene, camera))
+
+    def capture_snapshot(self, snap: RenderSnapshot, scene, camera) -> RenderSnapshot:
+        """Заполнить снимок (update‑поток). Forward рисует все узлы с `draw`."""
+        aspect = self.window.width / self.window.height
+        return snap.capture(scene, camera, aspect, cull=False, lod=self.lod,
+                            backend=self.backend)
+
+    def render_snapshot(self, snap: RenderSnapshot) -> None:
+        """
+        Отрисовать кадр только по данным `RenderSnapshot`
+        (может вызываться из render‑потока `FramePipeline`).
+        """
         self.backend.begin_frame()
+        self.shader.begin_frame()
         self.backend.set_viewport(0, 0,
                                  self.window.width, self.window.height)
         self.backend.set_scissor_rect(0, 0,
                                       self.window.width, self.window.height)
 
-        view = camera.get_view_matrix()
-        proj = camera.get_projection_matrix(self.window.width / self.window.height)
-
-        self.shader.set_uniform_mat4("uView", view)
-        self.shader.set_uniform_mat4("uProj", proj)
-        self.shader.set_uniform_vec3("uCamPos", camera.position)
+        self.shader.set_uniform_mat4("uView", snap.view)
+        self.shader.set_uniform_mat4("uProj", snap.proj)
+        self.shader.set_uniform_vec3("uCamPos", snap.cam_pos)
 
         self.shader.use()
 
@@ -80,25 +119,37 @@ class ForwardRenderer:
         self.backend.set_render_target(rtv0)
         self.backend.clear_render_target(rtv0, (0.07, 0.07, 0.08, 1.0))
 
-        for node in scene.traverse():
-            if not hasattr(node, "draw"):
-                continue
-
-            if hasattr(node, "material"):
-                node.material.bind(self.backend)
-            else:
-                # НЕ меняем слот 0 – он уже указывает на CBV
-                pass
-
-            self.shader.set_uniform_mat4("uModel", node.get_world_matrix().to_gl())
-
-            if hasattr(node, "color"):
-                self.shader.set_uniform_vec3("uTint", node.color)
-            else:
-                self.shader.set_uniform_vec3(
-                    "uTint", np.array([1.0, 1.0, 1.0], np.float32)
-                )
-
-            node.draw(self.backend)
+        # k самых влиятельных источников на объект (кэш, если ничего не двигалось)
+        lights = snap.active_lights
+        lit = len(lights) > 0
+        if lit:
+            n = snap.count
+            self.light_assign.update(snap.centres[:n], snap.radii[:n], lights)
+
+        # Всё per‑draw – из снимка: узлы и материалы в это время может
+        # менять главный поток
+        bound_pso = self.shader.pso
+        for i, (call, features, srv, model, base_color, uv_transform,
+                tint) in enumerate(snap.draws()):
+            # Минимальный вариант; PSO меняем, только если он другой
+            pso = self.shader.variant({**features, "DRAW_LIGHTS": lit})
+            if pso != bound_pso:
+                self.backend.set_graphics_pipeline(pso)
+                bound_pso = pso
+            if srv is not None:
+                self.backend.set_root_descriptor_table(1, srv)
+            self.shader.set_uniform_vec4("uBaseColor", base_color)
+            # Регион атласа (или единичное преобразование)
+            self.shader.set_uniform_vec4("uUVTransform", uv_transform)
+
+            self.shader.set_uniform_mat4("uModel", model)
+            if lit:
+                count, block = self.light_assign.draw_constants(i)
+                self.shader.set_uniform_int("uDrawLightCount", count)
+                self.shader.set_uniform_block("uDrawLights", block)
+            self.shader.set_uniform_vec3("uTint", tint)
+
+            self.shader.commit()            # свои константы у каждого draw
+            call.submit(self.backend)
 
         self.backend.end_frame()
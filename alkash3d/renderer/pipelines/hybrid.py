@@ -2,19 +2,27 @@
 """
 Гибридный пайплайн: Deferred‑geom + CUDA/OptiX‑RT + пост‑процессинг.
 Если native‑модуль rt_core недоступен – работает как обычный Deferred.
+Освещение – как в Deferred: все источники сцены в LightCB, при многих
+локальных – кластерные списки (`prepare_lights`).
 """
 
 import numpy as np
+from alkash3d.graphics.root_signature import ROOT_CLUSTER_CB
 from alkash3d.renderer.base_renderer import BaseRenderer
+from alkash3d.mesh.vertex_format import decode_model
+from alkash3d.renderer.permutations import material_features, vertex_features
+from alkash3d.renderer.light_buffer import LightBuffer
+from alkash3d.renderer.light_clusters import LightClusters
+from alkash3d.renderer.lod import LODSelector
+from alkash3d.renderer.pipeline_registry import PipelineDesc
+from alkash3d.renderer.pipelines.deferred import MAX_LIGHTS, prepare_lights
+from alkash3d.renderer.snapshot import pack_lights, scene_lights
 from alkash3d.renderer.shader import Shader
 from alkash3d.scene.mesh import Mesh
 from alkash3d.culling.bvh import BVH
 from alkash3d.utils import logger, gl_check_error
 from alkash3d.graphics import select_backend
 
-# ───── Импортируем световые классы напрямую, чтобы разорвать цикл ─────
-from alkash3d.scene.light import DirectionalLight, PointLight, SpotLight
-
 # Пытаемся импортировать native‑модуль (CUDA/OptiX)
 try:
     from alkash3d.native import rt_core
@@ -26,25 +34,31 @@ except Exception:
 class HybridRenderer(BaseRenderer):
     """Hybrid renderer (deferred geometry + optional ray‑tracing)."""
 
+    PIPELINES = (
+        PipelineDesc("shaders/deferred_geom_vert.hlsl", "shaders/deferred_geom_frag.hlsl"),
+        PipelineDesc("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl"),
+        PipelineDesc.make("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl",
+                          {"LIGHT_COUNT": 1, "LIGHT_TYPES": 1}),
+        PipelineDesc.make("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl",
+                          {"LIGHT_COUNT": 16, "LIGHT_TYPES": 7}),
+        PipelineDesc.make("shaders/deferred_light_vert.hlsl", "shaders/deferred_light_frag.hlsl",
+                          {"CLUSTERED": True, "LIGHT_TYPES": 7}),
+    )
+
     def __init__(self, window, backend=None):
         self.window = window
         self.backend = backend or select_backend("dx12")
         self.width, self.height = window.width, window.height
 
         # 1️⃣ Geometry‑pass (PBR‑shader)
-        self.geom_shader = Shader(
-            vertex_path=str(window.resource_path("shaders/deferred_geom_vert.hlsl")),
-            fragment_path=str(window.resource_path("shaders/deferred_geom_frag.hlsl")),
-            backend=self.backend,
-        )
-        self.light_shader = Shader(
-            vertex_path=str(window.resource_path("shaders/deferred_light_vert.hlsl")),
-            fragment_path=str(window.resource_path("shaders/deferred_light_frag.hlsl")),
-            backend=self.backend,
-        )
+        self.geom_shader = Shader.from_desc(self.backend, self.PIPELINES[0])
+        self.light_shader = Shader.from_desc(self.backend, self.PIPELINES[1])
         self._setup_gbuffer()
         self._setup_quad()
         self.backend.enable_depth_test(True)
+        self.light_buffer = LightBuffer(self.backend, MAX_LIGHTS)
+        self.clusters = LightClusters(self.backend)
+        self._lights = None             # переиспользуемый массив LIGHT_DTYPE
 
         # 2️⃣ Ray‑tracer (CUDA/OptiX)
         self.rt_enabled = rt_core is not None
@@ -52,6 +66,8 @@ class HybridRenderer(BaseRenderer):
             self._init_raytracer_output()
 
         self.bvh = BVH()
+        self.lod = LODSelector()
+        self.jobs = None      # JobSystem движка (culling), задаёт Engine
         self.postproc = None  # будет заполнен в Engine
 
     # -----------------------------------------------------------------
@@ -115,22 +131,37 @@ class HybridRenderer(BaseRenderer):
     def render(self, scene, camera):
         # ---------- 1️⃣ Geometry‑pass ----------
         self.backend.begin_frame()
+        self.geom_shader.begin_frame()
+        self.light_shader.begin_frame()
         self.backend.set_render_targets(self.rtv_handles)
         self.backend.clear_render_target(self.rtv_handles[0],
                                         (0.0, 0.0, 0.0, 1.0))
 
         self.geom_shader.use()
+        bound_pso = self.geom_shader.pso
         self.geom_shader.set_uniform_mat4("uView", camera.get_view_matrix())
         self.geom_shader.set_uniform_mat4("uProj", camera.get_projection_matrix(self.width / self.height))
 
-        for node in scene.visible_nodes(camera):
-            if not hasattr(node, "draw"):
-                continue
-            model = node.get_world_matrix().to_gl()
-            self.geom_shader.set_uniform_mat4("uModel", model)
-            if hasattr(node, "material"):
-                node.material.bind(self.backend)
-            node.draw(self.backend)
+        nodes = [n for n in scene.visible_nodes(camera, self.width / self.height, self.jobs)
+                 if hasattr(n, "draw")]
+        models = np.array([n.get_world_matrix().to_gl() for n in nodes],
+                          dtype=np.float32).reshape(-1, 4, 4)
+        proj = camera.get_projection_matrix(self.width / self.height)
+        lods = self.lod.select(nodes, models, camera.position.as_np(), proj, camera.near)
+
+        for node, model, lod in zip(nodes, models, lods.tolist()):
+            self.geom_shader.set_uniform_mat4(
+                "uModel", decode_model(model, getattr(node, "position_decode", None)))
+            material = getattr(node, "material", None)
+            pso = self.geom_shader.variant({**material_features(material, node),
+                                            **vertex_features(node, self.backend)})
+            if pso != bound_pso:
+                self.backend.set_graphics_pipeline(pso)
+                bound_pso = pso
+            if material is not None:
+                material.bind(self.backend)
+            self.geom_shader.commit()
+            node.draw(self.backend, lod=lod)
 
         # ---------- 2️⃣ RT‑pass ----------
         if self.rt_enabled:
@@ -155,7 +186,13 @@ class HybridRenderer(BaseRenderer):
         self.backend.set_render_target(back_rtv)
         self.backend.clear_render_target(back_rtv, (0.07, 0.07, 0.08, 1.0))
 
-        self.light_shader.use()
+        lights = scene_lights(scene)
+        self._lights = pack_lights(lights, self._lights)
+        features, clustered = prepare_lights(self.light_buffer, self.clusters,
+                                             self._lights[:len(lights)],
+                                             camera.get_view_matrix(), proj,
+                                             camera.near, camera.far)
+        self.light_shader.use(features)
         self.light_shader.set_uniform_vec3("uCamPos", camera.position)
 
         # bind G‑buffer textures + optional RT‑texture
@@ -168,28 +205,11 @@ class HybridRenderer(BaseRenderer):
             rt_slot = len(self.gbuffer_textures)
             self.backend.set_root_descriptor_table(rt_slot, self.rt_srv_gpu)
 
-        # lights
-        lights = [
-            n for n in scene.traverse()
-            if isinstance(n, (DirectionalLight, PointLight, SpotLight))
-        ]
-        self.light_shader.set_uniform_int("uNumLights", min(len(lights), 8))
-        for i, light in enumerate(lights[:8]):
-            uni = light.get_uniforms()
-            pfx = f"lights[{i}]"
-            self.light_shader.set_uniform_int(f"{pfx}.type", uni["type"])
-            self.light_shader.set_uniform_vec3(f"{pfx}.color", uni["color"])
-            self.light_shader.set_uniform_float(f"{pfx}.intensity", uni["intensity"])
-            if uni["type"] == 0:
-                self.light_shader.set_uniform_vec3(f"{pfx}.direction", uni["direction"])
-            elif uni["type"] == 1:
-                self.light_shader.set_uniform_vec3(f"{pfx}.position", uni["position"])
-                self.light_shader.set_uniform_float(f"{pfx}.radius", uni["radius"])
-            elif uni["type"] == 2:
-                self.light_shader.set_uniform_vec3(f"{pfx}.position", uni["position"])
-                self.light_shader.set_uniform_vec3(f"{pfx}.spotDir", uni["direction"])
-                self.light_shader.set_uniform_float(f"{pfx}.innerCutoff", uni["innerCutoff"])
-                self.light_shader.set_uniform_float(f"{pfx}.outerCutoff", uni["outerCutoff"])
+        # lights – LightCB одной записью (только при изменениях)
+        self.light_shader.commit()
+        self.light_buffer.bind(0)
+        if clustered:
+            self.clusters.bind(ROOT_CLUSTER_CB)      # ClusterCB : register(b3)
 
         # draw fullscreen triangle (lighting)
         self.backend.set_vertex_buffers(self.quad_vb)
@@ -6,6 +6,7 @@ import numpy as np
 import json
 from alkash3d.renderer.base_renderer import BaseRenderer
 from alkash3d.utils import logger, gl_check_error
+from alkash3d.renderer.pipeline_registry import PipelineDesc
 from alkash3d.renderer.shader import Shader
 from alkash3d.graphics import select_backend
 import alkash3d_rtx  # уже скомпилированный Rust‑модуль
@@ -23,6 +24,9 @@ class RTXRenderer(BaseRenderer):
     RTX‑pipeline – мост к чистому Rust‑модулю ``alkash3d_rtx``.
     Делает сериализацию JSON → Rust‑трассировку → вывод как fullscreen‑quad.
     """
+    PIPELINES = (
+        PipelineDesc("shaders/quad_vert.hlsl", "shaders/quad_frag.hlsl"),
+    )
 
     def __init__(self, window, backend=None):
         self.window = window
@@ -30,11 +34,7 @@ class RTXRenderer(BaseRenderer):
         self.width, self.height = window.width, window.height
 
         # Шейдер, который просто копирует RGBA‑текстуру в кадр.
-        self.quad_shader = Shader(
-            vertex_path=str(SHADER_DIR / "quad_vert.hlsl"),
-            fragment_path=str(SHADER_DIR / "quad_frag.hlsl"),
-            backend=self.backend,
-        )
+        self.quad_shader = Shader.from_desc(self.backend, self.PIPELINES[0])
         self._setup_quad()
         self.backend.enable_depth_test(False)
 
@@ -1,13 +1,50 @@
 """
 Простейший менеджер HLSL‑шейдеров для DirectX 12.
 * Компилирует VS/PS через DX12‑бекенд.
-* Создаёт один constant‑buffer, в который записываются матрицы.
+* Константы кадра/объекта (матрицы, UV‑преобразование материала
+  `uUVTransform` – регион атласа, базовый цвет `uBaseColor`, per‑draw
+  источники forward‑а `uCamPos`, `uDrawLightCount`, `uDrawLights`)
+  собираются в CPU‑копии FrameCB; `set_uniform_*` в GPU не пишут.
+* `commit()` перед каждым draw: если константы изменились, они
+  копируются в следующий слот кольца constant‑buffer‑ов кадра, и
+  таблица 0 указывает на этот слот. Один общий буфер не годится:
+  command list выполняется после всех записей кадра, и каждый draw
+  прочёл бы константы последнего. `begin_frame()` возвращает кольцо
+  в начало (`end_frame` бэкенда ждёт GPU, слоты прошлого кадра уже
+  прочитаны); кольцо растёт по числу draw‑ев с разными константами.
+* `reload()` пересобирает PSO из исходников (горячая перезагрузка,
+  см. `alkash3d.assets.watcher.watch_shader`); при ошибке компиляции
+  остаётся старый PSO.
+* Байткод и PSO берутся из `ShaderCache` (диск + дедупликация PSO).
+* `use(features)` выбирает вариант по define‑ам (см.
+  `alkash3d.renderer.permutations`): варианты компилируются лениво и
+  кэшируются, базовый – без дополнительных define‑ов.
+* Первый `use()` варианта записывает пайплайн в `PipelineRegistry` (список для
+  прогрева на следующем запуске).
 """
 
 import os
+from pathlib import Path
+
 import numpy as np
 from alkash3d.utils import logger
-from alkash3d.graphics.dx12_backend import DX12Backend
+from alkash3d.graphics.dx12_backend import DX12Backend, STUB_PSO
+from alkash3d.renderer.pipeline_registry import (
+    RESOURCE_ROOT, PipelineDesc, PipelineRegistry,
+)
+from alkash3d.renderer.light_assign import MAX_DRAW_LIGHTS
+from alkash3d.renderer.permutations import variant_key
+from alkash3d.renderer.shader_cache import ShaderCache
+
+
+def _resource_relative(path) -> str:
+    """Путь относительно `resources/` (если он внутри), иначе абсолютный."""
+    p = Path(path).resolve()
+    try:
+        return p.relative_to(RESOURCE_ROOT).as_posix()
+    except ValueError:
+        return str(p)
+
 
 class Shader:
     """Обёртка над парой VS/PS‑blob‑ов и готовым PSO."""
@@ -16,49 +53,98 @@ class Shader:
         "uProj": 64,
         "uModel": 128,
     }
-    _CB_SIZE = 192
+    _VEC4_OFFSETS = {
+        "uUVTransform": 192,
+        "uBaseColor": 208,
+    }
+    _VEC3_OFFSETS = {
+        "uCamPos": 224,
+    }
+    _INT_OFFSETS = {
+        "uDrawLightCount": 236,
+    }
+    # Блоки «как есть» (offset, размер): per‑draw источники forward‑а
+    _BLOCK_OFFSETS = {
+        "uDrawLights": (240, MAX_DRAW_LIGHTS * 64),
+    }
+    _CB_SIZE = 240 + MAX_DRAW_LIGHTS * 64
 
-    def __init__(self, backend: DX12Backend, vertex_path: str, fragment_path: str):
+    def __init__(self, backend: DX12Backend, vertex_path: str, fragment_path: str,
+                 defines: dict | None = None, desc: PipelineDesc | None = None):
         self.backend = backend
+        self.vertex_path = vertex_path
+        self.fragment_path = fragment_path
+        self.defines = dict(defines or {})
+        self.desc = desc or PipelineDesc.make(_resource_relative(vertex_path),
+                                              _resource_relative(fragment_path),
+                                              self.defines)
+        self._recorded: set[tuple] = set()
+        self._variants: dict[tuple, int] = {}      # ключ варианта → PSO
+        self._failed_variants: set[tuple] = set()
+        self._mtimes = self._source_mtimes()
 
-        print("=" * 50)
-        print("[Shader] Initializing shader program")
-        print(f"[Shader] Vertex shader path: {vertex_path}")
-        print(f"[Shader] Fragment shader path: {fragment_path}")
-        print("=" * 50)
+        logger.debug(f"[Shader] {vertex_path} / {fragment_path}")
 
-        print("[Shader] Compiling vertex shader...")
-        self.vs_blob = backend.compile_shader("vs", vertex_path)
-        if not self.vs_blob:
+        # Байткод и PSO – через кэш: повторный запуск берёт blob‑ы с диска,
+        # одинаковые пары VS/PS разделяют один PSO (после прогрева –
+        # просто поиск в памяти)
+        vs_blob, ps_blob, pso = ShaderCache.shared(backend).pipeline(
+            vertex_path, fragment_path, self.defines or None)
+        if not vs_blob:
             raise RuntimeError(f"Failed to compile vertex shader: {vertex_path}")
-        print(f"[Shader] Vertex shader compiled: {hex(self.vs_blob)}")
-
-        print("[Shader] Compiling fragment shader...")
-        self.ps_blob = backend.compile_shader("ps", fragment_path)
-        if not self.ps_blob:
+        if not ps_blob:
             raise RuntimeError(f"Failed to compile fragment shader: {fragment_path}")
-        print(f"[Shader] Fragment shader compiled: {hex(self.ps_blob)}")
-
-        print("[Shader] Creating graphics pipeline...")
-        self.pso = backend.create_graphics_ps(self.vs_blob, self.ps_blob)
-        if not self.pso:
+        if not pso:
             raise RuntimeError("Failed to create graphics pipeline")
-        print(f"[Shader] Graphics pipeline created: {hex(self.pso)}")
-        print("=" * 50)
+        self.vs_blob, self.ps_blob, self.pso = vs_blob, ps_blob, pso
+        logger.debug(f"[Shader] Graphics pipeline ready: {hex(self.pso)}")
 
-        self._frame_cb = backend.create_constant_buffer(
-            b"\x00" * self._CB_SIZE
-        )
+        # Кольцо FrameCB: (буфер, GPU‑дескриптор) на каждый draw кадра
+        self._ring: list[tuple] = []
+        self._ring_used = 0
+        self._bound_slot = None         # слот с текущими константами
+        self._frame_data = bytearray(self._CB_SIZE)
+        # Единичное UV‑преобразование, иначе все UV схлопнутся в (0, 0)
+        self._frame_data[192:208] = np.array([1.0, 1.0, 0.0, 0.0],
+                                             dtype=np.float32).tobytes()
+        self._frame_data[208:224] = np.ones(4, dtype=np.float32).tobytes()
+        self._variants[variant_key(self.defines)] = self.pso
 
-        idx = backend.cbv_srv_uav_heap.next_free()
-        cpu_handle = backend.cbv_srv_uav_heap.get_cpu_handle(idx)
-        backend.create_shader_resource_view(self._frame_cb, cpu_handle)
+    @classmethod
+    def from_desc(cls, backend: DX12Backend, desc: PipelineDesc) -> "Shader":
+        """Шейдер по объявлению рендерера (см. `PipelineRegistry`)."""
+        return cls(backend, str(desc.vertex_path), str(desc.fragment_path),
+                   desc.define_map, desc)
 
-        self._frame_cb_gpu = backend.cbv_srv_uav_heap.get_gpu_handle(idx)
-        self._frame_data = bytearray(self._CB_SIZE)
+    def use(self, features: dict | None = None) -> None:
+        """Привязать PSO базового варианта или варианта `features`."""
+        self.backend.set_graphics_pipeline(self.variant(features))
 
-    def use(self) -> None:
-        self.backend.set_graphics_pipeline(self.pso)
+    def variant(self, features: dict | None = None) -> int:
+        """PSO варианта `defines ∪ features` (компилируется при первом запросе)."""
+        defines = {**self.defines, **features} if features else self.defines
+        key = variant_key(defines)
+        pso = self._variants.get(key)
+        if pso is None:
+            pso = self._build_variant(key)
+        if key not in self._recorded:
+            self._recorded.add(key)
+            PipelineRegistry.shared(self.backend).record(
+                PipelineDesc(self.desc.vertex, self.desc.fragment, key, self.desc.state))
+        return pso
+
+    def _build_variant(self, key: tuple) -> int:
+        _, _, pso = ShaderCache.shared(self.backend).pipeline(
+            self.vertex_path, self.fragment_path, dict(key) or None)
+        if not pso:
+            # Вариант не собрался – рисуем базовым (ошибка в логе один раз)
+            if key not in self._failed_variants:
+                self._failed_variants.add(key)
+                logger.error(f"[Shader] Variant {dict(key)} failed for "
+                             f"{os.path.basename(self.fragment_path)}, using base")
+            return self.pso
+        self._variants[key] = pso
+        return pso
 
     def set_uniform_mat4(self, name: str, mat) -> None:
         if name not in self._MAT_OFFSETS:
@@ -66,19 +152,110 @@ class Shader:
             return
 
         arr = np.asarray(mat, dtype=np.float32).reshape(16)
-        offset = self._MAT_OFFSETS[name]
-        self._frame_data[offset: offset + 64] = arr.tobytes()
-        self.backend.update_buffer(self._frame_cb, bytes(self._frame_data))
-        self.backend.set_root_descriptor_table(0, self._frame_cb_gpu)
+        self._write(self._MAT_OFFSETS[name], arr.tobytes())
+
+    def set_uniform_vec4(self, name: str, vec) -> None:
+        if name not in self._VEC4_OFFSETS:
+            logger.debug(f"[Shader] Unknown vec4 uniform: {name}")
+            return
+
+        data = np.asarray(vec, dtype=np.float32).reshape(4).tobytes()
+        self._write(self._VEC4_OFFSETS[name], data)
 
     def set_uniform_vec3(self, name: str, vec) -> None:
-        pass
+        if name not in self._VEC3_OFFSETS:
+            return
+        if hasattr(vec, "as_np"):
+            vec = vec.as_np()
+        data = np.asarray(vec, dtype=np.float32).reshape(3).tobytes()
+        self._write(self._VEC3_OFFSETS[name], data)
 
     def set_uniform_int(self, name: str, value: int) -> None:
-        pass
+        if name not in self._INT_OFFSETS:
+            return
+        self._write(self._INT_OFFSETS[name], int(value).to_bytes(4, "little", signed=True))
+
+    def set_uniform_block(self, name: str, data: bytes) -> None:
+        """Сырые байты блока (массив структур), дополняются нулями."""
+        if name not in self._BLOCK_OFFSETS:
+            logger.debug(f"[Shader] Unknown uniform block: {name}")
+            return
+        offset, size = self._BLOCK_OFFSETS[name]
+        data = bytes(data[:size]).ljust(size, b"\x00")
+        self._write(offset, data)
+
+    def _write(self, offset: int, data: bytes) -> None:
+        """Записать в CPU‑копию FrameCB (в GPU – при `commit()`)."""
+        if self._frame_data[offset: offset + len(data)] == data:
+            return
+        self._frame_data[offset: offset + len(data)] = data
+        self._bound_slot = None
+
+    # -----------------------------------------------------------------
+    #   Кольцо FrameCB
+    # -----------------------------------------------------------------
+    def begin_frame(self) -> None:
+        """Начало кадра: слоты кольца снова свободны."""
+        self._ring_used = 0
+        self._bound_slot = None
+
+    def commit(self) -> None:
+        """
+        Перед draw: константы – в новый слот кольца (если изменились
+        с прошлого `commit`), таблица 0 – на слот с ними.
+        """
+        if self._bound_slot is None:
+            if self._ring_used == len(self._ring):
+                self._ring.append(self._create_slot())
+            self._bound_slot = self._ring[self._ring_used]
+            self._ring_used += 1
+            self.backend.update_buffer(self._bound_slot[0], bytes(self._frame_data))
+        self.backend.set_root_descriptor_table(0, self._bound_slot[1])
+
+    def _create_slot(self) -> tuple:
+        heap = self.backend.cbv_srv_uav_heap
+        cb = self.backend.create_constant_buffer(b"\x00" * self._CB_SIZE)
+        idx = heap.next_free()
+        self.backend.create_shader_resource_view(cb, heap.get_cpu_handle(idx))
+        return cb, heap.get_gpu_handle(idx)
 
     def set_uniform_float(self, name: str, value: float) -> None:
         pass
 
-    def reload_if_needed(self):
-        pass
\ No newline at end of file
+    # -----------------------------------------------------------------
+    #   Горячая перезагрузка
+    # -----------------------------------------------------------------
+    def _source_mtimes(self) -> tuple:
+        out = []
+        for path in (self.vertex_path, self.fragment_path):
+            try:
+                out.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                out.append(0)
+        return tuple(out)
+
+    def reload(self) -> bool:
+        """Перекомпилировать VS/PS и заменить PSO; False – оставлен старый."""
+        self._mtimes = self._source_mtimes()
+        vs_blob, ps_blob, pso = ShaderCache.shared(self.backend).pipeline(
+            self.vertex_path, self.fragment_path, self.defines or None)
+        if not pso or (pso == STUB_PSO and self.pso != STUB_PSO):
+            logger.error(f"[Shader] Reload failed, keeping previous pipeline: "
+                         f"{self.vertex_path}, {self.fragment_path}")
+            return False
+
+        # Старый PSO не освобождаем: им владеет ShaderCache (его могут
+        # разделять другие Shader‑ы с теми же исходниками)
+        self.vs_blob, self.ps_blob, self.pso = vs_blob, ps_blob, pso
+        # Остальные варианты пересоберутся лениво из новых исходников
+        self._variants = {variant_key(self.defines): pso}
+        self._failed_variants.clear()
+        logger.info(f"[Shader] Reloaded {os.path.basename(self.vertex_path)} / "
+                    f"{os.path.basename(self.fragment_path)}")
+        return True
+
+    def reload_if_needed(self) -> bool:
+        """Перезагрузить, если исходники изменились (проверка mtime)."""
+        if self._source_mtimes() == self._mtimes:
+            return False
+        return self.reload()
\ No newline at end of file
@@ -0,0 +1,248 @@
+"""
+Кэш байткода шейдеров (память + диск) и дедупликация PSO.
+
+Ключ варианта – sha1 от:
+  версии кэша, стадии, точки входа/профиля, отсортированных define‑ов,
+  содержимого исходника и содержимого всех (рекурсивных) include‑ов.
+Поэтому правка include‑а инвалидирует все зависящие от него варианты,
+а смена пути/mtime без смены содержимого – нет.
+
+Уровни:
+1️⃣  память – `ключ → blob` в пределах процесса;
+2️⃣  диск – `<cache>/shaders/<ключ[:2]>/<ключ>.cso` (заголовок + байткод),
+    запись через `atomic_write`; нужен бэкенд с `supports_shader_blobs`;
+3️⃣  компиляция – `backend.compile_shader(stage, path, defines)`.
+
+`pipeline(vs, ps, defines)` возвращает `(vs_blob, ps_blob, pso)`: одна
+пара ключей → один PSO на весь процесс, сколько бы `Shader`‑ов её ни
+запросило. PSO принадлежат кэшу (не освобождаются по одному). Define
+`VERTEX_FORMAT` выбирает и input layout PSO (`alkash3d.mesh.vertex_format`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+
+from alkash3d.utils.cache import atomic_write, cache_root
+from alkash3d.utils.logger import logger
+
+# Поднимать при смене компилятора/флагов компиляции/формата файла
+CACHE_VERSION = 1
+
+_MAGIC = b"ASHC"
+_HEADER = struct.Struct("<4sHHI")           # magic, version, reserved, size
+
+_INCLUDE_RE = re.compile(rb'^\s*#\s*include\s+"([^"]+)"', re.MULTILINE)
+
+
+def shader_includes(path) -> set[Path]:
+    """Все файлы, включаемые HLSL‑исходником (рекурсивно)."""
+    found: set[Path] = set()
+    stack = [Path(path).resolve()]
+    while stack:
+        src = stack.pop()
+        try:
+            text = src.read_bytes()
+        except OSError:
+            continue
+        for inc in _INCLUDE_RE.findall(text):
+            p = (src.parent / os.fsdecode(inc)).resolve()
+            if p not in found:
+                found.add(p)
+                stack.append(p)
+    return found
+
+
+def _stage_signature(backend, stage: str) -> str:
+    stages = getattr(backend, "SHADER_STAGES", None)
+    if stages is None:
+        from alkash3d.graphics.dx12_backend import SHADER_STAGES as stages
+    entry, profile = stages.get(stage, ("", ""))
+    return f"{stage}:{entry}:{profile}"
+
+
+class ShaderCache:
+    """Кэш скомпилированных шейдеров и PSO для одного бэкенда."""
+
+    _shared: dict[int, "ShaderCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, backend, cache_dir=None):
+        self.backend = backend
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else cache_root("shaders")
+        self._blobs: dict[str, int] = {}
+        self._pipelines: dict[tuple[str, str], tuple[int, int, int]] = {}
+        self._lock = threading.RLock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.compiles = 0
+        self.pipelines_created = 0
+        self.compile_ms = 0.0
+        self.load_ms = 0.0
+
+    # -----------------------------------------------------------------
+    #   Общий экземпляр на бэкенд
+    # -----------------------------------------------------------------
+    @classmethod
+    def shared(cls, backend) -> "ShaderCache":
+        with cls._shared_lock:
+            cache = cls._shared.get(id(backend))
+            if cache is None or cache.backend is not backend:
+                cache = cls._shared[id(backend)] = cls(backend)
+            return cache
+
+    @classmethod
+    def set_shared(cls, backend, cache: "ShaderCache | None") -> None:
+        with cls._shared_lock:
+            if cache is None:
+                cls._shared.pop(id(backend), None)
+            else:
+                cls._shared[id(backend)] = cache
+
+    # -----------------------------------------------------------------
+    #   Ключи
+    # -----------------------------------------------------------------
+    def key(self, stage: str, path, defines: dict | None = None) -> str:
+        """Ключ варианта: версия, стадия, define‑ы, исходник и include‑ы."""
+        src = Path(path).resolve()
+        h = hashlib.sha1()
+        h.update(f"v{CACHE_VERSION}|{_stage_signature(self.backend, stage)}|".encode())
+        for name, value in sorted((defines or {}).items()):
+            h.update(f"{name}={value};".encode())
+        h.update(b"|")
+        for p in [src, *sorted(shader_includes(src))]:
+            try:
+                data = p.read_bytes()
+            except OSError:
+                data = b""
+            h.update(os.fsencode(p.name))
+            h.update(struct.pack("<Q", len(data)))
+            h.update(data)
+        return h.hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.cso"
+
+    # -----------------------------------------------------------------
+    #   Шейдеры
+    # -----------------------------------------------------------------
+    def compile(self, stage: str, path, defines: dict | None = None) -> int:
+        """Blob варианта: память → диск → компиляция (0 – ошибка)."""
+        return self._compile_keyed(stage, path, defines, self.key(stage, path, defines))
+
+    def _compile_keyed(self, stage, path, defines, key) -> int:
+        with self._lock:
+            blob = self._blobs.get(key)
+            if blob:
+                self.memory_hits += 1
+                return blob
+
+        blob = self._load_disk(key)
+        if not blob:
+            t0 = time.perf_counter()
+            blob = self.backend.compile_shader(stage, str(path), defines)
+            self.compile_ms += (time.perf_counter() - t0) * 1000.0
+            self.compiles += 1
+            if blob:
+                self._store_disk(key, blob)
+        if blob:
+            with self._lock:
+                blob = self._blobs.setdefault(key, blob)
+        return blob
+
+    def _load_disk(self, key: str) -> int:
+        if not getattr(self.backend, "supports_shader_blobs", False):
+            return 0
+        p = self._disk_path(key)
+        t0 = time.perf_counter()
+        try:
+            data = p.read_bytes()
+        except OSError:
+            return 0
+        try:
+            magic, version, _, size = _HEADER.unpack_from(data)
+        except struct.error:
+            magic, version, size = b"", 0, -1
+        if (magic != _MAGIC or version != CACHE_VERSION
+                or size != len(data) - _HEADER.size):
+            logger.warning(f"[ShaderCache] Corrupt cache entry {p.name}, recompiling")
+            return 0
+        blob = self.backend.create_shader_blob(data[_HEADER.size:])
+        if blob:
+            self.disk_hits += 1
+            self.load_ms += (time.perf_counter() - t0) * 1000.0
+        return blob
+
+    def _store_disk(self, key: str, blob: int) -> None:
+        if not getattr(self.backend, "supports_shader_blobs", False):
+            return
+        data = self.backend.shader_blob_bytes(blob)
+        if not data:
+            return
+        try:
+            with atomic_write(self._disk_path(key)) as f:
+                f.write(_HEADER.pack(_MAGIC, CACHE_VERSION, 0, len(data)))
+                f.write(data)
+        except OSError as exc:
+            logger.warning(f"[ShaderCache] Cannot write cache entry: {exc}")
+
+    # -----------------------------------------------------------------
+    #   PSO
+    # -----------------------------------------------------------------
+    def pipeline(self, vertex_path, fragment_path,
+                 defines: dict | None = None) -> tuple[int, int, int]:
+        """`(vs_blob, ps_blob, pso)`; одинаковая пара вариантов – один PSO."""
+        vs_key = self.key("vs", vertex_path, defines)
+        ps_key = self.key("ps", fragment_path, defines)
+        with self._lock:
+            cached = self._pipelines.get((vs_key, ps_key))
+            if cached is not None:
+                self.memory_hits += 1
+                return cached
+
+        vs_blob = self._compile_keyed("vs", vertex_path, defines, vs_key)
+        ps_blob = self._compile_keyed("ps", fragment_path, defines, ps_key)
+        if not vs_blob or not ps_blob:
+            return vs_blob, ps_blob, 0
+        vertex_format = int((defines or {}).get("VERTEX_FORMAT") or 0)
+        if vertex_format:
+            pso = self.backend.create_graphics_ps(vs_blob, ps_blob, vertex_format)
+        else:
+            pso = self.backend.create_graphics_ps(vs_blob, ps_blob)
+        if not pso:
+            return vs_blob, ps_blob, 0
+        with self._lock:
+            existing = self._pipelines.get((vs_key, ps_key))
+            if existing is not None:
+                return existing
+            self._pipelines[(vs_key, ps_key)] = (vs_blob, ps_blob, pso)
+            self.pipelines_created += 1
+        return vs_blob, ps_blob, pso
+
+    # -----------------------------------------------------------------
+    #   Статистика
+    # -----------------------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "compiles": self.compiles,
+            "pipelines": self.pipelines_created,
+            "compile_ms": round(self.compile_ms, 2),
+            "load_ms": round(self.load_ms, 2),
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        kind = "cold" if s["compiles"] else "warm"
+        return (f"[ShaderCache] {kind}: {s['compiles']} compiled "
+                f"({s['compile_ms']:.1f} ms), {s['disk_hits']} from disk "
+                f"({s['load_ms']:.1f} ms), {s['memory_hits']} memory hits, "
+                f"{s['pipelines']} PSO")
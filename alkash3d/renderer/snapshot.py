@@ -0,0 +1,195 @@
+"""
+Неизменяемый (на время рендера) снимок кадра для рендерера.
+
+Update‑стадия упаковывает всё, что нужно для отрисовки, в
+`RenderSnapshot`:
+
+* матрицы камеры (view / proj) и позицию камеры;
+* список видимых узлов (`nodes`) и их world‑матрицы в одном
+  NumPy‑массиве `transforms` (N, 4, 4) – уже транспонированные
+  (`to_gl`), как их ждёт шейдер;
+* параметры источников света в структурированном массиве `lights`;
+* уровни LOD видимых узлов (`lods`, см. `alkash3d.renderer.lod`);
+* всё, что нужно каждому draw (с `backend`): мировые сферы
+  (`centres`/`radii`), модельные матрицы с деквантованием (`models`),
+  `DrawCall` меша (VB/IB, раскладка, диапазон индексов уровня LOD),
+  define‑ы варианта шейдера, SRV материала и его константы
+  (`base_colors`, `uv_transforms`, `tints`).
+
+Рендерер читает только снимок (`nodes` – лишь для отладки и тестов) –
+значит, пока он рисует кадр N, главный поток может спокойно считать
+`scene.update` для кадра N+1, а узлы, материалы и их GPU‑буферы
+меняются только в главном потоке
+(см. `alkash3d.core.frame_pipeline.FramePipeline`).
+
+Массивы снимка переиспользуются между кадрами и растут геометрически –
+никаких аллокаций/копий «на объект».
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from alkash3d.assets.atlas import IDENTITY_UV
+from alkash3d.mesh.vertex_format import decode_model
+from alkash3d.renderer.light_assign import object_bounds
+from alkash3d.renderer.permutations import material_features, vertex_features
+from alkash3d.scene.light import Light
+
+_WHITE = np.ones(4, dtype=np.float32)
+
+LIGHT_DTYPE = np.dtype([
+    ("type", np.int32),
+    ("color", np.float32, 3),
+    ("intensity", np.float32),
+    ("position", np.float32, 3),
+    ("radius", np.float32),
+    ("direction", np.float32, 3),
+    ("inner_cutoff", np.float32),
+    ("outer_cutoff", np.float32),
+])
+
+
+def scene_lights(scene) -> list:
+    """Источники сцены: кэш `Scene.lights()` или обход графа."""
+    if hasattr(scene, "lights"):
+        return scene.lights()
+    return [n for n in scene.traverse() if isinstance(n, Light)]
+
+
+def pack_lights(lights, out: np.ndarray | None = None) -> np.ndarray:
+    """Упаковать источники в `LIGHT_DTYPE` (один вызов NumPy на весь список)."""
+    n = len(lights)
+    if out is None or len(out) < n:
+        out = np.zeros(max(n, 0 if out is None else len(out) * 2), dtype=LIGHT_DTYPE)
+    if n:
+        out[:n] = [light.packed() for light in lights]
+    return out
+
+
+class RenderSnapshot:
+    """Упакованные данные одного кадра (double‑buffer‑слот)."""
+
+    def __init__(self, capacity: int = 64, light_capacity: int = 16):
+        self.frame = -1
+        self.view = np.identity(4, dtype=np.float32)
+        self.proj = np.identity(4, dtype=np.float32)
+        self.cam_pos = np.zeros(3, dtype=np.float32)
+        self.near = 0.1
+        self.far = 1000.0
+
+        self.nodes: list = []
+        self.transforms = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.lods = np.zeros(capacity, dtype=np.int32)
+        self.centres = np.zeros((capacity, 3), dtype=np.float32)
+        self.radii = np.zeros(capacity, dtype=np.float32)
+        self.count = 0
+
+        # Per‑draw данные (заполняются при capture с backend)
+        self.calls: list = []               # DrawCall
+        self.features: list = []            # define‑ы варианта шейдера
+        self.srvs: list = []                # SRV материала (slot 1) или None
+        self.models = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.base_colors = np.zeros((capacity, 4), dtype=np.float32)
+        self.uv_transforms = np.zeros((capacity, 4), dtype=np.float32)
+        self.tints = np.zeros((capacity, 3), dtype=np.float32)
+
+        self.lights = np.zeros(light_capacity, dtype=LIGHT_DTYPE)
+        self.light_count = 0
+
+    # -----------------------------------------------------------------
+    def capture(self, scene, camera, aspect: float,
+                frame: int = 0, cull: bool = True, lod=None,
+                jobs=None, backend=None) -> "RenderSnapshot":
+        """
+        Заполнить снимок из сцены (вызывается в update‑потоке).
+        `cull=False` – все узлы с `draw_call` (без octree‑запроса);
+        `lod` – `LODSelector` (без него все узлы рисуются уровнем 0);
+        `jobs` – `JobSystem` для frustum‑culling; `backend` – записать
+        per‑draw данные (GPU‑буферы мешей создаются здесь же).
+        """
+        self.frame = frame
+        self.view[:] = camera.get_view_matrix()
+        self.proj[:] = camera.get_projection_matrix(aspect)
+        self.cam_pos[:] = camera.position.as_np()
+        self.near, self.far = camera.near, camera.far
+
+        source = scene.visible_nodes(camera, aspect, jobs) if cull else scene.traverse()
+        nodes = [n for n in source if hasattr(n, "draw_call")]
+        self._reserve(len(nodes))
+        for i, node in enumerate(nodes):
+            self.transforms[i] = node.get_world_matrix().to_gl()
+        self.nodes = nodes
+        self.count = n = len(nodes)
+        self.centres[:n], self.radii[:n] = object_bounds(nodes, self.transforms[:n])
+        if lod is not None:
+            self.lods[:n] = lod.select(nodes, self.transforms[:n],
+                                       self.cam_pos, self.proj, self.near)
+        else:
+            self.lods[:n] = 0
+        if backend is not None:
+            self._record_draws(backend)
+        else:
+            self.calls, self.features, self.srvs = [], [], []
+
+        self._capture_lights(scene)
+        return self
+
+    def _record_draws(self, backend) -> None:
+        """Скопировать всё, что render‑поток прочёл бы у узла и материала."""
+        calls, features, srvs = [], [], []
+        for i, node in enumerate(self.nodes):
+            material = getattr(node, "material", None)
+            feats = material_features(material, node)
+            feats.update(vertex_features(node, backend))
+            features.append(feats)
+            calls.append(node.draw_call(backend, int(self.lods[i])))
+            srvs.append(material.srv_handle(backend)
+                        if hasattr(material, "srv_handle") else None)
+            self.models[i] = decode_model(self.transforms[i],
+                                          getattr(node, "position_decode", None))
+            self.base_colors[i] = getattr(material, "base_color", _WHITE)
+            self.uv_transforms[i] = getattr(material, "uv_transform", IDENTITY_UV)
+            color = getattr(node, "color", _WHITE[:3])
+            self.tints[i] = color.as_np() if hasattr(color, "as_np") else color
+        self.calls, self.features, self.srvs = calls, features, srvs
+
+    # -----------------------------------------------------------------
+    def draw_items(self):
+        """Итератор (node, world_matrix_gl) для рендера."""
+        return zip(self.nodes, self.transforms[:self.count])
+
+    def draw_lods(self):
+        """Итератор (node, world_matrix_gl, lod) для рендера."""
+        return zip(self.nodes, self.transforms[:self.count], self.lods[:self.count].tolist())
+
+    def draws(self):
+        """
+        Итератор записанных draw для render‑потока:
+        (DrawCall, features, srv, model, base_color, uv_transform, tint).
+        """
+        n = self.count
+        return zip(self.calls, self.features, self.srvs, self.models[:n],
+                   self.base_colors[:n], self.uv_transforms[:n], self.tints[:n])
+
+    @property
+    def active_lights(self) -> np.ndarray:
+        return self.lights[:self.light_count]
+
+    # -----------------------------------------------------------------
+    def _reserve(self, n: int) -> None:
+        if n > len(self.transforms):
+            cap = max(n, len(self.transforms) * 2)
+            self.transforms = np.zeros((cap, 4, 4), dtype=np.float32)
+            self.lods = np.zeros(cap, dtype=np.int32)
+            self.centres = np.zeros((cap, 3), dtype=np.float32)
+            self.radii = np.zeros(cap, dtype=np.float32)
+            self.models = np.zeros((cap, 4, 4), dtype=np.float32)
+            self.base_colors = np.zeros((cap, 4), dtype=np.float32)
+            self.uv_transforms = np.zeros((cap, 4), dtype=np.float32)
+            self.tints = np.zeros((cap, 3), dtype=np.float32)
+
+    def _capture_lights(self, scene) -> None:
+        lights = scene_lights(scene)
+        self.lights = pack_lights(lights, self.lights)
+        self.light_count = len(lights)
@@ -8,6 +8,7 @@ from alkash3d.scene.light import DirectionalLight, PointLight, SpotLight
 from alkash3d.scene.mesh import Mesh
 from alkash3d.scene.model import Model
 from alkash3d.scene.scene import Scene
+from alkash3d.scene.interpolation import TransformInterpolator
 
 __all__ = ["Node", "Camera", "DirectionalLight", "PointLight",
-           "SpotLight", "Mesh", "Model", "Scene"]
+           "SpotLight", "Mesh", "Model", "Scene", "TransformInterpolator"]
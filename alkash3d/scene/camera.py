@@ -26,12 +26,11 @@ class Camera(Node):
     def get_projection_matrix(self, aspect_ratio):
         return Mat4.perspective(self.fov, aspect_ratio, self.near, self.far).to_gl()
 
-    def get_view_projection_frustum(self):
-        """Псевдо‑frustum – всегда возвращает True."""
-        class DummyFrustum:
-            def intersects_sphere(self, centre, radius):
-                return True
-        return DummyFrustum()
+    def get_view_projection_frustum(self, aspect_ratio=1.0):
+        """Frustum камеры (`culling.Frustum`) для заданного aspect."""
+        from alkash3d.culling.frustum import Frustum
+        return Frustum.from_matrices(self.get_view_matrix(),
+                                     self.get_projection_matrix(aspect_ratio))
 
     def update_fly(self, dt, input_manager):
         speed = 5.0 * dt
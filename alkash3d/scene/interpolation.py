@@ -0,0 +1,84 @@
+"""
+Интерполяция трансформ узлов между двумя последними тиками симуляции.
+
+Симуляция идёт фиксированным шагом (`FixedTimestep`), а рендер – со
+своей частотой. Чтобы движение не «дёргалось», перед рендером позиции,
+углы и масштаб всех узлов временно заменяются на
+`lerp(prev, curr, alpha)`, после рендера возвращаются к `curr`.
+
+Состояние хранится в NumPy‑массивах (N, 9): position | rotation | scale.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _pack(nodes) -> np.ndarray:
+    state = np.empty((len(nodes), 9), dtype=np.float32)
+    for i, n in enumerate(nodes):
+        state[i, 0:3] = n.position._v
+        state[i, 3:6] = n.rotation._v
+        state[i, 6:9] = n.scale._v
+    return state
+
+
+def _write(nodes, state: np.ndarray) -> None:
+    for n, row in zip(nodes, state):
+        n.position._v[:] = row[0:3]
+        n.rotation._v[:] = row[3:6]
+        n.scale._v[:] = row[6:9]
+
+
+class TransformInterpolator:
+    """prev/curr‑снимки трансформ и их смешивание для рендера."""
+
+    def __init__(self):
+        self._prev_nodes: list = []
+        self._prev: np.ndarray | None = None
+        self._nodes: list = []
+        self._curr: np.ndarray | None = None
+        self._applied = False
+
+    # -----------------------------------------------------------------
+    def capture_previous(self, scene) -> None:
+        """Вызывать перед каждым тиком симуляции."""
+        self._prev_nodes = list(scene.traverse())
+        self._prev = _pack(self._prev_nodes)
+
+    def capture_current(self, scene) -> None:
+        """Вызывать после последнего тика кадра."""
+        self._nodes = list(scene.traverse())
+        self._curr = _pack(self._nodes)
+
+    # -----------------------------------------------------------------
+    def apply(self, alpha: float) -> None:
+        """Записать в узлы интерполированное состояние."""
+        if self._prev is None or self._curr is None or not self._nodes:
+            return
+
+        prev = self._aligned_prev()
+        delta = self._curr - prev
+        # Углы Эйлера (градусы) – по кратчайшей дуге
+        delta[:, 3:6] = (delta[:, 3:6] + 180.0) % 360.0 - 180.0
+        _write(self._nodes, prev + delta * np.float32(alpha))
+        self._applied = True
+
+    def restore(self) -> None:
+        """Вернуть узлам состояние последнего тика."""
+        if self._applied:
+            _write(self._nodes, self._curr)
+            self._applied = False
+
+    # -----------------------------------------------------------------
+    def _aligned_prev(self) -> np.ndarray:
+        """prev в порядке `self._nodes` (новые узлы – без интерполяции)."""
+        if self._prev_nodes == self._nodes:
+            return self._prev
+        index = {id(n): i for i, n in enumerate(self._prev_nodes)}
+        prev = self._curr.copy()
+        for i, n in enumerate(self._nodes):
+            j = index.get(id(n))
+            if j is not None:
+                prev[i] = self._prev[j]
+        return prev
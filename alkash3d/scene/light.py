@@ -1,12 +1,21 @@
 """
 Базовые типы освещения: Directional, Point и Spot.
 Все они – наследники Node, поэтому могут быть вложены в иерархию.
+
+`packed()` – кортеж в порядке полей `renderer.snapshot.LIGHT_DTYPE`
+(без словарей и временных массивов); из списка таких кортежей массив
+источников собирается одним вызовом NumPy.
 """
 
+import math
+
 from alkash3d.scene.node import Node
 from alkash3d.math.vec3 import Vec3
 import numpy as np
 
+_ZERO3 = (0.0, 0.0, 0.0)
+
+
 class Light(Node):
     """Базовый класс для всех видов света."""
     def __init__(self, color: Vec3 = Vec3(1.0, 1.0, 1.0),
@@ -19,6 +28,10 @@ class Light(Node):
     def get_uniforms(self) -> dict:
         raise NotImplementedError
 
+    def packed(self) -> tuple:
+        """(type, color, intensity, position, radius, direction, inner, outer)."""
+        raise NotImplementedError
+
 class DirectionalLight(Light):
     """Свет из бесконечности, задаётся направлением."""
     def __init__(self, direction: Vec3 = Vec3(0, -1, 0), **kwargs):
@@ -33,6 +46,10 @@ class DirectionalLight(Light):
             "intensity": self.intensity,
         }
 
+    def packed(self):
+        return (0, self.color._v, self.intensity, _ZERO3, 0.0,
+                self.direction._v, 0.0, 0.0)
+
 class PointLight(Light):
     """Точечный свет с радиусом затухания."""
     def __init__(self, position: Vec3 = Vec3(0, 0, 0), radius: float = 10.0, **kwargs):
@@ -49,6 +66,10 @@ class PointLight(Light):
             "radius": self.radius,
         }
 
+    def packed(self):
+        return (1, self.color._v, self.intensity, self.get_world_position()._v,
+                self.radius, _ZERO3, 0.0, 0.0)
+
     def get_world_position(self):
         return self.position
 
@@ -58,8 +79,10 @@ class SpotLight(Light):
                  direction: Vec3 = Vec3(0, -1, 0),
                  inner_angle: float = 15.0,
                  outer_angle: float = 30.0,
+                 radius: float = 10.0,
                  **kwargs):
         super().__init__(**kwargs)
+        self.radius = float(radius)
         self.direction = direction.normalized()
         self.inner_angle = float(inner_angle)
         self.outer_angle = float(outer_angle)
@@ -71,10 +94,17 @@ class SpotLight(Light):
             "direction": self.direction.as_np(),
             "color": self.color.as_np(),
             "intensity": self.intensity,
+            "radius": self.radius,
             "innerCutoff": np.cos(np.radians(self.inner_angle)),
             "outerCutoff": np.cos(np.radians(self.outer_angle)),
         }
 
+    def packed(self):
+        return (2, self.color._v, self.intensity, self.get_world_position()._v,
+                self.radius, self.direction._v,
+                math.cos(math.radians(self.inner_angle)),
+                math.cos(math.radians(self.outer_angle)))
+
     def get_world_position(self):
-        world = self.get_world_matrix()
+        world = self.get_world_matrix().m
         return Vec3(world[0, 3], world[1, 3], world[2, 3])
\ No newline at end of file
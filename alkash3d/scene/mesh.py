@@ -2,60 +2,216 @@
 Примитивный объект – создаёт буферы в GPU‑драйвере при первом draw().
 """
 
+from typing import Any, NamedTuple
+
 import numpy as np
 from alkash3d.scene.node import Node
 from alkash3d.math.vec3 import Vec3
+from alkash3d.mesh.mesh_file import lod_table
+from alkash3d.mesh.vertex_format import FLOAT32, decode_vertices, encode_vertices, format_id
+
+class DrawCall(NamedTuple):
+    """
+    Всё, что нужно command list‑у для одного draw меша: GPU‑буферы,
+    раскладка и диапазон индексов уровня LOD. Записывается в снимок
+    кадра в update‑потоке (`Mesh.draw_call`), render‑поток только
+    вызывает `submit` – сам узел он не читает.
+    """
+    vb: Any
+    ib: Any
+    stride: int
+    vertex_bytes: int
+    index_bytes: int
+    index_format: str
+    count: int
+    offset: int
+
+    def submit(self, backend) -> None:
+        if getattr(backend, "supports_index16", False):
+            backend.set_vertex_buffers(self.vb, self.ib,
+                                       stride=self.stride,
+                                       vertex_bytes=self.vertex_bytes,
+                                       index_bytes=self.index_bytes,
+                                       index_format=self.index_format)
+        else:
+            backend.set_vertex_buffers(self.vb, self.ib)
+        if self.ib is not None:
+            backend.draw_indexed(self.count, self.offset)
+        else:
+            backend.draw(self.count)
+
 
 class Mesh(Node):
-    """Примитивный объект – создаёт буферы в GPU‑драйвере при первом draw()."""
+    """
+    Примитивный объект – создаёт буферы в GPU‑драйвере при первом draw().
+
+    Массивы не копируются, если они уже нужного типа (в т.ч. view в
+    `np.memmap`). `bounds=(centre, radius)` – готовая ограничивающая
+    сфера (не пересчитывается), `interleaved` – готовый вершинный поток
+    (N, 8) для прямой загрузки в GPU (см. `alkash3d.mesh.mesh_file`).
+
+    LOD‑цепочка – `lod_ranges` (`LOD_DTYPE`: диапазоны общего индексного
+    буфера, уровень 0 – полный меш); `draw(backend, lod)` рисует
+    диапазон уровня, выбранного рендерером (`renderer.lod.LODSelector`).
+
+    `vertex_format` – раскладка GPU‑потока (`alkash3d.mesh.vertex_format`):
+    готовый компактный `interleaved` (из `.amesh`) грузится как есть,
+    иначе массивы кодируются один раз в конструкторе. `position_decode`
+    рендерер домножает на модельную матрицу (`decode_model`).
+    """
     def __init__(self,
                  vertices: np.ndarray,
                  normals: np.ndarray = None,
                  texcoords: np.ndarray = None,
                  indices: np.ndarray = None,
-                 name="Mesh"):
+                 name="Mesh",
+                 bounds=None,
+                 interleaved: np.ndarray = None,
+                 vertex_format=FLOAT32,
+                 position_decode=None):
         super().__init__(name)
 
-        self.vertices = vertices.astype(np.float32)
-        self.normals = normals.astype(np.float32) if normals is not None else None
-        self.texcoords = texcoords.astype(np.float32) if texcoords is not None else None
-        self.indices = indices.astype(np.uint32) if indices is not None else None
+        self.vertices = vertices.astype(np.float32, copy=False)
+        self.normals = normals.astype(np.float32, copy=False) if normals is not None else None
+        self.texcoords = texcoords.astype(np.float32, copy=False) if texcoords is not None else None
+        if indices is not None and indices.dtype not in (np.uint16, np.uint32):
+            indices = indices.astype(np.uint32)
+        self.indices = indices
+        self.vertex_format = format_id(vertex_format)
+        self.position_decode = position_decode
+        if self.vertex_format != FLOAT32 and interleaved is None:
+            interleaved, self.position_decode = encode_vertices(
+                self.vertices, self.normals, self.texcoords, self.vertex_format)
+        self._interleaved = interleaved
 
         self.vb = None
         self.ib = None
+        self._vb_stride = 32
+        self._vb_bytes = 0
+        self._ib_bytes = 0
+        self._index_format = "uint32"
         self.index_count = len(self.indices) if self.indices is not None else len(self.vertices) // 3
         self.color = Vec3(1.0, 1.0, 1.0)
+        self.lod_ranges = None
+        self.lod = 0                # последний выбранный уровень (гистерезис)
 
         # bounding sphere
-        verts = self.vertices
-        if verts.ndim == 1:
-            verts = verts.reshape((-1, 3))
-        self._bounding_center = verts.mean(axis=0).astype(np.float32)
-        self._bounding_radius = np.linalg.norm(verts - self._bounding_center, axis=1).max()
+        if bounds is not None:
+            centre, radius = bounds
+            self._bounding_center = np.asarray(centre, dtype=np.float32)
+            self._bounding_radius = float(radius)
+        else:
+            verts = self.vertices
+            if verts.ndim == 1:
+                verts = verts.reshape((-1, 3))
+            self._bounding_center = verts.mean(axis=0).astype(np.float32)
+            self._bounding_radius = np.linalg.norm(verts - self._bounding_center, axis=1).max()
 
-    def _setup_gpu_buffers(self, backend):
-        components = [self.vertices]
-        if self.normals is not None:
-            components.append(self.normals)
+    @property
+    def lod_count(self) -> int:
+        return len(self.lod_ranges) if self.lod_ranges is not None else 1
+
+    def set_lod_chain(self, levels, errors=None, backend=None) -> None:
+        """
+        Задать LOD‑цепочку: `levels` – индексы уровней (0 – полный меш) над
+        общими вершинами; они склеиваются в один индексный буфер.
+        `backend` – отдать уже созданные GPU‑буферы (пересоздадутся).
+        """
+        levels = [np.asarray(lvl).reshape(-1) for lvl in levels]
+        dtype = np.uint16 if len(self.vertices.reshape(-1, 3)) <= 0xFFFF else np.uint32
+        ranges = lod_table([len(lvl) for lvl in levels], errors)
+        if backend is not None:
+            self.release_gpu_buffers(backend)
+        self.indices = np.concatenate(levels).astype(dtype, copy=False)
+        self.lod_ranges = ranges
+        self.index_count = int(ranges["index_count"][0])
+        self.lod = 0
+
+    @property
+    def has_texcoords(self) -> bool:
+        """Есть ли UV (отдельным массивом или в interleaved‑потоке)."""
         if self.texcoords is not None:
-            components.append(self.texcoords)
-        interleaved = np.column_stack(components).astype(np.float32).ravel()
-        self.vb = backend.create_buffer(interleaved.tobytes(), usage="vertex")
+            return True
+        inter = self._interleaved
+        return inter is not None and inter.dtype.names is None \
+            and inter.ndim == 2 and inter.shape[1] >= 8
+
+    def _setup_gpu_buffers(self, backend):
+        if self.vertex_format != FLOAT32 and not getattr(backend, "supports_vertex_formats", False):
+            # Бэкенд знает только float32‑раскладку: позиции в единичном
+            # кубе, `position_decode` по‑прежнему в модельной матрице
+            interleaved = decode_vertices(self._interleaved, self.vertex_format,
+                                          normalized=True)
+        elif self._interleaved is not None:
+            interleaved = self._interleaved
+        else:
+            components = [self.vertices]
+            if self.normals is not None:
+                components.append(self.normals)
+            if self.texcoords is not None:
+                components.append(self.texcoords)
+            interleaved = np.column_stack(components).astype(np.float32)
+        if interleaved.dtype.names:
+            self._vb_stride = interleaved.dtype.itemsize
+        else:
+            self._vb_stride = interleaved.shape[1] * 4 if interleaved.ndim == 2 else 32
+        self.vb = backend.create_buffer(interleaved, usage="vertex")
+        self._vb_bytes = interleaved.nbytes
+
         if self.indices is not None:
-            self.ib = backend.create_buffer(self.indices.tobytes(), usage="index")
+            indices = self.indices
+            if indices.dtype == np.uint16 and not getattr(backend, "supports_index16", False):
+                indices = indices.astype(np.uint32)
+            self._index_format = "uint16" if indices.dtype == np.uint16 else "uint32"
+            self.ib = backend.create_buffer(indices, usage="index")
+            self._ib_bytes = indices.nbytes
         else:
             self.ib = None
 
-    def draw(self, backend):
-        """Отрисовать меш, создавая буферы «лениво»."""
+    def release_gpu_buffers(self, backend):
+        """
+        Отдать VB/IB бэкенду (`defer_release` – после кадров «в полёте»);
+        при следующем `draw()` буферы создадутся заново.
+        """
+        for buf in (self.vb, self.ib):
+            if buf is not None:
+                backend.defer_release(buf)
+        self.vb = self.ib = None
+        self._vb_bytes = self._ib_bytes = 0
+
+    def replace_geometry(self, src: "Mesh", backend) -> None:
+        """Взять массивы и bounds у `src` (горячая перезагрузка файла)."""
+        self.release_gpu_buffers(backend)
+        self.vertices, self.normals = src.vertices, src.normals
+        self.texcoords, self.indices = src.texcoords, src.indices
+        self._interleaved = src._interleaved
+        self.vertex_format = src.vertex_format
+        self.position_decode = src.position_decode
+        self.index_count = src.index_count
+        self._bounding_center = src._bounding_center
+        self._bounding_radius = src._bounding_radius
+        for attr in ("lod_ranges", "meshlets"):
+            if hasattr(src, attr):
+                setattr(self, attr, getattr(src, attr))
+
+    def draw_call(self, backend, lod: int | None = None) -> DrawCall:
+        """
+        Параметры draw уровня `lod` (буферы создаются «лениво», поэтому
+        вызывать в потоке, которому можно создавать ресурсы).
+        """
         if self.vb is None:
             self._setup_gpu_buffers(backend)
+        count, offset = self.index_count, 0
+        if self.ib is not None and self.lod_ranges is not None:
+            level = self.lod if lod is None else lod
+            rng = self.lod_ranges[min(max(int(level), 0), len(self.lod_ranges) - 1)]
+            count, offset = int(rng["index_count"]), int(rng["index_offset"])
+        return DrawCall(self.vb, self.ib, self._vb_stride, self._vb_bytes, self._ib_bytes,
+                        self._index_format, count, offset)
 
-        backend.set_vertex_buffers(self.vb, self.ib)
-        if self.ib is not None:
-            backend.draw_indexed(self.index_count)
-        else:
-            backend.draw(self.index_count)
+    def draw(self, backend, lod: int | None = None):
+        """Отрисовать меш (уровень `lod`), создавая буферы «лениво»."""
+        self.draw_call(backend, lod).submit(backend)
 
     @property
     def bounding_sphere(self):
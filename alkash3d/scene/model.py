@@ -12,6 +12,5 @@ class Model(Node):
         for m in meshes:
             self.add_child(m)
 
-    def draw(self):
-        for m in self.meshes:
-            m.draw(self.backend)   # backend будет передан из рендера
+    # Собственного `draw` нет: меши – дочерние узлы, рендер обходит их
+    # сам (иначе каждый меш рисовался бы дважды).
@@ -3,6 +3,7 @@
 """
 
 from alkash3d.scene.node import Node
+from alkash3d.scene.light import Light
 from alkash3d.culling.octree import Octree
 
 class Scene(Node):
@@ -14,13 +15,25 @@ class Scene(Node):
             max_depth=6,
             max_objects=8,
         )
+        self._lights: list | None = None     # собираются в update()
 
     def update(self, dt):
+        lights = []
         for node in self.traverse():
             if hasattr(node, "on_update"):
                 node.on_update(dt)
+            if isinstance(node, Light):
+                lights.append(node)
+        self._lights = lights
         self.culling.rebuild(self)
 
-    def visible_nodes(self, camera):
-        frustum = camera.get_view_projection_frustum()
-        return self.culling.query(frustum)
\ No newline at end of file
+    def lights(self) -> list:
+        """Источники света (список с последнего `update`, без нового обхода)."""
+        if self._lights is None:
+            return [n for n in self.traverse() if isinstance(n, Light)]
+        return self._lights
+
+    def visible_nodes(self, camera, aspect=1.0, jobs=None):
+        """Узлы в frustum камеры; `jobs` – `JobSystem` для проверки сфер."""
+        frustum = camera.get_view_projection_frustum(aspect)
+        return self.culling.query(frustum, jobs)
\ No newline at end of file
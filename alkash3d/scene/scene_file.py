@@ -0,0 +1,369 @@
+"""
+Бинарный формат сцены (`.ascene`).
+
+Раскладка файла (little‑endian, секции выровнены на 64 байта):
+
+    Header : magic "ASCN", version u16, reserved u16, node_count u32,
+             blob_count u32, names_nbytes u32, nodes_off u64,
+             blobs_off u64, names_off u64                        (44 B)
+    Nodes  : node_count × NODE_DTYPE – трансформ, индекс родителя
+             (родитель всегда раньше ребёнка), код типа, имя
+             (offset/len в таблице строк), параметры камеры/света,
+             индекс mesh‑блоба (-1 – нет)
+    Blobs  : blob_count × BLOB_DTYPE – sha1, offset, nbytes
+    Names  : UTF‑8 имена подряд
+    Data   : mesh‑блобы – образы `.amesh` (см. `alkash3d.mesh.mesh_file`)
+
+Блобы адресуются содержимым: меш, на который ссылаются много узлов
+(или одинаковые меши), хранится один раз. `load_scene_file` отображает
+файл в память и строит меши на view в него – данные вершин читаются
+с диска только при первом обращении (обычно – загрузка в GPU); узлы,
+ссылающиеся на один блоб, делят одни и те же массивы.
+
+`clone_node` копирует поддерево через ту же таблицу узлов, но без
+сериализации геометрии – копии делят массивы с оригиналом.
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from alkash3d.math.vec3 import Vec3
+from alkash3d.mesh.mesh_file import MeshFile, Meshlets, encode_mesh_file
+from alkash3d.scene.camera import Camera
+from alkash3d.scene.light import DirectionalLight, Light, PointLight, SpotLight
+from alkash3d.scene.mesh import Mesh
+from alkash3d.scene.model import Model
+from alkash3d.scene.node import Node
+from alkash3d.scene.scene import Scene
+from alkash3d.utils.cache import atomic_write
+from alkash3d.utils.logger import logger
+
+MAGIC = b"ASCN"
+VERSION = 1
+ALIGN = 64
+
+_HEADER = struct.Struct("<4sHHIIIQQQ")
+
+# Порядок важен: индекс – код типа в файле
+NODE_TYPES = ["Node", "Scene", "Mesh", "Model", "Camera",
+              "DirectionalLight", "PointLight", "SpotLight"]
+_TYPE_CODES = {name: i for i, name in enumerate(NODE_TYPES)}
+
+NODE_DTYPE = np.dtype([
+    ("parent", np.int32),
+    ("type", np.uint8),
+    ("reserved", np.uint8, 3),
+    ("name_offset", np.uint32),
+    ("name_len", np.uint32),
+    ("mesh", np.int32),
+    ("position", np.float32, 3),
+    ("rotation", np.float32, 3),
+    ("scale", np.float32, 3),
+    ("color", np.float32, 3),
+    ("direction", np.float32, 3),
+    # Camera: fov, near, far; Light: intensity, radius / inner, outer
+    ("params", np.float32, 4),
+])
+
+BLOB_DTYPE = np.dtype([
+    ("hash", "S20"),
+    ("offset", np.uint64),
+    ("nbytes", np.uint64),
+])
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) & ~(ALIGN - 1)
+
+
+def _vec(v) -> tuple[float, float, float]:
+    return (float(v.x), float(v.y), float(v.z))
+
+
+def _type_name(node: Node) -> str:
+    for cls in type(node).__mro__:
+        if cls.__name__ in _TYPE_CODES:
+            return cls.__name__
+    return "Node"
+
+
+# ---------------------------------------------------------------------
+#   Таблица узлов
+# ---------------------------------------------------------------------
+def _flatten(root: Node) -> tuple[np.ndarray, list[str], list[Node]]:
+    """Поддерево → (NODE_DTYPE‑таблица, имена, узлы) в порядке DFS."""
+    nodes, parents = [], []
+    stack = [(root, -1)]
+    while stack:
+        node, parent = stack.pop()
+        parents.append(parent)
+        idx = len(nodes)
+        nodes.append(node)
+        for child in reversed(node.children):
+            stack.append((child, idx))
+
+    table = np.zeros(len(nodes), dtype=NODE_DTYPE)
+    table["parent"] = parents
+    table["mesh"] = -1
+    names = []
+    for rec, node in zip(table, nodes):
+        typ = _type_name(node)
+        if typ != type(node).__name__:
+            logger.debug(f"[SceneFile] {type(node).__name__} stored as {typ}")
+        rec["type"] = _TYPE_CODES[typ]
+        rec["position"] = _vec(node.position)
+        rec["rotation"] = _vec(node.rotation)
+        rec["scale"] = _vec(node.scale)
+        names.append(str(node.name))
+
+        if isinstance(node, Mesh):
+            rec["color"] = _vec(node.color)
+        elif isinstance(node, Camera):
+            rec["params"][:3] = (node.fov, node.near, node.far)
+        elif isinstance(node, Light):
+            rec["color"] = _vec(node.color)
+            rec["params"][0] = node.intensity
+            if isinstance(node, PointLight):
+                rec["params"][1] = node.radius
+            if isinstance(node, (DirectionalLight, SpotLight)):
+                rec["direction"] = _vec(node.direction)
+            if isinstance(node, SpotLight):
+                rec["params"][1:3] = (node.inner_angle, node.outer_angle)
+    return table, names, nodes
+
+
+def _build(table: np.ndarray, names: list[str], make_mesh) -> Node:
+    """Таблица → дерево узлов; `make_mesh(i, name)` строит `Mesh` узла i."""
+    nodes: list[Node] = []
+    for i, rec in enumerate(table):
+        typ = NODE_TYPES[rec["type"]] if rec["type"] < len(NODE_TYPES) else "Node"
+        name = names[i]
+        p = rec["params"]
+        if typ == "Mesh":
+            node = make_mesh(i, name)
+            node.color = Vec3(*rec["color"].tolist())
+        elif typ == "Scene":
+            node = Scene()
+            node.name = name
+        elif typ == "Model":
+            node = Model([], name=name)
+        elif typ == "Camera":
+            node = Camera(fov=float(p[0]), near=float(p[1]), far=float(p[2]), name=name)
+        elif typ == "DirectionalLight":
+            node = DirectionalLight(direction=Vec3(*rec["direction"].tolist()),
+                                    color=Vec3(*rec["color"].tolist()),
+                                    intensity=float(p[0]), name=name)
+        elif typ == "PointLight":
+            node = PointLight(radius=float(p[1]), color=Vec3(*rec["color"].tolist()),
+                              intensity=float(p[0]), name=name)
+        elif typ == "SpotLight":
+            node = SpotLight(direction=Vec3(*rec["direction"].tolist()),
+                             inner_angle=float(p[1]), outer_angle=float(p[2]),
+                             color=Vec3(*rec["color"].tolist()),
+                             intensity=float(p[0]), name=name)
+        else:
+            node = Node(name)
+        node.position = Vec3(*rec["position"].tolist())
+        node.rotation = Vec3(*rec["rotation"].tolist())
+        node.scale = Vec3(*rec["scale"].tolist())
+
+        parent = int(rec["parent"])
+        if parent >= 0:
+            nodes[parent].add_child(node)
+            if isinstance(nodes[parent], Model) and isinstance(node, Mesh):
+                nodes[parent].meshes.append(node)
+        nodes.append(node)
+    return nodes[0]
+
+
+def _share_mesh(src: Mesh, name: str) -> Mesh:
+    """Новый `Mesh` на тех же массивах (без копий и без пересчёта bounds)."""
+    mesh = Mesh(src.vertices, src.normals, src.texcoords, src.indices, name=name,
+                bounds=(src._bounding_center, src._bounding_radius),
+                interleaved=src._interleaved, vertex_format=src.vertex_format,
+                position_decode=src.position_decode)
+    for attr in ("lod_ranges", "meshlets", "material", "payload_path"):
+        if hasattr(src, attr):
+            setattr(mesh, attr, getattr(src, attr))
+    return mesh
+
+
+def clone_node(node: Node) -> Node:
+    """Глубокая копия поддерева; меши делят массивы с оригиналом."""
+    table, names, nodes = _flatten(node)
+    return _build(table, names, lambda i, name: _share_mesh(nodes[i], name))
+
+
+# ---------------------------------------------------------------------
+#   Запись
+# ---------------------------------------------------------------------
+def _encode_mesh(mesh: Mesh) -> bytes:
+    return encode_mesh_file(mesh.vertices, mesh.normals, mesh.texcoords,
+                            mesh.indices, lods=getattr(mesh, "lod_ranges", None),
+                            meshlets=getattr(mesh, "meshlets", None),
+                            vertex_format=mesh.vertex_format)
+
+
+def save_scene_file(root: Node, path) -> Path:
+    """Записать сцену в `.ascene` (атомарно)."""
+    path = Path(path)
+    _detach_from(root, path)
+    table, names, nodes = _flatten(root)
+
+    blobs: list[bytes] = []
+    by_hash: dict[bytes, int] = {}
+    by_arrays: dict[tuple, int] = {}          # общие массивы → без кодирования
+    for rec, node in zip(table, nodes):
+        if not isinstance(node, Mesh):
+            continue
+        key = (id(node.vertices), id(node.normals), id(node.texcoords), id(node.indices))
+        idx = by_arrays.get(key)
+        if idx is None:
+            data = _encode_mesh(node)
+            digest = hashlib.sha1(data).digest()
+            idx = by_hash.get(digest)
+            if idx is None:
+                idx = by_hash[digest] = len(blobs)
+                blobs.append(data)
+            by_arrays[key] = idx
+        rec["mesh"] = idx
+
+    name_bytes = [n.encode("utf-8") for n in names]
+    offset = 0
+    for rec, nb in zip(table, name_bytes):
+        rec["name_offset"], rec["name_len"] = offset, len(nb)
+        offset += len(nb)
+    names_blob = b"".join(name_bytes)
+
+    blob_table = np.zeros(len(blobs), dtype=BLOB_DTYPE)
+    nodes_off = _align(_HEADER.size)
+    blobs_off = _align(nodes_off + table.nbytes)
+    names_off = _align(blobs_off + blob_table.nbytes)
+    offset = _align(names_off + len(names_blob))
+    for i, data in enumerate(blobs):
+        blob_table[i] = (hashlib.sha1(data).digest(), offset, len(data))
+        offset = _align(offset + len(data))
+
+    with atomic_write(path) as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(table), len(blobs),
+                             len(names_blob), nodes_off, blobs_off, names_off))
+        for off, data in ((nodes_off, table.tobytes()),
+                          (blobs_off, blob_table.tobytes()),
+                          (names_off, names_blob)):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(data)
+        for (_, off, _), data in zip(blob_table.tolist(), blobs):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(data)
+    logger.info(f"[SceneFile] Saved {len(table)} nodes, {len(blobs)} mesh blobs → {path}")
+    return path
+
+
+def _detach_from(root: Node, path: Path) -> None:
+    """
+    Меши, отображённые из `path`, переводятся на копии в памяти –
+    иначе перезапись файла (rename поверх отображённого) на Windows
+    невозможна. Общие массивы остаются общими.
+    """
+    target = path.resolve()
+    copies: dict[int, tuple] = {}
+    touched = False
+    for node in root.traverse():
+        if not isinstance(node, Mesh) or getattr(node, "payload_path", None) != target:
+            continue
+        touched = True
+        key = id(node._interleaved)
+        if key not in copies:
+            inter = np.array(node._interleaved)
+            copies[key] = (inter, np.array(node.indices),
+                           np.array(getattr(node, "lod_ranges", None))
+                           if getattr(node, "lod_ranges", None) is not None else None)
+        inter, indices, lods = copies[key]
+        node._interleaved = inter
+        if inter.dtype.names:
+            # Компактный поток: CPU‑массивы – уже декодированные копии
+            node.position_decode = np.array(node.position_decode)
+        else:
+            node.vertices, node.normals, node.texcoords = inter[:, 0:3], inter[:, 3:6], inter[:, 6:8]
+        node.indices = indices
+        if lods is not None:
+            node.lod_ranges = lods
+        node.meshlets = None if getattr(node, "meshlets", None) is None \
+            else Meshlets(*(np.array(a) for a in node.meshlets))
+        node.payload_path = None
+    if touched:
+        gc.collect()                         # закрыть отображение
+
+
+# ---------------------------------------------------------------------
+#   Чтение
+# ---------------------------------------------------------------------
+class SceneFile:
+    """Отображённый в память `.ascene`; таблицы – view без копий."""
+
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+        (magic, version, _, node_count, blob_count, names_nbytes,
+         nodes_off, blobs_off, names_off) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an ASCN scene file: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported ASCN version {version}: {self.path}")
+        self.nodes = self._map[nodes_off:nodes_off + node_count * NODE_DTYPE.itemsize] \
+            .view(NODE_DTYPE)
+        self.blobs = self._map[blobs_off:blobs_off + blob_count * BLOB_DTYPE.itemsize] \
+            .view(BLOB_DTYPE)
+        self._names = bytes(self._map[names_off:names_off + names_nbytes])
+        self._meshes: dict[int, MeshFile] = {}
+
+    @property
+    def names(self) -> list[str]:
+        return [self._names[o:o + n].decode("utf-8")
+                for o, n in zip(self.nodes["name_offset"].tolist(),
+                                self.nodes["name_len"].tolist())]
+
+    def mesh_file(self, blob: int) -> MeshFile:
+        """Меш блоба `blob` (разбирается при первом обращении)."""
+        mf = self._meshes.get(blob)
+        if mf is None:
+            mf = MeshFile(self.path, buffer=self._map,
+                          base=int(self.blobs["offset"][blob]))
+            self._meshes[blob] = mf
+        return mf
+
+    def build(self) -> Node:
+        def make_mesh(i: int, name: str) -> Mesh:
+            mf = self.mesh_file(int(self.nodes["mesh"][i]))
+            mesh = Mesh(mf.positions, mf.normals, mf.texcoords, mf.indices,
+                        name=name, bounds=mf.bounding_sphere, interleaved=mf.vertices,
+                        vertex_format=mf.vertex_format, position_decode=mf.position_decode)
+            mesh.lod_ranges = mf.lods
+            mesh.meshlets = mf.meshlets
+            mesh.payload_path = self.path
+            return mesh
+
+        return _build(self.nodes, self.names, make_mesh)
+
+
+def load_scene_file(path) -> Node:
+    """Загрузить `.ascene`; геометрия читается лениво (memmap)."""
+    sf = SceneFile(path)
+    root = sf.build()
+    logger.info(f"[SceneFile] Loaded {len(sf.nodes)} nodes, "
+                f"{len(sf.blobs)} mesh blobs ← {sf.path}")
+    return root
+
+
+def is_scene_file(path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == MAGIC
+    except OSError:
+        return False
@@ -0,0 +1,362 @@
+"""
+Потоковая подгрузка мира по ячейкам сетки.
+
+Уровень делится на квадратные ячейки в плоскости XZ; каждая ячейка –
+отдельный `.ascene` (см. `alkash3d.scene.scene_file`), а `world.json`
+описывает сетку:
+
+    {"version": 1, "cell_size": 64.0,
+     "cells": {"3,-2": {"file": "cell_3_-2.ascene", "nbytes": 123456}}}
+
+`StreamingManager.update(camera_pos)` раз в кадр (в потоке update):
+
+1️⃣  ячейки ближе `load_radius` запрашиваются у `AsyncLoader` по
+    возрастанию расстояния; за кадр ставится не больше
+    `io_budget_bytes` новых запросов, а резидентные + загружаемые
+    ячейки не превышают `budget_bytes`;
+2️⃣  файл отображается в память и «прогревается» в I/O‑потоке,
+    VB/IB создаются в `AsyncLoader.pump` в пределах бюджета загрузки;
+3️⃣  готовые ячейки подключаются к сцене здесь же, в `update` – чтобы
+    не менять граф сцены из render‑потока;
+4️⃣  ячейки дальше `unload_radius` (> `load_radius` – гистерезис, чтобы
+    не «дребезжать» на границе) отключаются; их GPU‑буферы уходят в
+    `backend.defer_release` только через `retire_frames` вызовов
+    `update` – когда снимки кадров, ещё видевших ячейку, отрисованы
+    (конвейерный режим, `FramePipeline.depth`).
+
+Ячейка помнит свой handle загрузки: выгрузка во время загрузки
+«забывает» его, а пришедший позже устаревший handle не подключается –
+его результат сразу освобождается.
+
+Размер мира ограничен диском: в памяти только ячейки вокруг камеры.
+Нарезать готовую сцену на ячейки – `partition_scene` или
+`python -m alkash3d.scene.streaming level.ascene out_dir --cell 64`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import threading
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from alkash3d.assets.async_loader import _iter_meshes, _mesh_bytes, _upload_mesh, register_kind
+from alkash3d.scene.node import Node
+from alkash3d.scene.scene_file import load_scene_file, save_scene_file
+from alkash3d.utils.cache import atomic_write
+from alkash3d.utils.logger import logger
+
+MANIFEST = "world.json"
+MANIFEST_VERSION = 1
+_PAGE = 4096
+
+# Состояния ячейки
+LOADING = "loading"
+RESIDENT = "resident"
+
+
+def _cell_key(ix: int, iz: int) -> str:
+    return f"{ix},{iz}"
+
+
+def cell_of(position, cell_size: float) -> tuple[int, int]:
+    """Ячейка, в которую попадает точка (x, y, z)."""
+    return (int(math.floor(float(position[0]) / cell_size)),
+            int(math.floor(float(position[2]) / cell_size)))
+
+
+def _node_position(node: Node) -> np.ndarray:
+    sphere = getattr(node, "bounding_sphere", None)
+    if sphere is not None:
+        return np.asarray(sphere[0], dtype=np.float32)
+    p = node.position
+    return np.array([p.x, p.y, p.z], dtype=np.float32)
+
+
+# ---------------------------------------------------------------------
+#   Нарезка сцены на ячейки (офлайн)
+# ---------------------------------------------------------------------
+def partition_scene(root: Node, out_dir, cell_size: float = 64.0) -> Path:
+    """
+    Разложить дочерние узлы `root` по ячейкам (по центру ограничивающей
+    сферы / позиции) и записать `.ascene` каждой ячейки и `world.json`.
+    Трансформ `root` должен быть единичным.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cells: dict[tuple[int, int], list[Node]] = {}
+    for child in list(root.children):
+        cells.setdefault(cell_of(_node_position(child), cell_size), []).append(child)
+
+    manifest = {"version": MANIFEST_VERSION, "cell_size": float(cell_size), "cells": {}}
+    for (ix, iz), children in sorted(cells.items()):
+        cell_root = Node(f"cell_{ix}_{iz}")
+        cell_root.children = children          # без смены parent у исходной сцены
+        path = save_scene_file(cell_root, out_dir / f"cell_{ix}_{iz}.ascene")
+        manifest["cells"][_cell_key(ix, iz)] = {"file": path.name,
+                                                "nbytes": path.stat().st_size}
+    with atomic_write(out_dir / MANIFEST) as f:
+        f.write(json.dumps(manifest, indent=2).encode("utf-8"))
+    logger.info(f"[Streaming] Partitioned into {len(cells)} cells of {cell_size} → {out_dir}")
+    return out_dir / MANIFEST
+
+
+# ---------------------------------------------------------------------
+#   Тип ассета «ячейка»: отображение + прогрев в I/O‑потоке
+# ---------------------------------------------------------------------
+def _decode_cell(path: Path):
+    root = load_scene_file(path)
+    nbytes = 0
+    for mesh in _iter_meshes(root):
+        # Прочитать страницы с диска здесь, а не при создании VB в кадре
+        for arr in (getattr(mesh, "_interleaved", None), mesh.indices):
+            if arr is not None and arr.size:
+                flat = arr.reshape(-1).view(np.uint8)
+                int(flat[::_PAGE].sum())
+        nbytes += _mesh_bytes(mesh)
+    return root, nbytes
+
+
+register_kind("scene_cell", _decode_cell, _upload_mesh)
+
+
+class StreamingCell:
+    """Ячейка мира: состояние, корневой узел и размер в памяти."""
+
+    __slots__ = ("key", "ix", "iz", "path", "file_bytes", "state",
+                 "handle", "root", "nbytes")
+
+    def __init__(self, ix: int, iz: int, path: Path, file_bytes: int):
+        self.key = (ix, iz)
+        self.ix, self.iz = ix, iz
+        self.path = path
+        self.file_bytes = int(file_bytes)
+        self.state = None
+        self.handle = None
+        self.root: Node | None = None
+        self.nbytes = 0
+
+    def __repr__(self):
+        return f"StreamingCell({self.ix},{self.iz}, {self.state})"
+
+
+class StreamingManager:
+    """Подгружает и выгружает ячейки мира вокруг камеры."""
+
+    def __init__(self, scene: Node, loader, world, backend=None,
+                 load_radius: float = 128.0, unload_radius: float | None = None,
+                 budget_bytes: int = 512 * 1024 * 1024,
+                 io_budget_bytes: int = 8 * 1024 * 1024,
+                 retire_frames: int = 0):
+        self.scene = scene
+        self.loader = loader
+        self.backend = backend
+        self.load_radius = float(load_radius)
+        self.unload_radius = float(unload_radius if unload_radius is not None
+                                   else load_radius * 1.25)
+        if self.unload_radius < self.load_radius:
+            raise ValueError("unload_radius must be >= load_radius")
+        self.budget_bytes = int(budget_bytes)
+        self.io_budget_bytes = int(io_budget_bytes)
+        self.retire_frames = int(retire_frames)
+
+        world = Path(world)
+        manifest_path = world / MANIFEST if world.is_dir() else world
+        manifest = json.loads(manifest_path.read_text("utf-8"))
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported world manifest: {manifest_path}")
+        self.cell_size = float(manifest["cell_size"])
+        self.cells: dict[tuple[int, int], StreamingCell] = {}
+        for key, info in manifest["cells"].items():
+            ix, iz = (int(v) for v in key.split(","))
+            self.cells[(ix, iz)] = StreamingCell(ix, iz, manifest_path.parent / info["file"],
+                                                 info.get("nbytes", 0))
+
+        self._active: dict[tuple[int, int], StreamingCell] = {}
+        self._arrived: list[tuple] = []             # (ячейка, handle) из pump
+        self._lock = threading.Lock()
+        self._retiring: deque = deque()             # (кадр освобождения, root)
+        self._frame = 0
+
+        self.resident_bytes = 0
+        self.loads = 0
+        self.unloads = 0
+
+    # -----------------------------------------------------------------
+    def _distance(self, cell: StreamingCell, x: float, z: float) -> float:
+        """Расстояние от точки до прямоугольника ячейки в XZ."""
+        s = self.cell_size
+        dx = max(cell.ix * s - x, 0.0, x - (cell.ix + 1) * s)
+        dz = max(cell.iz * s - z, 0.0, z - (cell.iz + 1) * s)
+        return math.hypot(dx, dz)
+
+    def _cells_within(self, x: float, z: float, radius: float):
+        s = self.cell_size
+        x0, x1 = int(math.floor((x - radius) / s)), int(math.floor((x + radius) / s))
+        z0, z1 = int(math.floor((z - radius) / s)), int(math.floor((z + radius) / s))
+        if (x1 - x0 + 1) * (z1 - z0 + 1) > len(self.cells):
+            candidates = self.cells.values()
+        else:
+            candidates = (self.cells[(ix, iz)] for ix in range(x0, x1 + 1)
+                          for iz in range(z0, z1 + 1) if (ix, iz) in self.cells)
+        out = []
+        for cell in candidates:
+            d = self._distance(cell, x, z)
+            if d <= radius:
+                out.append((d, cell))
+        return out
+
+    def _committed_bytes(self) -> int:
+        """Резидентные байты + оценка загружаемых (по размеру файла)."""
+        pending = sum(c.file_bytes for c in self._active.values() if c.state == LOADING)
+        return self.resident_bytes + pending
+
+    # -----------------------------------------------------------------
+    def update(self, camera_position) -> None:
+        """Раз в кадр из потока update."""
+        if hasattr(camera_position, "x"):
+            x, z = float(camera_position.x), float(camera_position.z)
+        else:
+            x, z = float(camera_position[0]), float(camera_position[2])
+
+        self._frame += 1
+        self._release_retired()
+        self._attach_arrived()
+
+        # 1️⃣  Выгрузка за радиусом гистерезиса
+        for cell in list(self._active.values()):
+            if self._distance(cell, x, z) > self.unload_radius:
+                self._unload(cell)
+
+        # 2️⃣  Загрузка по приоритету (ближние – раньше) в пределах бюджетов
+        wanted = sorted(self._cells_within(x, z, self.load_radius),
+                        key=lambda dc: (dc[0], dc[1].key))
+        issued = 0
+        for _, cell in wanted:
+            if cell.key in self._active:
+                continue
+            if self._committed_bytes() + cell.file_bytes > self.budget_bytes:
+                break                               # дальние подождут
+            if issued and issued + cell.file_bytes > self.io_budget_bytes:
+                break                               # остальные – в следующих кадрах
+            self._request(cell)
+            issued += cell.file_bytes
+
+    def _request(self, cell: StreamingCell) -> None:
+        cell.state = LOADING
+        self._active[cell.key] = cell
+        cell.handle = self.loader.request("scene_cell", cell.path,
+                                          on_ready=lambda h, c=cell: self._on_loaded(c, h))
+
+    def _on_loaded(self, cell: StreamingCell, handle) -> None:
+        """Поток `pump`: только отметить – граф сцены меняет `update`."""
+        self.loader.forget(handle)
+        with self._lock:
+            self._arrived.append((cell, handle))
+
+    def _attach_arrived(self) -> None:
+        with self._lock:
+            arrived, self._arrived = self._arrived, []
+        for cell, handle in arrived:
+            if handle is not cell.handle or cell.state != LOADING:
+                # Ячейку выгрузили, пока она грузилась (возможно, уже
+                # запросили заново – другим handle)
+                if handle.is_ready():
+                    self._release_root(handle.value)
+                continue
+            if handle.is_failed():
+                del self._active[cell.key]
+                cell.state = None
+                continue
+            cell.handle = None
+            cell.root = handle.value
+            cell.nbytes = sum(_mesh_bytes(m) for m in _iter_meshes(cell.root))
+            cell.state = RESIDENT
+            self.scene.add_child(cell.root)
+            self.resident_bytes += cell.nbytes
+            self.loads += 1
+            logger.debug(f"[Streaming] Cell {cell.key} resident ({cell.nbytes} B)")
+
+    def _unload(self, cell: StreamingCell) -> None:
+        del self._active[cell.key]
+        if cell.state == LOADING:
+            self.loader.forget(cell.handle)
+        elif cell.state == RESIDENT:
+            self.scene.remove_child(cell.root)
+            self._retire(cell.root)
+            self.resident_bytes -= cell.nbytes
+            self.unloads += 1
+            logger.debug(f"[Streaming] Cell {cell.key} unloaded")
+        cell.state = None
+        cell.handle = None
+        cell.root = None
+        cell.nbytes = 0
+
+    def _retire(self, root: Node) -> None:
+        """Освободить `root`, когда его уже не рисует ни один снимок."""
+        if self.retire_frames <= 0:
+            self._release_root(root)
+        else:
+            self._retiring.append((self._frame + self.retire_frames, root))
+
+    def _release_retired(self, everything: bool = False) -> None:
+        while self._retiring and (everything or self._retiring[0][0] <= self._frame):
+            self._release_root(self._retiring.popleft()[1])
+
+    def _release_root(self, root: Node) -> None:
+        for node in root.traverse():
+            if self.backend is not None and hasattr(node, "release_gpu_buffers"):
+                node.release_gpu_buffers(self.backend)
+            material = getattr(node, "material", None)
+            if material is not None and hasattr(material, "release"):
+                material.release()
+
+    # -----------------------------------------------------------------
+    def unload_all(self) -> None:
+        """Выгрузить всё сразу (render‑поток уже ничего не рисует)."""
+        self._attach_arrived()
+        for cell in list(self._active.values()):
+            self._unload(cell)
+        self._release_retired(everything=True)
+
+    def stats(self) -> dict:
+        return {
+            "cells": len(self.cells),
+            "resident": sum(1 for c in self._active.values() if c.state == RESIDENT),
+            "loading": sum(1 for c in self._active.values() if c.state == LOADING),
+            "resident_bytes": self.resident_bytes,
+            "budget_bytes": self.budget_bytes,
+            "loads": self.loads,
+            "unloads": self.unloads,
+        }
+
+
+# ---------------------------------------------------------------------
+#   CLI
+# ---------------------------------------------------------------------
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m alkash3d.scene.streaming",
+        description="Split a scene into streaming grid cells (.ascene + world.json).",
+    )
+    ap.add_argument("scene", help=".ascene or .glb/.gltf source scene")
+    ap.add_argument("out_dir")
+    ap.add_argument("--cell", type=float, default=64.0, help="cell size in world units")
+    args = ap.parse_args(argv)
+
+    src = Path(args.scene)
+    if src.suffix.lower() in (".glb", ".gltf"):
+        from alkash3d.assets.gltf import load_gltf
+        root = load_gltf(src)
+    else:
+        root = load_scene_file(src)
+    partition_scene(root, args.out_dir, args.cell)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
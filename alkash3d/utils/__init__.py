@@ -1,12 +1,14 @@
 """
-Пакет утилит: логгер, конфиг, FPS‑counter, загрузка текстур, профайлер.
+Пакет утилит: логгер, конфиг, FPS‑counter, статистика кадров,
+загрузка текстур, профайлер.
 """
 
 from alkash3d.utils.logger import logger, gl_check_error
 from alkash3d.utils.config import Config
 from alkash3d.utils.fps_counter import FPSCounter
+from alkash3d.utils.frame_stats import FrameStats
 from alkash3d.utils.texture_loader import load_texture
 from alkash3d.utils.profiler import Profiler
 
 __all__ = ["logger", "gl_check_error", "Config", "FPSCounter",
-           "load_texture", "Profiler"]
+           "FrameStats", "load_texture", "Profiler"]
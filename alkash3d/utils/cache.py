@@ -0,0 +1,53 @@
+"""
+Каталог дискового кэша движка (импортированные меши, текстуры, шейдеры).
+
+По‑умолчанию `~/.cache/alkash3d`; переопределяется переменной
+окружения `ALKASH3D_CACHE_DIR`.
+"""
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def cache_root(*parts: str) -> Path:
+    """Каталог кэша (создаётся при первом обращении)."""
+    base = os.environ.get("ALKASH3D_CACHE_DIR")
+    root = Path(base) if base else Path.home() / ".cache" / "alkash3d"
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def file_cache_key(path, *extra) -> str:
+    """
+    Ключ кэша для исходного файла: абсолютный путь + mtime + размер
+    (+ произвольные доп. поля, напр. версия формата).
+    """
+    p = Path(path).expanduser().resolve()
+    st = p.stat()
+    raw = "|".join([str(p), str(st.st_mtime_ns), str(st.st_size), *map(str, extra)])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+
+@contextmanager
+def atomic_write(path):
+    """
+    Открыть `path` на запись бинарно через временный файл в том же
+    каталоге; по выходе без исключения – `os.replace` (читатели никогда
+    не видят недописанный файл).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
@@ -10,7 +10,30 @@ from alkash3d.utils.logger import logger
 DEFAULT_CONFIG = {
     "window": {"width": 1280, "height": 720, "title": "AlKAsH3D Engine"},
     "v_sync": True,
+    "fps_cap": 0,
+    "sim_hz": 60,
+    "max_sim_steps": 5,
+    "interpolate": True,
+    "pipelined": False,
+    "job_workers": 0,
+    "profile_jobs": False,
+    "asset_io_workers": 2,
+    "upload_budget_mb": 16,
+    "upload_budget_ms": 2.0,
+    "texture_budget_mb": 512,
+    "hot_reload": False,
+    "hot_reload_poll_files": 64,
+    "hot_reload_debounce_ms": 150,
+    "pipeline_warmup": True,
+    "pipeline_record": True,
+    "lod_bias": 0.0,
+    "stream_load_radius": 128.0,
+    "stream_unload_radius": 160.0,
+    "stream_budget_mb": 512,
+    "stream_io_mb_per_frame": 8,
     "show_fps": True,
+    "frame_stats_capacity": 1024,
+    "hitch_factor": 2.0,
     "upscale": {"enabled": False, "mode": "fsr", "quality": "medium"},
     "editor_app": False,
 }
@@ -0,0 +1,213 @@
+"""
+Статистика времени кадра: перцентили, 1 % / 0.1 % lows, хитчи, гистограмма.
+
+В отличие от `FPSCounter` (скользящее среднее) хранит «сырые» времена
+последних N кадров в кольцевом NumPy‑буфере, разбитые на стадии
+CPU‑update / render / present. Среднее скрывает подтормаживания,
+перцентили – нет.
+
+Использование:
+
+    stats = FrameStats()
+    while running:
+        stats.begin_frame()
+        with stats.stage("update"):
+            scene.update(dt)
+        with stats.stage("render"):
+            renderer.render(scene, camera)
+        with stats.stage("present"):
+            window.swap_buffers()
+        stats.end_frame()
+
+    print(stats.format_summary())
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class FrameStats:
+    """Кольцевой буфер времён кадра (в секундах) + агрегаты по нему."""
+
+    #: Колонки буфера. `total` – интервал «кадр‑к‑кадру» (включает ожидание).
+    STAGES = ("total", "update", "render", "present")
+
+    def __init__(self, capacity: int = 1024, hitch_factor: float = 2.0):
+        if capacity <= 0:
+            raise ValueError("FrameStats capacity must be positive")
+        self.capacity = int(capacity)
+        self.hitch_factor = float(hitch_factor)
+
+        self._samples = np.zeros((self.capacity, len(self.STAGES)), dtype=np.float64)
+        self._head = 0          # индекс следующей записи
+        self._count = 0         # сколько строк заполнено
+
+        self._current = np.zeros(len(self.STAGES), dtype=np.float64)
+        self._frame_start: float | None = None
+        self._last_end: float | None = None
+
+    # -----------------------------------------------------------------
+    #   Запись
+    # -----------------------------------------------------------------
+    def begin_frame(self) -> None:
+        """Начать новый кадр (обнуляет текущую строку)."""
+        self._current[:] = 0.0
+        self._frame_start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Контекст‑менеджер: добавляет длительность блока к стадии `name`."""
+        col = self._column(name)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self._current[col] += time.perf_counter() - start
+
+    def add_stage_time(self, name: str, seconds: float) -> None:
+        """Добавить уже измеренное время к стадии текущего кадра."""
+        self._current[self._column(name)] += float(seconds)
+
+    def end_frame(self) -> None:
+        """Закрыть кадр и записать строку в кольцевой буфер."""
+        now = time.perf_counter()
+        if self._last_end is not None:
+            total = now - self._last_end
+        elif self._frame_start is not None:
+            total = now - self._frame_start
+        else:
+            total = float(self._current[1:].sum())
+        self._last_end = now
+        self._current[0] = total
+        self._push(self._current)
+        self._frame_start = None
+
+    def record(self, update: float = 0.0, render: float = 0.0,
+               present: float = 0.0, total: float | None = None) -> None:
+        """Записать готовые времена (в секундах) одним вызовом."""
+        if total is None:
+            total = update + render + present
+        self._push(np.array([total, update, render, present], dtype=np.float64))
+
+    def reset(self) -> None:
+        self._head = 0
+        self._count = 0
+        self._frame_start = None
+        self._last_end = None
+
+    # -----------------------------------------------------------------
+    #   Доступ к данным
+    # -----------------------------------------------------------------
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def frame_times(self, stage: str = "total") -> np.ndarray:
+        """Времена стадии в секундах, от самого старого кадра к новому."""
+        col = self._column(stage)
+        if self._count < self.capacity:
+            return self._samples[:self._count, col].copy()
+        return np.roll(self._samples[:, col], -self._head)
+
+    def percentiles(self, q=(50.0, 95.0, 99.0), stage: str = "total") -> dict:
+        """{перцентиль: мс}. Пустой буфер → нули."""
+        times = self._valid(stage)
+        if times.size == 0:
+            return {float(p): 0.0 for p in q}
+        values = np.percentile(times, q) * 1000.0
+        return {float(p): float(v) for p, v in zip(q, values)}
+
+    def lows(self, fractions=(0.01, 0.001)) -> dict:
+        """
+        «1 % low» / «0.1 % low» в FPS – средний FPS по худшим
+        `fraction` кадрам (минимум один кадр).
+        """
+        times = self._valid("total")
+        result = {}
+        for frac in fractions:
+            if times.size == 0:
+                result[float(frac)] = 0.0
+                continue
+            n = max(1, int(times.size * frac))
+            worst = np.partition(times, times.size - n)[-n:]
+            mean = float(worst.mean())
+            result[float(frac)] = 1.0 / mean if mean > 0.0 else 0.0
+        return result
+
+    def hitches(self, factor: float | None = None, stage: str = "total") -> int:
+        """Количество кадров длиннее `factor × медиана`."""
+        times = self._valid(stage)
+        if times.size == 0:
+            return 0
+        factor = self.hitch_factor if factor is None else float(factor)
+        return int(np.count_nonzero(times > factor * np.median(times)))
+
+    def histogram(self, bins: int = 32, range_ms: tuple[float, float] | None = None,
+                  stage: str = "total") -> tuple[np.ndarray, np.ndarray]:
+        """Гистограмма времён стадии: (counts, edges в мс)."""
+        times = self._valid(stage) * 1000.0
+        if range_ms is None:
+            hi = float(times.max()) if times.size else 1.0
+            range_ms = (0.0, max(hi, 1e-3))
+        return np.histogram(times, bins=bins, range=range_ms)
+
+    def average_fps(self) -> float:
+        times = self._valid("total")
+        if times.size == 0:
+            return 0.0
+        mean = float(times.mean())
+        return 1.0 / mean if mean > 0.0 else 0.0
+
+    def summary(self) -> dict:
+        """Сводка для логов / UI."""
+        pct = self.percentiles()
+        lows = self.lows()
+        stage_p50 = {
+            name: self.percentiles((50.0,), stage=name)[50.0]
+            for name in self.STAGES[1:]
+        }
+        return {
+            "frames": self._count,
+            "fps": self.average_fps(),
+            "p50_ms": pct[50.0],
+            "p95_ms": pct[95.0],
+            "p99_ms": pct[99.0],
+            "low_1_fps": lows[0.01],
+            "low_01_fps": lows[0.001],
+            "hitches": self.hitches(),
+            "stage_p50_ms": stage_p50,
+        }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        st = s["stage_p50_ms"]
+        return (
+            f"FPS {s['fps']:.1f} | p50 {s['p50_ms']:.2f} ms, "
+            f"p95 {s['p95_ms']:.2f} ms, p99 {s['p99_ms']:.2f} ms | "
+            f"1% low {s['low_1_fps']:.1f}, 0.1% low {s['low_01_fps']:.1f} | "
+            f"hitches {s['hitches']} | "
+            f"update {st['update']:.2f} / render {st['render']:.2f} / "
+            f"present {st['present']:.2f} ms"
+        )
+
+    # -----------------------------------------------------------------
+    #   Внутреннее
+    # -----------------------------------------------------------------
+    def _column(self, name: str) -> int:
+        try:
+            return self.STAGES.index(name)
+        except ValueError:
+            raise ValueError(f"Unknown frame stage: {name}") from None
+
+    def _valid(self, stage: str) -> np.ndarray:
+        return self._samples[:self._count, self._column(stage)]
+
+    def _push(self, row: np.ndarray) -> None:
+        self._samples[self._head] = row
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
@@ -1,40 +1,134 @@
 """
-Загружает PNG/JPG → DirectX 12‑текстуру, возвращает «resource‑handle».
+Загружает PNG/JPG → DirectX 12‑текстуру, возвращает «resource‑handle».
+
+Загрузка разделена на два шага:
+
+1️⃣  `decode_texture(path)` – чтение файла и декодирование Pillow‑ом в
+    RGBA8‑массив. Не трогает GPU, поэтому может выполняться в рабочем
+    потоке (см. `alkash3d.assets.async_loader`).
+2️⃣  `upload_texture(decoded, backend)` – создание DX12‑текстуры и SRV;
+    только из потока, владеющего command‑list‑ом.
+
+`load_texture()` – синхронная комбинация обоих шагов.
+
+«Сваренные» текстуры (`.atex`, см. `alkash3d.assets.texture_cook`)
+не декодируются: уровни – view в отображённый файл, грузятся в GPU с
+mip‑цепочкой и в BC‑формате. Если рядом с `foo.png` лежит не более
+старый `foo.atex`, берётся он.
 """
 
+from __future__ import annotations
+
+import hashlib
+import io
+from dataclasses import dataclass
 from pathlib import Path
+
 from PIL import Image
 import numpy as np
 from alkash3d.graphics.dx12_backend import DX12Backend
 from alkash3d.utils.logger import logger
 
-def load_texture(path: str, backend: DX12Backend):
-    """
-    Загружает изображение через Pillow и создаёт DX12‑текстуру.
-    Возвращаемый объект – указатель, полученный от backend.create_texture.
-    """
-    if not isinstance(backend, DX12Backend):
-        raise RuntimeError("[TextureLoader] DX12 backend required")
 
+# Байт на пиксель / на блок 4×4 для поддерживаемых форматов
+_BYTES_PER_PIXEL = {"RGBA8": 4, "R8": 1, "RG8": 2, "RGBA16F": 8, "RGBA32F": 16}
+_BYTES_PER_BLOCK = {"BC1": 8, "BC3": 16, "BC4": 8, "BC5": 16, "BC7": 16}
+
+
+def texture_nbytes(w: int, h: int, fmt: str = "RGBA8", mip_levels: int = 1) -> int:
+    """Размер текстуры в байтах вместе со всей цепочкой mip‑уровней."""
+    fmt = fmt.upper()
+    total = 0
+    for _ in range(max(1, int(mip_levels))):
+        if fmt in _BYTES_PER_BLOCK:
+            total += ((w + 3) // 4) * ((h + 3) // 4) * _BYTES_PER_BLOCK[fmt]
+        else:
+            total += w * h * _BYTES_PER_PIXEL.get(fmt, 4)
+        w, h = max(1, w // 2), max(1, h // 2)
+    return total
+
+
+@dataclass
+class DecodedTexture:
+    """Декодированное изображение, готовое к загрузке в GPU."""
+    path: Path
+    pixels: np.ndarray          # (h, w, 4) uint8
+    w: int
+    h: int
+    fmt: str = "RGBA8"
+    content_hash: str = ""      # sha1 содержимого файла
+    mip_levels: int = 1
+    levels: list | None = None  # mip‑уровни `.atex` (pixels тогда None)
+    source: object = None       # `TextureFile` для распаковки BC
+
+    @property
+    def nbytes(self) -> int:
+        return texture_nbytes(self.w, self.h, self.fmt, self.mip_levels)
+
+
+def decode_texture(path) -> DecodedTexture:
+    """Прочитать и декодировать изображение (потокобезопасно, без GPU)."""
     p = Path(path).expanduser().resolve()
     if not p.is_file():
         raise FileNotFoundError(f"Texture not found: {p}")
 
-    img = Image.open(p).convert("RGBA")
-    w, h = img.size
-    img_data = np.array(img, dtype=np.uint8).tobytes()
+    cooked = p if p.suffix.lower() == ".atex" else p.with_suffix(".atex")
+    if cooked.is_file() and (cooked == p or cooked.stat().st_mtime_ns >= p.stat().st_mtime_ns):
+        return _decode_cooked(cooked)
+
+    raw = p.read_bytes()
+    with Image.open(io.BytesIO(raw)) as img:
+        pixels = np.asarray(img.convert("RGBA"), dtype=np.uint8)
+    h, w = pixels.shape[:2]
+    return DecodedTexture(p, np.ascontiguousarray(pixels), w, h,
+                          content_hash=hashlib.sha1(raw).hexdigest())
+
+
+def _decode_cooked(path: Path) -> DecodedTexture:
+    from alkash3d.assets.texture_file import TextureFile
+    tf = TextureFile(path)
+    return DecodedTexture(path, None, tf.width, tf.height, tf.format,
+                          content_hash=f"{tf.source_hash}:{tf.format}",
+                          mip_levels=tf.mip_count, levels=tf.levels, source=tf)
+
+
+def upload_texture(decoded: DecodedTexture, backend: DX12Backend):
+    """
+    Создать DX12‑текстуру из `DecodedTexture`. SRV создаёт сам
+    `backend.create_texture` (`tex._srv_gpu`).
+    """
+    if not isinstance(backend, DX12Backend):
+        raise RuntimeError("[TextureLoader] DX12 backend required")
+
+    if decoded.levels is not None:
+        if getattr(backend, "supports_texture_mips", False):
+            tex = backend.create_texture_mips(decoded.levels, decoded.w,
+                                              decoded.h, decoded.fmt)
+            logger.debug(f"[TextureLoader] Loaded cooked texture {decoded.path} "
+                         f"({decoded.w}x{decoded.h} {decoded.fmt}, "
+                         f"{decoded.mip_levels} mips)")
+            return tex
+        # Бэкенд без mip/BC – распаковываем верхний уровень в RGBA8
+        decoded = DecodedTexture(decoded.path, decoded.source.to_rgba(0),
+                                 decoded.w, decoded.h,
+                                 content_hash=decoded.content_hash)
 
     tex = backend.create_texture(
-        data=img_data,
-        w=w,
-        h=h,
-        fmt="RGBA8",
+        data=decoded.pixels,
+        w=decoded.w,
+        h=decoded.h,
+        fmt=decoded.fmt,
     )
+    logger.debug(f"[TextureLoader] Loaded texture {decoded.path} "
+                 f"({decoded.w}x{decoded.h})")
+    return tex
 
-    idx = backend.cbv_srv_uav_heap.next_free()
-    cpu_handle = backend.cbv_srv_uav_heap.get_cpu_handle(idx)
-    backend.create_shader_resource_view(tex, cpu_handle)
-    tex._srv_gpu = backend.cbv_srv_uav_heap.get_gpu_handle(idx)
 
-    logger.debug(f"[TextureLoader] Loaded texture {p} ({w}x{h})")
-    return tex
\ No newline at end of file
+def load_texture(path: str, backend: DX12Backend):
+    """
+    Загружает изображение через Pillow и создаёт DX12‑текстуру.
+    Возвращаемый объект – указатель, полученный от backend.create_texture.
+    """
+    if not isinstance(backend, DX12Backend):
+        raise RuntimeError("[TextureLoader] DX12 backend required")
+    return upload_texture(decode_texture(path), backend)
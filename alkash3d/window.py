@@ -33,6 +33,16 @@ class Window:
     def set_vsync(self, enable: bool = True):
         pass
 
+    def get_refresh_rate(self, default: int = 60) -> int:
+        """Частота обновления основного монитора (Гц)."""
+        try:
+            mode = glfw.get_video_mode(glfw.get_primary_monitor())
+            if mode and mode.refresh_rate > 0:
+                return int(mode.refresh_rate)
+        except Exception:
+            pass
+        return default
+
     def should_close(self) -> bool:
         return glfw.window_should_close(self.handle)
 
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""Общие подделки бэкенда для тестов (без DX12)."""
+import threading
+from pathlib import Path
+
+import pytest
+
+GPU_HANDLE_BASE = 0x1000
+
+
+class FakeHeap:
+    """cbv_srv_uav‑heap: каждый `next_free()` – новый дескриптор."""
+
+    def __init__(self):
+        self.allocated = 0
+        self.freed = []
+
+    def next_free(self):
+        self.allocated += 1
+        return self.allocated - 1
+
+    def get_cpu_handle(self, idx):
+        return idx
+
+    def get_gpu_handle(self, idx):
+        return GPU_HANDLE_BASE + idx
+
+    def free(self, idx):
+        self.freed.append(idx)
+
+
+class FakeBackend:
+    """
+    Бэкенд, который всё записывает:
+
+    * шейдеры «компилируются» в словарь блобов – `compiled`
+      ((stage, имя файла, defines) каждой компиляции), `threads`
+      (потоки, из которых компилировали), `psos`, `bound`;
+    * буферы – последние записанные байты (`buffers`, история –
+      `writes`), дескрипторы – `views` (индекс в heap → ресурс);
+    * `tables` – текущие привязки корневых таблиц, `draws` – копия
+      `tables` на момент каждого draw (что увидит command list).
+    """
+
+    supports_index16 = True
+    supports_vertex_formats = False
+
+    def __init__(self, supports_shader_blobs=False):
+        self.supports_shader_blobs = supports_shader_blobs
+        self.cbv_srv_uav_heap = FakeHeap()
+        self.rtv_heap = FakeHeap()
+        self.compiled = []
+        self.threads = set()
+        self.blobs = {}
+        self.psos = 0
+        self.bound = []
+        self.buffers = {}
+        self.writes = []
+        self.views = {}
+        self.tables = {}
+        self.table_calls = []
+        self.draws = []
+        self.released = []
+        self._lock = threading.Lock()
+
+    # -----------------------------------------------------------------
+    #   Шейдеры / PSO
+    # -----------------------------------------------------------------
+    def compile_shader(self, stage, path, defines=None):
+        with self._lock:
+            self.threads.add(threading.get_ident())
+            self.compiled.append((stage, Path(path).name, dict(defines or {})))
+            return self._blob(Path(path).read_bytes() + repr(defines).encode())
+
+    def _blob(self, data):
+        handle = 0x1000 + len(self.blobs)
+        self.blobs[handle] = data
+        return handle
+
+    def shader_blob_bytes(self, blob):
+        return self.blobs[blob]
+
+    def create_shader_blob(self, data):
+        with self._lock:
+            return self._blob(data)
+
+    def create_graphics_ps(self, vs, ps, vertex_format=0):
+        with self._lock:
+            self.psos += 1
+            return 0x9000 + self.psos
+
+    def set_graphics_pipeline(self, pso):
+        self.bound.append(pso)
+
+    # -----------------------------------------------------------------
+    #   Ресурсы и дескрипторы
+    # -----------------------------------------------------------------
+    def create_buffer(self, data, usage="default"):
+        with self._lock:
+            buf = len(self.buffers) + 1
+            self.buffers[buf] = data.tobytes() if hasattr(data, "tobytes") else bytes(data)
+            return buf
+
+    def create_constant_buffer(self, data):
+        return self.create_buffer(data, usage="constant")
+
+    def update_buffer(self, buf, data):
+        self.buffers[buf] = bytes(data)
+        self.writes.append(bytes(data))
+
+    def create_texture(self, data=None, w=1, h=1, fmt="RGBA8"):
+        return self.create_buffer(b"" if data is None else data, usage="texture")
+
+    def update_texture(self, tex, data, w, h):
+        self.buffers[tex] = bytes(data)
+
+    def create_shader_resource_view(self, res, handle):
+        self.views[handle] = res
+
+    def set_descriptor_heaps(self, heaps):
+        pass
+
+    def set_root_descriptor_table(self, index, handle):
+        self.tables[index] = handle
+        self.table_calls.append(index)
+
+    def bound_resource(self, handle):
+        """Ресурс, на который смотрит GPU‑дескриптор `handle`."""
+        return self.views.get(handle - GPU_HANDLE_BASE)
+
+    def defer_release(self, resource):
+        self.released.append(resource)
+
+    # -----------------------------------------------------------------
+    #   Команды
+    # -----------------------------------------------------------------
+    def set_viewport(self, *rect):
+        pass
+
+    def set_scissor_rect(self, *rect):
+        pass
+
+    def set_render_target(self, rtv):
+        pass
+
+    def set_render_targets(self, rtvs):
+        pass
+
+    def clear_render_target(self, rtv, color):
+        pass
+
+    def set_vertex_buffers(self, vb, ib=None, *args, **kwargs):
+        pass
+
+    def draw(self, count, start=0, *args):
+        self.draws.append(dict(self.tables))
+
+    def draw_indexed(self, count, start=0, *args):
+        self.draws.append(dict(self.tables))
+
+    def executed_constants(self, root_index=0):
+        """
+        Байты, которые каждый draw прочтёт из таблицы `root_index`,
+        когда command list выполнится (после всех записей кадра).
+        """
+        return [self.buffers[self.bound_resource(d[root_index])] for d in self.draws]
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+@pytest.fixture
+def fake_backend():
+    """Фабрика `FakeBackend(supports_shader_blobs=...)`."""
+    return FakeBackend
+
+
+@pytest.fixture
+def stub_backend():
+    """
+    `DX12Backend` в stub‑режиме (без DLL) – для кода, которому нужен
+    именно он (`upload_texture`); записывает привязки таблиц и
+    отложенные освобождения.
+    """
+    from alkash3d.graphics.dx12_backend import DX12Backend
+
+    class _StubBackend(DX12Backend):
+        def __init__(self):
+            super().__init__()
+            self._in_stub_mode = True
+            self.tables = {}
+            self.released = []
+
+        def set_root_descriptor_table(self, index, handle):
+            self.tables[index] = handle
+
+        def defer_release(self, resource):
+            self.released.append(resource)
+
+    return _StubBackend()
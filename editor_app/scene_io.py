@@ -1,7 +1,12 @@
 # editor_app/scene_io.py
 """
-Простая (де)сериализация сцены в/из JSON.
-Поддерживает Mesh‑геометрию, материалы и основные Light‑параметры.
+Сохранение/загрузка сцены редактора.
+
+* Основной формат – бинарный `.ascene` (`alkash3d.scene.scene_file`):
+  таблица узлов + меши, хранимые один раз по хэшу содержимого и
+  читаемые лениво.
+* JSON (`node_to_dict`/`dict_to_node`) остаётся только для экспорта и
+  чтения старых файлов: `save_scene(..., "x.json")` / `export_scene_json`.
 """
 
 import json
@@ -11,9 +16,11 @@ from typing import Dict, Any
 import numpy as np
 
 from alkash3d.scene.node import Node
+from alkash3d.scene.scene import Scene
 from alkash3d.scene.camera import Camera
 from alkash3d.scene.light import DirectionalLight, PointLight, SpotLight
 from alkash3d.scene.mesh import Mesh
+from alkash3d.scene.scene_file import is_scene_file, load_scene_file, save_scene_file
 from alkash3d.math.vec3 import Vec3
 
 
@@ -40,11 +47,14 @@ def node_to_dict(node: Node) -> Dict[str, Any]:
 
     # --- Mesh специфично ------------------------------------------------
     if isinstance(node, Mesh):
+        def _list(arr):
+            return arr.tolist() if arr is not None else []
+
         mesh_data = {
-            "vertices": node.vertices.tolist() if hasattr(node, "vertices") else [],
-            "indices": node.indices.tolist() if hasattr(node, "indices") else [],
-            "normals": node.normals.tolist() if hasattr(node, "normals") else [],
-            "tex_coords": node.tex_coords.tolist() if hasattr(node, "tex_coords") else [],
+            "vertices": _list(node.vertices),
+            "indices": _list(node.indices),
+            "normals": _list(node.normals),
+            "tex_coords": _list(node.texcoords),
         }
         data["mesh"] = mesh_data
 
@@ -85,9 +95,22 @@ def dict_to_node(data: Dict[str, Any]) -> Node:
         "PointLight": PointLight,
         "SpotLight": SpotLight,
         "Mesh": Mesh,
+        "Scene": Scene,
     }
 
-    node: Node = type_map.get(typ, Node)()
+    if typ == "Mesh":
+        m = data.get("mesh", {})
+        normals = np.array(m.get("normals") or [], dtype=np.float32).reshape(-1, 3)
+        tex = np.array(m.get("tex_coords") or [], dtype=np.float32).reshape(-1, 2)
+        indices = np.array(m.get("indices") or [], dtype=np.uint32)
+        node: Node = Mesh(
+            np.array(m.get("vertices", []), dtype=np.float32).reshape(-1, 3),
+            normals if len(normals) else None,
+            tex if len(tex) else None,
+            indices if len(indices) else None,
+        )
+    else:
+        node = type_map.get(typ, Node)()
     node.name = name
 
     # Трансформа
@@ -96,15 +119,7 @@ def dict_to_node(data: Dict[str, Any]) -> Node:
     node.scale = _list_to_vec3(data["scale"])
 
     # --- Mesh -----------------------------------------------------------
-    if isinstance(node, Mesh) and "mesh" in data:
-        m = data["mesh"]
-        node.vertices = np.array(m.get("vertices", []), dtype=np.float32).reshape(-1, 3)
-        node.indices = np.array(m.get("indices", []), dtype=np.uint32)
-        if "normals" in m and m["normals"]:
-            node.normals = np.array(m["normals"], dtype=np.float32).reshape(-1, 3)
-        if "tex_coords" in m and m["tex_coords"]:
-            node.tex_coords = np.array(m["tex_coords"], dtype=np.float32).reshape(-1, 2)
-
+    if isinstance(node, Mesh):
         # Material
         if "material" in data and hasattr(node, "material"):
             mat = data["material"]
@@ -134,22 +149,33 @@ def dict_to_node(data: Dict[str, Any]) -> Node:
 
 
 # ----------------------------------------------------------------------
-def save_scene(root: Node, path: Path) -> None:
-    """Записывает сцену в JSON‑файл."""
+def export_scene_json(root: Node, path: Path) -> None:
+    """Экспорт сцены в JSON (медленно и объёмно – только для обмена)."""
     scene_data = {
         "version": "1.txt.0",
         "scene_name": root.name,
         "root": node_to_dict(root),
     }
     with Path(path).open("w", encoding="utf-8") as f:
-        json.dump(scene_data, f, indent=2, ensure_ascii=False)
+        json.dump(scene_data, f, ensure_ascii=False)
+
+
+def save_scene(root: Node, path: Path) -> None:
+    """Записывает сцену: `.json` – экспорт, иначе бинарный `.ascene`."""
+    if Path(path).suffix.lower() == ".json":
+        export_scene_json(root, path)
+    else:
+        save_scene_file(root, path)
 
 
 def load_scene(path: Path) -> Node:
-    """Читает сцену из JSON‑файла."""
+    """Читает сцену из `.ascene` или (старого) JSON‑файла."""
+    if is_scene_file(path):
+        return load_scene_file(path)
+
     with Path(path).open("r", encoding="utf-8") as f:
         raw = json.load(f)
 
     if "root" in raw:
         return dict_to_node(raw["root"])
-    return dict_to_node(raw)
\ No newline at end of file
+    return dict_to_node(raw)
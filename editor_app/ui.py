@@ -33,12 +33,16 @@ from alkash3d.scene import Scene, Node
 from alkash3d.scene.mesh import Mesh
 from alkash3d.scene.camera import Camera
 from alkash3d.scene.light import DirectionalLight, PointLight, SpotLight
+from alkash3d.scene.scene_file import clone_node
 from alkash3d.math.vec3 import Vec3
-from alkash3d.utils.loader import load_obj
+from alkash3d.assets.obj import load_obj_mesh
+from alkash3d.assets.gltf import load_gltf
+from alkash3d.utils.frame_stats import FrameStats
+from alkash3d.core.frame_pacer import FramePacer
 
 # ───── Виджеты проекта ────────────────────────────────────────
 from .gl_widget import GLWidget, TransformMode
-from .scene_io import save_scene, load_scene, node_to_dict, dict_to_node
+from .scene_io import save_scene, load_scene
 
 
 # ----------------------------------------------------------------------
@@ -430,6 +434,10 @@ class ProjectDock(QDockWidget):
         import_btn.clicked.connect(parent._import_obj)
         l.addWidget(import_btn)
 
+        gltf_btn = QPushButton("Import glTF…")
+        gltf_btn.clicked.connect(parent._import_gltf)
+        l.addWidget(gltf_btn)
+
         self.setWidget(w)
 
 
@@ -460,6 +468,9 @@ class ConsoleDock(QDockWidget):
 class MainWindow(QMainWindow):
     """Главное окно редактора со всеми панелями и логикой."""
 
+    #: Ограничение FPS вьюпорта редактора (0 – без ограничения)
+    FPS_CAP = 60
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("AlKAsH3D Editor - Untitled")
@@ -714,6 +725,9 @@ class MainWindow(QMainWindow):
         self.fps_lbl = QLabel("FPS: 0")
         sb.addPermanentWidget(self.fps_lbl)
 
+        self.frame_lbl = QLabel("p99: – ms | 1% low: –")
+        sb.addPermanentWidget(self.frame_lbl)
+
     # ------------------------------------------------------------------
     #   Таймеры (обновление сцены, FPS‑счётчик)
     # ------------------------------------------------------------------
@@ -722,15 +736,23 @@ class MainWindow(QMainWindow):
         self._frame_cnt = 0
         self._fps_acc = 0.0
         self._is_playing = False
+        self.frame_stats = FrameStats(capacity=600)
 
+        # Single‑shot PreciseTimer, перезапускаемый по дедлайну пейсера:
+        # «сон» отдаём event‑loop‑у Qt, хвост докручивает FramePacer.wait().
+        # Фиксированный QTimer(16) дрейфует и не держит 60 FPS ровно.
+        self.pacer = FramePacer(self.FPS_CAP)
         self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setSingleShot(True)
         self._timer.timeout.connect(self._main_loop)
-        self._timer.start(16)      # ~60 fps
+        self._timer.start(0)
 
     # ------------------------------------------------------------------
     #   Главный цикл (FPS‑счётчик, обновление сцены)
     # ------------------------------------------------------------------
     def _main_loop(self):
+        self.pacer.wait()
         now = time.time()
         dt = now - self._last_time
         self._last_time = now
@@ -740,11 +762,29 @@ class MainWindow(QMainWindow):
         if self._fps_acc >= 1.0:
             fps = self._frame_cnt / self._fps_acc
             self.fps_lbl.setText(f"FPS: {int(fps)}")
+            self._update_frame_stats_label()
             self._frame_cnt = 0
             self._fps_acc = 0.0
 
-        self.scene.update(dt)
-        self.gl_widget.update()
+        stats = self.frame_stats
+        stats.begin_frame()
+        with stats.stage("update"):
+            self.scene.update(dt)
+        with stats.stage("render"):
+            # repaint() рисует синхронно – иначе время рендера не измерить
+            self.gl_widget.repaint()
+        stats.end_frame()
+
+        self._timer.start(self.pacer.sleep_budget_ms() if self.pacer.enabled else 0)
+
+    def _update_frame_stats_label(self):
+        """p99 / 1 % low в статус‑баре, полная сводка – во всплывающей подсказке."""
+        s = self.frame_stats.summary()
+        self.frame_lbl.setText(
+            f"p99: {s['p99_ms']:.1f} ms | 1% low: {s['low_1_fps']:.0f} | "
+            f"hitches: {s['hitches']}"
+        )
+        self.frame_lbl.setToolTip(self.frame_stats.format_summary())
 
     # ------------------------------------------------------------------
     #   Выбор/синхронизация узлов
@@ -807,7 +847,7 @@ class MainWindow(QMainWindow):
 
     def _open_scene(self):
         path, _ = QFileDialog.getOpenFileName(
-                self, "Open Scene", "", "Scene Files (*.json)")
+                self, "Open Scene", "", "Scene Files (*.ascene *.json)")
         if not path:
             return
         try:
@@ -833,7 +873,7 @@ class MainWindow(QMainWindow):
 
     def _save_scene_as(self):
         path, _ = QFileDialog.getSaveFileName(
-                self, "Save Scene", "", "Scene Files (*.json)")
+                self, "Save Scene", "", "Scene Files (*.ascene);;JSON Export (*.json)")
         if not path:
             return
         try:
@@ -951,8 +991,7 @@ class MainWindow(QMainWindow):
         if not path:
             return
         try:
-            pos, norm, tex, inds = load_obj(path)
-            mesh = Mesh(pos, norm, tex, inds, name=Path(path).stem)
+            mesh = load_obj_mesh(path)
             self.scene.add_child(mesh)
             self.hierarchy.refresh()
             self._log(f"Imported OBJ: {path}")
@@ -963,6 +1002,26 @@ class MainWindow(QMainWindow):
                                  f"Failed to import OBJ:\n{e}")
             self._log(f"ERROR importing OBJ: {e}")
 
+    # ------------------------------------------------------------------
+    #   Импорт glTF / GLB
+    # ------------------------------------------------------------------
+    def _import_gltf(self):
+        path, _ = QFileDialog.getOpenFileName(
+                self, "Import glTF", "", "glTF 2.0 (*.gltf *.glb)")
+        if not path:
+            return
+        try:
+            root = load_gltf(path)
+            self.scene.add_child(root)
+            self.hierarchy.refresh()
+            self._log(f"Imported glTF: {path}")
+            self._push_undo({"type": "add_node", "node": root,
+                             "parent": self.scene})
+        except Exception as e:
+            QMessageBox.critical(self, "Import Error",
+                                 f"Failed to import glTF:\n{e}")
+            self._log(f"ERROR importing glTF: {e}")
+
     # ------------------------------------------------------------------
     #   Добавление Mesh по правому‑клику (запрос от GLWidget)
     # ------------------------------------------------------------------
@@ -997,7 +1056,7 @@ class MainWindow(QMainWindow):
     def _duplicate_selected(self):
         if not self.selected_node:
             return
-        copy = dict_to_node(node_to_dict(self.selected_node))
+        copy = clone_node(self.selected_node)
         copy.name = f"{self.selected_node.name}_copy"
         if self.selected_node.parent:
             self.selected_node.parent.add_child(copy)
@@ -1034,7 +1093,7 @@ class MainWindow(QMainWindow):
 
     def _duplicate_via_hierarchy(self, item: QTreeWidgetItem):
         node: Node = item.data(0, Qt.UserRole)
-        copy = dict_to_node(node_to_dict(node))
+        copy = clone_node(node)
         copy.name = f"{node.name}_copy"
         if node.parent:
             node.parent.add_child(copy)
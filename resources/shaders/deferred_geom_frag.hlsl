@@ -4,6 +4,10 @@
 // 1 – нормаль  (float4, RGBA16F) – нормаль упакована в [-1,1] → [0,1]
 // 2 – альбедо (float4, RGBA8)
 // 3 – материал (metallic, roughness, ao, padding)  (float4, RGBA8)
+//
+// Варианты (define‑ы, см. alkash3d.renderer.permutations):
+//   HAS_TEXCOORDS && HAS_ALBEDO_MAP – читать albedo‑карту, иначе baseAlbedo
+//   HAS_TEXCOORDS && HAS_NORMAL_MAP – читать normal‑map (без проверки альфы)
 
 Texture2D albedoMap   : register(t0);
 Texture2D normalMap   : register(t1);
@@ -42,18 +46,20 @@ float4 PSMain(PS_IN input) : SV_Target0
 
     // ---- G‑buffer 1 – нормаль
     float3 normal = input.normWS;
-    // Если есть normal‑map – используем её (если UV заданы)
-    if (normalMap.Sample(sLinear, input.uv).a != 0.0) // простая проверка наличия
-    {
-        float3 nMap = normalMap.Sample(sLinear, input.uv).rgb * 2.0 - 1.0;
-        normal = normalize(mul((float3x3)uModel, nMap));
-    }
+#if HAS_TEXCOORDS && HAS_NORMAL_MAP
+    float3 nMap = normalMap.Sample(sLinear, input.uv).rgb * 2.0 - 1.0;
+    normal = normalize(mul((float3x3)uModel, nMap));
+#endif
     float4 outNormal = EncodeNormal(normal);
 
     // ---- G‑buffer 2 – альбедо
+#if HAS_TEXCOORDS && HAS_ALBEDO_MAP
     float4 albedo = albedoMap.Sample(sLinear, input.uv);
     if (albedo.a == 0)        // fallback, если texture не привязан
         albedo = baseAlbedo;
+#else
+    float4 albedo = baseAlbedo;
+#endif
 
     // ---- G‑buffer 3 – материал
     float metallic  = metallicMap.Sample(sLinear, input.uv).r;
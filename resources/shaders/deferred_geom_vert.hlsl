@@ -1,5 +1,7 @@
 // deferred_geom_vert.hlsl
 // Заполняет G‑buffer (позиция, нормаль, альбедо, параметры материала)
+// VERTEX_FORMAT – компактные вершины (vertex_decode.hlsli)
+#include "vertex_decode.hlsli"
 
 cbuffer CameraCB : register(b0)
 {
@@ -15,7 +17,7 @@ cbuffer ModelCB : register(b1)
 struct VS_IN
 {
     float3 pos     : POSITION;   // позиция вершины
-    float3 norm    : NORMAL;    // нормаль (если её нет – будет 0
+    VERTEX_NORMAL norm : NORMAL; // нормаль (если её нет – будет 0
     float2 tex     : TEXCOORD0; // UV (если её нет – будет 0)
 };
 
@@ -40,7 +42,7 @@ VS_OUT VSMain(VS_IN input)
     o.posH = mul(uProj, viewPos);
 
     // трансформируем нормаль (только вращение/масштаб)
-    o.normWS = normalize(mul((float3x3)uModel, input.norm));
+    o.normWS = normalize(mul((float3x3)uModel, DecodeNormal(input.norm)));
 
     o.uv = input.tex;
     return o;
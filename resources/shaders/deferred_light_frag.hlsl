@@ -1,5 +1,23 @@
 // deferred_light_frag.hlsl
 // Считывает G‑buffer и вычисляет освещение для всех активных источников
+//
+// Варианты (define‑ы, см. alkash3d.renderer.permutations):
+//   LIGHT_COUNT – верхняя граница цикла (корзина 1/4/16/64/256/1024);
+//                 до 4 источников цикл разворачивается
+//   LIGHT_TYPES – маска встречающихся типов (1 – directional, 2 – point,
+//                 4 – spot); при одном типе ветвления по типу нет
+//   CLUSTERED   – локальные источники берутся из списка кластера
+//                 (alkash3d.renderer.light_clusters), направленные –
+//                 первые uNumDirectional элементов lights[]
+#ifndef LIGHT_COUNT
+#define LIGHT_COUNT 1024
+#endif
+#ifndef LIGHT_TYPES
+#define LIGHT_TYPES 7
+#endif
+#define SINGLE_LIGHT_TYPE (LIGHT_TYPES == 1 || LIGHT_TYPES == 2 || LIGHT_TYPES == 4)
+
+static const float PI = 3.14159265;
 
 // ---------- G‑buffer ----------
 Texture2D gPos      : register(t0);   // позиция (float4)
@@ -9,22 +27,28 @@ Texture2D gMat      : register(t3);   // материал (metallic, rough, ao)
 SamplerState sLinear : register(s0);
 
 // ---------- Списки источников ----------
-static const uint MAX_LIGHTS = 256;
+// Совпадает с alkash3d.renderer.pipelines.deferred.MAX_LIGHTS
+// (16 + 1020 × 64 байт – предел cbuffer‑а в 64 КБ)
+static const uint MAX_LIGHTS = 1020;
+// Раскладка совпадает с alkash3d.renderer.light_buffer.LIGHT_CB_DTYPE
+// (4 регистра по 16 байт на источник)
 struct Light
 {
-    int    type;        // 0 = directional, 1 = point, 2 = spot
     float3 color;
     float  intensity;
-    float3 direction;   // для directional / spot
     float3 position;     // для point / spot
-    float  radius;      // для point
-    float3 spotDir;     // для spot
+    float  radius;      // для point / spot – радиус действия
+    float3 direction;   // для directional / spot
     float  innerCutoff; // cos(theta_inner)
+    int    type;        // 0 = directional, 1 = point, 2 = spot
     float  outerCutoff; // cos(theta_outer)
+    float2 pad;
 };
 cbuffer LightCB : register(b0)
 {
-    int uNumLights;
+    int   uNumLights;
+    int   uNumDirectional;   // направленные источники идут первыми
+    uint2 uLightPad;
     Light lights[MAX_LIGHTS];
 };
 
@@ -34,12 +58,117 @@ cbuffer CameraCB : register(b1)
     float  pad0;
 };
 
+#if CLUSTERED
+// Раскладка совпадает с alkash3d.renderer.light_clusters.LightClusters.pack()
+#ifndef CLUSTER_X
+#define CLUSTER_X 16
+#endif
+#ifndef CLUSTER_Y
+#define CLUSTER_Y 9
+#endif
+#ifndef CLUSTER_Z
+#define CLUSTER_Z 24
+#endif
+#define CLUSTER_COUNT (CLUSTER_X * CLUSTER_Y * CLUSTER_Z)
+#define CLUSTER_GRID_REGS ((CLUSTER_COUNT + 3) / 4)
+#define CLUSTER_INDEX_REGS (4096 - 6 - CLUSTER_GRID_REGS)
+
+cbuffer ClusterCB : register(b3)
+{
+    float4x4 uClusterView;                         // world → view
+    uint4    uClusterDims;                         // x, y, z, –
+    float4   uClusterDepth;                        // near, far, z / ln(far/near), –
+    uint4    uClusterGrid[CLUSTER_GRID_REGS];      // (offset << 12) | count
+    uint4    uClusterIndices[CLUSTER_INDEX_REGS];  // uint16, по 8 на регистр
+};
+
+uint ClusterIndex(float2 uv, float3 worldPos)
+{
+    float depth = -mul(uClusterView, float4(worldPos, 1.0)).z;
+    uint slice = (uint)clamp(log(max(depth, uClusterDepth.x) / uClusterDepth.x)
+                             * uClusterDepth.z, 0.0, CLUSTER_Z - 1);
+    uint2 tile = min((uint2)(saturate(uv) * float2(CLUSTER_X, CLUSTER_Y)),
+                     uint2(CLUSTER_X - 1, CLUSTER_Y - 1));
+    return (slice * CLUSTER_Y + tile.y) * CLUSTER_X + tile.x;
+}
+
+uint ClusterLight(uint i)
+{
+    uint word = uClusterIndices[i >> 3][(i >> 1) & 3];
+    return (i & 1) ? (word >> 16) : (word & 0xFFFF);
+}
+#endif
+
 float3 DecodeNormal(float4 packed)
 {
     // Преобразуем из [0,1] обратно в [-1,1]
     return normalize(packed.xyz * 2.0 - 1.0);
 }
 
+// Вклад одного источника (Cook‑Torrance)
+float3 ShadeLight(Light L, float3 worldPos, float3 N, float3 V, float NdotV,
+                  float3 albedo, float3 F0, float metallic, float rough)
+{
+    float3 Ldir = float3(0, 0, 1);   // направление от точки к свету
+    float3 Lcolor = L.color * L.intensity;
+
+#if LIGHT_TYPES & 1
+    if (SINGLE_LIGHT_TYPE || L.type == 0)   // directional
+    {
+        Ldir = normalize(-L.direction);
+    }
+#endif
+#if LIGHT_TYPES & 2
+    if (SINGLE_LIGHT_TYPE || L.type == 1)   // point
+    {
+        Ldir = normalize(L.position - worldPos);
+        // attenuation (simple inverse‑square)
+        float dist = length(L.position - worldPos);
+        float att = saturate(1.0 - dist / L.radius);
+        Lcolor *= att;
+    }
+#endif
+#if LIGHT_TYPES & 4
+    if (SINGLE_LIGHT_TYPE || L.type == 2)   // spot
+    {
+        Ldir = normalize(L.position - worldPos);
+        float dist = length(L.position - worldPos);
+        float cosTheta = dot(-Ldir, normalize(L.direction));
+        float spotAtt = smoothstep(L.outerCutoff, L.innerCutoff, cosTheta);
+        Lcolor *= spotAtt * saturate(1.0 - dist / L.radius);
+    }
+#endif
+
+    float NdotL = saturate(dot(N, Ldir));
+    if (NdotL <= 0.0)
+        return float3(0, 0, 0);
+
+    // halfway vector
+    float3 H = normalize(Ldir + V);
+    float NdotH = saturate(dot(N, H));
+    float VdotH = saturate(dot(V, H));
+
+    // Distribution GGX
+    float a = rough * rough;
+    float a2 = a * a;
+    float NdotH2 = NdotH * NdotH;
+    float denom = (NdotH2 * (a2 - 1.0) + 1.0);
+    float D = a2 / (PI * denom * denom + 1e-7);
+
+    // Geometry (Smith)
+    float k = (rough + 1.0) * (rough + 1.0) / 8.0; // Schlick‑GGX
+    float G_Smith = NdotL / (NdotL * (1.0 - k) + k) *
+                   NdotV / (NdotV * (1.0 - k) + k);
+
+    // Fresnel (Schlick)
+    float3 F = F0 + (1.0 - F0) * pow(1.0 - VdotH, 5.0);
+
+    float3 spec = (D * G_Smith * F) / (4.0 * NdotL * NdotV + 1e-7);
+    float3 diff = (1.0 - F) * (1.0 - metallic) * albedo / PI;
+
+    return (diff + spec) * Lcolor * NdotL;
+}
+
 // ----------------- Основная функция -----------------
 float4 PSMain(float2 uv : TEXCOORD0) : SV_Target
 {
@@ -56,69 +185,41 @@ float4 PSMain(float2 uv : TEXCOORD0) : SV_Target
     // 2) PBR‑базовые расчёты
     float3 N = normalize(normal);
     float3 V = normalize(camPos - worldPos);
+    float  NdotV = saturate(dot(N, V));
     float3 F0 = lerp(float3(0.04, 0.04, 0.04), albedo.rgb, metallic);
 
     float3 Lo = float3(0,0,0); // итоговый свет
 
-    // 3) Перебираем все источники
+#if CLUSTERED
+    // 3a) Направленные источники – всегда
+    [loop]
+    for (uint d = 0; d < (uint)uNumDirectional; ++d)
+        Lo += ShadeLight(lights[d], worldPos, N, V, NdotV, albedo.rgb, F0, metallic, rough);
+
+    // 3b) Локальные – только список своего кластера
+    uint cluster = ClusterIndex(uv, worldPos);
+    uint cell = uClusterGrid[cluster >> 2][cluster & 3];
+    uint offset = cell >> 12;
+    uint count  = cell & 0xFFF;
+    [loop]
+    for (uint c = 0; c < count; ++c)
+        Lo += ShadeLight(lights[ClusterLight(offset + c)], worldPos, N, V, NdotV,
+                         albedo.rgb, F0, metallic, rough);
+#else
+    // 3) Перебираем активные источники (не больше корзины варианта)
+    uint numLights = min((uint)uNumLights, (uint)LIGHT_COUNT);
+#if LIGHT_COUNT <= 4
     [unroll]
-    for (int i = 0; i < uNumLights; ++i)
+#else
+    [loop]
+#endif
+    for (uint i = 0; i < LIGHT_COUNT; ++i)
     {
-        Light L = lights[i];
-        float3 Ldir;   // направление от точки к свету
-        float3 Lcolor = L.color * L.intensity;
-
-        if (L.type == 0)               // directional
-        {
-            Ldir = normalize(-L.direction);
-        }
-        else if (L.type == 1)          // point
-        {
-            Ldir = normalize(L.position - worldPos);
-            // attenuation (simple inverse‑square)
-            float dist = length(L.position - worldPos);
-            float att = saturate(1.0 - dist / L.radius);
-            Lcolor *= att;
-        }
-        else                           // spot
-        {
-            Ldir = normalize(L.position - worldPos);
-            float3 spotDir = normalize(L.spotDir);
-            float cosTheta = dot(Ldir, spotDir);
-            float spotAtt = smoothstep(L.outerCutoff, L.innerCutoff, cosTheta);
-            Lcolor *= spotAtt;
-        }
-
-        // ---- Diffuse & specular (Cook‑Torrance) ----
-        float NdotL = saturate(dot(N, Ldir));
-        if (NdotL > 0.0)
-        {
-            // halfway vector
-            float3 H = normalize(Ldir + V);
-            float NdotH = saturate(dot(N, H));
-            float VdotH = saturate(dot(V, H));
-
-            // Distribution GGX
-            float a = rough * rough;
-            float a2 = a * a;
-            float NdotH2 = NdotH * NdotH;
-            float denom = (NdotH2 * (a2 - 1.0) + 1.0);
-            float D = a2 / (PI * denom * denom + 1e-7);
-
-            // Geometry (Smith)
-            float k = (rough + 1.0) * (rough + 1.0) / 8.0; // Schlick‑GGX
-            float G_Smith = NdotL / (NdotL * (1.0 - k) + k) *
-                           NdotV / (NdotV * (1.0 - k) + k);
-
-            // Fresnel (Schlick)
-            float3 F = F0 + (1.0 - F0) * pow(1.0 - VdotH, 5.0);
-
-            float3 spec = (D * G_Smith * F) / (4.0 * NdotL * NdotV + 1e-7);
-            float3 diff = (1.0 - F) * (1.0 - metallic) * albedo.rgb / PI;
-
-            Lo += (diff + spec) * Lcolor * NdotL;
-        }
+        if (i >= numLights)
+            break;
+        Lo += ShadeLight(lights[i], worldPos, N, V, NdotV, albedo.rgb, F0, metallic, rough);
     }
+#endif
 
     // 4) Добавляем ambient term (AO)
     float3 ambient = float3(0.03,0.03,0.03) * albedo.rgb * ao;
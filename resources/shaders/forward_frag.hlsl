@@ -1,15 +1,102 @@
+// Варианты (define‑ы, см. alkash3d.renderer.permutations):
+//   HAS_TEXCOORDS && HAS_ALBEDO_MAP – читать albedo‑карту, иначе только uBaseColor
+//   ALPHA_TEST – отбрасывать пиксели с альфой < ALPHA_CUTOFF
+//   DRAW_LIGHTS – освещение до MAX_DRAW_LIGHTS источников, выбранных для
+//                 объекта на CPU (alkash3d.renderer.light_assign)
+#ifndef ALPHA_CUTOFF
+#define ALPHA_CUTOFF 0.5
+#endif
+
+// = alkash3d.renderer.light_assign.MAX_DRAW_LIGHTS
+#define MAX_DRAW_LIGHTS 4
+
+// Раскладка совпадает с alkash3d.renderer.light_buffer.LIGHT_CB_DTYPE
+struct Light
+{
+    float3 color;
+    float  intensity;
+    float3 position;
+    float  radius;
+    float3 direction;
+    float  innerCutoff;
+    int    type;        // 0 = directional, 1 = point, 2 = spot
+    float  outerCutoff;
+    float2 pad;
+};
+
+cbuffer FrameCB : register(b0)
+{
+    float4x4 uView;
+    float4x4 uProj;
+    float4x4 uModel;
+    float4   uUVTransform;
+    float4   uBaseColor;
+    float3   uCamPos;
+    int      uDrawLightCount;                 // источники объекта (≤ MAX_DRAW_LIGHTS)
+    Light    uDrawLights[MAX_DRAW_LIGHTS];    // по убыванию вклада
+};
+
 // входные данные от VS
 struct VS_OUT
 {
     float4 pos : SV_POSITION;
     float2 uv  : TEXCOORD0;
+#if DRAW_LIGHTS
+    float3 worldPos : TEXCOORD1;
+    float3 normal   : TEXCOORD2;
+#endif
 };
 
-Texture2D   gAlbedo  : register(t0);   // SRV – слот 1 в root‑signature
+#if HAS_TEXCOORDS && HAS_ALBEDO_MAP
+Texture2D   gAlbedo  : register(t0);   // SRV – слот 1 в root‑signature
 SamplerState gSampler : register(s0); // статический сэмплер (в root‑signature)
+#endif
+
+#if DRAW_LIGHTS
+// Lambert + Blinn‑Phong; затухание – как в deferred_light_frag.hlsl
+float3 ShadeDrawLight(Light L, float3 P, float3 N, float3 V, float3 albedo)
+{
+    float3 Ldir = -L.direction;
+    float  att = 1.0;
+    if (L.type != 0)
+    {
+        float3 toLight = L.position - P;
+        float dist = length(toLight);
+        Ldir = toLight / max(dist, 1e-4);
+        att = saturate(1.0 - dist / L.radius);
+        if (L.type == 2)
+            att *= smoothstep(L.outerCutoff, L.innerCutoff, dot(-Ldir, normalize(L.direction)));
+    }
+    Ldir = normalize(Ldir);
+    float NdotL = saturate(dot(N, Ldir));
+    float spec = pow(saturate(dot(N, normalize(Ldir + V))), 32.0) * 0.25;
+    return (albedo * NdotL + spec * NdotL) * L.color * L.intensity * att;
+}
+#endif
 
 float4 PSMain(VS_OUT i) : SV_TARGET
 {
+#if HAS_TEXCOORDS && HAS_ALBEDO_MAP
     // читаем цвет из текстуры
-    return gAlbedo.Sample(gSampler, i.uv);
+    float4 color = gAlbedo.Sample(gSampler, i.uv) * uBaseColor;
+#else
+    float4 color = uBaseColor;
+#endif
+#if ALPHA_TEST
+    clip(color.a - ALPHA_CUTOFF);
+#endif
+#if DRAW_LIGHTS
+    float3 N = normalize(i.normal);
+    float3 V = normalize(uCamPos - i.worldPos);
+    float3 lit = color.rgb * 0.03;
+    [unroll]
+    for (int l = 0; l < MAX_DRAW_LIGHTS; ++l)
+    {
+        if (l >= uDrawLightCount)
+            break;
+        lit += ShadeDrawLight(uDrawLights[l], i.worldPos, N, V, color.rgb);
+    }
+    color.rgb = lit;
+#endif
+    return color;
 }
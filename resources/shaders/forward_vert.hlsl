@@ -1,20 +1,34 @@
+// Варианты (define‑ы, см. alkash3d.renderer.permutations):
+//   HAS_TEXCOORDS – у меша есть UV; без него uv = 0 и атлас не применяется
+//   DRAW_LIGHTS   – передавать мировую позицию/нормаль для per‑object
+//                   освещения (alkash3d.renderer.light_assign)
+//   VERTEX_FORMAT – компактные вершины (vertex_decode.hlsli)
+#include "vertex_decode.hlsli"
+
 cbuffer FrameCB : register(b0)
 {
     float4x4 uView;   // 0‑й 4×4‑массив
     float4x4 uProj;   // 1‑й
     float4x4 uModel;  // 2‑й
+    float4   uUVTransform; // (scale.xy, offset.xy) – регион атласа
+    float4   uBaseColor;   // цвет материала (множитель albedo‑карты)
 };
 
 struct VS_IN
 {
-    float3 pos : POSITION;   // vertex position
-    float2 uv  : TEXCOORD0;  // texture coords
+    float3 pos  : POSITION;   // vertex position
+    VERTEX_NORMAL norm : NORMAL; // нормаль (нет у меша – 0)
+    float2 uv   : TEXCOORD0;  // texture coords
 };
 
 struct VS_OUT
 {
     float4 pos : SV_POSITION; // позиция в экранных координатах
     float2 uv  : TEXCOORD0;    // передаём дальше
+#if DRAW_LIGHTS
+    float3 worldPos : TEXCOORD1;
+    float3 normal   : TEXCOORD2;
+#endif
 };
 
 VS_OUT VSMain(VS_IN i)
@@ -23,6 +37,14 @@ VS_OUT VSMain(VS_IN i)
     float4 world = mul(uModel, float4(i.pos, 1.0));
     float4 view  = mul(uView,  world);
     o.pos = mul(uProj, view);
-    o.uv  = i.uv;
+#if HAS_TEXCOORDS
+    o.uv  = i.uv * uUVTransform.xy + uUVTransform.zw;
+#else
+    o.uv  = float2(0.0, 0.0);
+#endif
+#if DRAW_LIGHTS
+    o.worldPos = world.xyz;
+    o.normal   = mul((float3x3)uModel, DecodeNormal(i.norm));
+#endif
     return o;
 }
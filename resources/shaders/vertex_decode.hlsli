@@ -0,0 +1,32 @@
+// vertex_decode.hlsli
+// Декодирование компактных вершин (define VERTEX_FORMAT, см.
+// alkash3d.mesh.vertex_format). Позиции (unorm16) и UV (half) IA
+// отдаёт уже во float; деквантование позиций – в uModel.
+#ifndef VERTEX_DECODE_HLSLI
+#define VERTEX_DECODE_HLSLI
+
+#if VERTEX_FORMAT
+#define VERTEX_NORMAL float2   // октаэдрическая нормаль (snorm16/snorm8)
+#else
+#define VERTEX_NORMAL float3
+#endif
+
+// [-1, 1]² → единичная нормаль (= vertex_format.oct_decode)
+float3 OctDecode(float2 e)
+{
+    float3 n = float3(e, 1.0 - abs(e.x) - abs(e.y));
+    float t = saturate(-n.z);
+    n.xy += float2(n.x >= 0.0 ? -t : t, n.y >= 0.0 ? -t : t);
+    return normalize(n);
+}
+
+float3 DecodeNormal(VERTEX_NORMAL n)
+{
+#if VERTEX_FORMAT
+    return OctDecode(n);
+#else
+    return n;
+#endif
+}
+
+#endif
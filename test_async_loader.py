@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import time
+
+from PIL import Image
+
+from alkash3d.assets.async_loader import AsyncLoader
+from alkash3d.assets.material import PBRMaterial
+from alkash3d.assets.texture_manager import TextureManager
+
+
+def _png(path, color, size=4):
+    Image.new("RGBA", (size, size), color).save(path)
+    return path
+
+
+def _wait_decoded(loader, n, timeout=10.0):
+    end = time.monotonic() + timeout
+    while loader.decoded + loader.failed < n and time.monotonic() < end:
+        time.sleep(0.005)
+    assert loader.decoded + loader.failed >= n
+
+
+def test_mesh_loads_in_background_and_uploads_on_pump(tmp_path, monkeypatch, fake_backend):
+    monkeypatch.setenv("ALKASH3D_CACHE_DIR", str(tmp_path / "cache"))
+    src = tmp_path / "tri.obj"
+    src.write_bytes(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n")
+    loader = AsyncLoader(workers=1, budget_bytes=1)
+    try:
+        ready = []
+        h = loader.request_mesh(src, on_ready=ready.append)
+        assert loader.request_mesh(src) is h          # дедупликация
+        backend = fake_backend()
+        assert loader.wait([h], backend=backend, timeout=10.0)
+        assert h.is_ready() and ready == [h]
+        assert h.value.vb is not None and len(backend.buffers) == 2
+
+        bad = loader.request_mesh(tmp_path / "missing.obj")
+        assert loader.wait([bad], backend=backend, timeout=10.0)
+        assert bad.is_failed() and loader.failed == 1
+    finally:
+        loader.shutdown()
+
+
+def test_texture_loads_in_background(tmp_path, stub_backend):
+    loader = AsyncLoader(workers=1)
+    try:
+        h = loader.request_texture(_png(tmp_path / "a.png", (255, 0, 0, 255)))
+        assert not h.is_ready()
+        assert loader.wait([h], backend=stub_backend, timeout=10.0)
+        assert h.is_ready() and h.value._srv_gpu is not None
+        assert loader.uploaded == 1 and loader.uploaded_bytes == 4 * 4 * 4
+    finally:
+        loader.shutdown()
+
+
+def test_texture_decode_runs_on_job_system(tmp_path, stub_backend):
+    from alkash3d.jobs import JobSystem
+
+    jobs = JobSystem(num_workers=1)
+    loader = AsyncLoader(workers=1, jobs=jobs)
+    try:
+        h = loader.request_texture(_png(tmp_path / "a.png", (0, 255, 0, 255)))
+        assert loader.wait([h], backend=stub_backend, timeout=10.0)
+        assert h.is_ready() and jobs.jobs_executed == 1
+    finally:
+        loader.shutdown()
+        jobs.shutdown()
+
+
+def test_upload_budget_defers_excess_to_next_pump(tmp_path, stub_backend):
+    # Байтовый бюджет: одна текстура 4×4 RGBA8 за кадр
+    loader = AsyncLoader(workers=1, budget_bytes=64, budget_ms=1e6)
+    try:
+        handles = [loader.request_texture(_png(tmp_path / f"{i}.png", (i, 0, 0, 255)))
+                   for i in range(3)]
+        _wait_decoded(loader, 3)
+        assert loader.pump(stub_backend) == 1          # первый – всегда
+        assert sum(h.is_ready() for h in handles) == 1
+        assert loader.pump(stub_backend) == 1
+        assert loader.pump(stub_backend) == 1
+        assert all(h.is_ready() for h in handles) and loader.pump(stub_backend) == 0
+    finally:
+        loader.shutdown()
+
+    # Бюджет по времени: нулевой – тоже по одному за кадр
+    loader = AsyncLoader(workers=1, budget_bytes=1 << 30, budget_ms=0.0)
+    try:
+        for i in range(2):
+            loader.request_texture(_png(tmp_path / f"t{i}.png", (0, i, 0, 255)))
+        _wait_decoded(loader, 2)
+        assert loader.pump(stub_backend) == 1
+        assert loader.pump(stub_backend) == 1
+    finally:
+        loader.shutdown()
+
+
+def test_material_binds_placeholder_until_texture_is_resident(tmp_path, monkeypatch, stub_backend):
+    monkeypatch.setattr(PBRMaterial, "placeholder_srv_gpu", 0x777)
+    loader = AsyncLoader(workers=1)
+    manager = TextureManager(stub_backend, loader=loader)
+    TextureManager.set_shared(manager)
+    try:
+        mat = PBRMaterial(albedo_map=str(_png(tmp_path / "albedo.png", (0, 0, 255, 255))))
+        mat.bind(stub_backend)
+        assert stub_backend.tables[1] == 0x777         # карта ещё грузится
+
+        _wait_decoded(loader, 1)
+        loader.pump(stub_backend)                      # граница кадра
+        mat.bind(stub_backend)
+        tex = mat.textures["albedo"]
+        assert stub_backend.tables[1] == tex._srv_gpu != 0x777
+        mat.release()
+    finally:
+        TextureManager.set_shared(None)
+        loader.shutdown()
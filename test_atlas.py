@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from alkash3d.assets.atlas import MaxRectsPacker, SkylinePacker, TextureAtlas
+
+
+def _images():
+    rng = np.random.default_rng(1)
+    sizes = [(16, 16), (8, 30), (40, 12), (5, 5), (24, 24), (3, 17)] * 3
+    return {f"img{i}": rng.integers(0, 255, (h, w, 4), dtype=np.uint8)
+            for i, (h, w) in enumerate(sizes)}
+
+
+def test_atlas_regions_do_not_overlap_and_uvs_sample_source():
+    images = _images()
+    for packer in ("maxrects", "skyline"):
+        atlas = TextureAtlas.build(images, padding=2, packer=packer)
+        used = np.zeros(atlas.pixels.shape[:2], dtype=int)
+        for name, r in atlas.regions.items():
+            used[r.y - 2:r.y + r.h + 2, r.x - 2:r.x + r.w + 2] += 1
+            assert (atlas.pixels[r.y:r.y + r.h, r.x:r.x + r.w] == images[name]).all()
+            sx, sy, ox, oy = r.uv_transform
+            assert round(ox * atlas.width) == r.x and round((sx + ox) * atlas.width) == r.x + r.w
+            assert round(oy * atlas.height) == r.y and round((sy + oy) * atlas.height) == r.y + r.h
+        assert used.max() == 1
+        assert len(atlas.levels) == 2            # padding 2 → 2 mip‑уровня
+
+
+def test_maxrects_free_allows_reuse():
+    p = MaxRectsPacker(64, 64)
+    rects = [p.insert(32, 32) for _ in range(4)]
+    assert None not in rects and p.insert(32, 32) is None
+    p.free(*rects[2], 32, 32)
+    assert p.insert(32, 32) == rects[2]
+    s = SkylinePacker(64, 64)
+    assert s.insert(64, 10) == (0, 0) and s.insert(10, 10) == (0, 10)
+
+
+def test_atlas_rejects_images_larger_than_max_size():
+    images = {"big": np.zeros((10, 70, 4), dtype=np.uint8)}
+    with pytest.raises(ValueError, match="exceeds max atlas size 64"):
+        TextureAtlas.build(images, max_size=64, padding=2)
+    atlas = TextureAtlas.build({"ok": np.zeros((10, 60, 4), dtype=np.uint8)},
+                               max_size=64, padding=2)
+    assert atlas.width <= 64 and atlas.height <= 64
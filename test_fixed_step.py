@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from alkash3d.core.fixed_step import FixedTimestep
+from alkash3d.scene import Scene, Node, TransformInterpolator
+from alkash3d.math.vec3 import Vec3
+
+def test_accumulator_ticks_and_alpha():
+    fs = FixedTimestep(sim_hz=60.0, max_steps=5)
+    # 144 Гц рендер: примерно каждый второй‑третий кадр – один тик
+    ticks = sum(fs.advance(1.0 / 144.0) for _ in range(144))
+    assert ticks in (59, 60)
+    assert 0.0 <= fs.alpha < 1.0
+
+def test_spiral_of_death_is_capped():
+    fs = FixedTimestep(sim_hz=60.0, max_steps=3)
+    assert fs.advance(1.0) == 3           # кадр в 1 с → только 3 тика
+    assert fs.dropped_time > 0.9
+    assert fs.advance(1.0 / 60.0) == 1    # аккумулятор не «разбух»
+
+def test_interpolation_applies_and_restores():
+    scene = Scene()
+    node = Node("Mover")
+    scene.add_child(node)
+    interp = TransformInterpolator()
+
+    interp.capture_previous(scene)
+    node.position = Vec3(10.0, 0.0, 0.0)
+    node.rotation = Vec3(0.0, 350.0, 0.0)
+    interp.capture_previous(scene)
+    node.position = Vec3(20.0, 0.0, 0.0)
+    node.rotation = Vec3(0.0, 10.0, 0.0)   # через 0°, а не через 180°
+    interp.capture_current(scene)
+
+    interp.apply(0.5)
+    assert np.allclose(node.position.as_np(), [15.0, 0.0, 0.0])
+    assert np.isclose(node.rotation.y % 360.0, 0.0, atol=1e-4)
+    interp.restore()
+    assert np.allclose(node.position.as_np(), [20.0, 0.0, 0.0])
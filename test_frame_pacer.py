@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import alkash3d.core.frame_pacer as frame_pacer
+from alkash3d.core.frame_pacer import FramePacer
+
+MS = 1_000_000
+
+
+class _Clock:
+    """Подменяет модуль `time`: каждое чтение – +1 мкс, sleep – с пересыпом."""
+
+    def __init__(self, oversleep_ns=0):
+        self.now = 1_000 * MS
+        self.oversleep_ns = oversleep_ns
+        self.sleeps = []
+
+    def perf_counter_ns(self):
+        self.now += 1_000
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += int(seconds * 1e9) + self.oversleep_ns
+
+
+def _pacer(monkeypatch, fps=100.0, oversleep_ns=0, **kw):
+    clock = _Clock(oversleep_ns)
+    monkeypatch.setattr(frame_pacer, "time", clock)
+    return FramePacer(fps, **kw), clock
+
+
+def test_deadlines_follow_fixed_grid(monkeypatch):
+    pacer, clock = _pacer(monkeypatch)
+    first = pacer.begin_frame()
+    assert pacer.period_ns == 10 * MS
+
+    for k in range(1, 6):
+        clock.now += 3 * MS                     # «работа» кадра
+        pacer.wait()
+        deadline = first + (k - 1) * pacer.period_ns
+        assert deadline <= clock.now < deadline + MS // 10
+        assert pacer.deadline_ns == first + k * pacer.period_ns   # без дрейфа
+    assert pacer.missed_deadlines == 0
+    assert clock.sleeps                         # CPU отдавался ОС
+
+
+def test_missed_deadline_resyncs_from_now(monkeypatch):
+    pacer, clock = _pacer(monkeypatch)
+    first = pacer.begin_frame()
+
+    clock.now += 35 * MS                        # кадр длиной в 3.5 периода
+    pacer.wait()
+    assert pacer.missed_deadlines == 1
+    assert not clock.sleeps                     # опоздавший кадр не спит
+    assert pacer.deadline_ns - clock.now <= pacer.period_ns
+    assert pacer.deadline_ns > first + 3 * pacer.period_ns   # без «догоняющих» кадров
+
+    resynced = pacer.deadline_ns
+    pacer.wait()
+    assert pacer.missed_deadlines == 1
+    assert pacer.deadline_ns == resynced + pacer.period_ns
+
+
+def test_slack_grows_fast_and_decays_slowly(monkeypatch):
+    pacer, clock = _pacer(monkeypatch, oversleep_ns=2 * MS,
+                          initial_slack_ms=0.5, max_slack_ms=4.0)
+    pacer.begin_frame()
+    pacer.wait()
+    assert pacer.last_oversleep_ns >= 2 * MS
+    grown = pacer.slack_ns
+    assert grown > 1.5 * MS                     # рост – половина разрыва за кадр
+    for _ in range(10):
+        pacer.wait()
+    assert abs(pacer.slack_ns - 3 * MS) < MS // 10   # 1.5 × пересып
+    assert pacer.missed_deadlines == 0          # spin‑хвост покрыл пересып
+
+    clock.oversleep_ns = 0
+    pacer.wait()
+    assert pacer.slack_ns > 2.5 * MS            # спад медленный
+    for _ in range(100):
+        pacer.wait()
+    assert pacer.slack_ns == 0.2 * MS           # до min_slack
+
+
+def test_disabled_pacer_does_not_wait(monkeypatch):
+    pacer, clock = _pacer(monkeypatch, fps=0.0)
+    assert not pacer.enabled and pacer.begin_frame() is None
+    assert pacer.wait() == 0.0 and not clock.sleeps
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import numpy as np
+import pytest
+
+from alkash3d.core.frame_pipeline import FramePipeline
+from alkash3d.math.vec3 import Vec3
+from alkash3d.renderer.snapshot import RenderSnapshot
+from alkash3d.scene import Camera, Mesh, Scene
+from alkash3d.scene.light import PointLight
+
+
+class _Renderer:
+    """Записывает кадры; `gate` задерживает отрисовку, `fail_on` – падает."""
+
+    def __init__(self, fail_on=None):
+        self.frames = []
+        self.threads = set()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.fail_on = fail_on
+
+    def render_snapshot(self, snap):
+        self.started.set()
+        self.gate.wait(5.0)
+        self.threads.add(threading.current_thread().name)
+        if snap.frame == self.fail_on:
+            raise RuntimeError("device removed")
+        self.frames.append(snap.frame)
+
+
+def _submit(pipe, frame):
+    snap = pipe.acquire()
+    snap.frame = frame
+    pipe.submit(snap)
+    return snap
+
+
+def test_double_buffer_handoff_and_back_pressure():
+    renderer = _Renderer()
+    renderer.gate.clear()
+    pipe = FramePipeline(renderer)
+    try:
+        a = _submit(pipe, 0)
+        assert renderer.started.wait(5.0)       # render‑поток держит кадр 0
+        b = _submit(pipe, 1)                    # главный поток не ждёт
+        assert b is not a
+
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pipe.acquire()))
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive()                # оба снимка заняты
+
+        renderer.gate.set()
+        waiter.join(5.0)
+        assert got and got[0] is a              # снимок вернулся в пул
+        pipe.submit(got[0])
+        pipe.flush()
+    finally:
+        pipe.stop()
+    assert renderer.frames == [0, 1, 0]
+    assert renderer.threads == {"alkash3d-render"}
+    assert pipe.frames_rendered == 3
+
+
+def test_render_thread_error_reaches_main_thread():
+    renderer = _Renderer(fail_on=1)
+    pipe = FramePipeline(renderer)
+    try:
+        _submit(pipe, 0)
+        _submit(pipe, 1)
+        with pytest.raises(RuntimeError, match="device removed"):
+            pipe.flush()
+        _submit(pipe, 2)                        # ошибка отдана один раз
+        pipe.flush()
+    finally:
+        pipe.stop()
+    assert renderer.frames == [0, 2]
+    assert not pipe._thread.is_alive()
+
+
+def test_capture_packs_nodes_transforms_and_lights():
+    scene = Scene()
+    meshes = []
+    for x in range(3):
+        mesh = Mesh(np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32))
+        mesh.position = Vec3(float(x), 2.0, -5.0)
+        scene.add_child(mesh)
+        meshes.append(mesh)
+    scene.add_child(PointLight(Vec3(1.0, 2.0, 3.0), radius=7.0))
+    cam = Camera()
+    scene.add_child(cam)
+
+    snap = RenderSnapshot(capacity=1, light_capacity=1).capture(
+        scene, cam, aspect=16 / 9, frame=42, cull=False)
+    assert snap.frame == 42 and snap.count == 3
+    assert snap.nodes == meshes                 # только узлы с draw
+    for node, world, lod in snap.draw_lods():
+        assert np.allclose(world, node.get_world_matrix().to_gl())
+        assert lod == 0
+    assert np.allclose(snap.view, cam.get_view_matrix())
+    assert np.allclose(snap.proj, cam.get_projection_matrix(16 / 9))
+
+    lights = snap.active_lights
+    assert len(lights) == 1 and lights[0]["type"] == 1
+    assert np.allclose(lights[0]["position"], [1.0, 2.0, 3.0])
+    assert lights[0]["radius"] == 7.0
+
+    transforms = snap.transforms
+    scene.children.remove(meshes[2])
+    snap.capture(scene, cam, aspect=16 / 9, frame=43, cull=False)
+    assert snap.count == 2 and snap.transforms is transforms   # без аллокаций
+
+
+class _Window:
+    width, height = 64, 64
+
+
+def test_render_reads_only_the_snapshot(tmp_path, monkeypatch, fake_backend):
+    from alkash3d.renderer.pipelines.forward import ForwardRenderer
+
+    monkeypatch.setenv("ALKASH3D_CACHE_DIR", str(tmp_path / "cache"))
+    backend = fake_backend()
+    renderer = ForwardRenderer(_Window(), backend)
+    scene, cam = Scene(), Camera()
+    scene.add_child(cam)
+    mesh = Mesh(np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32))
+    mesh.position = Vec3(3.0, 0.0, -5.0)
+    scene.add_child(mesh)
+
+    snap = renderer.capture_snapshot(RenderSnapshot(), scene, cam)
+    assert snap.calls[0].vb is not None and snap.calls[0].count == mesh.index_count
+
+    # Главный поток меняет и освобождает узел, пока кадр ещё в полёте
+    mesh.position = Vec3(-7.0, 0.0, -5.0)
+    mesh.release_gpu_buffers(backend)
+    mesh.draw = mesh.draw_call = None
+    renderer.render_snapshot(snap)
+
+    (cb,) = backend.executed_constants(0)
+    assert np.frombuffer(cb[128:192], np.float32).reshape(4, 4)[3, 0] == 3.0
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from alkash3d.utils.frame_stats import FrameStats
+
+def test_ring_buffer_wraps():
+    stats = FrameStats(capacity=4)
+    for i in range(6):
+        stats.record(update=i * 0.001)
+    assert stats.count == 4
+    assert np.allclose(stats.frame_times("update"), [0.002, 0.003, 0.004, 0.005])
+
+def test_percentiles_lows_and_hitches():
+    stats = FrameStats(capacity=1000)
+    for _ in range(990):
+        stats.record(update=0.004, render=0.006)     # 10 ms
+    for _ in range(10):
+        stats.record(update=0.004, render=0.046)     # 50 ms – хитчи
+    pct = stats.percentiles()
+    assert abs(pct[50.0] - 10.0) < 1e-6
+    assert pct[99.0] <= 50.0 + 1e-6
+    lows = stats.lows()
+    assert abs(lows[0.01] - 20.0) < 1e-6               # худший 1 % = 50 ms
+    assert stats.hitches() == 10
+    assert stats.hitches(factor=10.0) == 0
+
+def test_histogram_and_empty_buffer():
+    stats = FrameStats(capacity=16)
+    assert stats.summary()["fps"] == 0.0
+    for t in (0.010, 0.010, 0.020):
+        stats.record(render=t)
+    counts, edges = stats.histogram(bins=2, range_ms=(0.0, 30.0))
+    assert counts.tolist() == [2, 1]
+    assert edges[-1] == 30.0
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import json
+import struct
+import numpy as np
+from alkash3d.assets.gltf import load_gltf
+from alkash3d.scene import Camera, Mesh, PointLight
+from alkash3d.scene.light import SpotLight
+
+def _write_glb(path):
+    # Треугольник: pos | normal | uv, шаг 32 байта + uint16 индексы
+    verts = np.array([[0, 0, 0, 0, 0, 1, 0, 0],
+                      [1, 0, 0, 0, 0, 1, 1, 0],
+                      [0, 1, 0, 0, 0, 1, 0, 1]], np.float32)
+    idx = np.array([0, 1, 2, 0], np.uint16)          # + выравнивание
+    binary = verts.tobytes() + idx.tobytes()
+    doc = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0, 1, 3]}],
+        "nodes": [
+            {"name": "Tri", "mesh": 0, "translation": [1, 2, 3],
+             "rotation": [0, 0.7071068, 0, 0.7071068],
+             "children": [2]},
+            {"name": "Cam", "camera": 0},
+            {"name": "Lamp", "translation": [0, 1, 0],
+             "extensions": {"KHR_lights_punctual": {"light": 0}}},
+            {"name": "Spot", "extensions": {"KHR_lights_punctual": {"light": 1}}},
+        ],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0, "NORMAL": 1,
+                                                   "TEXCOORD_0": 2},
+                                    "indices": 3, "material": 0}]}],
+        "materials": [{"pbrMetallicRoughness": {"baseColorFactor": [1, 0, 0, 1],
+                                                "metallicFactor": 0.25}}],
+        "cameras": [{"type": "perspective",
+                     "perspective": {"yfov": np.pi / 3, "znear": 0.5, "zfar": 50}}],
+        "extensions": {"KHR_lights_punctual": {"lights": [
+            {"type": "point", "intensity": 3.0, "range": 7.0},
+            {"type": "spot", "range": 4.5, "spot": {"outerConeAngle": 0.5}}]}},
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": [{"buffer": 0, "byteOffset": 0, "byteLength": 96, "byteStride": 32},
+                        {"buffer": 0, "byteOffset": 96, "byteLength": 6}],
+        "accessors": [
+            {"bufferView": 0, "byteOffset": 0, "componentType": 5126, "count": 3,
+             "type": "VEC3", "min": [0, 0, 0], "max": [1, 1, 0]},
+            {"bufferView": 0, "byteOffset": 12, "componentType": 5126, "count": 3, "type": "VEC3"},
+            {"bufferView": 0, "byteOffset": 24, "componentType": 5126, "count": 3, "type": "VEC2"},
+            {"bufferView": 1, "componentType": 5123, "count": 3, "type": "SCALAR"},
+        ],
+    }
+    js = json.dumps(doc).encode()
+    js += b" " * (-len(js) % 4)
+    body = struct.pack("<II", len(js), 0x4E4F534A) + js
+    body += struct.pack("<II", len(binary), 0x004E4942) + binary
+    path.write_bytes(struct.pack("<4sII", b"glTF", 2, 12 + len(body)) + body)
+
+def test_glb_hierarchy_and_zero_copy(tmp_path):
+    path = tmp_path / "tri.glb"
+    _write_glb(path)
+    root = load_gltf(path)
+
+    tri = root.children[0]
+    assert isinstance(tri, Mesh) and tri.name == "Tri"
+    assert tri._interleaved is not None and tri._interleaved.shape == (3, 8)
+    assert np.shares_memory(tri.vertices, tri._interleaved)
+    assert tri.indices.tolist() == [0, 1, 2]
+    assert np.allclose(tri.position.as_np(), [1, 2, 3])
+    assert np.isclose(tri.rotation.y, 90.0, atol=1e-3)
+    assert tri.material.binding_point >= 0
+
+    cam = root.children[1]
+    assert isinstance(cam, Camera) and np.isclose(cam.fov, 60.0) and cam.far == 50
+
+    lamp = [n for n in root.children if isinstance(n, PointLight)][0]
+    assert lamp.radius == 7.0 and lamp.intensity == 3.0
+    # (0,1,0) в системе узла Tri: поворот на 90° вокруг Y + сдвиг (1,2,3)
+    assert np.allclose(lamp.position.as_np(), [1, 3, 3], atol=1e-5)
+
+    spot = [n for n in root.children if isinstance(n, SpotLight)][0]
+    assert spot.radius == 4.5 and np.isclose(spot.outer_angle, np.degrees(0.5))
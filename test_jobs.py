@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import threading
+import numpy as np
+import pytest
+from alkash3d.jobs import JobSystem, JobCounter
+
+def test_parallel_for_covers_range_once():
+    jobs = JobSystem(num_workers=3)
+    hits = np.zeros(10_000, dtype=np.int32)
+    lock = threading.Lock()
+
+    def body(start, end):
+        with lock:
+            hits[start:end] += 1
+
+    jobs.parallel_for(len(hits), body, min_chunk=100)
+    jobs.shutdown()
+    assert np.all(hits == 1)
+
+def test_dependencies_and_continuations_run_in_order():
+    jobs = JobSystem(num_workers=2)
+    order = []
+    a = jobs.submit(order.append, "a")
+    b = jobs.submit(order.append, "b")
+    c = jobs.submit(order.append, "c", after=[a, b])
+    c.then(order.append, "d")
+    jobs.wait_frame()
+    jobs.shutdown()
+    assert sorted(order[:2]) == ["a", "b"]
+    assert order[2:] == ["c", "d"]
+
+def test_counter_reraises_job_error():
+    jobs = JobSystem(num_workers=2)
+    counter = JobCounter()
+
+    def boom():
+        raise ValueError("boom")
+
+    jobs.submit(boom, counter=counter)
+    with pytest.raises(ValueError):
+        counter.wait(jobs)
+    jobs.shutdown()
+
+
+def test_background_jobs_do_not_hold_the_frame():
+    jobs = JobSystem(num_workers=2)
+    gate, done = threading.Event(), threading.Event()
+    jobs.submit(lambda: (gate.wait(5.0), done.set()), background=True)
+    jobs.submit(lambda: None)
+    jobs.wait_frame()                       # кадр не ждёт фоновую задачу
+    assert not done.is_set()
+    gate.set()
+    assert done.wait(5.0)
+    jobs.shutdown()
+
+
+def test_parallel_frustum_culling_matches_serial():
+    from alkash3d.scene import Camera, Mesh, Scene
+
+    cam = Camera()
+    frustum = cam.get_view_projection_frustum(16 / 9)
+    rng = np.random.default_rng(3)
+    centres = rng.uniform(-200.0, 200.0, (20_000, 3)).astype(np.float32)
+    radii = rng.uniform(0.1, 5.0, 20_000).astype(np.float32)
+    jobs = JobSystem(num_workers=3)
+    try:
+        assert np.array_equal(frustum.cull_spheres(centres, radii, jobs),
+                              frustum.cull_spheres(centres, radii))
+
+        scene = Scene()
+        tri = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+        front, behind = Mesh(tri), Mesh(tri)
+        behind.position.z = 50.0            # камера в z=5 смотрит в −z
+        scene.add_child(front)
+        scene.add_child(behind)
+        scene.update(0.0)
+        assert scene.visible_nodes(cam, 16 / 9, jobs) == [front]
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.renderer.light_assign import LightAssignment, object_bounds
+from alkash3d.renderer.snapshot import LIGHT_DTYPE
+
+
+class _Node:
+    def __init__(self, centre, radius):
+        self._bounding_center = np.asarray(centre, np.float32)
+        self._bounding_radius = radius
+
+
+def _light(kind, pos=(0, 0, 0), radius=5.0, intensity=1.0):
+    row = np.zeros(1, dtype=LIGHT_DTYPE)
+    row["type"] = kind
+    row["color"] = (1.0, 1.0, 1.0)
+    row["intensity"] = intensity
+    row["position"] = pos
+    row["radius"] = radius
+    row["direction"] = (0.0, -1.0, 0.0)
+    return row
+
+
+def test_object_bounds_apply_transform_and_scale():
+    world = np.diag([2.0, 2.0, 2.0, 1.0]).astype(np.float32)
+    world[:3, 3] = (10.0, 0.0, 0.0)
+    transforms = world.T[None].copy()          # формат to_gl
+    centres, radii = object_bounds([_Node((1, 0, 0), 1.5)], transforms)
+    assert np.allclose(centres, [[12.0, 0.0, 0.0]])
+    assert np.allclose(radii, [3.0])
+
+
+def test_top_k_by_influence_and_cache():
+    lights = np.concatenate([
+        _light(1, (0, 0, 0), radius=5.0),           # 0 – рядом с объектом A
+        _light(1, (100, 0, 0), radius=5.0),         # 1 – рядом с B
+        _light(0, intensity=0.2),                   # 2 – направленный, всем
+        _light(1, (3, 0, 0), radius=5.0, intensity=4.0),  # 3 – ярче, чем 0
+        _light(1, (50, 0, 0), radius=5.0),          # 4 – никому не достаёт
+    ])
+    centres = np.array([[1.0, 0, 0], [100.0, 0, 0]], np.float32)
+    radii = np.array([1.0, 1.0], np.float32)
+
+    assign = LightAssignment(k=2)
+    assert assign.update(centres, radii, lights)
+    assert assign.indices[0].tolist() == [3, 0]
+    assert assign.indices[1].tolist() == [1, 2]
+    assert assign.counts.tolist() == [2, 2]
+    count, block = assign.draw_constants(0)
+    assert count == 2 and len(block) == 2 * 64
+
+    # Ничего не двигалось – без пересчёта
+    assert not assign.update(centres, radii, lights)
+    assert assign.recomputed == 1
+
+    # Объект сдвинулся – пересчёт; вдали от всех – только направленный
+    centres[1] = (-500.0, 0, 0)
+    assert assign.update(centres, radii, lights)
+    assert assign.indices[1].tolist() == [2, -1]
+    assert assign.counts[1] == 1
+    assert np.all(assign.blocks[1][1:]["intensity"] == 0.0)
+
+
+class _Window:
+    width, height = 64, 64
+
+
+def test_forward_draws_get_their_own_constants(tmp_path, monkeypatch, fake_backend):
+    from alkash3d.math.vec3 import Vec3
+    from alkash3d.renderer.pipelines.forward import ForwardRenderer
+    from alkash3d.scene import Camera, Mesh, Scene
+    from alkash3d.scene.light import PointLight
+
+    monkeypatch.setenv("ALKASH3D_CACHE_DIR", str(tmp_path / "cache"))
+    backend = fake_backend()
+    renderer = ForwardRenderer(_Window(), backend)
+
+    scene, cam = Scene(), Camera()
+    scene.add_child(cam)
+    tri = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    for x in (-50.0, 50.0):                    # далеко друг от друга
+        mesh = Mesh(tri.copy())
+        mesh.position = Vec3(x, 0.0, -5.0)
+        scene.add_child(mesh)
+    scene.add_child(PointLight(Vec3(-50.0, 0.0, -5.0), radius=5.0))
+
+    renderer.render(scene, cam)
+    first, second = backend.executed_constants(0)
+    # Каждый draw видит свою модельную матрицу и свой список источников,
+    # хотя command list выполняется после записи констант обоих
+    model = lambda cb: np.frombuffer(cb[128:192], np.float32).reshape(4, 4)
+    count = lambda cb: int(np.frombuffer(cb[236:240], np.int32)[0])
+    assert model(first)[3, 0] == -50.0 and model(second)[3, 0] == 50.0
+    assert (count(first), count(second)) == (1, 0)
+
+    # Следующий кадр переиспользует те же слоты кольца
+    slots = len(backend.buffers)
+    renderer.render(scene, cam)
+    assert len(backend.buffers) == slots
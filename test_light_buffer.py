@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.math.vec3 import Vec3
+from alkash3d.renderer.light_buffer import LIGHT_CB_DTYPE, LIGHT_CB_HEADER, LightBuffer
+from alkash3d.renderer.snapshot import pack_lights
+from alkash3d.scene.light import DirectionalLight, PointLight, SpotLight
+
+
+def test_layout_matches_hlsl_packing():
+    assert LIGHT_CB_DTYPE.itemsize == 64
+    assert LIGHT_CB_DTYPE.fields["type"][1] == 48
+    assert LIGHT_CB_DTYPE.fields["outer_cutoff"][1] == 52
+
+
+def test_single_upload_only_when_lights_change(fake_backend):
+    lights = [DirectionalLight(direction=Vec3(0, -1, 0)),
+              PointLight(position=Vec3(1, 2, 3), radius=5.0, intensity=2.0),
+              SpotLight(inner_angle=10.0, outer_angle=20.0)]
+    backend = fake_backend()
+    buf = LightBuffer(backend, capacity=4)
+
+    assert buf.update(pack_lights(lights)) and buf.upload()
+    assert len(backend.writes) == 1
+    raw = np.frombuffer(backend.writes[0], dtype=np.uint8)
+    assert raw[:4].view(np.int32)[0] == 3
+    rows = raw[LIGHT_CB_HEADER:].view(LIGHT_CB_DTYPE)
+    assert list(rows["type"]) == [0, 1, 2]
+    assert np.allclose(rows[1]["position"], (1, 2, 3)) and rows[1]["radius"] == 5.0
+    assert np.isclose(rows[2]["inner_cutoff"], np.cos(np.radians(10.0)))
+
+    # Ничего не поменялось – ни новой версии, ни записи
+    version = buf.version
+    assert not buf.update(pack_lights(lights))
+    buf.bind()
+    assert buf.version == version and len(backend.writes) == 1
+
+    # Сдвинули один источник, потом убрали последний
+    lights[1].position = Vec3(4, 5, 6)
+    assert buf.update(pack_lights(lights))
+    buf.bind()
+    assert len(backend.writes) == 2
+    assert buf.update(pack_lights(lights[:2])) and buf.count == 2
+    assert buf.rows[2]["type"] == 0 and buf.rows[2]["intensity"] == 0.0
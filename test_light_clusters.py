@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.math.mat4 import Mat4
+from alkash3d.renderer.light_buffer import LIGHT_CB_DTYPE
+from alkash3d.renderer.light_clusters import LightClusters
+
+
+def _lights(*items):
+    rows = np.zeros(len(items), dtype=LIGHT_CB_DTYPE)
+    for row, (kind, pos, radius) in zip(rows, items):
+        row["type"] = kind
+        row["position"] = pos
+        row["radius"] = radius
+        row["direction"] = (0.0, 0.0, -1.0)
+        row["outer_cutoff"] = 0.9
+    return rows
+
+
+def _camera():
+    view = Mat4.identity().to_gl()
+    proj = Mat4.perspective(90.0, 1.0, 0.1, 100.0).to_gl()
+    return view, proj
+
+
+def test_point_light_only_in_nearby_clusters():
+    clusters = LightClusters(tiles=(4, 4), slices=8)
+    view, proj = _camera()
+    # 0 – направленный, 1 – точечный справа‑сверху, 2 – за камерой
+    rows = _lights((0, (0, 0, 0), 0.0),
+                   (1, (5.0, 5.0, -10.0), 1.0),
+                   (1, (0.0, 0.0, 10.0), 1.0))
+    clusters.build(rows, view, proj, 0.1, 100.0)
+
+    assert set(clusters.indices.tolist()) == {1}
+    hit = np.flatnonzero(clusters.counts)
+    ix = hit % 4
+    iy = (hit // 4) % 4
+    iz = hit // 16
+    # x/d = 0.5 → ndc 0.5 → тайл 3 из 4; глубина 10 → срез около середины
+    assert set(ix.tolist()) <= {2, 3} and set(iy.tolist()) <= {2, 3}
+    depth = 0.1 * (1000.0 ** (iz / 8.0))
+    assert np.all(depth < 11.0) and np.all(0.1 * 1000.0 ** ((iz + 1) / 8.0) > 9.0)
+    for c in hit:
+        assert clusters.cluster_lights(int(c)).tolist() == [1]
+
+
+def test_spot_cone_rejects_clusters_behind_it():
+    clusters = LightClusters(tiles=(4, 4), slices=8)
+    view, proj = _camera()
+    point = _lights((1, (0.0, 0.0, -10.0), 8.0))
+    spot = _lights((2, (0.0, 0.0, -10.0), 8.0))
+    clusters.build(point, view, proj, 0.1, 100.0)
+    n_point = clusters.indices.size
+    clusters.build(spot, view, proj, 0.1, 100.0)
+    # Конус смотрит от камеры – ближние к камере кластеры отбрасываются
+    assert 0 < clusters.indices.size < n_point
+
+
+def test_pack_layout():
+    clusters = LightClusters(tiles=(4, 4), slices=8)
+    view, proj = _camera()
+    clusters.build(_lights((1, (0.0, 0.0, -5.0), 2.0)), view, proj, 0.1, 100.0)
+    data = clusters.pack()
+    assert len(data) % 16 == 0 and len(data) <= 4096 * 16
+    dims = np.frombuffer(data, np.uint32, 4, 64)
+    assert dims[:3].tolist() == [4, 4, 8]
+    grid = np.frombuffer(data, np.uint32, clusters.num_clusters, 96)
+    assert np.array_equal(grid & 0xFFF, clusters.counts)
+    assert np.array_equal(grid >> 12, clusters.offsets)
+    idx = np.frombuffer(data, np.uint16, clusters.indices.size, 96 + clusters.grid_regs * 16)
+    assert np.array_equal(idx, clusters.indices)
+    assert clusters.defines()["CLUSTERED"] is True
+
+
+def test_prepare_lights_switches_to_clusters(fake_backend):
+    from alkash3d.renderer.light_buffer import LightBuffer
+    from alkash3d.renderer.pipelines.deferred import CLUSTER_MIN_LIGHTS, prepare_lights
+    from alkash3d.renderer.snapshot import LIGHT_DTYPE
+
+    backend = fake_backend()
+    buf, clusters = LightBuffer(backend, 64), LightClusters(backend, tiles=(4, 4), slices=8)
+    view, proj = _camera()
+    lights = np.zeros(CLUSTER_MIN_LIGHTS + 1, dtype=LIGHT_DTYPE)
+    lights["type"] = 1
+    lights["radius"] = 2.0
+    lights["position"][:, 2] = -np.arange(1, len(lights) + 1) * 3.0
+
+    features, clustered = prepare_lights(buf, clusters, lights[:4], view, proj, 0.1, 100.0)
+    assert not clustered and features["LIGHT_COUNT"] == 4
+    features, clustered = prepare_lights(buf, clusters, lights, view, proj, 0.1, 100.0)
+    assert clustered and features["CLUSTERED"] and buf.count == len(lights)
+    assert clusters.indices.size > 0
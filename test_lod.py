@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.math.mat4 import Mat4
+from alkash3d.renderer.lod import LODSelector
+from alkash3d.scene.mesh import Mesh
+
+
+class _Backend:
+    def __init__(self):
+        self.draws = []
+
+    def create_buffer(self, data, usage=None):
+        return usage
+
+    def set_vertex_buffers(self, vb, ib=None):
+        pass
+
+    def draw_indexed(self, count, start=0):
+        self.draws.append((count, start))
+
+
+def _chain_mesh():
+    verts = np.random.default_rng(0).uniform(-1, 1, (12, 3)).astype(np.float32)
+    mesh = Mesh(verts)
+    full = np.arange(12, dtype=np.uint32)
+    mesh.set_lod_chain([full, full[:6], full[:3]], errors=[0.0, 0.1, 0.4])
+    return mesh
+
+
+def test_lod_chain_draws_level_range():
+    mesh = _chain_mesh()
+    assert mesh.lod_count == 3
+    assert mesh.indices.dtype == np.uint16 and len(mesh.indices) == 21
+    backend = _Backend()
+    mesh.draw(backend)
+    mesh.draw(backend, lod=2)
+    mesh.draw(backend, lod=9)
+    assert backend.draws == [(12, 0), (3, 18), (3, 18)]
+
+
+def test_levels_by_screen_size_bias_and_hysteresis():
+    sel = LODSelector(lod0_size=0.25, hysteresis=0.2)
+    counts = np.full(4, 4)
+    sizes = np.array([0.5, 0.2, 0.1, 0.01])
+    assert sel.levels(sizes, counts).tolist() == [0, 1, 2, 3]
+    sel.bias = 1.0
+    assert sel.levels(sizes, counts).tolist() == [0, 2, 3, 3]
+    sel.bias = 0.0
+
+    # Чуть меньше границы LOD0/LOD1 – остаётся прежний уровень
+    just_below = np.array([0.24])
+    assert sel.levels(just_below, np.array([4]), np.array([0.0])).tolist() == [0]
+    assert sel.levels(just_below, np.array([4])).tolist() == [1]
+    # Далеко за границей – переключается
+    assert sel.levels(np.array([0.1]), np.array([4]), np.array([0.0])).tolist() == [2]
+
+
+def test_select_uses_world_bounds_and_remembers_level():
+    near, far = _chain_mesh(), _chain_mesh()
+    plain = Mesh(np.zeros((3, 3), np.float32))
+    nodes = [near, far, plain]
+    transforms = np.stack([Mat4.translate(0, 0, -2).to_gl(),
+                           Mat4.translate(0, 0, -200).to_gl(),
+                           Mat4.identity().to_gl()])
+    proj = Mat4.perspective(60.0, 1.0, 0.1, 1000.0).to_gl()
+    levels = LODSelector().select(nodes, transforms, np.zeros(3), proj)
+    assert levels.tolist() == [0, 2, 0]
+    assert far.lod == 2 and near.lod == 0
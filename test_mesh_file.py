@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from alkash3d.mesh.mesh_file import MeshFile, encode_mesh_file, load_mesh, write_mesh_file, LOD_DTYPE
+from alkash3d.mesh.optimize import build_meshlets
+
+def _quad():
+    pos = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], np.float32)
+    uv = pos[:, :2].copy()
+    idx = np.array([0, 1, 2, 0, 2, 3], np.uint32)
+    return pos, uv, idx
+
+def test_roundtrip_is_aligned_and_zero_copy(tmp_path):
+    pos, uv, idx = _quad()
+    lods = np.zeros(2, dtype=LOD_DTYPE)
+    lods[0] = (0, 6, 0.0, 0)
+    lods[1] = (0, 3, 0.5, 0)
+    path = write_mesh_file(tmp_path / "quad.amesh", pos, None, uv, idx, lods=lods)
+
+    mf = MeshFile(path)
+    assert mf.indices.dtype == np.uint16
+    assert np.array_equal(mf.indices, idx)
+    assert np.allclose(mf.positions, pos)
+    assert np.allclose(mf.normals, [0, 0, 1])
+    assert np.allclose(mf.texcoords, uv)
+    assert mf.lods["index_count"].tolist() == [6, 3]
+    assert all(off % 64 == 0 for _, off, _ in mf.sections.values())
+    assert isinstance(mf.vertices, np.memmap)
+    centre, radius = mf.bounding_sphere
+    assert np.allclose(centre, [0.5, 0.5, 0.0]) and np.isclose(radius, np.sqrt(0.5))
+
+def test_mesh_is_built_on_views(tmp_path):
+    pos, uv, idx = _quad()
+    path = write_mesh_file(tmp_path / "quad.amesh", pos, None, uv, idx)
+    mesh = load_mesh(path)
+    assert np.shares_memory(mesh.vertices, mesh._interleaved)
+    assert mesh.index_count == 6
+
+def test_meshlets_are_written_and_cover_lod0(tmp_path):
+    n = 12
+    x, y = np.meshgrid(np.arange(n + 1), np.arange(n + 1))
+    pos = np.stack([x, y, np.zeros_like(x)], -1).reshape(-1, 3).astype(np.float32)
+    i = (np.arange(n)[:, None] * (n + 1) + np.arange(n)[None, :]).reshape(-1)
+    idx = np.stack([i, i + 1, i + n + 2, i, i + n + 2, i + n + 1], -1).reshape(-1)
+    lods = np.zeros(2, dtype=LOD_DTYPE)
+    lods[0] = (0, len(idx), 0.0, 0)
+    lods[1] = (0, 6, 0.5, 0)
+    path = write_mesh_file(tmp_path / "grid.amesh", pos, None, None, idx, lods=lods,
+                           meshlets=True)
+    assert path.read_bytes() == encode_mesh_file(pos, None, None, idx, lods, True)
+
+    mf = MeshFile(path)
+    table, verts, local = mf.meshlets
+    assert len(table) > 1
+    assert (table["vertex_count"] <= 64).all() and (table["triangle_count"] <= 124).all()
+    # Meshlet‑ы восстанавливают индексы уровня 0 в исходном порядке
+    rebuilt = np.concatenate([
+        verts[m["vertex_offset"]:m["vertex_offset"] + m["vertex_count"]][
+            local[m["triangle_offset"]:m["triangle_offset"] + m["triangle_count"]]]
+        for m in table]).reshape(-1)
+    assert np.array_equal(rebuilt, idx)
+    assert load_mesh(path).meshlets.table.shape == table.shape
+
+    small = build_meshlets(idx, max_vertices=8, max_triangles=4)
+    assert (small.table["vertex_count"] <= 8).all() and (small.table["triangle_count"] <= 4).all()
+    assert MeshFile(write_mesh_file(tmp_path / "none.amesh", pos, None, None, idx)).meshlets is None
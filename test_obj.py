@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from alkash3d.assets.obj import load_obj, parse_obj
+
+QUAD = b"""# quad + triangle with relative indices
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+vt 0 1
+vn 0 0 1
+f 1/1/1 2/2/1 3/3/1 4/4/1
+f -4/-4/-1 -2/-2/-1 -1/-1/-1
+"""
+
+def test_fan_triangulation_and_welding():
+    pos, norm, uv, idx = parse_obj(QUAD)
+    assert len(idx) == 9                 # 2 треугольника квада + 1
+    assert len(pos) == 4                 # одинаковые углы сварены
+    tris = pos[idx].reshape(-1, 3, 3)
+    assert np.allclose(tris[0], [[0, 0, 0], [1, 0, 0], [1, 1, 0]])
+    assert np.allclose(tris[2], [[0, 0, 0], [1, 1, 0], [0, 1, 0]])
+    assert np.allclose(norm, [0, 0, 1])
+    assert np.allclose(uv[idx[:3]], [[0, 0], [1, 0], [1, 1]])
+
+def test_missing_attributes_get_defaults():
+    pos, norm, uv, idx = parse_obj(b"v 0 0 0\nv 1 0 0\nv 0 1 0 1.0\nf 1 2 3")
+    assert idx.tolist() == [0, 1, 2]
+    assert np.allclose(norm, [0, 0, 1]) and np.allclose(uv, 0.0)
+
+def test_cache_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALKASH3D_CACHE_DIR", str(tmp_path / "cache"))
+    src = tmp_path / "quad.obj"
+    src.write_bytes(QUAD)
+    first = load_obj(src)
+    second = load_obj(src)
+    assert isinstance(second[0], np.memmap)
+    for a, b in zip(first, second):
+        assert np.array_equal(a, b)
+
+def test_inline_comments_are_ignored():
+    pos, _, _, idx = parse_obj(b"v 0 0 0 # c\nv 1 0 0\nv 0 1 0#x\n# full line\nf 1 2 3 # x\n")
+    assert len(pos) == 3 and idx.tolist() == [0, 1, 2]
+
+def test_leading_whitespace_records():
+    pos, _, uv, idx = parse_obj(b"  v 0 0 0\n\tv 1 0 0\n v 0 1 0\n vt 0.5 0.5\n   f 1/1 2/1 3/1\n")
+    assert len(pos) == 3 and idx.tolist() == [0, 1, 2]
+    assert np.allclose(uv, 0.5)
+
+def test_out_of_range_face_index_names_line():
+    for data in (b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 4\n",
+                 b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 -4\n",
+                 b"v 0 0 0\nv 1 0 0\nv 0 1 0\nvt 0 0\nf 1/1 2/2 3/1\n"):
+        try:
+            parse_obj(data)
+        except ValueError as exc:
+            assert "line" in str(exc) and "out of range" in str(exc)
+        else:
+            raise AssertionError("expected ValueError")
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.mesh.optimize import (
+    cache_stats, optimize_mesh, optimize_overdraw, optimize_vertex_cache, optimize_vertex_fetch,
+)
+
+
+def _grid(n=32):
+    x, y = np.meshgrid(np.linspace(0, 1, n + 1), np.linspace(0, 1, n + 1))
+    pos = np.stack([x, y, np.zeros_like(x)], axis=-1).reshape(-1, 3).astype(np.float32)
+    i = np.arange(n)[:, None] * (n + 1) + np.arange(n)[None, :]
+    a, b, c, d = i, i + 1, i + n + 1, i + n + 2
+    tris = np.stack([np.stack([a, b, d], -1), np.stack([a, d, c], -1)], -2)
+    return pos, tris.reshape(-1).astype(np.uint32)
+
+
+def _canonical(indices):
+    """Множество треугольников с учётом порядка обхода (циклический сдвиг)."""
+    t = np.asarray(indices).reshape(-1, 3)
+    rot = np.argmin(t, axis=1)
+    t = np.stack([np.roll(row, -r) for row, r in zip(t, rot)])
+    return sorted(map(tuple, t.tolist()))
+
+
+def test_vertex_cache_reduces_acmr_and_keeps_triangles():
+    pos, idx = _grid()
+    shuffled = idx.reshape(-1, 3)[np.random.default_rng(0).permutation(len(idx) // 3)].reshape(-1)
+    before = cache_stats(shuffled, len(pos))
+    out = optimize_vertex_cache(shuffled, len(pos))
+    after = cache_stats(out, len(pos))
+    assert out.dtype == idx.dtype
+    assert _canonical(out) == _canonical(shuffled)
+    assert after["acmr"] < 0.8 < before["acmr"]
+    assert 1.0 <= after["atvr"] < before["atvr"]
+
+
+def test_vertex_fetch_orders_by_first_use():
+    idx = np.array([5, 2, 7, 2, 7, 0], dtype=np.uint16)
+    out, order = optimize_vertex_fetch(idx, 8)
+    assert out.tolist() == [0, 1, 2, 1, 2, 3]
+    assert order[:4].tolist() == [5, 2, 7, 0]
+    assert sorted(order.tolist()) == list(range(8))
+
+
+def test_overdraw_and_full_pass_report():
+    pos, idx = _grid(16)
+    out = optimize_overdraw(optimize_vertex_cache(idx, len(pos)), pos)
+    assert _canonical(out) == _canonical(idx)
+
+    half = idx[: len(idx) // 2]
+    new_pos, _, _, levels, report = optimize_mesh(pos, None, None, [idx, half], overdraw=True)
+    assert report["after"]["acmr"] <= report["before"]["acmr"]
+    # Вершины переставлены согласованно для всех уровней
+    assert np.allclose(np.sort(new_pos[levels[1]].reshape(-1, 3, 3), axis=None),
+                       np.sort(pos[half].reshape(-1, 3, 3), axis=None))
+    first = np.unique(levels[0], return_index=True)[1]
+    assert np.all(np.diff(first) > 0)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.assets.material import PBRMaterial
+from alkash3d.renderer.permutations import (
+    light_bucket, light_features, material_features, variant_key,
+)
+from alkash3d.renderer.shader import Shader
+from alkash3d.scene.mesh import Mesh
+
+
+def test_feature_keys_and_buckets():
+    assert variant_key({"ALPHA_TEST": False, "HAS_TEXCOORDS": True}) == (("HAS_TEXCOORDS", 1),)
+    assert [light_bucket(n) for n in (0, 1, 3, 5, 300)] == [1, 1, 4, 16, 1024]
+    assert light_features([{"type": 1}, {"type": 2}]) == {"LIGHT_COUNT": 4, "LIGHT_TYPES": 6}
+
+    tri = np.zeros((3, 3), np.float32)
+    plain = Mesh(tri)
+    uv = Mesh(tri, texcoords=np.zeros((3, 2), np.float32))
+    mat = PBRMaterial(albedo_map="wood.png", alpha_test=True)
+    assert variant_key(material_features(None, uv)) == (("HAS_TEXCOORDS", 1),)
+    # Без UV карты не читаются, alpha‑test остаётся
+    assert variant_key(material_features(mat, plain)) == (("ALPHA_TEST", 1),)
+    assert variant_key(material_features(mat, uv)) == (
+        ("ALPHA_TEST", 1), ("HAS_ALBEDO_MAP", 1), ("HAS_TEXCOORDS", 1))
+
+
+def test_shader_variants_are_lazy_and_cached(tmp_path, fake_backend):
+    d = tmp_path
+    (d / "v.hlsl").write_text("vs")
+    (d / "p.hlsl").write_text("ps")
+    backend = fake_backend()
+    shader = Shader(backend, str(d / "v.hlsl"), str(d / "p.hlsl"))
+    assert len(backend.compiled) == 2
+
+    lit = shader.variant({"LIGHT_COUNT": 4})
+    assert lit != shader.pso and len(backend.compiled) == 4
+    assert shader.variant({"LIGHT_COUNT": 4, "ALPHA_TEST": False}) == lit
+    shader.use()
+    assert backend.bound == [shader.pso] and len(backend.compiled) == 4
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from alkash3d.renderer.pipeline_registry import PipelineDesc, PipelineRegistry
+from alkash3d.renderer.shader_cache import ShaderCache
+
+
+def test_warm_up_compiles_unique_stages_and_replays_recording(tmp_path, fake_backend):
+    d = tmp_path
+    for name in ("a_vert.hlsl", "a_frag.hlsl", "b_frag.hlsl"):
+        (d / name).write_text(name)
+    backend = fake_backend()
+    reg = PipelineRegistry(backend, ShaderCache(backend, d / "cache"))
+
+    descs = [PipelineDesc.make(d / "a_vert.hlsl", d / "a_frag.hlsl"),
+             PipelineDesc.make(d / "a_vert.hlsl", d / "b_frag.hlsl"),
+             PipelineDesc.make(d / "a_vert.hlsl", d / "b_frag.hlsl", {"FOG": 1}),
+             PipelineDesc.make(d / "a_vert.hlsl", d / "a_frag.hlsl"),
+             PipelineDesc.make(d / "missing.hlsl", d / "a_frag.hlsl")]
+    seen = []
+    stats = reg.warm_up(descs, workers=3, progress=lambda done, total, _: seen.append((done, total)))
+    # vs×2 (без/с FOG) + ps×3, 3 PSO; дубликат и пропавший файл отброшены
+    assert (stats["pipelines"], stats["failed"]) == (3, 0)
+    assert len(backend.compiled) == 5 and backend.psos == 3
+    assert sorted(seen)[-1] == (8, 8)
+
+    # Повторный прогрев – всё из памяти
+    reg.warm_up(descs[:3])
+    assert len(backend.compiled) == 5 and backend.psos == 3
+
+    # Запись сессии → JSON → тот же набор
+    reg.record(descs[2])
+    reg.record(descs[0])
+    reg.record(descs[2])
+    log = d / "pipelines.json"
+    assert reg.save_recorded(log) == 2
+    assert PipelineRegistry.load_recorded(log) == [descs[2], descs[0]]
+    assert PipelineRegistry.load_recorded(d / "nope.json") == []
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import re
+from pathlib import Path
+
+from alkash3d.graphics.root_signature import ROOT_CLUSTER_CB, ROOT_SIGNATURE, root_index_for
+from alkash3d.renderer.light_clusters import LightClusters
+
+ROOT = Path(__file__).resolve().parent
+_KINDS = {"b": "CBV", "t": "SRV", "u": "UAV"}
+
+
+def _native_tables():
+    """Диапазоны корневой подписи из lib.rs, по таблицам в порядке параметров."""
+    src = (ROOT / "alkash3d/alkash3d_dx12/src/lib.rs").read_text(encoding="utf-8")
+    body = src[src.index("mod root_sig"):src.index("/* ==================== PSO")]
+    arrays = dict(re.findall(r"let (\w+) = \[(.*?)\n        \];", body, re.S))
+    order = re.findall(r"pDescriptorRanges: (\w+)\.as_ptr\(\)", body)
+    tables = []
+    for name in order:
+        ranges = re.findall(r"RANGE_TYPE_(\w+),\s*NumDescriptors: (\d+),\s*"
+                            r"BaseShaderRegister: (\d+)", arrays[name])
+        tables.append(tuple((kind, int(base), int(n)) for kind, n, base in ranges))
+    return tuple(tables)
+
+
+def _registers(shader: str, cbuffer: str):
+    src = (ROOT / "resources/shaders" / shader).read_text(encoding="utf-8")
+    m = re.search(rf"cbuffer\s+{cbuffer}\s*:\s*register\(([btu])(\d+)\)", src)
+    assert m, f"{cbuffer} not declared in {shader}"
+    return _KINDS[m.group(1)], int(m.group(2))
+
+
+def test_python_mirror_matches_native_root_signature():
+    assert _native_tables() == ROOT_SIGNATURE
+
+
+def test_cluster_cb_register_is_reachable():
+    kind, reg = _registers("deferred_light_frag.hlsl", "ClusterCB")
+    assert root_index_for(kind, reg) == ROOT_CLUSTER_CB
+    kind, reg = _registers("deferred_light_frag.hlsl", "LightCB")
+    assert root_index_for(kind, reg) == 0
+
+
+def test_clusters_bind_to_cluster_table(fake_backend):
+    backend = fake_backend()
+    clusters = LightClusters(backend, tiles=(2, 2), slices=2)
+    clusters.bind()
+    kind, reg = _registers("deferred_light_frag.hlsl", "ClusterCB")
+    assert backend.table_calls == [root_index_for(kind, reg)]
+    assert backend.bound_resource(backend.tables[ROOT_CLUSTER_CB]) == clusters._cb
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from alkash3d.math.vec3 import Vec3
+from alkash3d.scene import Mesh, Node, PointLight, Scene
+from alkash3d.scene.scene_file import clone_node, load_scene_file, save_scene_file
+
+
+def _quad():
+    v = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], np.float32)
+    return Mesh(v, np.tile([0, 0, 1], (4, 1)), v[:, :2], np.array([0, 1, 2, 0, 2, 3]))
+
+
+def test_scene_file_roundtrip_dedups_and_shares_meshes(tmp_path):
+    root = Scene()
+    group = Node("group")
+    group.position = Vec3(1, 2, 3)
+    root.add_child(group)
+    for i in range(5):
+        m = _quad()
+        m.name = f"quad{i}"
+        group.add_child(m)
+    root.add_child(PointLight(radius=7.0, intensity=2.0, name="lamp"))
+
+    path = save_scene_file(root, tmp_path / "level.ascene")
+    loaded = load_scene_file(path)
+    assert isinstance(loaded, Scene)
+    g = loaded.children[0]
+    assert g.name == "group" and (g.position.x, g.position.z) == (1.0, 3.0)
+    quads = g.children
+    assert [q.name for q in quads] == [f"quad{i}" for i in range(5)]
+    assert quads[0].vertices.base is quads[4].vertices.base       # один блоб
+    assert (quads[3].indices == [0, 1, 2, 0, 2, 3]).all()
+    lamp = loaded.children[1]
+    assert lamp.radius == 7.0 and lamp.intensity == 2.0
+
+    copy = clone_node(g)
+    assert copy.children[2].vertices is quads[2].vertices
+    save_scene_file(loaded, path)                                 # перезапись открытого
+    assert len(load_scene_file(path).children[0].children) == 5
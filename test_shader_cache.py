@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from alkash3d.renderer.shader_cache import ShaderCache
+
+
+def test_disk_and_memory_hits_and_include_invalidation(tmp_path, fake_backend):
+    d = tmp_path
+    (d / "common.hlsli").write_text("float4 tint;")
+    (d / "v.hlsl").write_text('#include "common.hlsli"\nvs')
+    (d / "p.hlsl").write_text('#include "common.hlsli"\nps')
+
+    # Холодный старт: две компиляции, один PSO на две одинаковые пары
+    cold = ShaderCache(fake_backend(supports_shader_blobs=True), d / "cache")
+    first = cold.pipeline(d / "v.hlsl", d / "p.hlsl")
+    assert cold.pipeline(d / "v.hlsl", d / "p.hlsl") == first
+    assert (cold.compiles, cold.pipelines_created, cold.memory_hits) == (2, 1, 1)
+
+    # Тёплый старт (новый процесс): байткод с диска, без компиляции
+    backend = fake_backend(supports_shader_blobs=True)
+    warm = ShaderCache(backend, d / "cache")
+    warm.pipeline(d / "v.hlsl", d / "p.hlsl")
+    assert (warm.compiles, warm.disk_hits) == (0, 2)
+
+    # Define‑ы – отдельный вариант; правка include‑а инвалидирует оба
+    warm.compile("ps", d / "p.hlsl", {"USE_FOG": 1})
+    assert backend.compiled == [("ps", "p.hlsl", {"USE_FOG": 1})]
+    (d / "common.hlsli").write_text("float4 tint2;")
+    warm.pipeline(d / "v.hlsl", d / "p.hlsl")
+    assert warm.compiles == 3 and warm.pipelines_created == 2
+    assert "compiled" in warm.report()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.mesh.mesh_file import MeshFile
+from alkash3d.mesh.simplify import generate_lods, simplify, simplify_directory, simplify_mesh
+from alkash3d.mesh.vertex_format import COMPACT16
+from alkash3d.scene.mesh import Mesh
+
+
+def _grid(n=16, bump=0.0):
+    """(n+1)² вершин, 2n² треугольников; bump – синусоидальный рельеф."""
+    x, y = np.meshgrid(np.linspace(0, 1, n + 1), np.linspace(0, 1, n + 1))
+    z = bump * np.sin(x * 6.0) * np.cos(y * 5.0)
+    pos = np.stack([x, y, z], axis=-1).reshape(-1, 3).astype(np.float32)
+    i = np.arange(n)[:, None] * (n + 1) + np.arange(n)[None, :]
+    a, b, c, d = i, i + 1, i + n + 1, i + n + 2
+    tris = np.stack([np.stack([a, b, d], -1), np.stack([a, d, c], -1)], -2)
+    return pos, tris.reshape(-1).astype(np.uint32)
+
+
+def test_flat_grid_keeps_outline_with_zero_error():
+    pos, idx = _grid()
+    out, err = simplify(pos, idx, 0.1)
+    assert out.dtype == idx.dtype
+    assert len(out) <= len(idx) * 0.1 + 3
+    assert err < 1e-4
+    # Контур сохранён: все 4 угла на месте, площадь не изменилась
+    used = np.unique(out)
+    for corner in (0, 16, 16 * 17, 17 * 17 - 1):
+        assert corner in used
+    t = pos[out.reshape(-1, 3)].astype(np.float64)
+    area = 0.5 * np.linalg.norm(np.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0]), axis=1)
+    assert abs(area.sum() - 1.0) < 1e-5
+
+
+def test_lod_chain_error_grows_and_counts_shrink():
+    pos, idx = _grid(24, bump=0.1)
+    chain, errors = generate_lods(pos, idx, levels=4, ratio=0.5)
+    counts = [len(c) for c in chain]
+    assert len(chain) == 4
+    assert all(b < a for a, b in zip(counts, counts[1:]))
+    assert errors[0] == 0.0 and all(b >= a for a, b in zip(errors, errors[1:]))
+    assert errors[-1] > 0.0
+
+
+def test_uv_seam_collapses_without_mixing_sides():
+    pos, idx = _grid(8)
+    # Дублируем вершины средней колонки (шов UV): слева u = x, справа u = x + 10
+    seam = np.flatnonzero(np.isclose(pos[:, 0], 0.5))
+    twins = np.arange(len(pos), len(pos) + len(seam))
+    pos2 = np.concatenate([pos, pos[seam]])
+    tris = idx.reshape(-1, 3).copy()
+    right = pos[tris].mean(axis=1)[:, 0] > 0.5
+    remap = np.arange(len(pos))
+    remap[seam] = twins
+    tris[right] = remap[tris[right]]
+    uv = pos2[:, :2].astype(np.float64).copy()
+    uv[:len(pos), 0] += np.where(pos[:, 0] > 0.5, 10.0, 0.0)
+    uv[twins, 0] += 10.0
+    out, _ = simplify(pos2, tris.reshape(-1), 0.1, texcoords=uv)
+    assert len(out) <= len(tris) * 3 * 0.1 + 3
+    # Шов не заблокирован, но стороны не перемешаны: у каждого треугольника
+    # все вершины с одной стороны разрыва UV
+    u = uv[out.reshape(-1, 3), 0]
+    assert (np.ptp(u, axis=1) < 5.0).all()
+
+
+def test_unwelded_mesh_simplifies():
+    pos, idx = _grid(24, bump=0.1)
+    # Flat‑shaded: у каждой грани свои вершины и своя нормаль
+    flat = pos[idx].astype(np.float32)
+    t = flat.reshape(-1, 3, 3).astype(np.float64)
+    n = np.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0])
+    n = np.repeat(n / np.linalg.norm(n, axis=1, keepdims=True), 3, axis=0)
+    indices = np.arange(len(flat), dtype=np.uint32)
+    out, err = simplify(flat, indices, 0.5, normals=n)
+    assert len(out) <= len(indices) * 0.5 + 3
+    assert err < 0.05
+    chain, _ = generate_lods(flat, indices, normals=n, levels=3, ratio=0.5)
+    assert len(chain) == 3
+
+
+def test_simplify_mesh_and_directory(tmp_path, monkeypatch):
+    pos, idx = _grid(12, bump=0.05)
+    mesh = Mesh(pos, indices=idx)
+    errors = simplify_mesh(mesh, levels=3)
+    assert mesh.lod_count == len(errors) == 3
+    assert mesh.index_count == len(idx)
+
+    monkeypatch.setenv("ALKASH3D_CACHE_DIR", str(tmp_path / "cache"))
+    src = tmp_path / "models"
+    src.mkdir()
+    lines = [f"v {x} {y} {z}" for x, y, z in pos]
+    lines += [f"f {a + 1} {b + 1} {c + 1}" for a, b, c in idx.reshape(-1, 3)]
+    (src / "grid.obj").write_text("\n".join(lines) + "\n")
+    assert simplify_directory(src, levels=3, workers=1) == {"cooked": 1, "skipped": 0, "failed": 0}
+    assert simplify_directory(src, levels=3, workers=1)["skipped"] == 1
+
+    from alkash3d.assets.obj import cache_path, load_obj, load_obj_mesh
+    mf = MeshFile(cache_path(src / "grid.obj"))
+    assert len(mf.lods) == 3 and mf.lods["error"][2] > 0.0
+    assert len(load_obj(src / "grid.obj")[3]) == len(idx)
+    assert load_obj_mesh(src / "grid.obj").lod_count == 3
+
+    # Цепочка оборвалась раньше запрошенного – всё равно не пересобирается
+    assert simplify_directory(src, levels=12, workers=1)["cooked"] == 1
+    mf = MeshFile(cache_path(src / "grid.obj"))
+    assert len(mf.lods) < 12 and mf.lods[0]["requested_levels"] == 12
+    del mf
+    assert simplify_directory(src, levels=12, workers=1)["skipped"] == 1
+    assert simplify_directory(src, levels=3, workers=1)["cooked"] == 1
+
+    # Другой формат вершин – пересборка
+    stats = simplify_directory(src, levels=3, workers=1, vertex_format="compact16")
+    assert stats["cooked"] == 1
+    assert MeshFile(cache_path(src / "grid.obj")).vertex_format == COMPACT16
+    assert simplify_directory(src, levels=3, workers=1, vertex_format="compact16")["skipped"] == 1
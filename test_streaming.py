@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from alkash3d.assets.async_loader import AsyncLoader
+from alkash3d.math.vec3 import Vec3
+from alkash3d.scene import Mesh, Node, Scene
+from alkash3d.scene.streaming import StreamingManager, partition_scene
+
+
+class _Backend:
+    def __init__(self):
+        self.live = set()
+
+    def create_buffer(self, data, usage="vertex"):
+        buf = object()
+        self.live.add(buf)
+        return buf
+
+    def defer_release(self, buf):
+        self.live.discard(buf)
+
+
+def test_cells_stream_in_and_out_with_hysteresis(tmp_path):
+    level = Node("level")
+    tri = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], np.float32)
+    for ix in range(-3, 4):
+        m = Mesh(tri + [ix * 10 + 5, 0, 5], indices=np.arange(3), name=f"m{ix}")
+        level.add_child(m)
+    partition_scene(level, tmp_path, cell_size=10.0)
+
+    scene, backend, loader = Scene(), _Backend(), AsyncLoader(workers=1)
+    sm = StreamingManager(scene, loader, tmp_path, backend=backend,
+                          load_radius=6.0, unload_radius=12.0)
+    try:
+        def step(x):
+            sm.update(Vec3(x, 0, 5))
+            loader.wait(backend=backend, timeout=5)
+            sm.update(Vec3(x, 0, 5))
+            return sorted(c.name for c in scene.children)
+
+        assert step(5.0) == ["cell_-1_0", "cell_0_0", "cell_1_0"]
+        assert len(backend.live) == 6                   # VB + IB на ячейку
+        assert step(20.0) == ["cell_0_0", "cell_1_0", "cell_2_0"]   # -1 за гистерезисом
+        assert step(35.0) == ["cell_2_0", "cell_3_0"]
+        assert sm.stats()["unloads"] == 3 and len(backend.live) == 4
+    finally:
+        loader.shutdown()
+
+
+def _level(tmp_path, xs):
+    level = Node("level")
+    tri = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], np.float32)
+    for ix in xs:
+        level.add_child(Mesh(tri + [ix * 10 + 5, 0, 5], indices=np.arange(3), name=f"m{ix}"))
+    partition_scene(level, tmp_path, cell_size=10.0)
+
+
+def test_unload_while_loading_then_reload_keeps_buffers(tmp_path):
+    _level(tmp_path, [0])
+    scene, backend, loader = Scene(), _Backend(), AsyncLoader(workers=1)
+    sm = StreamingManager(scene, loader, tmp_path, backend=backend,
+                          load_radius=6.0, unload_radius=12.0)
+    try:
+        sm.update(Vec3(5, 0, 5))                # запрос
+        sm.update(Vec3(100, 0, 5))              # выгрузка, пока грузится
+        sm.update(Vec3(5, 0, 5))                # запрос заново
+        loader.wait(backend=backend, timeout=5)
+        sm.update(Vec3(5, 0, 5))
+        sm.update(Vec3(5, 0, 5))
+        assert [c.name for c in scene.children] == ["cell_0_0"]
+        assert sm.stats()["resident"] == 1
+        mesh = scene.children[0].children[0]
+        assert mesh.vb in backend.live and mesh.ib in backend.live
+        assert len(backend.live) == 2           # устаревшая загрузка освобождена
+    finally:
+        loader.shutdown()
+
+
+def test_unloaded_buffers_wait_for_in_flight_frames(tmp_path):
+    _level(tmp_path, [0])
+    scene, backend, loader = Scene(), _Backend(), AsyncLoader(workers=1)
+    sm = StreamingManager(scene, loader, tmp_path, backend=backend,
+                          load_radius=6.0, unload_radius=12.0, retire_frames=2)
+    try:
+        sm.update(Vec3(5, 0, 5))
+        loader.wait(backend=backend, timeout=5)
+        sm.update(Vec3(5, 0, 5))
+        assert len(scene.children) == 1 and len(backend.live) == 2
+
+        sm.update(Vec3(100, 0, 5))              # ячейка ушла из сцены...
+        assert not scene.children and len(backend.live) == 2
+        sm.update(Vec3(100, 0, 5))              # ...снимок кадра ещё рисуется
+        assert len(backend.live) == 2
+        sm.update(Vec3(100, 0, 5))
+        assert not backend.live
+    finally:
+        loader.shutdown()
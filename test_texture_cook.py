@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from PIL import Image
+from alkash3d.assets.texture_cook import (
+    build_mips, cook_directory, cook_texture, decode_bc1, decode_bc3, encode_bc1, encode_bc3,
+)
+from alkash3d.assets.texture_file import TextureFile
+
+
+def _gradient(h=32, w=24):
+    y, x = np.mgrid[0:h, 0:w]
+    return np.stack([x * 10, y * 8, (x + y) * 4, 255 - y * 4], -1).astype(np.uint8)
+
+
+def test_mip_chain_sizes_and_constant_colour():
+    mips = build_mips(np.full((10, 7, 4), 200, np.uint8))
+    assert [m.shape[:2] for m in mips] == [(10, 7), (5, 3), (2, 1), (1, 1)]
+    assert all((m == 200).all() for m in mips)      # фильтр сохраняет константу
+
+
+def test_bc_roundtrip_error_is_small():
+    img = _gradient()
+    bc1 = decode_bc1(encode_bc1(img))
+    assert np.abs(bc1[..., :3].astype(int) - img[..., :3]).mean() < 8
+    bc3 = decode_bc3(encode_bc3(img))
+    assert np.abs(bc3.astype(int) - img).mean() < 8
+
+
+def test_cook_directory_is_incremental(tmp_path):
+    Image.fromarray(_gradient()).save(tmp_path / "a.png")
+    Image.fromarray(_gradient()[..., :3]).save(tmp_path / "b.png")
+    assert cook_directory(tmp_path, workers=1) == {"cooked": 2, "skipped": 0, "failed": 0}
+    assert cook_directory(tmp_path, workers=1)["skipped"] == 2
+
+    a, b = TextureFile(tmp_path / "a.atex"), TextureFile(tmp_path / "b.atex")
+    assert (a.format, b.format) == ("BC3", "BC1")    # прозрачность → BC3
+    assert a.mip_count == 6 and a.levels[0].shape == (8, 6 * 16)
+    assert isinstance(a.levels[0], np.memmap)
+    assert np.abs(a.to_rgba().astype(int) - _gradient()).mean() < 8
+
+
+def test_non_multiple_of_four_falls_back_to_rgba8(tmp_path):
+    src = tmp_path / "odd.png"
+    Image.fromarray(_gradient(30, 50)).save(src)
+    for fmt in ("auto", "BC1", "BC3"):
+        dst = cook_texture(src, tmp_path / f"odd_{fmt}.atex", fmt=fmt)
+        tex = TextureFile(dst)
+        assert tex.format == "RGBA8"
+        assert np.array_equal(tex.to_rgba(), _gradient(30, 50))
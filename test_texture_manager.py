@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from PIL import Image
+from alkash3d.assets.texture_manager import TextureManager
+
+
+def _png(path, color, size=4):
+    Image.new("RGBA", (size, size), color).save(path)
+    return path
+
+
+def test_refcount_dedup_and_lru_eviction(tmp_path, stub_backend):
+    backend, released = stub_backend, stub_backend.released
+    a = _png(tmp_path / "a.png", (255, 0, 0, 255))
+    b = _png(tmp_path / "b.png", (255, 0, 0, 255))      # то же содержимое
+    c = _png(tmp_path / "c.png", (0, 255, 0, 255))
+    mgr = TextureManager(backend, budget_bytes=4 * 4 * 4)  # одна текстура
+
+    ea = mgr.acquire(a)
+    assert mgr.acquire(tmp_path / "." / "a.png") is ea   # канонический путь
+    eb = mgr.acquire(b)
+    assert eb.texture is ea.texture and mgr.resident_bytes == 64
+    assert mgr.stats()["hits"] == 1 and mgr.stats()["misses"] == 2
+
+    ec = mgr.acquire(c)                 # сверх бюджета, но всё занято
+    assert mgr.resident_bytes == 128 and not released
+
+    for e in (ea, ea, eb):
+        mgr.release(e)
+    assert released == [ea.texture]     # LRU без ссылок вытеснен
+    assert mgr.stats()["evictions"] == 1 and mgr.resident_bytes == 64
+    assert ec.is_ready()
+
+
+class _Watcher:
+    def __init__(self):
+        self.watched = []
+
+    def watch(self, path, callback=None):
+        self.watched.append(path)
+        return path
+
+    def add_dependency(self, dep, on):
+        pass
+
+
+def test_hot_reload_watch_registered_once_per_path(tmp_path, stub_backend):
+    backend = stub_backend
+    a = _png(tmp_path / "a.png", (255, 0, 0, 255))
+    c = _png(tmp_path / "c.png", (0, 255, 0, 255))
+    mgr = TextureManager(backend, budget_bytes=4 * 4 * 4)
+    mgr.watcher = _Watcher()
+
+    mgr.release(mgr.acquire(a))
+    mgr.release(mgr.acquire(c))         # вытесняет a
+    assert mgr.stats()["evictions"] == 1
+    mgr.acquire(a)                      # повторный промах
+    missing = mgr.acquire(tmp_path / "missing.png")
+    assert missing.is_failed()
+    mgr.acquire(tmp_path / "missing.png")
+
+    assert sorted(p.name for p in mgr.watcher.watched) == ["a.png", "c.png", "missing.png"]
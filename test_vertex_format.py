@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from alkash3d.mesh.mesh_file import MeshFile, load_mesh, write_mesh_file
+from alkash3d.mesh.vertex_format import (
+    COMPACT8, COMPACT16, decode_model, decode_vertices, encode_vertices,
+    oct_decode, oct_encode, vertex_stride,
+)
+from alkash3d.renderer.permutations import vertex_features
+
+
+def _cloud(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    pos = (rng.normal(size=(n, 3)) * [4.0, 1.0, 0.5] + [10.0, -3.0, 2.0]).astype(np.float32)
+    nrm = rng.normal(size=(n, 3)).astype(np.float32)
+    nrm /= np.linalg.norm(nrm, axis=1, keepdims=True)
+    uv = rng.random((n, 2)).astype(np.float32)
+    return pos, nrm, uv
+
+
+def _angle_deg(a, b):
+    a, b = np.asarray(a, np.float64), np.asarray(b, np.float64)
+    return np.degrees(np.arctan2(np.linalg.norm(np.cross(a, b), axis=1), (a * b).sum(axis=1)))
+
+
+def test_strides():
+    assert vertex_stride("float32") == 32
+    assert vertex_stride(COMPACT16) == 16
+    assert vertex_stride(COMPACT8) == 12
+
+
+def test_octahedral_roundtrip_covers_both_hemispheres():
+    _, nrm, _ = _cloud()
+    e = oct_encode(nrm)
+    assert np.abs(e).max() <= 1.0
+    assert _angle_deg(oct_decode(e), nrm).max() < 1e-3
+
+
+def test_compact_formats_precision():
+    pos, nrm, uv = _cloud()
+    extent = (pos.max(axis=0) - pos.min(axis=0)).max()
+    for fmt, max_deg in ((COMPACT16, 0.02), (COMPACT8, 1.5)):
+        stream, decode = encode_vertices(pos, nrm, uv, fmt)
+        out = decode_vertices(stream, fmt, decode)
+        assert np.abs(out[:, 0:3] - pos).max() <= extent / 65535
+        assert _angle_deg(out[:, 3:6], nrm).max() < max_deg
+        assert np.abs(out[:, 6:8] - uv).max() < 1e-3
+
+
+def test_decode_model_matches_cpu_dequantization():
+    pos, nrm, uv = _cloud(100)
+    stream, decode = encode_vertices(pos, nrm, uv, COMPACT16)
+    unit = decode_vertices(stream, COMPACT16, normalized=True)[:, 0:3]
+    world = np.eye(4, dtype=np.float32)
+    world[:3, 3] = [1.0, 2.0, 3.0]
+    gl = decode_model(world.T, decode)                     # формат to_gl
+    via_gpu = np.c_[unit, np.ones(len(unit))] @ gl
+    assert np.allclose(via_gpu[:, :3], pos + [1.0, 2.0, 3.0], atol=1e-3)
+
+
+def test_compact_mesh_file_roundtrip(tmp_path):
+    pos, nrm, uv = _cloud(300)
+    idx = np.arange(300, dtype=np.uint32)
+    path = write_mesh_file(tmp_path / "c.amesh", pos, nrm, uv, idx, vertex_format="compact8")
+    mf = MeshFile(path)
+    assert mf.vertex_format == COMPACT8 and mf.sections["VTX0"][0] == 12
+    assert mf.indices.dtype == np.uint16
+    assert np.allclose(mf.positions, pos, atol=1e-3)
+
+    mesh = load_mesh(path)
+    assert mesh.vertex_format == COMPACT8 and mesh._interleaved.dtype.itemsize == 12
+    centre, radius = mesh._bounding_center, mesh._bounding_radius
+    assert np.linalg.norm(pos - centre, axis=1).max() <= radius + 1e-3
+
+
+class _Backend:
+    supports_index16 = True
+    supports_vertex_formats = False
+
+    def __init__(self):
+        self.uploads = []
+
+    def create_buffer(self, data, usage="default"):
+        self.uploads.append(data)
+        return len(self.uploads)
+
+
+def test_backend_without_vertex_formats_gets_float_stream(tmp_path):
+    pos, nrm, uv = _cloud(64)
+    path = write_mesh_file(tmp_path / "c.amesh", pos, nrm, uv, vertex_format="compact16")
+    mesh = load_mesh(path)
+    backend = _Backend()
+    assert vertex_features(mesh, backend) == {}
+    mesh._setup_gpu_buffers(backend)
+    assert mesh._vb_stride == 32 and backend.uploads[0].shape == (64, 8)
+
+    backend = _Backend()
+    backend.supports_vertex_formats = True
+    assert vertex_features(mesh, backend) == {"VERTEX_FORMAT": COMPACT16}
+    mesh._setup_gpu_buffers(backend)
+    assert mesh._vb_stride == 16 and backend.uploads[0].nbytes == 64 * 16
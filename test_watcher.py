@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import base64
+import json
+import os
+import time
+
+import numpy as np
+
+from alkash3d.assets.async_loader import AsyncLoader, _iter_meshes
+from alkash3d.assets.gltf import load_gltf
+from alkash3d.assets.watcher import AssetWatcher, watch_mesh
+
+
+def _touch(path, text):
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _poll_until(watcher, timeout=3.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        n = watcher.poll()
+        if n:
+            return n
+        time.sleep(0.02)
+    return 0
+
+
+def test_changes_reload_asset_and_dependents_once(tmp_path):
+    for backend in ("poll", "auto"):
+        d = tmp_path / backend
+        d.mkdir()
+        inc, src, other = d / "common.hlsli", d / "lit.hlsl", d / "other.png"
+        for f in (inc, src, other):
+            f.write_text("x")
+        w = AssetWatcher(poll_per_frame=2, debounce=0.05, backend=backend)
+        calls = []
+        key = object()                              # «шейдер» – ключ без файла
+        w.add_dependency(src, key)
+        w.add_dependency(inc, key)
+        w.on_reload(key, lambda k: calls.append("pso"))
+        w.watch(other, lambda p: calls.append(p.name))
+        try:
+            _touch(inc, "y")
+            _touch(src, "y")
+            assert _poll_until(w) == 1 and calls == ["pso"]   # два файла → один PSO
+            _touch(other, "z")
+            assert _poll_until(w) == 1 and calls == ["pso", "other.png"]
+        finally:
+            w.stop()
+
+
+def _write_gltf(path, scale_a, scale_b):
+    """Два меша – узлы «A» и «B» – треугольники разного размера."""
+    tri = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], np.float32)
+    data = (tri * scale_a).tobytes() + (tri * scale_b).tobytes()
+    doc = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0, 1]}],
+        "nodes": [{"name": "A", "mesh": 0}, {"name": "B", "mesh": 1}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}}]},
+                   {"primitives": [{"attributes": {"POSITION": 1}}]}],
+        "buffers": [{"byteLength": len(data), "uri": "data:application/octet-stream;base64,"
+                     + base64.b64encode(data).decode()}],
+        "bufferViews": [{"buffer": 0, "byteOffset": 0, "byteLength": 36},
+                        {"buffer": 0, "byteOffset": 36, "byteLength": 36}],
+        "accessors": [{"bufferView": v, "componentType": 5126, "count": 3, "type": "VEC3"}
+                      for v in (0, 1)],
+    }
+    _touch(path, json.dumps(doc))
+
+
+def test_mesh_reload_parses_off_thread_and_keeps_instances_apart(tmp_path, fake_backend):
+    path = tmp_path / "pair.gltf"
+    _write_gltf(path, 1.0, 2.0)
+    by_name = {m.name: m for m in _iter_meshes(load_gltf(path))}
+    in_order = list(_iter_meshes(load_gltf(path)))       # порядок файла
+    backend = fake_backend()
+    loader = AsyncLoader(workers=1)
+    w = AssetWatcher(debounce=0.05, backend="poll")
+    watch_mesh(w, loader, path, {"A": by_name["A"], "B": [by_name["B"]]}, backend)
+    watch_mesh(w, loader, path, in_order, backend)
+    try:
+        _write_gltf(path, 3.0, 5.0)
+        assert _poll_until(w) == 2
+        assert by_name["A"].vertices.max() == 1.0        # до pump – старая геометрия
+
+        end = time.monotonic() + 5.0
+        while by_name["A"].vertices.max() != 3.0 and time.monotonic() < end:
+            loader.pump(backend)
+            time.sleep(0.005)
+        assert by_name["A"].vertices.max() == 3.0
+        assert by_name["B"].vertices.max() == 5.0
+        assert [m.vertices.max() for m in in_order] == [5.0, 3.0]
+        assert by_name["A"].vb is not None               # буферы готовы до кадра
+    finally:
+        w.stop()
+        loader.shutdown()